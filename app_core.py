@@ -0,0 +1,1040 @@
+"""
+Shared application core for the Patient Alert System API.
+
+Configuration, the MongoDB connection, the lazily-loaded service registry,
+JWT authentication and the helpers used by the route blueprints in
+``blueprints/``. The Flask app itself is created by ``app_simple.create_app``.
+"""
+
+from flask import request, jsonify
+import pymongo
+from pymongo.errors import DuplicateKeyError
+import bcrypt
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+from dotenv import load_dotenv
+import importlib
+import importlib.util
+from service_registry import services
+from index_registry import index_registry, register_all
+from llm_gateway import llm_gateway, PRIORITY_INTERACTIVE
+# Registers the pymongo command listener before any MongoClient is created
+from request_metrics import track_outbound
+from scheduler_lease import PartitionedScheduler, patient_partition
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Load environment variables with error handling
+try:
+    load_dotenv()  # Load environment variables
+    print("✅ Environment variables loaded successfully")
+except Exception as e:
+    print(f"⚠️ Could not load .env file: {e}")
+    print("💡 Continuing with default values...")
+
+# Get webhook URL from environment
+DEFAULT_WEBHOOK_URL = os.getenv('DEFAULT_WEBHOOK_URL', 'https://n8n.srv795087.hstgr.cloud/webhook/bf25c478-c4a9-44c5-8f43-08c3fcae51f9')
+print(f"🔍 Using webhook URL: {DEFAULT_WEBHOOK_URL}")
+
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+import random
+import string
+import re
+import jwt
+from functools import wraps
+
+# Heavy optional dependencies are only probed here; they are imported where
+# they are used so that worker startup does not pay for them.
+def module_available(module_name: str) -> bool:
+    """Check whether a module can be imported without importing it"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# OCR and Document Processing dependencies
+PYMUPDF_AVAILABLE = module_available("fitz")
+if not PYMUPDF_AVAILABLE:
+    print("⚠️ PyMuPDF not available. Install with: pip install PyMuPDF")
+
+PIL_AVAILABLE = module_available("PIL")
+if not PIL_AVAILABLE:
+    print("⚠️ PIL not available. Install with: pip install Pillow")
+
+# Quantum and LLM dependencies
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
+    print("⚠️ SentenceTransformers not available. Install with: pip install sentence-transformers")
+
+QDRANT_AVAILABLE = module_available("qdrant_client")
+if not QDRANT_AVAILABLE:
+    print("⚠️ Qdrant client not available. Install with: pip install qdrant-client")
+
+OPENAI_AVAILABLE = module_available("openai")
+if not OPENAI_AVAILABLE:
+    print("⚠️ OpenAI client not available. Install with: pip install openai")
+
+# Load environment variables
+load_dotenv()
+
+# ==================== QUANTUM & LLM CONFIGURATION ====================
+
+# Qdrant Vector Database Configuration
+QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333")
+QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "pregnancy_knowledge")
+QDRANT_TIMEOUT_SEC = float(os.getenv("QDRANT_TIMEOUT_SEC", "60"))
+QDRANT_BATCH_SIZE = int(os.getenv("QDRANT_BATCH_SIZE", "64"))
+
+# Embeddings Configuration
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+VECTOR_SIZE = int(os.getenv("VECTOR_SIZE", "384"))
+
+# LLM Configuration
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
+
+# Retrieval Configuration
+TOP_K = int(os.getenv("TOP_K", "5"))
+RETRIEVAL_MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", "0.70"))
+
+# User-visible text and prompts (dynamic via env)
+DISCLAIMER_TEXT = os.getenv(
+    "DISCLAIMER_TEXT",
+    "This information is educational and not a medical diagnosis. If you have red-flag symptoms such as heavy bleeding, severe pain, high fever, severe headache with vision changes, reduced fetal movement, or feeling very unwell, seek urgent care immediately."
+)
+
+FALLBACK_STATIC_TEXT = os.getenv(
+    "FALLBACK_STATIC_TEXT",
+    "General guidance: rest, hydrate, track symptoms, avoid triggers, and contact your prenatal provider for advice."
+)
+
+FALLBACK_SYSTEM_PROMPT = os.getenv(
+    "FALLBACK_SYSTEM_PROMPT",
+    "You are a cautious pregnancy symptom assistant. Provide 3-5 concise, trimester-aware self-care suggestions, avoid medications/doses, include when to seek urgent care, and always add a medical disclaimer."
+)
+
+SUMMARY_SYSTEM_PROMPT = os.getenv(
+    "SUMMARY_SYSTEM_PROMPT",
+    "You are a cautious medical assistant supporting an obstetrician. Your ONLY knowledge source is the evidence bullets provided in the user message. Do NOT use outside knowledge. Primary task: Based on the evidence, determine the overall urgency level (mild, moderate, urgent) for the patient's symptoms. Provide a concise, trimester-specific guidance summary for a pregnant patient. Instructions: Use 3–5 short bullets. Include one bullet explicitly stating when to seek urgent care, based on evidence triage tags. Be clear, factual, and non-alarmist. If evidence is conflicting or insufficient, state that clearly. Do NOT invent facts not present in evidence. Do NOT recommend medications, dosages, diagnostic codes, or brand names. Do NOT make definitive diagnoses; frame as possible concerns and next steps. Keep lay-friendly tone; avoid jargon where possible. Assume this is general guidance, not a substitute for clinical judgment. Output format: Start with: 'Urgency level: <mild/moderate/urgent/uncertain>' Then list plain text bullets (no numbering, no markdown headings). Each bullet ≤ 25 words."
+)
+
+# Indexes for the collections opened by Database
+index_registry.register("Patient_test", "patient_id", owner="patients", unique=True, sparse=True)
+index_registry.register("Patient_test", "email", owner="patients", unique=True, sparse=True)
+index_registry.register("Patient_test", "mobile", owner="patients", unique=True, sparse=True)
+# Multikey indexes for lookups into the embedded appointments array
+index_registry.register("Patient_test", "appointments.appointment_id", owner="appointments")
+index_registry.register("Patient_test", "appointments.appointment_status", owner="appointments")
+index_registry.register("mental_health_logs", "patient_id", owner="mental_health")
+index_registry.register("mental_health_logs", "date", owner="mental_health")
+index_registry.register("mental_health_logs", [("patient_id", 1), ("date", 1), ("type", 1)], owner="mental_health")
+index_registry.register("mental_health_logs", [("patient_id", 1), ("type", 1), ("date", -1)], owner="mental_health")
+index_registry.register("doctor_v2", "doctor_id", owner="doctors")
+# Sent reminders are only needed until their dose day is over; the scheduler
+# creates this TTL index itself (see ensure_reminder_sends_ttl) so the
+# collection cannot grow when RECONCILE_INDEXES_ON_STARTUP is off
+index_registry.register("medication_reminder_sends", "sent_at", owner="medication_reminders",
+                        expireAfterSeconds=2 * 24 * 3600)
+
+# Database connection
+class Database:
+    def __init__(self):
+        self.client = None
+        self.patients_collection = None
+        self.connect()
+    
+    def connect(self):
+        max_retries = 3
+        retry_count = 0
+        
+        while retry_count < max_retries:
+            try:
+                mongo_uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+                db_name = os.getenv("DB_NAME", "patients_db")
+                
+                logger.debug(f"🔍 Attempting to connect to MongoDB (attempt {retry_count + 1}/{max_retries})...")
+                logger.debug(f"🔍 Database: {db_name}")
+                
+                # Close existing connection if any
+                if self.client:
+                    try:
+                        self.client.close()
+                    except:
+                        pass
+                
+                self.client = pymongo.MongoClient(mongo_uri, serverSelectionTimeoutMS=10000)
+                
+                # Test the connection
+                logger.debug("🔍 Testing connection with ping...")
+                self.client.admin.command('ping')
+                logger.info("✅ MongoDB connection test successful")
+                
+                # Get database
+                db = self.client[db_name]
+                logger.info(f"✅ Database '{db_name}' accessed successfully")
+                
+                # Initialize collections
+                self.patients_collection = db["Patient_test"]
+                self.mental_health_collection = db["mental_health_logs"]
+                self.doctors_collection = db["doctors"]
+                self.doctor_v2_collection = db["doctor_v2"]
+                self.reminder_sends_collection = db["medication_reminder_sends"]
+                
+                # Test collections exist and are accessible
+                logger.debug(f"🔍 Testing collections...")
+                logger.debug(f"🔍 Patients collection: {self.patients_collection.name}")
+                logger.debug(f"🔍 Mental health collection: {self.mental_health_collection.name}")
+                
+                # Indexes are reconciled at deploy time (python index_registry.py reconcile)
+                if os.getenv("RECONCILE_INDEXES_ON_STARTUP", "false").lower() == "true":
+                    logger.debug("🔍 Reconciling indexes...")
+                    # Lazily loaded services declare their indexes on import
+                    register_all()
+                    index_report = index_registry.reconcile(db)
+                    logger.info(f"✅ Indexes: {len(index_report['created'])} created, {len(index_report['rebuilt'])} rebuilt, "
+                          f"{len(index_report['unchanged'])} unchanged")
+                    for error in index_report["errors"]:
+                        logger.warning(f"⚠️ Index reconcile failed: {error}")
+                
+                logger.info("✅ Connected to MongoDB successfully")
+                logger.info(f"✅ Database: {db_name}")
+                logger.info(f"✅ Collections: Patient_test, mental_health_logs")
+                return  # Success, exit the retry loop
+                
+            except Exception as e:
+                retry_count += 1
+                logger.error(f"❌ Database connection attempt {retry_count} failed: {e}")
+                logger.debug(f"🔍 Error type: {type(e).__name__}")
+                logger.debug(f"🔍 Full error: {str(e)}")
+                
+                if retry_count >= max_retries:
+                    logger.error(f"❌ All {max_retries} connection attempts failed")
+                    self.patients_collection = None
+                    self.mental_health_collection = None
+                else:
+                    logger.info(f"🔄 Retrying in 2 seconds...")
+                    import time
+                    time.sleep(2)
+    
+    def close(self):
+        if self.client:
+            self.client.close()
+    
+    def is_connected(self):
+        """Check if database is connected and accessible"""
+        try:
+            if self.client is None or self.patients_collection is None:
+                return False
+            
+            # Test connection with a simple command
+            self.client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.error(f"❌ Database connection check failed: {e}")
+            return False
+    
+    def reconnect(self):
+        """Attempt to reconnect to the database"""
+        logger.info("🔄 Attempting to reconnect to database...")
+        self.connect()
+        return self.is_connected()
+
+# Initialize database
+db = Database()
+
+# ==================== SERVICE REGISTRY ====================
+# Each subsystem is created on first use (see service_registry.py).
+
+symptoms_service = services.register(
+    'symptoms', lambda: importlib.import_module('symptoms_service').symptoms_service)
+vital_signs_service = services.register(
+    'vital_signs', lambda: importlib.import_module('vital_signs_service').VitalSignsService(db))
+vital_signs_ocr_service = services.register(
+    'vital_signs_ocr', lambda: importlib.import_module('vital_signs_ocr_service').vital_signs_ocr_service)
+vital_ocr_service = services.register(
+    'vital_ocr', lambda: importlib.import_module('vital_ocr_service').vital_ocr_service)
+pregnancy_service = services.register(
+    'pregnancy', lambda: importlib.import_module('pregnancy_service').PregnancyService())
+hydration_service = services.register(
+    'hydration', lambda: importlib.import_module('hydration_service').HydrationService())
+mental_health_service = services.register(
+    'mental_health', lambda: importlib.import_module('mental_health_service').MentalHealthService())
+medical_lab_service = services.register(
+    'medical_lab', lambda: importlib.import_module('medical_lab_service').MedicalLabService())
+voice_interaction_service = services.register(
+    'voice_interaction', lambda: importlib.import_module('voice_interaction_service').voice_interaction_service)
+
+# ==================== QUANTUM & LLM SERVICES ====================
+
+class QuantumVectorService:
+    """Quantum-inspired vector database service using Qdrant"""
+    
+    def __init__(self):
+        self.client = None
+        self.embedding_model = None
+        self.initialize_services()
+    
+    def initialize_services(self):
+        """Initialize Qdrant client and embedding model"""
+        if QDRANT_AVAILABLE:
+            try:
+                from qdrant_client import QdrantClient
+                self.client = QdrantClient(
+                    url=QDRANT_URL,
+                    api_key=QDRANT_API_KEY,
+                    timeout=QDRANT_TIMEOUT_SEC,
+                )
+                logger.info("✅ Qdrant client initialized successfully")
+            except Exception as e:
+                logger.error(f"❌ Qdrant client initialization failed: {e}")
+                self.client = None
+        
+        if SENTENCE_TRANSFORMERS_AVAILABLE:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self.embedding_model = SentenceTransformer(EMBEDDING_MODEL)
+                logger.info("✅ Embedding model initialized successfully")
+            except Exception as e:
+                logger.error(f"❌ Embedding model initialization failed: {e}")
+                self.embedding_model = None
+    
+    def ensure_collection(self):
+        """Ensure Qdrant collection exists with proper configuration"""
+        if not self.client:
+            return False
+        
+        try:
+            from qdrant_client.http.models import Distance, VectorParams, PayloadSchemaType
+            collections = self.client.get_collections().collections
+            names = {c.name for c in collections}
+            
+            if QDRANT_COLLECTION not in names:
+                self.client.create_collection(
+                    collection_name=QDRANT_COLLECTION,
+                    vectors_config=VectorParams(
+                        size=VECTOR_SIZE,
+                        distance=Distance.COSINE,
+                    ),
+                )
+                logger.info(f"✅ Created Qdrant collection: {QDRANT_COLLECTION}")
+            
+            # Ensure payload indexes
+            try:
+                self.client.create_payload_index(
+                    collection_name=QDRANT_COLLECTION,
+                    field_name="trimester",
+                    field_schema=PayloadSchemaType.KEYWORD,
+                )
+            except Exception:
+                pass  # Index might already exist
+            
+            return True
+        except Exception as e:
+            logger.error(f"❌ Collection setup failed: {e}")
+            return False
+    
+    def embed_text(self, text: str) -> list:
+        """Generate embeddings for text using sentence transformers"""
+        if not self.embedding_model:
+            return []
+        
+        try:
+            vector = self.embedding_model.encode([text], normalize_embeddings=True)
+            return vector[0].tolist()
+        except Exception as e:
+            logger.error(f"❌ Text embedding failed: {e}")
+            return []
+    
+    def build_trimester_filter(self, weeks_pregnant: int):
+        """Build trimester filter for vector search"""
+        if not self.client:
+            return None
+        
+        if weeks_pregnant <= 0:
+            return None
+        
+        trimester = "first" if weeks_pregnant <= 13 else ("second" if weeks_pregnant <= 27 else "third")
+        
+        from qdrant_client.http.models import Filter, FieldCondition, MatchValue
+        return Filter(
+            should=[
+                FieldCondition(key="trimester", match=MatchValue(value=trimester)),
+                FieldCondition(key="trimester", match=MatchValue(value="all")),
+            ]
+        )
+    
+    def search_knowledge(self, query_text: str, weeks_pregnant: int) -> list:
+        """Search pregnancy knowledge base using vector similarity"""
+        if not self.client or not self.embedding_model:
+            return []
+        
+        try:
+            # Generate query embedding
+            query_vector = self.embed_text(query_text)
+            if not query_vector:
+                return []
+            
+            # Build trimester filter
+            trimester_filter = self.build_trimester_filter(weeks_pregnant)
+            
+            # Search Qdrant
+            results = self.client.search(
+                collection_name=QDRANT_COLLECTION,
+                query_vector=query_vector,
+                limit=TOP_K,
+                query_filter=trimester_filter,
+                with_payload=True,
+                score_threshold=RETRIEVAL_MIN_SCORE
+            )
+            
+            # Format results
+            suggestions = []
+            for hit in results:
+                payload = hit.payload or {}
+                suggestions.append({
+                    "id": str(hit.id),
+                    "text": payload.get("text", ""),
+                    "metadata": {
+                        "source": payload.get("source", ""),
+                        "tags": payload.get("tags", []),
+                        "triage": payload.get("triage", ""),
+                        "trimester": payload.get("trimester", ""),
+                    },
+                    "score": float(hit.score) if hit.score is not None else None,
+                })
+            
+            return suggestions
+        except Exception as e:
+            logger.error(f"❌ Knowledge search failed: {e}")
+            return []
+
+class LLMService:
+    """LLM service for symptom analysis and recommendations"""
+    
+    def __init__(self):
+        self.client = None
+        self.initialize_client()
+    
+    def initialize_client(self):
+        """Initialize OpenAI client"""
+        if OPENAI_AVAILABLE and OPENAI_API_KEY:
+            try:
+                self.client = llm_gateway.client_for("symptoms_fallback", PRIORITY_INTERACTIVE)
+                logger.info("✅ OpenAI client initialized successfully")
+            except Exception as e:
+                logger.error(f"❌ OpenAI client initialization failed: {e}")
+                self.client = None
+        else:
+            logger.warning("⚠️ OpenAI not available - using fallback responses")
+    
+    def detect_red_flags(self, text: str) -> list:
+        """Detect red flag symptoms in text"""
+        flags = []
+        lower_text = text.lower()
+        
+        if any(k in lower_text for k in ["bleeding", "spotting", "blood"]):
+            flags.append("vaginal bleeding")
+        if any(k in lower_text for k in ["severe pain", "sharp pain", "worst pain"]):
+            flags.append("severe pain")
+        if any(k in lower_text for k in ["vision", "blurry", "flashing lights"]):
+            flags.append("vision changes")
+        if any(k in lower_text for k in ["fever", "temperature", "high temp"]):
+            flags.append("fever")
+        if any(k in lower_text for k in ["reduced movement", "less movement", "not moving"]):
+            flags.append("reduced fetal movement")
+        
+        return flags
+    
+    def generate_llm_fallback(self, symptom_text: str, weeks_pregnant: int) -> dict:
+        """Generate LLM-powered fallback response"""
+        red_flags = self.detect_red_flags(symptom_text)
+        
+        if self.client:
+            try:
+                trimester = "first" if weeks_pregnant <= 13 else ("second" if weeks_pregnant <= 27 else "third")
+                
+                response = self.client.chat.completions.create(
+                    model=LLM_MODEL,
+                    messages=[
+                        {"role": "system", "content": FALLBACK_SYSTEM_PROMPT},
+                        {"role": "user", "content": f"User symptom text: '{symptom_text}'. Weeks pregnant: {weeks_pregnant} (trimester: {trimester}). If any red flags, state them and advise urgent care."}
+                    ],
+                    temperature=0.2,
+                )
+                content = response.choices[0].message.content.strip()
+            except Exception as e:
+                logger.warning(f"⚠️ LLM fallback failed: {e}")
+                content = FALLBACK_STATIC_TEXT
+        else:
+            content = FALLBACK_STATIC_TEXT
+        
+        suggestions = [
+            {
+                "id": "fallback-1",
+                "text": content,
+                "metadata": {
+                    "triage": "use clinical judgment; follow red-flag guidance",
+                    "source": "LLM-fallback" if self.client else "static-fallback",
+                },
+                "score": None,
+            }
+        ]
+        
+        if red_flags:
+            suggestions.insert(0, {
+                "id": "fallback-urgent",
+                "text": f"Your description suggests potential red flags ({', '.join(red_flags)}) — please seek urgent care or contact your provider immediately.",
+                "metadata": {"triage": "urgent", "source": "safety-check"},
+                "score": None,
+            })
+        
+        return {
+            "suggestions": suggestions,
+            "disclaimers": DISCLAIMER_TEXT,
+            "red_flags": red_flags
+        }
+    
+    def summarize_retrieval(self, symptom_text: str, weeks_pregnant: int, suggestions: list) -> dict:
+        """Summarize retrieved suggestions using LLM"""
+        if not suggestions or not self.client:
+            return None
+        
+        try:
+            trimester = "first" if weeks_pregnant <= 13 else ("second" if weeks_pregnant <= 27 else "third")
+            
+            # Build evidence from top suggestions
+            top_suggestions = suggestions[:3]
+            evidence = "\n".join(
+                f"- [triage: {s.get('metadata', {}).get('triage', 'unspecified')}] {s.get('text', '')}"
+                for s in top_suggestions
+            )
+            
+            response = self.client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"User symptom text: '{symptom_text}'. Weeks pregnant: {weeks_pregnant} (trimester: {trimester}). Evidence bullets (use ONLY these):\n{evidence}"}
+                ],
+                temperature=0.2,
+            )
+            content = response.choices[0].message.content.strip()
+            
+            return {
+                "id": "synthesis-1",
+                "text": content,
+                "metadata": {
+                    "source": "LLM-summary",
+                    "evidence_ids": [s.get("id") for s in top_suggestions],
+                    "triage": "summary",
+                },
+                "score": None,
+            }
+        except Exception as e:
+            logger.warning(f"⚠️ LLM summarization failed: {e}")
+            return None
+
+# Quantum and LLM services load the embedding model and clients on first use
+quantum_service = services.register('quantum', QuantumVectorService)
+llm_service = services.register('llm', LLMService)
+
+# User Activity Tracking System
+for field in ("user_email", "session_id", "timestamp", "activity_type"):
+    index_registry.register("user_activities", field, owner="activity_tracker")
+
+class UserActivityTracker:
+    """Track all user activities from login to logout"""
+    
+    def __init__(self, db):
+        self.db = db
+        self.activities_collection = db.client[os.getenv("DB_NAME", "patients_db")]["user_activities"]
+        
+        logger.info("✅ User Activity Tracker initialized")
+    
+    def start_user_session(self, user_email, user_role, username, user_id):
+        """Start tracking a new user session"""
+        session_id = str(uuid.uuid4())
+        session_start = datetime.now()
+        
+        session_data = {
+            "session_id": session_id,
+            "user_email": user_email,
+            "user_role": user_role,
+            "username": username,
+            "user_id": user_id,
+            "session_start": session_start,
+            "session_end": None,
+            "is_active": True,
+            "activities": [],
+            "created_at": session_start
+        }
+        
+        result = self.activities_collection.insert_one(session_data)
+        logger.debug(f"🔍 Started tracking session {session_id}", extra={"user_email": user_email})
+        return session_id
+    
+    def end_user_session(self, user_email, session_id=None):
+        """End a user session"""
+        if session_id:
+            # End specific session
+            result = self.activities_collection.update_one(
+                {"session_id": session_id, "is_active": True},
+                {
+                    "$set": {
+                        "session_end": datetime.now(),
+                        "is_active": False
+                    }
+                }
+            )
+        else:
+            # End all active sessions for user
+            result = self.activities_collection.update_many(
+                {"user_email": user_email, "is_active": True},
+                {
+                    "$set": {
+                        "session_end": datetime.now(),
+                        "is_active": False
+                    }
+                }
+            )
+        
+        logger.debug("🔍 Ended session(s)", extra={"user_email": user_email})
+        return result.modified_count
+    
+    def log_activity(self, user_email, activity_type, activity_data, session_id=None):
+        """Log a user activity"""
+        if not session_id:
+            # Find active session for user
+            active_session = self.activities_collection.find_one(
+                {"user_email": user_email, "is_active": True}
+            )
+            if active_session:
+                session_id = active_session["session_id"]
+            else:
+                logger.warning("⚠️ No active session found", extra={"user_email": user_email})
+                return None
+        
+        activity_entry = {
+            "activity_id": str(uuid.uuid4()),
+            "timestamp": datetime.now(),
+            "activity_type": activity_type,
+            "activity_data": activity_data,
+            "ip_address": request.remote_addr if request else "unknown"
+        }
+        
+        # Add activity to session
+        result = self.activities_collection.update_one(
+            {"session_id": session_id},
+            {"$push": {"activities": activity_entry}}
+        )
+        
+        logger.debug(f"🔍 Logged activity: {activity_type}", extra={"user_email": user_email})
+        return activity_entry["activity_id"]
+    
+    def get_user_activities(self, user_email, limit=100):
+        """Get all activities for a user"""
+        sessions = list(self.activities_collection.find(
+            {"user_email": user_email},
+            {"_id": 0}
+        ).sort("created_at", -1).limit(limit))
+        
+        return sessions
+    
+    def get_session_activities(self, session_id):
+        """Get all activities for a specific session"""
+        session = self.activities_collection.find_one(
+            {"session_id": session_id},
+            {"_id": 0}
+        )
+        return session
+    
+    def get_activity_summary(self, user_email):
+        """Get summary of user activities"""
+        pipeline = [
+            {"$match": {"user_email": user_email}},
+            {"$unwind": "$activities"},
+            {"$group": {
+                "_id": "$activities.activity_type",
+                "count": {"$sum": 1},
+                "last_activity": {"$max": "$activities.timestamp"}
+            }},
+            {"$sort": {"count": -1}}
+        ]
+        
+        summary = list(self.activities_collection.aggregate(pipeline))
+        return summary
+
+# Initialize activity tracker
+activity_tracker = UserActivityTracker(db)
+
+# JWT Configuration
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production")
+JWT_ALGORITHM = "HS256"
+JWT_EXPIRATION_HOURS = 24  # Token expires in 24 hours
+
+def generate_jwt_token(user_data):
+    """Generate JWT token for user"""
+    payload = {
+        "user_id": str(user_data.get("_id")) if user_data.get("_id") else str(user_data.get("patient_id", "")),
+        "patient_id": user_data.get("patient_id"),
+        "email": user_data.get("email"),
+        "username": user_data.get("username"),
+        "exp": datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
+        "iat": datetime.utcnow()
+    }
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+def verify_jwt_token(token):
+    """Verify JWT token and return user data"""
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        return payload
+    except jwt.ExpiredSignatureError:
+        return None
+    except jwt.InvalidTokenError:
+        return None
+
+def token_required(f):
+    """Decorator to require JWT token for protected routes"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        token = None
+        
+        # Get token from header
+        if 'Authorization' in request.headers:
+            auth_header = request.headers['Authorization']
+            try:
+                token = auth_header.split(" ")[1]  # Bearer <token>
+            except IndexError:
+                return jsonify({"error": "Invalid token format"}), 401
+        
+        if not token:
+            return jsonify({"error": "Token is missing"}), 401
+        
+        # Verify token
+        payload = verify_jwt_token(token)
+        if not payload:
+            return jsonify({"error": "Invalid or expired token"}), 401
+        
+        # Add user data to request
+        request.user_data = payload
+        return f(*args, **kwargs)
+    
+    return decorated
+
+# Utility functions
+def generate_patient_id():
+    """Generate unique patient ID with timestamp and random component"""
+    import time
+    timestamp = int(time.time())
+    random_component = uuid.uuid4().hex[:6].upper()
+    return f"PAT{timestamp}{random_component}"
+
+def generate_unique_patient_id():
+    """Generate a unique patient ID that doesn't exist in database"""
+    max_attempts = 10
+    for attempt in range(max_attempts):
+        patient_id = generate_patient_id()
+        
+        # Check if this patient ID already exists
+        if db.patients_collection is not None:
+            existing_patient = db.patients_collection.find_one({"patient_id": patient_id})
+            if existing_patient is None:
+                return patient_id
+        
+        # If we've tried too many times, add a random suffix
+        if attempt == max_attempts - 1:
+            extra_random = uuid.uuid4().hex[:4].upper()
+            patient_id = f"{patient_id}{extra_random}"
+            return patient_id
+    
+    # Fallback: use timestamp with more random components
+    timestamp = int(time.time() * 1000)  # Use milliseconds
+    random_component = uuid.uuid4().hex[:8].upper()
+    return f"PAT{timestamp}{random_component}"
+
+def generate_otp():
+    """Generate 6-digit OTP"""
+    return ''.join(random.choices(string.digits, k=6))
+
+def send_email(to_email: str, subject: str, body: str) -> bool:
+    """Send email using Gmail SMTP"""
+    try:
+        sender_email = os.getenv("SENDER_EMAIL")
+        sender_password = os.getenv("SENDER_PASSWORD")
+        
+        if not sender_email or not sender_password:
+            logger.error("❌ Email configuration missing - set SENDER_EMAIL and SENDER_PASSWORD in .env")
+            return False  # Return False instead of True for missing config
+        
+        logger.info(f"📧 Sending email: {subject}", extra={"email": to_email})
+        
+        msg = MIMEMultipart()
+        msg['From'] = sender_email
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        
+        with track_outbound("smtp"):
+            server = smtplib.SMTP('smtp.gmail.com', 587)
+            server.starttls()
+            
+            server.login(sender_email, sender_password)
+            
+            text = msg.as_string()
+            server.sendmail(sender_email, to_email, text)
+            server.quit()
+        
+        logger.debug("✅ Email sent")
+        return True
+    except smtplib.SMTPAuthenticationError as e:
+        logger.error(f"❌ SMTP Authentication failed (check the Gmail App Password and 2FA): {e}")
+        return False
+    except smtplib.SMTPRecipientsRefused as e:
+        logger.error(f"❌ Recipient email refused: {e}")
+        return False
+    except smtplib.SMTPServerDisconnected as e:
+        logger.error(f"❌ SMTP Server disconnected: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"❌ Email sending failed ({type(e).__name__}): {e}")
+        return False
+
+def send_otp_email(email: str, otp: str) -> bool:
+    """Send OTP email"""
+    subject = "Patient Alert System - OTP Verification"
+    body = f"""
+    Hello!
+    
+    Your OTP for Patient Alert System is: {otp}
+    
+    This OTP is valid for 10 minutes.
+    
+    If you didn't request this, please ignore this email.
+    
+    Best regards,
+    Patient Alert System Team
+    """
+    result = send_email(email, subject, body)
+    if not result:
+        logger.error("❌ Failed to send OTP email")
+    return result
+
+def send_patient_id_email(email: str, patient_id: str, username: str) -> bool:
+    """Send Patient ID to user's email"""
+    try:
+        subject = "Your Patient ID - Patient Alert System"
+        body = f"""
+Hello {username},
+
+Your Patient ID has been generated successfully.
+
+Patient ID: {patient_id}
+
+Please keep this ID safe and use it to log in to your account.
+
+Best regards,
+Patient Alert System Team
+        """
+        
+        return send_email(email, subject, body)
+    except Exception as e:
+        logger.error(f"Error sending Patient ID email: {e}")
+        return False
+
+def send_medication_reminder_email(email: str, username: str, medication_name: str, dosage: str, time: str, frequency: str, special_instructions: str = "") -> bool:
+    """Send medication reminder email to user"""
+    try:
+        subject = f"Medication Reminder: {medication_name}"
+        body = f"""
+Hello {username},
+
+It's time to take your medication!
+
+Medication: {medication_name}
+Dosage: {dosage}
+Time: {time}
+Frequency: {frequency}
+{f"Special Instructions: {special_instructions}" if special_instructions else ""}
+
+Please take your medication as prescribed by your doctor.
+    
+    Best regards,
+    Patient Alert System Team
+    """
+        
+        return send_email(email, subject, body)
+    except Exception as e:
+        logger.error(f"Error sending medication reminder email: {e}")
+        return False
+
+def reminder_due(dose_time_str: str, now: datetime, window_minutes: int = 15) -> bool:
+    """Whether a HH:MM dose time is within window_minutes of now"""
+    hour, minute = map(int, dose_time_str.split(':'))
+    dose_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return abs((now - dose_time).total_seconds() / 60) <= window_minutes
+
+def claim_reminder(reminder_key: str, patient_id: str, now: datetime) -> bool:
+    """Record a reminder as sent; False if any scheduler already sent it"""
+    try:
+        db.reminder_sends_collection.insert_one({"_id": reminder_key, "patient_id": patient_id, "sent_at": now})
+        return True
+    except DuplicateKeyError:
+        return False
+
+def ensure_reminder_sends_ttl():
+    """Create the declared medication_reminder_sends indexes, including the sent_at TTL"""
+    for spec in index_registry.declared("medication_reminder_sends"):
+        db.reminder_sends_collection.create_index(list(spec["keys"]), **spec["options"])
+
+def check_and_send_medication_reminders(partition: Optional[int] = None, partitions: int = 1, lease=None):
+    """Send email reminders for doses due within 15 minutes
+
+    With a partition, only patients in that partition (see scheduler_lease) are
+    checked, and the scan stops as soon as the lease is lost. Every reminder is
+    claimed in medication_reminder_sends first, so a dose is emailed once even
+    when schedulers overlap or the manual trigger runs as well.
+    """
+    try:
+        logger.debug(f"🔍 Checking for medication reminders{'' if partition is None else f' (partition {partition}/{partitions})'}...")
+        
+        patients = db.patients_collection.find(
+            {"medication_logs.dosages.reminder_enabled": True},
+            {"patient_id": 1, "email": 1, "username": 1, "medication_logs": 1}
+        )
+        current_time = datetime.now()
+        
+        reminders_sent = 0
+        
+        for patient in patients:
+            if lease is not None and not lease.held:
+                logger.warning(f"⚠️ Reminder lease lost; stopping partition {partition}")
+                break
+            try:
+                patient_id = patient.get('patient_id')
+                email = patient.get('email')
+                username = patient.get('username')
+                
+                if not all([patient_id, email, username]):
+                    continue
+                if partition is not None and patient_partition(patient_id, partitions) != partition:
+                    continue
+                
+                # Get medication logs for this patient
+                medication_logs = patient.get('medication_logs', [])
+                
+                for log in medication_logs:
+                    if not log.get('is_prescription_mode', False):
+                        # Handle multiple dosages
+                        dosages = log.get('dosages', [])
+                        for dosage in dosages:
+                            if dosage.get('reminder_enabled', False):
+                                try:
+                                    time_str = dosage.get('time', '')
+                                    if time_str and reminder_due(time_str, current_time):
+                                        reminder_key = f"reminder_{patient_id}_{log.get('medication_name')}_{time_str}_{current_time.strftime('%Y-%m-%d')}"
+                                        if not claim_reminder(reminder_key, patient_id, current_time):
+                                            continue
+                                        
+                                        if send_medication_reminder_email(
+                                            email=email,
+                                            username=username,
+                                            medication_name=log.get('medication_name', 'Unknown'),
+                                            dosage=dosage.get('dosage', ''),
+                                            time=time_str,
+                                            frequency=dosage.get('frequency', ''),
+                                            special_instructions=dosage.get('special_instructions', '')
+                                        ):
+                                            reminders_sent += 1
+                                            logger.info(f"✅ Medication reminder sent to patient {patient_id} for {time_str}")
+                                        else:
+                                            # Release the claim so the next check retries
+                                            db.reminder_sends_collection.delete_one({"_id": reminder_key})
+                                            logger.error(f"❌ Failed to send medication reminder to patient {patient_id}")
+                                            
+                                except Exception as e:
+                                    logger.warning(f"⚠️ Error processing dosage reminder for patient {patient_id}: {e}")
+                                    continue
+                                    
+            except Exception as e:
+                logger.warning(f"⚠️ Error processing patient {patient.get('patient_id', 'unknown')}: {e}")
+                continue
+        
+        logger.info(f"✅ Medication reminder check completed. {reminders_sent} reminders sent.")
+        return reminders_sent
+        
+    except Exception as e:
+        logger.error(f"❌ Error in medication reminder service: {e}")
+        return 0
+
+def hash_password(password: str) -> str:
+    """Hash password using bcrypt"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Verify password against hash"""
+    try:
+        # Ensure password is string and encode it
+        if isinstance(password, bytes):
+            password = password.decode('utf-8')
+        password_bytes = password.encode('utf-8')
+        
+        # Ensure hashed is string and encode it
+        if isinstance(hashed, bytes):
+            hashed = hashed.decode('utf-8')
+        hashed_bytes = hashed.encode('utf-8')
+        
+        return bcrypt.checkpw(password_bytes, hashed_bytes)
+    except Exception as e:
+        logger.error(f"Password verification error: {e}")
+        return False
+
+def validate_email(email: str) -> bool:
+    """Validate email format"""
+    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(email_pattern, email) is not None
+
+def validate_mobile(mobile: str) -> bool:
+    """Validate mobile number"""
+    return mobile.isdigit() and len(mobile) >= 10
+
+def is_profile_complete(patient_doc: dict) -> bool:
+    """Check if patient profile is complete"""
+    required_fields = ['first_name', 'last_name', 'date_of_birth', 'blood_type']
+    return all(field in patient_doc for field in required_fields)
+
+# ==================== MEDICATION REMINDER SCHEDULER ====================
+import time
+
+MEDICATION_REMINDER_INTERVAL_SECONDS = 15 * 60
+# Set once started, so a shutting-down process can hand its leases over
+medication_reminder_scheduler = None
+
+def start_medication_reminder_scheduler():
+    """Start the medication reminder scheduler; one process per partition sends (see scheduler_lease)"""
+    global medication_reminder_scheduler
+    try:
+        if db.patients_collection is None:
+            logger.error("❌ Medication reminder scheduler not started: database unavailable")
+            return None
+        try:
+            ensure_reminder_sends_ttl()
+        except Exception as e:
+            # e.g. an existing sent_at index with other options; `index_registry.py reconcile` rebuilds it
+            logger.warning(f"⚠️ Could not create the reminder sends TTL index: {e}")
+        scheduler = PartitionedScheduler(db.patients_collection.database, "medication_reminders",
+                                         check_and_send_medication_reminders,
+                                         interval=MEDICATION_REMINDER_INTERVAL_SECONDS)
+        scheduler_thread = scheduler.start()
+        medication_reminder_scheduler = scheduler
+        logger.info(f"✅ Medication reminder scheduler started as {scheduler.owner} "
+              f"({scheduler.partitions} partition(s), up to {scheduler.max_partitions} here)")
+        return scheduler_thread
+    except Exception as e:
+        logger.error(f"❌ Failed to start medication reminder scheduler: {e}")
+        return None
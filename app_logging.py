@@ -0,0 +1,308 @@
+"""
+Structured, sampled, non-blocking logging for the Flask app
+
+Route handlers log through ``get_logger(__name__)``. Records pass three steps
+on the request thread:
+- per-route sampling of DEBUG/INFO (warnings and errors are always kept)
+- redaction of PHI fields and of emails, phone numbers and bearer tokens
+- a put on an in-memory queue
+A QueueListener thread formats the records (text or JSON) and writes them to
+stdout, so handlers never block on I/O. The time each request spends in
+logging is measured and reported by ``logging_stats()``.
+
+Configuration:
+    LOG_MODE=quiet                   production: WARNING and up, JSON lines
+    LOG_LEVEL=INFO                   DEBUG also logs (redacted) request payloads
+    LOG_FORMAT=text|json
+    LOG_SAMPLE_RATES=profile.*=0.1,vitals.get_vital_signs_history=0.2,default=1
+    LOG_REDACT_FIELDS=extra,field,names
+    LOG_OVERHEAD_HEADER=true         add X-Log-Overhead-Us to responses
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+from fnmatch import fnmatch
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import g, has_request_context, request
+
+LOG_MODE = os.getenv("LOG_MODE", "dev").lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "WARNING" if LOG_MODE == "quiet" else "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json" if LOG_MODE == "quiet" else "text").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_OVERHEAD_HEADER = os.getenv("LOG_OVERHEAD_HEADER", "false").lower() == "true"
+
+PHI_FIELDS = {
+    "email", "user_email", "patient_email", "mobile", "phone", "password", "password_hash", "otp",
+    "username", "first_name", "last_name", "name", "full_name", "date_of_birth", "dob",
+    "address", "city", "state", "zip_code", "emergency_contact", "emergency_contact_name",
+    "emergency_contact_phone", "last_period_date", "expected_delivery_date", "notes",
+    "symptoms", "symptom_text", "query", "text", "transcript", "food_details", "medications",
+    "medical_conditions", "allergies", "token", "access_token", "authorization",
+    "patient_name", "patient_mobile", "reason", "food_input", "transcription",
+    "transcribed_text", "medication_name", "medicationname", "purpose", "dosage", "dosages",
+} | {f.strip().lower() for f in os.getenv("LOG_REDACT_FIELDS", "").split(",") if f.strip()}
+REDACTED = "[REDACTED]"
+PHI_PATTERNS = [
+    re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"),
+    re.compile(r"(?i)bearer\s+[\w.\-]+"),
+    # Phone numbers, but not patient IDs (PAT<timestamp>...) or dates
+    re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s-]?)?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}(?![\w:])"),
+]
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+def _parse_sample_rates(spec: str) -> List[Tuple[str, float]]:
+    rates = []
+    for part in spec.split(","):
+        if "=" in part:
+            pattern, rate = part.rsplit("=", 1)
+            try:
+                rates.append((pattern.strip(), max(0.0, min(1.0, float(rate)))))
+            except ValueError:
+                continue
+    return rates
+
+SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", "default=1"))
+
+def redact(value: Any, depth: int = 0) -> Any:
+    """Copy of value with PHI fields and patterns masked"""
+    if depth > 8:
+        return "..."
+    if isinstance(value, dict):
+        return {k: REDACTED if str(k).lower() in PHI_FIELDS else redact(v, depth + 1) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v, depth + 1) for v in value]
+    if isinstance(value, str):
+        return redact_text(value)
+    return value
+
+def redact_text(text: str) -> str:
+    for pattern in PHI_PATTERNS:
+        text = pattern.sub(REDACTED, text)
+    return text
+
+def _route() -> Optional[str]:
+    if has_request_context():
+        return request.endpoint
+    return None
+
+class SamplingFilter(logging.Filter):
+    """Keeps a per-route fraction of DEBUG/INFO records"""
+
+    def __init__(self, rates: List[Tuple[str, float]]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+
+    def rate_for(self, route: Optional[str]) -> float:
+        default = 1.0
+        for pattern, rate in self.rates:
+            if pattern == "default":
+                default = rate
+            elif route and fnmatch(route, pattern):
+                return rate
+        return default
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(getattr(record, "route", None))
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+class RedactionFilter(logging.Filter):
+    """Masks PHI in the message, its arguments and structured extras"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str):
+            record.msg = redact_text(record.msg)
+        if record.args:
+            record.args = redact(record.args) if isinstance(record.args, dict) else tuple(redact(list(record.args)))
+        for key in set(vars(record)) - _RECORD_ATTRS:
+            value = getattr(record, key)
+            setattr(record, key, REDACTED if key.lower() in PHI_FIELDS else redact(value))
+        return True
+
+class AsyncQueueHandler(QueueHandler):
+    """Filters on the calling thread, formats on the listener thread, and times itself"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped_full = 0
+        self.total_seconds = 0.0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        started = time.perf_counter()
+        record.route = _route()
+        try:
+            return super().handle(record)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.total_seconds += elapsed
+            if has_request_context():
+                g.log_overhead = g.get("log_overhead", 0.0) + elapsed
+                g.log_records = g.get("log_records", 0) + 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may change after the call) but leave formatting to the listener
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            # Never block a request on logging
+            self.dropped_full += 1
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = {key: getattr(record, key) for key in set(vars(record)) - _RECORD_ATTRS - {"route"}}
+        if extras:
+            line += " " + json.dumps(extras, default=str)
+        return line
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.utcfromtimestamp(record.created).isoformat(timespec="milliseconds") + "Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "route": getattr(record, "route", None),
+        }
+        for key in set(vars(record)) - _RECORD_ATTRS - {"route"}:
+            entry[key] = getattr(record, key)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RequestOverhead:
+    """Rolling per-request logging cost"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.records = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float, records: int):
+        with self._lock:
+            self.requests += 1
+            self.records += records
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "records_per_request": round(self.records / self.requests, 2) if self.requests else 0.0,
+                "avg_us_per_request": round(self.total_seconds / self.requests * 1e6, 1) if self.requests else 0.0,
+                "max_us_per_request": round(self.max_seconds * 1e6, 1)
+            }
+
+_handler: Optional[AsyncQueueHandler] = None
+_listener: Optional[QueueListener] = None
+_sampling: Optional[SamplingFilter] = None
+request_overhead = RequestOverhead()
+
+def get_logger(name: str) -> logging.Logger:
+    return logging.getLogger(name)
+
+def _restart_after_fork():
+    """Threads do not survive fork: give each preloaded gunicorn worker its own queue and writer"""
+    global _listener
+    if _handler is None or _listener is None:
+        return
+    _handler.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _listener = QueueListener(_handler.queue, *_listener.handlers, respect_handler_level=False)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+def configure_logging(app=None, stream=None) -> AsyncQueueHandler:
+    """Install the queue handler on the root logger (once) and hook request timing into app"""
+    global _handler, _listener, _sampling
+    if _handler is None:
+        log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _sampling = SamplingFilter(SAMPLE_RATES)
+        _handler = AsyncQueueHandler(log_queue)
+        _handler.addFilter(_sampling)
+        _handler.addFilter(RedactionFilter())
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+        _listener = QueueListener(log_queue, output, respect_handler_level=False)
+        _listener.start()
+        atexit.register(_listener.stop)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_after_fork)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            # basicConfig's console handler would write every record a second time, synchronously
+            if type(existing) is logging.StreamHandler:
+                root.removeHandler(existing)
+        root.addHandler(_handler)
+        root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+
+    if app is not None and not app.extensions.get("app_logging"):
+        app.extensions["app_logging"] = True
+
+        @app.after_request
+        def _record_log_overhead(response):
+            seconds = g.get("log_overhead", 0.0)
+            request_overhead.add(seconds, g.get("log_records", 0))
+            if LOG_OVERHEAD_HEADER:
+                response.headers["X-Log-Overhead-Us"] = f"{seconds * 1e6:.0f}"
+            return response
+    return _handler
+
+def flush_logs(timeout: float = 2.0):
+    """Wait until the listener has written everything queued so far"""
+    if _handler is None:
+        return
+    deadline = time.monotonic() + timeout
+    while _handler.queue.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+def logging_stats() -> Dict[str, Any]:
+    if _handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "mode": LOG_MODE,
+        "level": logging.getLevelName(logging.getLogger().level),
+        "format": LOG_FORMAT,
+        "records_enqueued": _handler.enqueued,
+        "records_sampled_out": _sampling.dropped if _sampling else 0,
+        "records_dropped_queue_full": _handler.dropped_full,
+        "queue_depth": _handler.queue.qsize(),
+        "avg_us_per_record": round(_handler.total_seconds / _handler.enqueued * 1e6, 1) if _handler.enqueued else 0.0,
+        "per_request": request_overhead.stats()
+    }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Audio Library - Content-addressed cache of synthesized speech
+
+Each clip is stored once under the SHA-256 of what was synthesized (text, voice,
+model and voice settings), so the same story or question is never sent to the
+TTS provider twice. Clips are plain MP3 files served by id with HTTP range
+support. Concurrent first requests for the same clip share one synthesis.
+
+Usage:
+    python audio_library.py warm      # synthesize every mental health story and question
+    python audio_library.py stats
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import tempfile
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from single_flight import SingleFlight
+
+AUDIO_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+def audio_id_for(text: str, **synthesis: Any) -> str:
+    """Content address of a clip: hash of the text and every synthesis option"""
+    payload = json.dumps({"text": text, **synthesis}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class AudioLibrary:
+    """MP3 clips on disk, addressed by audio id"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv(
+            "AUDIO_LIBRARY_DIR",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_library")
+        )
+        self.flights = SingleFlight()
+
+    def path_for(self, audio_id: str) -> str:
+        if not AUDIO_ID_PATTERN.match(audio_id or ""):
+            raise ValueError(f"Invalid audio id '{audio_id}'")
+        return os.path.join(self.root, audio_id[:2], f"{audio_id}.mp3")
+
+    def lookup(self, audio_id: str) -> Optional[str]:
+        """Path of a stored clip, or None"""
+        try:
+            path = self.path_for(audio_id)
+        except ValueError:
+            return None
+        return path if os.path.exists(path) else None
+
+    def store(self, audio_id: str, audio: bytes) -> str:
+        """Write a clip atomically so readers never see a partial file"""
+        path = self.path_for(audio_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def get_or_create(self, audio_id: str, synthesize: Callable[[], bytes]) -> Tuple[str, bool]:
+        """Path of the clip, synthesizing it on first use; returns (path, created)"""
+        path = self.lookup(audio_id)
+        if path:
+            return path, False
+
+        def create():
+            # Another request may have stored it while we waited
+            existing = self.lookup(audio_id)
+            return (existing, False) if existing else (self.store(audio_id, synthesize()), True)
+
+        return self.flights.do(audio_id, create)
+
+    def stats(self) -> Dict[str, Any]:
+        clips = 0
+        total_bytes = 0
+        if os.path.isdir(self.root):
+            for directory, _, files in os.walk(self.root):
+                for name in files:
+                    if name.endswith(".mp3"):
+                        clips += 1
+                        total_bytes += os.path.getsize(os.path.join(directory, name))
+        return {"root": self.root, "clips": clips, "bytes": total_bytes}
+
+# Global library
+audio_library = AudioLibrary()
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if command == "warm":
+        from mental_health_service import MentalHealthService
+        report = MentalHealthService().warm_audio_library()
+        print(f"✅ Audio library: {report['generated']} generated, {report['cached']} already cached")
+        for error in report["errors"]:
+            print(f"❌ {error}")
+        sys.exit(1 if report["errors"] else 0)
+
+    stats = audio_library.stats()
+    print(f"🔊 {stats['clips']} clips, {stats['bytes'] / 1024 / 1024:.1f} MB in {stats['root']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Binary audio transport for voice endpoints
+
+Audio can be uploaded as a multipart ``file`` field or as a raw request body
+(``Content-Type: audio/*`` or ``application/octet-stream``, with a Content-Length
+or ``Transfer-Encoding: chunked``). It is read in fixed-size chunks up to
+MAX_AUDIO_UPLOAD_MB. Clients get raw audio back with ``?format=binary`` or an
+``Accept: audio/*`` header. JSON with base64 audio keeps working for older clients.
+"""
+
+import os
+import base64
+from typing import Dict, Optional, Tuple
+
+from flask import Response, request
+
+AUDIO_CHUNK_SIZE = 64 * 1024
+MAX_AUDIO_BYTES = int(os.getenv("MAX_AUDIO_UPLOAD_MB", "25")) * 1024 * 1024
+
+AUDIO_MIMETYPES = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "mpeg": "audio/mpeg",
+    "webm": "audio/webm",
+    "ogg": "audio/ogg",
+    "m4a": "audio/mp4",
+    "flac": "audio/flac",
+}
+BINARY_MIMETYPES = ("application/octet-stream", "video/webm")
+
+class AudioTooLarge(Exception):
+    """Upload exceeds MAX_AUDIO_UPLOAD_MB"""
+
+def is_binary_audio(req=None) -> bool:
+    """True when the request body itself is audio"""
+    mimetype = (req or request).mimetype or ""
+    return mimetype.startswith("audio/") or mimetype in BINARY_MIMETYPES
+
+def read_audio_stream(stream, limit: Optional[int] = None) -> bytes:
+    """Read a (possibly chunked) stream without holding more than limit bytes"""
+    limit = limit or MAX_AUDIO_BYTES
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(AUDIO_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        if len(buffer) > limit:
+            raise AudioTooLarge(f"Audio exceeds {limit // (1024 * 1024)} MB")
+    return bytes(buffer)
+
+def uploaded_audio(req=None, field: str = "file") -> Optional[Tuple[bytes, str]]:
+    """(audio, mimetype) from a multipart file or binary body; None for JSON requests"""
+    req = req or request
+    if req.mimetype == "multipart/form-data":
+        upload = req.files.get(field)
+        if not upload or not upload.filename:
+            return None
+        return read_audio_stream(upload.stream), upload.mimetype or "application/octet-stream"
+    if is_binary_audio(req):
+        if req.content_length and req.content_length > MAX_AUDIO_BYTES:
+            raise AudioTooLarge(f"Audio exceeds {MAX_AUDIO_BYTES // (1024 * 1024)} MB")
+        return read_audio_stream(req.stream), req.mimetype
+    return None
+
+def upload_options(req=None) -> Dict[str, str]:
+    """Options sent alongside binary audio (query string and form fields)"""
+    req = req or request
+    return {**req.args.to_dict(), **req.form.to_dict()}
+
+def wants_binary_audio(req=None) -> bool:
+    """True when the client asked for raw audio instead of base64 JSON"""
+    req = req or request
+    audio_format = (req.args.get("format") or "").lower()
+    if audio_format in ("binary", "raw"):
+        return True
+    if audio_format in ("json", "base64"):
+        return False
+    best = req.accept_mimetypes.best_match(["application/json", "application/octet-stream", *AUDIO_MIMETYPES.values()])
+    return best not in (None, "application/json")
+
+def audio_mimetype(audio_format: Optional[str]) -> str:
+    return AUDIO_MIMETYPES.get((audio_format or "").lower(), "application/octet-stream")
+
+def decode_audio(audio: Dict) -> bytes:
+    """Raw bytes of a TTS result that carries either audio_bytes or base64 audio_data"""
+    if audio.get("audio_bytes") is not None:
+        return audio["audio_bytes"]
+    return base64.b64decode(audio.get("audio_data") or "")
+
+def audio_response(audio: bytes, mimetype: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Raw audio response"""
+    return Response(audio, mimetype=mimetype, headers={"Cache-Control": "no-store", **(headers or {})})
@@ -0,0 +1,76 @@
+"""
+Route blueprints for the Patient Alert System API, one module per subsystem.
+
+``ENABLED_FEATURES`` selects which blueprints a deployment mounts. It accepts
+feature names and/or feature set names, comma-separated, e.g.
+``ENABLED_FEATURES=appointments`` or ``ENABLED_FEATURES=auth,vitals,hydration``.
+Disabled blueprint modules are never imported, so their services and
+dependencies stay out of the worker.
+"""
+
+import importlib
+import os
+from typing import Iterable, List, Optional
+
+# Feature name -> blueprint module
+FEATURES = {
+    "core": "blueprints.core",
+    "auth": "blueprints.auth",
+    "profile": "blueprints.profile",
+    "tracking": "blueprints.tracking",
+    "symptoms": "blueprints.symptoms",
+    "vitals": "blueprints.vitals",
+    "medication": "blueprints.medication",
+    "quantum": "blueprints.quantum",
+    "mental_health": "blueprints.mental_health",
+    "nutrition": "blueprints.nutrition",
+    "pregnancy": "blueprints.pregnancy",
+    "hydration": "blueprints.hydration",
+    "medical_lab": "blueprints.medical_lab",
+    "voice": "blueprints.voice",
+    "appointments": "blueprints.appointments",
+    "doctors": "blueprints.doctors",
+}
+
+# Always mounted: root and health endpoints
+REQUIRED_FEATURES = ["core"]
+
+# Named feature sets for specialised worker pools
+FEATURE_SETS = {
+    "all": list(FEATURES),
+    "appointments": ["auth", "profile", "appointments", "doctors"],
+    "tracking": ["auth", "profile", "tracking", "hydration", "vitals", "nutrition"],
+    "ocr": ["auth", "medication", "vitals", "medical_lab"],
+    "ai": ["auth", "symptoms", "quantum", "mental_health", "nutrition", "pregnancy", "voice"],
+}
+
+def resolve_features(spec: Optional[Iterable[str]] = None) -> List[str]:
+    """Expand feature/feature-set names into an ordered list of features to mount"""
+    if spec is None:
+        spec = os.getenv("ENABLED_FEATURES", "all")
+    if isinstance(spec, str):
+        spec = spec.split(",")
+
+    requested = set(REQUIRED_FEATURES)
+    for name in (s.strip() for s in spec):
+        if not name:
+            continue
+        if name in FEATURE_SETS:
+            requested.update(FEATURE_SETS[name])
+        elif name in FEATURES:
+            requested.add(name)
+        else:
+            raise ValueError(
+                f"Unknown feature '{name}'. Available features: {', '.join(FEATURES)}; "
+                f"feature sets: {', '.join(FEATURE_SETS)}"
+            )
+    return [name for name in FEATURES if name in requested]
+
+def register_blueprints(app, features: Optional[Iterable[str]] = None) -> List[str]:
+    """Import and register the blueprints for the enabled features"""
+    enabled = resolve_features(features)
+    for name in enabled:
+        module = importlib.import_module(FEATURES[name])
+        app.register_blueprint(module.bp)
+    print(f"✅ Features enabled: {', '.join(enabled)}")
+    return enabled
@@ -0,0 +1,739 @@
+"""
+Authentication routes: signup, OTP verification, login, password reset and profile completion
+"""
+
+from datetime import datetime, timedelta
+
+import jwt
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import (
+    JWT_ALGORITHM, JWT_SECRET_KEY, activity_tracker, db, generate_jwt_token, generate_otp,
+    generate_unique_patient_id, hash_password, is_profile_complete, send_otp_email,
+    send_patient_id_email, token_required, validate_email, validate_mobile, verify_jwt_token,
+    verify_password
+)
+from pregnancy_week import gestational_info, pregnancy_cache
+
+bp = Blueprint('auth', __name__)
+logger = get_logger(__name__)
+
+@bp.route('/signup', methods=['POST'])
+def signup():
+    """Register a new patient - Step 1: Collect data and send OTP (JWT-based)"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['username', 'email', 'mobile', 'password']
+        for field in required_fields:
+            if field not in data or not data[field]:
+                return jsonify({"error": f"Missing required field: {field}"}), 400
+        
+        username = data['username'].strip()
+        email = data['email'].strip()
+        mobile = data['mobile'].strip()
+        password = data['password']
+        
+        # Validate email and mobile
+        if not validate_email(email):
+            return jsonify({"error": "Invalid email format"}), 400
+        
+        if not validate_mobile(mobile):
+            return jsonify({"error": "Invalid mobile number"}), 400
+        
+        # Check if username exists
+        if db.patients_collection.find_one({"username": username}):
+            return jsonify({"error": "Username already exists"}), 400
+        
+        # Check if email exists and is already active
+        existing_user = db.patients_collection.find_one({"email": email})
+        if existing_user and existing_user.get("status") == "active":
+            return jsonify({"error": "Email already exists and is active"}), 400
+        
+        # Check if mobile exists
+        if db.patients_collection.find_one({"mobile": mobile}):
+            return jsonify({"error": "Mobile number already exists"}), 400
+        
+        # Generate OTP
+        otp = generate_otp()
+        
+        # Create JWT token with signup data (expires in 10 minutes)
+        signup_payload = {
+            "username": username,
+            "email": email,
+            "mobile": mobile,
+            "password_hash": hash_password(password),
+            "otp": otp,
+            "exp": datetime.utcnow() + timedelta(minutes=10),
+            "iat": datetime.utcnow(),
+            "type": "signup_verification"
+        }
+        
+        # Generate JWT token
+        signup_token = jwt.encode(signup_payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+        
+        # Send OTP email
+        logger.info("📧 Attempting to send OTP", extra={"email": email})
+        if send_otp_email(email, otp):
+            return jsonify({
+                "email": email,
+                "status": "otp_sent",
+                "message": "Please check your email for OTP verification.",
+                "signup_token": signup_token  # Send token to frontend
+            }), 200
+        else:
+            logger.error("❌ Failed to send OTP email", extra={"email": email})
+            return jsonify({
+                "error": "Failed to send OTP email. Please check your email configuration.",
+                "details": "Check console logs for more information"
+            }), 500
+    
+    except Exception as e:
+        return jsonify({"error": f"Registration failed: {str(e)}"}), 500
+
+@bp.route('/send-otp', methods=['POST'])
+def send_otp():
+    """Send OTP to email for verification"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        email = data.get('email', '').strip()
+        
+        if not email:
+            return jsonify({"error": "Email is required"}), 400
+        
+        # Check if user exists
+        user = db.patients_collection.find_one({"email": email})
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        
+        # Generate OTP
+        otp = generate_otp()
+        
+        # Store OTP in database (with expiration)
+        db.patients_collection.update_one(
+            {"email": email},
+            {
+                "$set": {
+                    "otp": otp,
+                    "otp_created_at": datetime.now(),
+                    "otp_expires_at": datetime.now() + timedelta(minutes=10)
+                }
+            }
+        )
+        
+        # Send OTP email
+        if send_otp_email(email, otp):
+            return jsonify({
+                "message": "OTP sent successfully",
+                "email": email
+            }), 200
+        else:
+            return jsonify({"error": "Failed to send OTP email"}), 500
+    
+    except Exception as e:
+        return jsonify({"error": f"OTP sending failed: {str(e)}"}), 500
+
+@bp.route('/resend-otp', methods=['POST'])
+def resend_otp():
+    """Resend OTP for signup verification (JWT-based)"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        email = data.get('email', '').strip()
+        signup_token = data.get('signup_token', '').strip()
+        
+        if not email or not signup_token:
+            return jsonify({"error": "Email and signup token are required"}), 400
+        
+        # Decode and verify JWT token
+        try:
+            payload = jwt.decode(signup_token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            return jsonify({"error": "Signup session has expired. Please start registration again."}), 400
+        except jwt.InvalidTokenError:
+            return jsonify({"error": "Invalid signup token"}), 400
+        
+        # Verify token type and email match
+        if payload.get("type") != "signup_verification":
+            return jsonify({"error": "Invalid token type"}), 400
+        
+        if payload.get("email") != email:
+            return jsonify({"error": "Email mismatch"}), 400
+        
+        # Generate new OTP
+        new_otp = generate_otp()
+        
+        # Update JWT token with new OTP
+        updated_payload = payload.copy()
+        updated_payload["otp"] = new_otp
+        updated_payload["exp"] = datetime.utcnow() + timedelta(minutes=10)  # Reset expiration
+        
+        # Generate new JWT token
+        new_signup_token = jwt.encode(updated_payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+        
+        # Send OTP email
+        if send_otp_email(email, new_otp):
+            return jsonify({
+                "message": "OTP resent successfully",
+                "email": email,
+                "signup_token": new_signup_token
+            }), 200
+        else:
+            return jsonify({"error": "Failed to send OTP email"}), 500
+    
+    except Exception as e:
+        return jsonify({"error": f"OTP resend failed: {str(e)}"}), 500
+
+@bp.route('/verify-otp', methods=['POST'])
+def verify_otp():
+    """Verify OTP and create actual account (JWT-based)"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        email = data.get('email', '').strip()
+        otp = data.get('otp', '').strip()
+        signup_token = data.get('signup_token', '').strip()
+        
+        if not email or not otp or not signup_token:
+            return jsonify({"error": "Email, OTP, and signup token are required"}), 400
+        
+        # Decode and verify JWT token
+        try:
+            payload = jwt.decode(signup_token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        except jwt.ExpiredSignatureError:
+            return jsonify({"error": "Signup session has expired. Please start registration again."}), 400
+        except jwt.InvalidTokenError:
+            return jsonify({"error": "Invalid signup token"}), 400
+        
+        # Verify token type and email match
+        if payload.get("type") != "signup_verification":
+            return jsonify({"error": "Invalid token type"}), 400
+        
+        if payload.get("email") != email:
+            return jsonify({"error": "Email mismatch"}), 400
+        
+        # Check OTP
+        if payload.get("otp") != otp:
+            return jsonify({"error": "Invalid OTP"}), 400
+        
+        # Extract user data from JWT payload
+        username = payload.get("username")
+        mobile = payload.get("mobile")
+        password_hash = payload.get("password_hash")
+        
+        if not all([username, mobile, password_hash]):
+            return jsonify({"error": "Invalid signup data in token"}), 400
+        
+        # Check if user already exists (handle duplicate key error)
+        existing_user = db.patients_collection.find_one({"email": email})
+        if existing_user:
+            # User already exists, update their status to active and verify email
+            db.patients_collection.update_one(
+                {"email": email},
+            {
+                "$set": {
+                    "status": "active",
+                    "email_verified": True,
+                        "verified_at": datetime.now(),
+                        "password_hash": password_hash,  # Update password
+                        "username": username,  # Update username
+                        "mobile": mobile  # Update mobile
+                    }
+                }
+            )
+        
+        # Get the updated user data
+            updated_user = db.patients_collection.find_one({"email": email})
+            patient_id = updated_user.get("patient_id")
+        else:
+            # Generate unique patient ID for new account
+            patient_id = generate_unique_patient_id()
+            
+            # Create new account in database
+            user_data = {
+                "patient_id": patient_id,
+                "username": username,
+                "email": email,
+                "mobile": mobile,
+                "password_hash": password_hash,
+                "status": "active",
+                "email_verified": True,
+                "verified_at": datetime.now(),
+                "created_at": datetime.now()
+            }
+            
+            # Insert new user into database
+            result = db.patients_collection.insert_one(user_data)
+            
+            if not result.inserted_id:
+                return jsonify({"error": "Failed to create account"}), 500
+            
+            # Get the created user data
+            updated_user = user_data
+        
+        # Send Patient ID email
+        send_patient_id_email(email, patient_id, username)
+        
+        # Generate JWT token for login
+        token = generate_jwt_token(updated_user)
+        
+        return jsonify({
+            "patient_id": patient_id,
+            "username": username,
+            "email": email,
+            "mobile": mobile,
+            "status": "active",
+            "token": token,
+            "message": "Account created and verified successfully! Your Patient ID has been sent to your email."
+        }), 200
+    
+    except Exception as e:
+        return jsonify({"error": f"OTP verification failed: {str(e)}"}), 500
+
+@bp.route('/login', methods=['POST'])
+def login():
+    """Login patient with Patient ID/Email and password"""
+    try:
+        # Check database connection and attempt reconnection if needed
+        if not db.is_connected():
+            logger.warning("⚠️ Database not connected during login, attempting reconnection...")
+            if not db.reconnect():
+                return jsonify({"error": "Database connection error - unable to reconnect"}), 503
+        
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        login_identifier = data.get('login_identifier', '').strip()
+        password = data.get('password', '')
+        
+        if not login_identifier or not password:
+            return jsonify({"error": "Login identifier and password are required"}), 400
+        
+        # Find user by Patient ID or Email
+        user = db.patients_collection.find_one({"patient_id": login_identifier})
+        if not user:
+            user = db.patients_collection.find_one({"email": login_identifier})
+        
+        if not user:
+            return jsonify({"error": "Invalid credentials"}), 401
+        
+        # Check if account is active
+        if user.get("status") != "active":
+            return jsonify({"error": "Account not activated. Please verify your email."}), 401
+        
+        # Verify password
+        if not verify_password(password, user["password_hash"]):
+            return jsonify({"error": "Invalid credentials"}), 401
+        
+        # Check profile completion
+        profile_complete = is_profile_complete(user)
+        
+        # Identifiers only; username/email are PHI and stay out of the logs
+        logger.debug("🔍 Login", extra={"patient_id": user.get('patient_id'), "status": user.get('status'),
+                                        "profile_complete": profile_complete})
+        
+        # Generate JWT token
+        token = generate_jwt_token(user)
+        
+        # Start tracking user session
+        session_id = activity_tracker.start_user_session(
+            user_email=user["email"],
+            user_role="patient",
+            username=user["username"],
+            user_id=user["patient_id"]
+        )
+        
+        # Log login activity
+        activity_tracker.log_activity(
+            user_email=user["email"],
+            activity_type="login",
+            activity_data={
+                "login_method": "email" if "@" in login_identifier else "patient_id",
+                "profile_complete": profile_complete,
+                "session_id": session_id
+            },
+            session_id=session_id
+        )
+        
+        return jsonify({
+            "patient_id": user.get("patient_id", ""),
+            "username": user.get("username", ""),
+            "email": user.get("email", ""),
+            "object_id": str(user.get("_id", "")) if user.get("_id") else "",  # Handle null Object ID
+            "is_profile_complete": profile_complete,
+            "token": token,
+            "session_id": session_id,  # Include session ID for tracking
+            "message": "Login successful" if profile_complete else "Login successful. Please complete your profile."
+        }), 200
+    
+    except Exception as e:
+        return jsonify({"error": f"Login failed: {str(e)}"}), 500
+
+@bp.route('/logout', methods=['POST'])
+def logout():
+    """Logout user and end session tracking"""
+    try:
+        data = request.get_json()
+        user_email = data.get('email')
+        session_id = data.get('session_id')
+        
+        if not user_email:
+            return jsonify({"error": "User email is required"}), 400
+        
+        # Log logout activity before ending session
+        activity_tracker.log_activity(
+            user_email=user_email,
+            activity_type="logout",
+            activity_data={
+                "logout_time": datetime.now().isoformat(),
+                "session_id": session_id
+            },
+            session_id=session_id
+        )
+        
+        # End user session
+        ended_sessions = activity_tracker.end_user_session(user_email, session_id)
+        
+        return jsonify({
+            "success": True,
+            "message": "Logout successful",
+            "ended_sessions": ended_sessions
+        }), 200
+        
+    except Exception as e:
+        return jsonify({"error": f"Logout failed: {str(e)}"}), 500
+
+@bp.route('/forgot-password', methods=['POST'])
+def forgot_password():
+    """Send password reset OTP"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        login_identifier = data.get('login_identifier', '').strip()
+        
+        if not login_identifier:
+            return jsonify({"error": "Login identifier is required"}), 400
+        
+        # Find user by Patient ID or Email
+        user = db.patients_collection.find_one({"patient_id": login_identifier})
+        if not user:
+            user = db.patients_collection.find_one({"email": login_identifier})
+        
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        
+        email = user["email"]
+        
+        # Generate OTP
+        otp = generate_otp()
+        
+        # Store OTP
+        db.patients_collection.update_one(
+            {"_id": user["_id"]},
+            {
+                "$set": {
+                    "reset_otp": otp,
+                    "reset_otp_created_at": datetime.now(),
+                    "reset_otp_expires_at": datetime.now() + timedelta(minutes=10)
+                }
+            }
+        )
+        
+        # Send OTP email
+        if send_otp_email(email, otp):
+            return jsonify({
+                "message": "Password reset OTP sent successfully",
+                "email": email
+            }), 200
+        else:
+            return jsonify({"error": "Failed to send OTP email"}), 500
+    
+    except Exception as e:
+        return jsonify({"error": f"Password reset failed: {str(e)}"}), 500
+
+@bp.route('/reset-password', methods=['POST'])
+def reset_password():
+    """Reset password with OTP"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        email = data.get('email', '').strip()
+        otp = data.get('otp', '').strip()
+        new_password = data.get('new_password', '')
+        
+        if not email or not otp or not new_password:
+            return jsonify({"error": "Email, OTP, and new password are required"}), 400
+        
+        # Find user by email
+        user = db.patients_collection.find_one({"email": email})
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        
+        # Check OTP
+        if user.get("reset_otp") != otp:
+            return jsonify({"error": "Invalid OTP"}), 400
+        
+        # Check if OTP expired
+        if user.get("reset_otp_expires_at") < datetime.now():
+            return jsonify({"error": "OTP has expired"}), 400
+        
+        # Hash new password
+        new_hashed_password = hash_password(new_password)
+        
+        # Update password
+        db.patients_collection.update_one(
+            {"email": email},
+            {
+                "$set": {
+                    "password_hash": new_hashed_password,
+                    "password_updated_at": datetime.now()
+                },
+                "$unset": {
+                    "reset_otp": "",
+                    "reset_otp_created_at": "",
+                    "reset_otp_expires_at": ""
+                }
+            }
+        )
+        
+        return jsonify({
+            "patient_id": user.get("patient_id", ""),
+            "username": user.get("username", ""),
+            "email": user["email"],
+            "mobile": user.get("mobile", ""),
+            "status": "active",
+            "message": "Password reset successfully"
+        }), 200
+    
+    except Exception as e:
+        return jsonify({"error": f"Password reset failed: {str(e)}"}), 500
+
+@bp.route('/complete-profile', methods=['POST'])
+@token_required
+def complete_profile():
+    """Complete patient profile information"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        # Get patient_id from JWT token
+        patient_id = request.user_data.get('patient_id')
+        
+        if not patient_id:
+            return jsonify({"error": "Patient ID not found in token"}), 400
+        
+        # Find user by Patient ID
+        user = db.patients_collection.find_one({"patient_id": patient_id})
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        
+        # Extract profile data with safe handling of null values
+        first_name = request.json.get('first_name', '').strip() if request.json.get('first_name') else ''
+        last_name = request.json.get('last_name', '').strip() if request.json.get('last_name') else ''
+        date_of_birth = request.json.get('date_of_birth', '').strip() if request.json.get('date_of_birth') else ''
+        blood_type = request.json.get('blood_type', '').strip() if request.json.get('blood_type') else ''
+        is_pregnant = request.json.get('is_pregnant', False)
+        last_period_date = request.json.get('last_period_date', '').strip() if request.json.get('last_period_date') else ''
+        weight = request.json.get('weight', '').strip() if request.json.get('weight') else ''
+        height = request.json.get('height', '').strip() if request.json.get('height') else ''
+        
+        # Emergency contact
+        emergency_contact = {
+            "name": request.json.get('emergency_name', '').strip() if request.json.get('emergency_name') else '',
+            "relationship": request.json.get('emergency_relationship', '').strip() if request.json.get('emergency_relationship') else '',
+            "phone": request.json.get('emergency_phone', '').strip() if request.json.get('emergency_phone') else ''
+        }
+        
+        # Calculate age
+        age = None
+        if date_of_birth:
+            try:
+                from datetime import datetime
+                birth_date = datetime.strptime(date_of_birth, '%Y-%m-%d')
+                today = datetime.now()
+                age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+            except:
+                age = None
+        
+        # Calculate pregnancy information if pregnant
+        calculated_pregnancy_week = None
+        calculated_expected_delivery = None
+        
+        if is_pregnant and last_period_date:
+            pregnancy_info = gestational_info({"last_period_date": last_period_date})
+            if pregnancy_info['error']:
+                logger.error(f"Error calculating pregnancy dates: {pregnancy_info['error']}")
+            else:
+                calculated_pregnancy_week = pregnancy_info['current_week']
+                calculated_expected_delivery = pregnancy_info['expected_delivery']
+        
+        # Update profile
+        update_data = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "date_of_birth": date_of_birth,
+            "age": age,
+            "blood_type": blood_type,
+            "weight": weight,
+            "height": height,
+            "is_pregnant": is_pregnant,
+            "last_period_date": last_period_date if is_pregnant else None,
+            "pregnancy_week": calculated_pregnancy_week if is_pregnant else None,
+            "expected_delivery_date": calculated_expected_delivery if is_pregnant else None,
+            "emergency_contact": emergency_contact,
+            "profile_completed_at": datetime.now()
+        }
+        
+        # Remove None values
+        update_data = {k: v for k, v in update_data.items() if v is not None}
+        
+        db.patients_collection.update_one(
+            {"patient_id": patient_id},
+            {"$set": update_data}
+        )
+        pregnancy_cache.invalidate(patient_id)
+        
+        return jsonify({
+            "patient_id": patient_id,
+            "message": "Profile completed successfully",
+            "is_profile_complete": True
+        }), 200
+    
+    except Exception as e:
+        return jsonify({"error": f"Profile completion failed: {str(e)}"}), 500
+
+@bp.route('/edit-profile', methods=['PUT'])
+def edit_profile():
+    """Edit/Update patient profile information"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        data = request.get_json()
+        patient_id = data.get('patient_id', '').strip()
+        
+        if not patient_id:
+            return jsonify({"error": "Patient ID is required"}), 400
+        
+        # Check if patient exists
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({"error": "Patient not found"}), 404
+        
+        # Extract profile data with safe handling of null values
+        profile_data = {
+            "first_name": data.get('first_name', '').strip(),
+            "last_name": data.get('last_name', '').strip(),
+            "date_of_birth": data.get('date_of_birth', '').strip(),
+            "gender": data.get('gender', '').strip(),
+            "blood_type": data.get('blood_type', '').strip(),
+            "height": data.get('height', '').strip(),
+            "weight": data.get('weight', '').strip(),
+            "pregnancy_status": data.get('pregnancy_status', '').strip(),
+            "pregnancy_week": data.get('pregnancy_week', '').strip(),
+            "expected_delivery_date": data.get('expected_delivery_date', '').strip(),
+            "emergency_contact_name": data.get('emergency_contact_name', '').strip(),
+            "emergency_contact_phone": data.get('emergency_contact_phone', '').strip(),
+            "emergency_contact_relationship": data.get('emergency_contact_relationship', '').strip(),
+            "address": data.get('address', '').strip(),
+            "city": data.get('city', '').strip(),
+            "state": data.get('state', '').strip(),
+            "zip_code": data.get('zip_code', '').strip(),
+            "phone": data.get('phone', '').strip(),
+            "medical_conditions": data.get('medical_conditions', []),
+            "allergies": data.get('allergies', []),
+            "medications": data.get('medications', []),
+            "last_updated": datetime.now()
+        }
+        
+        # Remove empty fields to avoid overwriting with empty strings
+        profile_data = {k: v for k, v in profile_data.items() if v != '' and v != []}
+        
+        # Update profile
+        result = db.patients_collection.update_one(
+            {"patient_id": patient_id},
+            {"$set": profile_data}
+        )
+        pregnancy_cache.invalidate(patient_id)
+        
+        if result.modified_count == 0:
+            return jsonify({"error": "No changes made to profile"}), 400
+        
+        # Get updated profile
+        updated_patient = db.patients_collection.find_one({"patient_id": patient_id})
+        
+        return jsonify({
+            "message": "Profile updated successfully",
+            "profile": {
+                "patient_id": updated_patient.get("patient_id"),
+                "username": updated_patient.get("username"),
+                "email": updated_patient.get("email"),
+                "first_name": updated_patient.get("first_name"),
+                "last_name": updated_patient.get("last_name"),
+                "date_of_birth": updated_patient.get("date_of_birth"),
+                "gender": updated_patient.get("gender"),
+                "blood_type": updated_patient.get("blood_type"),
+                "height": updated_patient.get("height"),
+                "weight": updated_patient.get("weight"),
+                "pregnancy_status": updated_patient.get("pregnancy_status"),
+                "pregnancy_week": updated_patient.get("pregnancy_week"),
+                "expected_delivery_date": updated_patient.get("expected_delivery_date"),
+                "emergency_contact_name": updated_patient.get("emergency_contact_name"),
+                "emergency_contact_phone": updated_patient.get("emergency_contact_phone"),
+                "emergency_contact_relationship": updated_patient.get("emergency_contact_relationship"),
+                "address": updated_patient.get("address"),
+                "city": updated_patient.get("city"),
+                "state": updated_patient.get("state"),
+                "zip_code": updated_patient.get("zip_code"),
+                "phone": updated_patient.get("phone"),
+                "medical_conditions": updated_patient.get("medical_conditions", []),
+                "allergies": updated_patient.get("allergies", []),
+                "medications": updated_patient.get("medications", []),
+                "profile_completed_at": updated_patient.get("profile_completed_at"),
+                "last_updated": updated_patient.get("last_updated")
+            }
+        }), 200
+    
+    except Exception as e:
+        return jsonify({"error": f"Profile update failed: {str(e)}"}), 500
+
+@bp.route('/verify-token', methods=['POST'])
+def verify_token():
+    """Verify JWT token and return user data"""
+    try:
+        data = request.get_json()
+        token = data.get('token', '').strip()
+        
+        if not token:
+            return jsonify({"error": "Token is required"}), 400
+        
+        # Verify token
+        payload = verify_jwt_token(token)
+        if not payload:
+            return jsonify({"error": "Invalid or expired token"}), 401
+        
+        return jsonify({
+            "valid": True,
+            "user_data": payload,
+            "message": "Token is valid"
+        }), 200
+    
+    except Exception as e:
+        return jsonify({"error": f"Token verification failed: {str(e)}"}), 500
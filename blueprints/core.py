@@ -0,0 +1,204 @@
+"""
+Core routes: root, health and service status
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, jsonify
+
+from app_logging import get_logger, logging_stats
+from service_registry import services
+from llm_gateway import llm_gateway
+from app_core import db
+
+bp = Blueprint('core', __name__)
+logger = get_logger(__name__)
+
+# API Routes
+@bp.route('/')
+def root():
+    """Root endpoint"""
+    return jsonify({
+        "message": "Patient Alert System API",
+        "version": "1.0.0",
+        "status": "running",
+        "endpoints": [
+            "POST /signup - Register new patient",
+            "POST /send-otp - Send OTP to email",
+            "POST /resend-otp - Resend OTP for signup verification",
+            "POST /verify-otp - Verify OTP and activate account",
+            "POST /login - Login with Patient ID/Email",
+            "POST /forgot-password - Send password reset OTP",
+            "POST /reset-password - Reset password with OTP",
+            "POST /complete-profile - Complete patient profile",
+            "PUT /edit-profile - Edit/Update patient profile",
+            "GET /profile/<patient_id> - Get patient profile",
+            "POST /symptoms/assist - Get pregnancy symptom assistance (Quantum+LLM; ?stream=sse|ndjson to stream)",
+            "POST /symptoms/save-symptom-log - Save symptom log",
+            "POST /symptoms/save-analysis-report - Save symptom analysis report",
+            "GET /symptoms/get-symptom-history/<patient_id> - Get symptom history",
+            "GET /symptoms/get-analysis-reports/<patient_id> - Get AI analysis reports",
+            "POST /symptoms/knowledge/add - Add new knowledge to symptoms database",
+            "POST /symptoms/knowledge/bulk - Add multiple knowledge items to symptoms database",
+            "POST /symptoms/ingest?limit=&full= - Embed new or changed knowledge into the vector database",
+            "GET /symptoms/ingest/status - Knowledge ingestion high-water mark and last run",
+            "POST /vitals/record - Record vital sign for patient",
+            "POST /vitals/record-batch - Record many readings (JSON array or NDJSON)",
+            "GET /vitals/history/<patient_id>?days=&resolution=raw|hourly|daily|auto - Get patient's vital signs history (rollups for long windows)",
+            "POST /vitals/analyze - AI analysis of patient's vital signs",
+            "GET /vitals/stats/<patient_id> - Get vital signs statistics",
+            "GET /vitals/health-summary/<patient_id> - Get comprehensive health summary",
+            "POST /vitals/alerts - Create vital signs alert",
+            "GET /vitals/alerts/<patient_id> - Get patient's vital signs alerts",
+            "POST /vitals/ocr - Process vital signs document with OCR",
+            "POST /vitals/process-text - Process vital signs text for extraction",
+            "POST /medication/save-medication-log - Save medication log",
+            "GET /medication/get-medication-history/<patient_id> - Get medication history",
+            "POST /medication/process-prescription-document - Process prescription document with PaddleOCR",
+            "POST /medication/process-with-paddleocr - Process prescription with medication folder PaddleOCR service",
+            "POST /medication/process-prescription-text - Process prescription text for structured extraction",
+            "POST /medication/save-tablet-tracking - Save tablet tracking in medication_daily_tracking array",
+            "GET /medication/get-tablet-tracking-history/<patient_id> - Get tablet tracking history from medication_daily_tracking array",
+            "GET /symptoms/health - Symptom service health check",
+            "GET /quantum/health - Quantum vector service health",
+            "GET /quantum/collections - Get Qdrant collections",
+            "GET /quantum/collection-status/<name> - Get collection status",
+            "POST /quantum/add-knowledge - Add knowledge to vector DB",
+            "POST /quantum/search-knowledge - Search knowledge base",
+            "GET /llm/health - LLM service health",
+            "POST /llm/test - Test LLM functionality",
+            "GET / - API information",
+            "POST /medication/send-reminders - Manually trigger medication reminder check and send emails",
+            "POST /medication/test-reminder/<patient_id> - Test medication reminder email for a specific patient",
+            "GET /nutrition/health - Nutrition service health check",
+            "POST /nutrition/transcribe - Transcribe audio using Whisper AI",
+            "POST /nutrition/analyze-with-gpt4 - Analyze food using GPT-4 (?stream=sse|ndjson to stream)",
+            "POST /nutrition/save-food-entry - Save basic food entry",
+            "GET /nutrition/get-food-entries/<user_id> - Get food entries from patient's food_data array",
+            "GET /nutrition/daily-summary/<user_id> - Calories, macros and meal count for a day (?date=)",
+            "GET /nutrition/summary-range/<user_id> - Daily nutrition totals for a range (?start=&end= or ?days=)",
+            "GET /nutrition/debug-food-data/<user_id> - Debug food data structure",
+            "GET /health/logging - Log mode, sampling and per-request logging overhead",
+            "GET /metrics - Per-route latency, payload size, MongoDB and outbound time (Prometheus text)",
+            "GET /metrics/slow-requests - Recent slow requests with a per-stage breakdown"
+        ]
+    })
+
+@bp.route('/health')
+def health():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.now().isoformat(),
+        'database': 'connected' if db else 'disconnected',
+        'services': {
+            'pregnancy_tracking': 'available',
+            'hydration_tracking': 'available',
+            'mental_health_assessment': 'available',
+            'symptoms_analysis': 'available',
+            'vital_signs': 'available',
+            'medication_management': 'available',
+            'mental_health': 'available',
+            'nutrition_tracking': 'available',
+            'medical_lab_ocr': 'available',
+            'voice_interaction': 'available'
+        }
+    }), 200
+
+# ==================== DATABASE HEALTH CHECK ====================
+
+@bp.route('/health/database', methods=['GET'])
+def check_database_health():
+    """Check database connection status"""
+    try:
+        if db.is_connected():
+            return jsonify({
+                'success': True,
+                'message': 'Database is connected and healthy',
+                'status': 'connected',
+                'collections': {
+                    'patients': db.patients_collection is not None,
+                    'mental_health': db.mental_health_collection is not None
+                }
+            }), 200
+        else:
+            # Try to reconnect
+            logger.info("🔄 Database health check failed, attempting reconnection...")
+            if db.reconnect():
+                return jsonify({
+                    'success': True,
+                    'message': 'Database reconnected successfully',
+                    'status': 'reconnected',
+                    'collections': {
+                        'patients': db.patients_collection is not None,
+                        'mental_health': db.mental_health_collection is not None
+                    }
+                }), 200
+            else:
+                return jsonify({
+                    'success': False,
+                    'message': 'Database is not connected and reconnection failed',
+                    'status': 'disconnected',
+                    'error': 'Database connection failed'
+                }), 503
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Database health check failed',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@bp.route('/health/database/reconnect', methods=['POST'])
+def force_database_reconnect():
+    """Force database reconnection"""
+    try:
+        logger.info("🔄 Force reconnecting to database...")
+        if db.reconnect():
+            return jsonify({
+                'success': True,
+                'message': 'Database reconnected successfully',
+                'status': 'reconnected',
+                'collections': {
+                    'patients': db.patients_collection is not None,
+                    'mental_health': db.mental_health_collection is not None
+                }
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Database reconnection failed',
+                'status': 'failed',
+                'error': 'Unable to reconnect to database'
+            }), 503
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Database reconnection failed',
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@bp.route('/health/services', methods=['GET'])
+def check_services_health():
+    """Report which lazily-loaded services are loaded, their load time and RSS cost"""
+    return jsonify({
+        'success': True,
+        **services.report()
+    }), 200
+
+@bp.route('/health/llm', methods=['GET'])
+def check_llm_health():
+    """Report LLM gateway usage per feature and queue state per model"""
+    return jsonify({
+        'success': True,
+        **llm_gateway.stats()
+    }), 200
+
+@bp.route('/health/logging', methods=['GET'])
+def check_logging_health():
+    """Report log mode, queue depth, sampled-out records and per-request logging overhead"""
+    return jsonify({
+        'success': True,
+        **logging_stats()
+    }), 200
@@ -0,0 +1,144 @@
+"""
+Medical lab OCR routes
+"""
+
+import asyncio
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+from app_core import medical_lab_service, token_required
+from json_provider import omit_bboxes
+
+bp = Blueprint('medical_lab', __name__)
+
+# ============================================================================
+# MEDICAL LAB OCR ENDPOINTS
+# ============================================================================
+
+@bp.route('/api/medical-lab/upload', methods=['POST'])
+@token_required
+def medical_lab_upload():
+    """Upload and process medical documents (PDF, images, text files)"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({
+                'success': False,
+                'error': 'No file provided'
+            }), 400
+        
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({
+                'success': False,
+                'error': 'No file selected'
+            }), 400
+        
+        # Read file content
+        file_content = file.read()
+        filename = file.filename
+        
+        # Validate file type
+        if not medical_lab_service.validate_file_type(file.content_type, filename):
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported file type: {file.content_type}',
+                'supported_types': list(medical_lab_service.supported_formats.keys())
+            }), 400
+        
+        # Process file
+        result = asyncio.run(medical_lab_service.process_file(file_content, filename))
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(omit_bboxes(result)), 200 if result['success'] else 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error processing file: {str(e)}'
+        }), 500
+
+@bp.route('/api/medical-lab/base64', methods=['POST'])
+@token_required
+def medical_lab_base64():
+    """Process base64 encoded image"""
+    try:
+        data = request.get_json()
+        base64_image = data.get('image', '')
+        filename = data.get('filename', 'base64_image')
+        
+        if not base64_image:
+            return jsonify({
+                'success': False,
+                'error': 'Base64 image data is required'
+            }), 400
+        
+        # Process base64 image
+        result = asyncio.run(medical_lab_service.process_base64_image(base64_image, filename))
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(omit_bboxes(result)), 200 if result['success'] else 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error processing base64 image: {str(e)}'
+        }), 500
+
+@bp.route('/api/medical-lab/formats', methods=['GET'])
+def get_medical_lab_formats():
+    """Get supported file formats"""
+    try:
+        formats = medical_lab_service.get_supported_formats()
+        return jsonify({
+            'success': True,
+            'supported_formats': formats,
+            'description': 'File formats supported by medical lab service'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error getting supported formats: {str(e)}'
+        }), 500
+
+@bp.route('/api/medical-lab/languages', methods=['GET'])
+def get_medical_lab_languages():
+    """Get supported languages"""
+    try:
+        languages = {
+            "supported_languages": ["en", "ch", "chinese_cht", "ko", "ja", "latin", "arabic", "cyrillic"],
+            "current_language": "en",
+            "supported_file_formats": ["PDF", "TXT", "DOC", "DOCX", "Images (JPEG, PNG, GIF, BMP, TIFF)"]
+        }
+        
+        return jsonify({
+            'success': True,
+            **languages
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error getting supported languages: {str(e)}'
+        }), 500
+
+@bp.route('/api/medical-lab/health', methods=['GET'])
+def medical_lab_service_health():
+    """Check medical lab service health"""
+    try:
+        service_info = medical_lab_service.get_service_info()
+        return jsonify({
+            'success': True,
+            'status': 'healthy',
+            'service': 'Medical Lab OCR Service',
+            'timestamp': datetime.now().isoformat(),
+            **service_info
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error checking service health: {str(e)}'
+        }), 500
@@ -0,0 +1,673 @@
+"""
+Mental health routes: mood check-ins, assessments, stories and chat
+"""
+
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, send_file
+
+from app_logging import get_logger
+from app_core import db, mental_health_service, token_required
+from streaming import requested_stream_mode, stream_events
+from audio_transport import wants_binary_audio
+
+bp = Blueprint('mental_health', __name__)
+logger = get_logger(__name__)
+
+# ==================== MENTAL HEALTH ENDPOINTS ====================
+
+@bp.route('/mental-health/mood-checkin', methods=['POST'])
+def submit_mood_checkin():
+    """Submit a mood check-in for a patient"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        # Extract required fields
+        patient_id = data.get('patient_id')
+        mood = data.get('mood')
+        note = data.get('note', '')
+        date_str = data.get('date')
+        
+        if not patient_id or not mood:
+            return jsonify({
+                'success': False,
+                'message': 'Patient ID and mood are required'
+            }), 400
+        
+        # Parse date (use current date if not provided)
+        if date_str:
+            try:
+                checkin_date = datetime.strptime(date_str, '%d/%m/%Y').date()
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'message': 'Invalid date format. Use DD/MM/YYYY'
+                }), 400
+        else:
+            checkin_date = datetime.now().date()
+        
+        # Check if database is connected
+        if not db.is_connected():
+            return jsonify({
+                'success': False,
+                'message': 'Database not connected'
+            }), 503
+        
+        # Check if patient exists
+        if db.patients_collection is None:
+            return jsonify({
+                'success': False,
+                'message': 'Database connection error'
+            }), 500
+        
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({
+                'success': False,
+                'message': 'Patient not found'
+            }), 404
+        
+        # Check if already checked in for this date (mood check-in only)
+        existing_mood_checkin = db.mental_health_collection.find_one({
+            "patient_id": patient_id,
+            "date": checkin_date.isoformat(),
+            "type": "mood_checkin"
+        })
+        
+        if existing_mood_checkin:
+            return jsonify({
+                'success': False,
+                'message': 'Already checked in for this date'
+            }), 409
+        
+        # Create mood check-in entry
+        mood_entry = {
+            "patient_id": patient_id,
+            "mood": mood,
+            "note": note,
+            "date": checkin_date.isoformat(),
+            "timestamp": datetime.now().isoformat(),
+            "type": "mood_checkin",
+            "created_at": datetime.now().isoformat()
+        }
+        
+        # Insert into mental health collection
+        result = db.mental_health_collection.insert_one(mood_entry)
+        
+        if result.inserted_id:
+            logger.info(f"✅ Mood check-in saved for patient {patient_id}: {mood}")
+            
+            # Update patient's mental health logs count
+            db.patients_collection.update_one(
+                {"patient_id": patient_id},
+                {
+                    "$push": {"mental_health_logs": mood_entry},
+                    "$inc": {"mental_health_logs_count": 1}
+                }
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': 'Mood check-in saved successfully',
+                'data': {
+                    'id': str(result.inserted_id),
+                    'patient_id': patient_id,
+                    'mood': mood,
+                    'date': checkin_date.isoformat(),
+                    'timestamp': mood_entry['timestamp']
+                }
+            }), 201
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to save mood check-in'
+            }), 500
+            
+    except Exception as e:
+        logger.error(f"❌ Mood check-in error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Internal server error: {str(e)}'
+        }), 500
+
+@bp.route('/mental-health/history/<patient_id>', methods=['GET'])
+def get_mental_health_history(patient_id):
+    """Get mental health history for a patient"""
+    try:
+        # Check if database is connected
+        if not db.is_connected():
+            return jsonify({
+                'success': False,
+                'message': 'Database not connected'
+            }), 503
+        
+        if db.mental_health_collection is None:
+            return jsonify({
+                'success': False,
+                'message': 'Database connection error'
+            }), 500
+        
+        # Get mood check-ins for the patient
+        mood_entries = list(db.mental_health_collection.find(
+            {"patient_id": patient_id, "type": "mood_checkin"},
+            {"_id": 0}  # Exclude MongoDB _id
+        ).sort("date", -1).limit(30))  # Last 30 entries
+        
+        # Get assessment entries for the patient
+        assessment_entries = list(db.mental_health_collection.find(
+            {"patient_id": patient_id, "type": "mental_health_assessment"},
+            {"_id": 0}  # Exclude MongoDB _id
+        ).sort("date", -1).limit(30))  # Last 30 entries
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'patient_id': patient_id,
+                'mood_history': mood_entries,
+                'assessment_history': assessment_entries,
+                'total_mood_entries': len(mood_entries),
+                'total_assessment_entries': len(assessment_entries)
+            }
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Get mental health history error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Internal server error: {str(e)}'
+        }), 500
+
+@bp.route('/mental-health/assessment', methods=['POST'])
+def submit_mental_health_assessment():
+    """Submit a mental health assessment for a patient"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        # Extract required fields
+        patient_id = data.get('patient_id')
+        score = data.get('score')
+        date_str = data.get('date')
+        
+        if not patient_id or score is None:
+            return jsonify({
+                'success': False,
+                'message': 'Patient ID and score are required'
+            }), 400
+        
+        # Validate score range
+        if not isinstance(score, (int, float)) or score < 1 or score > 10:
+            return jsonify({
+                'success': False,
+                'message': 'Score must be a number between 1 and 10'
+            }), 400
+        
+        # Parse date (use current date if not provided)
+        if date_str:
+            try:
+                assessment_date = datetime.strptime(date_str, '%d/%m/%Y').date()
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'message': 'Invalid date format. Use DD/MM/YYYY'
+                }), 400
+        else:
+            assessment_date = datetime.now().date()
+        
+        # Check if database is connected
+        if not db.is_connected():
+            return jsonify({
+                'success': False,
+                'message': 'Database not connected'
+            }), 503
+        
+        # Check if patient exists
+        if db.patients_collection is None:
+            return jsonify({
+                'success': False,
+                'message': 'Database connection error'
+            }), 500
+        
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({
+                'success': False,
+                'message': 'Patient not found'
+            }), 404
+        
+        # Check if already assessed for this date
+        existing_assessment = db.mental_health_collection.find_one({
+            "patient_id": patient_id,
+            "date": assessment_date.isoformat(),
+            "type": "mental_health_assessment"
+        })
+        
+        if existing_assessment:
+            return jsonify({
+                'success': False,
+                'message': 'Already assessed for this date'
+            }), 409
+        
+        # Create assessment entry
+        assessment_entry = {
+            "patient_id": patient_id,
+            "score": float(score),
+            "date": assessment_date.isoformat(),
+            "timestamp": datetime.now().isoformat(),
+            "type": "mental_health_assessment",
+            "created_at": datetime.now().isoformat()
+        }
+        
+        # Insert into mental health collection
+        result = db.mental_health_collection.insert_one(assessment_entry)
+        
+        if result.inserted_id:
+            logger.info(f"✅ Mental health assessment saved for patient {patient_id}: {score}/10")
+            
+            return jsonify({
+                'success': True,
+                'message': 'Mental health assessment saved successfully',
+                'data': {
+                    'id': str(result.inserted_id),
+                    'patient_id': patient_id,
+                    'score': float(score),
+                    'date': assessment_date.isoformat(),
+                    'timestamp': assessment_entry['timestamp']
+                }
+            }), 201
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to save assessment'
+            }), 500
+            
+    except Exception as e:
+        logger.error(f"❌ Mental health assessment error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Internal server error: {str(e)}'
+        }), 500
+
+# ============================================================================
+# MENTAL HEALTH ASSESSMENT ENDPOINTS
+# ============================================================================
+
+@bp.route('/api/mental-health/generate-story', methods=['POST'])
+@token_required
+def generate_mental_health_story():
+    """Generate a mental health assessment story"""
+    try:
+        data = request.get_json()
+        story_type = data.get('story_type', 'pregnancy')
+        scenario = data.get('scenario', 'pregnancy_mental_health')
+        
+        result = mental_health_service.generate_story(story_type, scenario)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error generating story: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/assess', methods=['POST'])
+@token_required
+def assess_mental_health():
+    """Assess mental health based on story responses"""
+    try:
+        data = request.get_json()
+        answers = data.get('answers', [])
+        story_id = data.get('story_id', '')
+        
+        if not answers:
+            return jsonify({
+                'success': False,
+                'error': 'Answers are required'
+            }), 400
+        
+        patient_id = request.user_data['patient_id']
+        result = mental_health_service.assess_mental_health(answers, story_id, patient_id)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error assessing mental health: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/generate-audio', methods=['POST'])
+@token_required
+def generate_mental_health_audio():
+    """Generate Tamil audio for mental health story"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '')
+        
+        if not text:
+            return jsonify({
+                'success': False,
+                'error': 'Text is required for audio generation'
+            }), 400
+        
+        binary = wants_binary_audio(request)
+        # Clients that play audio_url or take raw audio skip the base64 copy
+        include_data = data.get('include_audio_data', True) and not binary
+        result = mental_health_service.generate_audio(text, include_data=include_data)
+        if binary and result['success']:
+            path = mental_health_service.audio_for_id(result['audio_id'])
+            return send_file(path, mimetype='audio/mpeg', conditional=True, etag=result['audio_id'])
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error generating audio: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/audio/<audio_id>', methods=['GET'])
+def get_mental_health_audio(audio_id):
+    """Stream a library clip with HTTP range support.
+
+    Not behind token_required: <audio> elements cannot send an Authorization
+    header, and ids are SHA-256 content hashes that cannot be guessed.
+    """
+    try:
+        path = mental_health_service.audio_for_id(audio_id)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error generating audio: {str(e)}'
+        }), 503
+    if not path:
+        return jsonify({
+            'success': False,
+            'error': 'Audio not found'
+        }), 404
+    # Clips never change for an id, so they can be cached indefinitely
+    return send_file(path, mimetype='audio/mpeg', conditional=True, etag=audio_id, max_age=31536000)
+
+@bp.route('/api/mental-health/story-types', methods=['GET'])
+def get_mental_health_story_types():
+    """Get available mental health story types"""
+    try:
+        story_types = {
+            "pregnancy": "Stories about pregnancy-related mental health challenges",
+            "postpartum": "Stories about postpartum mental health experiences", 
+            "general": "General mental health and life challenges"
+        }
+        
+        return jsonify({
+            'success': True,
+            'story_types': story_types
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error getting story types: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/health', methods=['GET'])
+def mental_health_service_health():
+    """Check mental health service health"""
+    try:
+        return jsonify({
+            'success': True,
+            'status': 'healthy',
+            'service': 'Mental Health Assessment',
+            'features': [
+                'Story generation',
+                'Mental health assessment',
+                'Tamil audio generation',
+                'AI-powered analysis'
+            ],
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error checking service health: {str(e)}'
+        }), 500
+
+# ==================== MENTAL HEALTH CHAT ENDPOINTS ====================
+
+@bp.route('/api/mental-health/chat', methods=['POST'])
+@token_required
+def mental_health_chat():
+    """Send a message to the mental health AI chat"""
+    try:
+        data = request.get_json()
+        if not data or 'message' not in data:
+            return jsonify({
+                'success': False,
+                'message': 'Message is required'
+            }), 400
+
+        patient_id = request.user_data['patient_id']
+        message = data['message']
+        context = data.get('context')
+        mood = data.get('mood')
+        session_id = data.get('session_id')
+        user_profile = data.get('user_profile', {})
+
+        # Opt-in streaming: tokens as they arrive, then the final body
+        stream_mode = requested_stream_mode()
+        if stream_mode:
+            return stream_events(mental_health_service.stream_chat_response(
+                message=message,
+                patient_id=patient_id,
+                context=context,
+                mood=mood,
+                session_id=session_id,
+                user_profile=user_profile
+            ), stream_mode)
+
+        # Generate AI response using the mental health service
+        result = mental_health_service.generate_chat_response(
+            message=message,
+            patient_id=patient_id,
+            context=context,
+            mood=mood,
+            session_id=session_id,
+            user_profile=user_profile
+        )
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        logger.error(f"❌ Mental health chat error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Chat error: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/chat/history', methods=['GET'])
+@token_required
+def get_mental_health_chat_history():
+    """Get mental health chat history for a patient"""
+    try:
+        patient_id = request.user_data['patient_id']
+        limit = request.args.get('limit', 50, type=int)
+        offset = request.args.get('offset', 0, type=int)
+
+        # Get chat sessions from database
+        if db.mental_health_collection is None:
+            return jsonify({
+                'success': False,
+                'message': 'Database not available'
+            }), 500
+
+        # Query chat sessions
+        chat_sessions = list(db.mental_health_collection.find(
+            {"patient_id": patient_id, "type": "chat_session"}
+        ).sort("created_at", -1).skip(offset).limit(limit))
+
+        return jsonify({
+            'success': True,
+            'sessions': chat_sessions,
+            'count': len(chat_sessions)
+        }), 200
+
+    except Exception as e:
+        logger.error(f"❌ Get mental health chat history error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Failed to get chat history: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/chat/session', methods=['POST'])
+@token_required
+def start_mental_health_chat_session():
+    """Start a new mental health chat session"""
+    try:
+        data = request.get_json() or {}
+        patient_id = request.user_data['patient_id']
+        initial_mood = data.get('initial_mood')
+        user_profile = data.get('user_profile', {})
+
+        session_id = str(uuid.uuid4())
+        session_data = {
+            "session_id": session_id,
+            "patient_id": patient_id,
+            "type": "chat_session",
+            "initial_mood": initial_mood,
+            "user_profile": user_profile,
+            "created_at": datetime.now(),
+            "last_activity": datetime.now(),
+            "messages": [],
+            "current_mood": initial_mood,
+            "session_data": {}
+        }
+
+        # Save session to database
+        if db.mental_health_collection is not None:
+            db.mental_health_collection.insert_one(session_data)
+
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            'message': 'Chat session started successfully'
+        }), 200
+
+    except Exception as e:
+        logger.error(f"❌ Start mental health chat session error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Failed to start chat session: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/chat/session/<session_id>', methods=['DELETE'])
+@token_required
+def end_mental_health_chat_session(session_id):
+    """End a mental health chat session"""
+    try:
+        patient_id = request.user_data['patient_id']
+        data = request.get_json() or {}
+        summary = data.get('summary')
+
+        # Update session in database
+        if db.mental_health_collection is not None:
+            update_data = {
+                "last_activity": datetime.now(),
+                "ended_at": datetime.now(),
+                "status": "ended"
+            }
+            if summary:
+                update_data["summary"] = summary
+
+            db.mental_health_collection.update_one(
+                {"session_id": session_id, "patient_id": patient_id, "type": "chat_session"},
+                {"$set": update_data}
+            )
+
+        return jsonify({
+            'success': True,
+            'message': 'Chat session ended successfully'
+        }), 200
+
+    except Exception as e:
+        logger.error(f"❌ End mental health chat session error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Failed to end chat session: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/assessments', methods=['GET'])
+@token_required
+def get_mental_health_assessments():
+    """Get mental health assessments for a patient"""
+    try:
+        patient_id = request.user_data['patient_id']
+        limit = request.args.get('limit', 10, type=int)
+        offset = request.args.get('offset', 0, type=int)
+
+        # Get assessments from database using mental health service
+        if mental_health_service.mental_health_collection is not None:
+            assessments = list(mental_health_service.mental_health_collection.find(
+                {"patient_id": patient_id, "type": "mental_health_assessment"}
+            ).sort("created_at", -1).skip(offset).limit(limit))
+
+            return jsonify({
+                'success': True,
+                'assessments': assessments,
+                'count': len(assessments)
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Database not available'
+            }), 500
+
+    except Exception as e:
+        logger.error(f"❌ Get mental health assessments error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Failed to get assessments: {str(e)}'
+        }), 500
+
+@bp.route('/api/mental-health/debug', methods=['GET'])
+@token_required
+def debug_mental_health_database():
+    """Debug endpoint to check mental health database status"""
+    try:
+        patient_id = request.user_data['patient_id']
+        
+        debug_info = {
+            'patient_id': patient_id,
+            'database_connected': mental_health_service.mental_health_collection is not None,
+            'database_name': mental_health_service.db.name if mental_health_service.db else None,
+            'collection_name': mental_health_service.mental_health_collection.name if mental_health_service.mental_health_collection else None,
+        }
+        
+        if mental_health_service.mental_health_collection is not None:
+            # Get total count
+            total_count = mental_health_service.mental_health_collection.count_documents({})
+            patient_count = mental_health_service.mental_health_collection.count_documents({"patient_id": patient_id})
+            
+            debug_info.update({
+                'total_assessments': total_count,
+                'patient_assessments': patient_count,
+                'recent_assessments': list(mental_health_service.mental_health_collection.find(
+                    {"patient_id": patient_id}
+                ).sort("created_at", -1).limit(3))
+            })
+        
+        return jsonify({
+            'success': True,
+            'debug_info': debug_info
+        }), 200
+
+    except Exception as e:
+        logger.error(f"❌ Debug mental health database error: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Debug failed: {str(e)}'
+        }), 500
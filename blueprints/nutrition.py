@@ -0,0 +1,637 @@
+"""
+Nutrition routes: transcription, GPT-4 food analysis, food entries and daily summaries
+"""
+
+import base64
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import requests
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import db
+from audio_transport import AudioTooLarge, upload_options, uploaded_audio
+from llm_gateway import llm_gateway, PRIORITY_INTERACTIVE
+from nutrition_rollups import MAX_RANGE_DAYS, nutrition_rollups, replaced_entry
+from request_metrics import track_outbound
+from streaming import relay_tokens, requested_stream_mode, stream_chat_completion, stream_events
+
+bp = Blueprint('nutrition', __name__)
+logger = get_logger(__name__)
+
+# ==================== NUTRITION BACKEND INTEGRATION ====================
+
+def record_nutrition(user_id, food_entry, earlier_entries=()):
+    """Add a saved food entry to the patient's daily rollup; the entry itself is already stored
+
+    A save of a meal that is already in earlier_entries (same analysis) replaces it
+    in the rollup instead of counting the meal again.
+    """
+    try:
+        nutrition_rollups.record(db.patients_collection.database, user_id, food_entry,
+                                 replaces=replaced_entry(food_entry, list(earlier_entries)))
+    except Exception as e:
+        logger.warning(f"⚠️ Could not update nutrition rollup for {user_id}: {e}")
+
+@bp.route('/nutrition/health', methods=['GET'])
+def nutrition_health_check():
+    """Nutrition service health check endpoint"""
+    return jsonify({
+        'success': True,
+        'message': 'Nutrition service is running',
+        'timestamp': datetime.now().isoformat(),
+        'database_connected': db.patients_collection is not None
+    })
+
+@bp.route('/nutrition/transcribe', methods=['POST'])
+def transcribe_audio():
+    """Transcribe audio using N8N webhook only (Whisper disabled)"""
+    try:
+        logger.info("🎤 Transcription request received")
+        
+        upload = uploaded_audio(request)
+        if upload:
+            # Binary/multipart upload; the N8N webhook still takes base64
+            data = upload_options(request)
+            data['audio'] = base64.b64encode(upload[0]).decode('ascii')
+            data.setdefault('audio_format', upload[1].split('/')[-1])
+        else:
+            data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        audio_data = data.get('audio')
+        if not audio_data:
+            return jsonify({
+                'success': False,
+                'message': 'Audio data is required'
+            }), 400
+        
+        use_n8n = data.get('use_n8n', True)  # Default to N8N
+        method = data.get('method', 'n8n_webhook')  # Default to N8N webhook
+        context = data.get('context', 'food_tracking')  # Default to food tracking
+        
+        # Determine which N8N webhook to use based on context
+        if context == 'symptoms_tracking':
+            webhook_url = 'https://n8n.srv795087.hstgr.cloud/webhook/symptoms'
+            logger.info(f"🩺 Using symptoms N8N webhook for symptoms tracking")
+        else:
+            webhook_url = 'https://n8n.srv795087.hstgr.cloud/webhook/food'
+            logger.info(f"🍎 Using food N8N webhook for food tracking")
+            
+        logger.info(f"🎯 Using method: {method}, use_n8n: {use_n8n}, context: {context}")
+        if True:  # Always use N8N webhook
+            try:
+                logger.info("🔄 Trying N8N webhook for transcription + translation...")
+                
+                # Prepare payload for N8N - try multiple field formats
+                n8n_payload = {
+                    # Different possible field names for audio data
+                    'audio_data': audio_data,
+                    'audio': audio_data,
+                    'file': audio_data,
+                    'data': audio_data,
+                    'input': audio_data,
+                    'base64': audio_data,
+                    
+                    # Action and context
+                    'action': 'transcribe_and_translate',
+                    'type': 'audio_transcription',
+                    'source_language': 'auto',
+                    'target_language': 'en',
+                    'audio_format': data.get('audio_format', 'webm'),
+                    'context': context,
+                    'format': 'base64',
+                    'encoding': 'base64',
+                }
+                
+                logger.info(f"📤 Sending to N8N: {webhook_url}")
+                logger.debug("📦 N8N payload", extra={"payload": {k: v if k != 'audio_data' else f'[{len(v)} chars]'
+                                                                  for k, v in n8n_payload.items()}})
+                
+                with track_outbound("n8n"):
+                    n8n_response = requests.post(
+                        webhook_url,
+                        json=n8n_payload,
+                        headers={'Content-Type': 'application/json'},
+                        timeout=60
+                    )
+                
+                if n8n_response.status_code == 200:
+                    n8n_data = n8n_response.json()
+                    logger.debug(f"🔍 N8N response data: {n8n_data}")
+                    
+                    # Handle different N8N response formats
+                    transcription = None
+                    
+                    # Format 1: {output: "text"}
+                    if 'output' in n8n_data:
+                        transcription = str(n8n_data['output'])
+                    
+                    # Format 2: {success: true, transcription: "text"}
+                    elif n8n_data.get('success') or n8n_data.get('status') == 'success':
+                        transcription = n8n_data.get('transcription') or n8n_data.get('translated_text') or n8n_data.get('text')
+                    
+                    # Format 3: Direct text response
+                    elif isinstance(n8n_data, str):
+                        transcription = n8n_data
+                    
+                    if transcription:
+                        logger.info(f"✅ N8N webhook transcription successful ({len(transcription)} chars)")
+                        return jsonify({
+                            'success': True,
+                            'transcription': transcription,
+                            'output': transcription,  # Include for compatibility
+                            'language': 'auto',
+                            'method': 'n8n_webhook',
+                            'original_text': n8n_data.get('original_text'),
+                            'translation_note': 'Processed via N8N webhook',
+                            'timestamp': datetime.now().isoformat()
+                        }), 200
+                
+                logger.error(f"❌ N8N webhook failed: {n8n_response.status_code}")
+                return jsonify({
+                    'success': False,
+                    'message': f'N8N webhook failed with status {n8n_response.status_code}',
+                    'method': 'n8n_webhook'
+                }), 500
+            except Exception as e:
+                logger.error(f"❌ N8N webhook error: {e}")
+                return jsonify({
+                    'success': False,
+                    'message': f'N8N webhook error: {str(e)}',
+                    'method': 'n8n_webhook'
+                }), 500
+        
+        # No Whisper fallback - N8N only
+        return jsonify({
+            'success': False,
+            'message': 'N8N webhook is the only supported transcription method',
+            'method': 'n8n_webhook'
+        }), 400
+            
+    except AudioTooLarge as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 413
+    except Exception as e:
+        logger.error(f"❌ Error in transcription: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/nutrition/analyze-with-gpt4', methods=['POST'])
+def analyze_food_with_gpt4():
+    """Analyze food using GPT-4"""
+    try:
+        logger.info("🍎 GPT-4 analysis request received")
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        food_input = data.get('food_input', '')
+        pregnancy_week = data.get('pregnancy_week', 1)
+        user_id = data.get('userId', '')
+        
+        if not food_input:
+            return jsonify({
+                'success': False,
+                'message': 'Food input is required'
+            }), 400
+        
+        # Get OpenAI API key
+        openai_api_key = os.getenv('OPENAI_API_KEY')
+        if not openai_api_key:
+            return jsonify({
+                'success': False,
+                'message': 'OpenAI API key not configured'
+            }), 500
+        
+        # Shared, pooled OpenAI client
+        client = llm_gateway.client_for('nutrition', PRIORITY_INTERACTIVE)
+        if client is None:
+            return jsonify({
+                'success': False,
+                'message': 'OpenAI package not installed. Run: pip install openai'
+            }), 500
+        
+        request_kwargs = food_analysis_request(food_input, pregnancy_week)
+        
+        # Opt-in streaming: relay the model output, then the parsed analysis
+        stream_mode = requested_stream_mode()
+        if stream_mode:
+            def events():
+                parts = []
+                yield from relay_tokens(stream_chat_completion(client, **request_kwargs), parts)
+                yield 'result', food_analysis_body(''.join(parts).strip(), food_input, pregnancy_week, user_id)
+            return stream_events(events(), stream_mode)
+        
+        # Call GPT-4
+        response = client.chat.completions.create(**request_kwargs)
+        
+        # Extract response
+        gpt_response = response.choices[0].message.content.strip()
+        
+        return jsonify(food_analysis_body(gpt_response, food_input, pregnancy_week, user_id)), 200
+            
+    except Exception as e:
+        logger.error(f"❌ Error in GPT-4 analysis: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+def food_analysis_request(food_input, pregnancy_week):
+    """Chat completion arguments for the GPT-4 food analysis"""
+    # Create GPT-4 prompt
+    prompt = f"""
+    Analyze this food item for a pregnant woman at week {pregnancy_week}:
+    
+    Food: {food_input}
+    
+    Provide a detailed analysis in JSON format with the following structure:
+    {{
+        "nutritional_breakdown": {{
+            "estimated_calories": <number>,
+            "protein_grams": <number>,
+            "carbohydrates_grams": <number>,
+            "fat_grams": <number>,
+            "fiber_grams": <number>
+        }},
+        "pregnancy_benefits": {{
+            "nutrients_for_fetal_development": ["list of specific nutrients"],
+            "benefits_for_mother": ["list of benefits"],
+            "week_specific_advice": "specific advice for week {pregnancy_week}"
+        }},
+        "safety_considerations": {{
+            "food_safety_tips": ["list of safety tips"],
+            "cooking_recommendations": ["cooking guidelines"]
+        }},
+        "smart_recommendations": {{
+            "next_meal_suggestions": ["suggestions for next meal"],
+            "hydration_tips": "water intake advice"
+        }}
+    }}
+    
+    Focus on pregnancy-specific nutrition needs.
+    """
+    
+    return {
+        'model': "gpt-4",
+        'messages': [
+            {
+                "role": "system",
+                "content": "You are a nutrition expert specializing in pregnancy nutrition. Provide accurate, detailed analysis in the exact JSON format requested."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        'temperature': 0.3,
+        'max_tokens': 1500
+    }
+
+def food_analysis_body(gpt_response, food_input, pregnancy_week, user_id):
+    """Parse the GPT-4 analysis, save it for the patient and build the response body"""
+    # Try to parse JSON response
+    try:
+        # Remove markdown formatting if present
+        if gpt_response.startswith('```json'):
+            gpt_response = gpt_response.replace('```json', '').replace('```', '').strip()
+        
+        analysis_data = json.loads(gpt_response)
+        if isinstance(analysis_data, dict):
+            # Echoed back by save-food-entry, which links the two saves of this meal
+            analysis_data['analysis_id'] = f"analysis_{uuid.uuid4().hex}"
+        
+        # Save to database if user_id provided
+        if user_id:
+            try:
+                # Find patient
+                patient = db.patients_collection.find_one({"patient_id": user_id})
+                if patient:
+                    # Initialize food_data array if not exists
+                    if 'food_data' not in patient:
+                        patient['food_data'] = []
+                    
+                    # Add GPT-4 analysis to food_data
+                    food_entry = {
+                        'type': 'gpt4_analysis',
+                        'food_input': food_input,
+                        'analysis': analysis_data,
+                        'pregnancy_week': pregnancy_week,
+                        'timestamp': datetime.now().isoformat(),
+                        'created_at': datetime.now()
+                    }
+                    
+                    patient['food_data'].append(food_entry)
+                    
+                    # Update patient document
+                    db.patients_collection.update_one(
+                        {"patient_id": user_id},
+                        {"$set": {"food_data": patient['food_data']}}
+                    )
+                    record_nutrition(user_id, food_entry, patient['food_data'][:-1])
+                    
+                    logger.info(f"✅ GPT-4 analysis saved to database for user: {user_id}")
+                else:
+                    logger.warning(f"⚠️ Patient not found for user ID: {user_id}")
+            except Exception as e:
+                logger.warning(f"⚠️ Could not save to database: {e}")
+        
+        logger.info("✅ GPT-4 analysis successful", extra={"patient_id": user_id or None})
+        
+        return {
+            'success': True,
+            'analysis': analysis_data,
+            'food_input': food_input,
+            'pregnancy_week': pregnancy_week,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except json.JSONDecodeError as e:
+        logger.warning(f"⚠️ JSON parsing error: {e}")
+        logger.warning(f"⚠️ Raw GPT response: {gpt_response[:200]}...")
+        
+        # Fallback analysis
+        fallback_analysis = {
+            "nutritional_breakdown": {
+                "estimated_calories": 0,
+                "protein_grams": 0,
+                "carbohydrates_grams": 0,
+                "fat_grams": 0,
+                "fiber_grams": 0
+            },
+            "pregnancy_benefits": {
+                "nutrients_for_fetal_development": ["General nutrients"],
+                "benefits_for_mother": ["General benefits"],
+                "week_specific_advice": f"Consult your doctor for week {pregnancy_week} specific advice"
+            },
+            "safety_considerations": {
+                "food_safety_tips": ["Ensure food is properly cooked", "Wash fruits and vegetables"],
+                "cooking_recommendations": ["Cook thoroughly", "Avoid raw foods"]
+            },
+            "smart_recommendations": {
+                "next_meal_suggestions": ["Balanced meal with protein and vegetables"],
+                "hydration_tips": "Drink plenty of water throughout the day"
+            },
+            "note": "Analysis generated with fallback due to parsing error"
+        }
+        
+        return {
+            'success': True,
+            'analysis': fallback_analysis,
+            'food_input': food_input,
+            'pregnancy_week': pregnancy_week,
+            'timestamp': datetime.now().isoformat(),
+            'fallback_used': True
+        }
+
+@bp.route('/nutrition/save-food-entry', methods=['POST'])
+def save_food_entry():
+    """Save basic food entry to patient's food_data array"""
+    try:
+        logger.info("🍽️ Food entry save request received")
+        
+        data = request.get_json()
+        logger.debug("🍽️ Received food entry", extra={"payload": data})
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        user_id = data.get('userId')
+        # Accept both 'food_input' and 'food_details' for backward compatibility
+        food_input = data.get('food_input') or data.get('food_details', '')
+        pregnancy_week = data.get('pregnancy_week', 1)
+        
+        if not user_id:
+            return jsonify({
+                'success': False,
+                'message': 'User ID is required'
+            }), 400
+        
+        if not food_input:
+            return jsonify({
+                'success': False,
+                'message': 'Food input is required'
+            }), 400
+        
+        # Find patient
+        patient = db.patients_collection.find_one({"patient_id": user_id})
+        if not patient:
+            return jsonify({
+                'success': False,
+                'message': f'Patient not found with ID: {user_id}'
+            }), 404
+        
+        # Initialize food_data array if not exists
+        if 'food_data' not in patient:
+            patient['food_data'] = []
+        
+        # Create food entry with all available fields
+        food_entry = {
+            'type': 'basic_entry',
+            'food_input': food_input,
+            'food_details': food_input,  # Also store as food_details for consistency
+            'pregnancy_week': pregnancy_week,
+            'meal_type': data.get('meal_type', ''),
+            'notes': data.get('notes', ''),
+            'transcribed_text': data.get('transcribed_text', ''),
+            'nutritional_breakdown': data.get('nutritional_breakdown', {}),
+            'gpt4_analysis': data.get('gpt4_analysis', {}),
+            'timestamp': data.get('timestamp', datetime.now().isoformat()),
+            'created_at': datetime.now()
+        }
+        if data.get('analysis_id'):
+            food_entry['analysis_id'] = data['analysis_id']
+        
+        # Add to food_data array
+        patient['food_data'].append(food_entry)
+        
+        # Update patient document
+        result = db.patients_collection.update_one(
+            {"patient_id": user_id},
+            {"$set": {"food_data": patient['food_data']}}
+        )
+        
+        if result.modified_count > 0:
+            record_nutrition(user_id, food_entry, patient['food_data'][:-1])
+            logger.info(f"✅ Food entry saved successfully for user: {user_id}")
+            return jsonify({
+                'success': True,
+                'message': 'Food entry saved successfully',
+                'food_entry': food_entry,
+                'total_entries': len(patient['food_data'])
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to save food entry'
+            }), 500
+            
+    except Exception as e:
+        logger.error(f"❌ Error saving food entry: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/nutrition/get-food-entries/<user_id>', methods=['GET'])
+def get_food_entries(user_id):
+    """Get food entries from patient's food_data array"""
+    try:
+        logger.info(f"🍽️ Getting food entries for user ID: {user_id}")
+        
+        # Find patient
+        patient = db.patients_collection.find_one({"patient_id": user_id})
+        if not patient:
+            return jsonify({
+                'success': False,
+                'message': f'Patient not found with ID: {user_id}'
+            }), 404
+        
+        # Get food_data array
+        food_data = patient.get('food_data', [])
+        
+        # Sort by timestamp (most recent first)
+        food_data.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        
+        logger.info(f"✅ Retrieved {len(food_data)} food entries for user: {user_id}")
+        
+        return jsonify({
+            'success': True,
+            'user_id': user_id,
+            'food_data': food_data,
+            'total_entries': len(food_data)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error getting food entries: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/nutrition/daily-summary/<user_id>', methods=['GET'])
+def get_daily_nutrition_summary(user_id):
+    """Calories, macros and meal count for one day (?date=YYYY-MM-DD, default today)"""
+    try:
+        day = request.args.get('date')
+        try:
+            day = datetime.strptime(day, '%Y-%m-%d').date() if day else datetime.now().date()
+        except ValueError:
+            return jsonify({'success': False, 'message': 'date must be YYYY-MM-DD'}), 400
+        
+        summary = nutrition_rollups.day(db.patients_collection.database, user_id, day)
+        return jsonify({
+            'success': True,
+            'user_id': user_id,
+            'daily_summary': summary
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error getting daily nutrition summary: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/nutrition/summary-range/<user_id>', methods=['GET'])
+def get_nutrition_summary_range(user_id):
+    """Daily totals for a range (?start=&end= YYYY-MM-DD, or ?days=7 ending today) for weekly/monthly trends"""
+    try:
+        try:
+            end = request.args.get('end')
+            end = datetime.strptime(end, '%Y-%m-%d').date() if end else datetime.now().date()
+            start = request.args.get('start')
+            if start:
+                start = datetime.strptime(start, '%Y-%m-%d').date()
+            else:
+                start = end - timedelta(days=request.args.get('days', 7, type=int) - 1)
+        except ValueError:
+            return jsonify({'success': False, 'message': 'start and end must be YYYY-MM-DD'}), 400
+        
+        if start > end:
+            return jsonify({'success': False, 'message': 'start must not be after end'}), 400
+        if (end - start).days + 1 > MAX_RANGE_DAYS:
+            return jsonify({'success': False, 'message': f'Range is limited to {MAX_RANGE_DAYS} days'}), 400
+        
+        trend = nutrition_rollups.range(db.patients_collection.database, user_id, start, end)
+        return jsonify({
+            'success': True,
+            'user_id': user_id,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            **trend
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error getting nutrition summary range: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/nutrition/debug-food-data/<user_id>', methods=['GET'])
+def debug_food_data(user_id):
+    """Debug endpoint to check food data structure"""
+    try:
+        logger.debug(f"🔍 Debug food data for user ID: {user_id}")
+        
+        # Find patient
+        patient = db.patients_collection.find_one({"patient_id": user_id})
+        if not patient:
+            return jsonify({
+                'success': False,
+                'message': f'Patient not found with ID: {user_id}'
+            }), 404
+        
+        # Get food_data array
+        food_data = patient.get('food_data', [])
+        
+        # Analyze data structure
+        basic_entries = [entry for entry in food_data if entry.get('type') == 'basic_entry']
+        gpt4_analyses = [entry for entry in food_data if entry.get('type') == 'gpt4_analysis']
+        
+        debug_info = {
+            'user_id': user_id,
+            'total_food_entries': len(food_data),
+            'basic_entries_count': len(basic_entries),
+            'gpt4_analyses_count': len(gpt4_analyses),
+            'food_data_structure': {
+                'has_food_data_field': 'food_data' in patient,
+                'food_data_type': type(food_data).__name__,
+                'food_data_length': len(food_data) if isinstance(food_data, list) else 'Not a list'
+            },
+            'sample_entries': food_data[:3] if food_data else []
+        }
+        
+        logger.info(f"✅ Debug info generated for user: {user_id}")
+        
+        return jsonify({
+            'success': True,
+            'debug_info': debug_info
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"❌ Error in debug food data: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
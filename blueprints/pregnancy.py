@@ -0,0 +1,227 @@
+"""
+Pregnancy tracking routes
+"""
+
+from flask import Blueprint, request, jsonify, Response
+
+from app_core import pregnancy_service, token_required
+
+bp = Blueprint('pregnancy', __name__)
+
+# ============================================================================
+# PREGNANCY TRACKING ENDPOINTS
+# ============================================================================
+
+@bp.route('/api/pregnancy/week/<int:week>', methods=['GET'])
+@token_required
+def get_pregnancy_week(week):
+    """Get pregnancy week information"""
+    try:
+        result = pregnancy_service.get_pregnancy_week_data(week)
+        return jsonify(result.dict()), 200 if result.success else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/weeks', methods=['GET'])
+@token_required
+def get_all_pregnancy_weeks():
+    """Get all pregnancy weeks data"""
+    try:
+        weeks_data = pregnancy_service.get_all_pregnancy_weeks()
+        return jsonify({
+            'success': True,
+            'data': {str(week): week_data.dict() for week, week_data in weeks_data.items()},
+            'message': f'Successfully retrieved data for {len(weeks_data)} weeks'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/trimester/<int:trimester>', methods=['GET'])
+@token_required
+def get_trimester_weeks(trimester):
+    """Get weeks for a specific trimester"""
+    try:
+        if trimester not in [1, 2, 3]:
+            return jsonify({
+                'success': False,
+                'message': 'Trimester must be 1, 2, or 3'
+            }), 400
+        
+        weeks_data = pregnancy_service.get_trimester_weeks(trimester)
+        return jsonify({
+            'success': True,
+            'trimester': trimester,
+            'weeks': {str(week): week_data.dict() for week, week_data in weeks_data.items()},
+            'message': f'Successfully retrieved weeks for trimester {trimester}'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/week/<int:week>/baby-image', methods=['GET'])
+@token_required
+def get_baby_size_image(week):
+    """Get baby size visualization image.
+    
+    Serves the pre-rendered PNG with cache headers. Pass ``format=base64``
+    (or ``format=json``) for the legacy JSON response with base64 image data.
+    """
+    try:
+        style = request.args.get('style', 'matplotlib')
+        response_format = request.args.get('format', 'png').lower()
+        
+        if response_format not in ('base64', 'json'):
+            image = pregnancy_service.get_baby_size_image_bytes(week, style)
+            if image is not None:
+                etag = f'"{image["etag"]}"'
+                headers = {
+                    'ETag': etag,
+                    'Cache-Control': 'private, max-age=604800, immutable'
+                }
+                if request.headers.get('If-None-Match') == etag:
+                    return Response(status=304, headers=headers)
+                return Response(image['content'], mimetype=image['mimetype'], headers=headers)
+        
+        result = pregnancy_service.get_baby_size_image(week, style)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/week/<int:week>/baby-size', methods=['GET'])
+@token_required
+async def get_ai_baby_size(week):
+    """Get AI-powered baby size information"""
+    try:
+        result = await pregnancy_service.get_ai_baby_size(week)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/week/<int:week>/symptoms', methods=['GET'])
+@token_required
+async def get_early_symptoms(week):
+    """Get AI-powered early symptoms information"""
+    try:
+        result = await pregnancy_service.get_early_symptoms(week)
+        return jsonify(result.dict()), 200 if result.success else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/week/<int:week>/screening', methods=['GET'])
+@token_required
+async def get_prenatal_screening(week):
+    """Get AI-powered prenatal screening information"""
+    try:
+        result = await pregnancy_service.get_prenatal_screening(week)
+        return jsonify(result.dict()), 200 if result.success else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/week/<int:week>/wellness', methods=['GET'])
+@token_required
+async def get_wellness_tips(week):
+    """Get AI-powered wellness tips"""
+    try:
+        result = await pregnancy_service.get_wellness_tips(week)
+        return jsonify(result.dict()), 200 if result.success else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/week/<int:week>/nutrition', methods=['GET'])
+@token_required
+async def get_nutrition_tips(week):
+    """Get AI-powered nutrition tips"""
+    try:
+        result = await pregnancy_service.get_nutrition_tips(week)
+        return jsonify(result.dict()), 200 if result.success else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/openai/status', methods=['GET'])
+@token_required
+def get_openai_status():
+    """Check OpenAI service status"""
+    try:
+        result = pregnancy_service.get_openai_status()
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/tracking', methods=['POST'])
+@token_required
+def save_pregnancy_tracking():
+    """Save pregnancy tracking data"""
+    try:
+        data = request.get_json()
+        patient_id = request.user_data['patient_id']
+        
+        result = pregnancy_service.save_pregnancy_tracking(patient_id, data)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/tracking/history', methods=['GET'])
+@token_required
+def get_pregnancy_tracking_history():
+    """Get pregnancy tracking history"""
+    try:
+        patient_id = request.user_data['patient_id']
+        result = pregnancy_service.get_pregnancy_tracking_history(patient_id)
+        return jsonify(result), 200 if result['success'] else 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/api/pregnancy/progress', methods=['GET'])
+@token_required
+def calculate_pregnancy_progress():
+    """Calculate pregnancy progress"""
+    try:
+        patient_id = request.user_data['patient_id']
+        current_week = request.args.get('week', 1, type=int)
+        
+        result = pregnancy_service.calculate_pregnancy_progress(patient_id, current_week)
+        return jsonify({
+            'success': True,
+            'data': result.dict(),
+            'message': 'Pregnancy progress calculated successfully'
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
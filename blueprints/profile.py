@@ -0,0 +1,435 @@
+"""
+Patient profile routes: profile lookup, pregnancy week and activity tracking
+"""
+
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import activity_tracker, db, token_required
+from pregnancy_week import gestational_info, pregnancy_cache
+
+bp = Blueprint('profile', __name__)
+logger = get_logger(__name__)
+
+# Only what the profile endpoints return; other embedded logs (vitals, hydration, ...) are not loaded
+COMPLETE_PROFILE_FIELDS = [
+    'patient_id', 'username', 'email', 'mobile', 'first_name', 'last_name', 'age', 'blood_type',
+    'weight', 'height', 'is_pregnant', 'last_period_date', 'pregnancy_week', 'expected_delivery_date',
+    'emergency_contact', 'preferences', 'profile_completed_at', 'last_updated', 'sleep_logs', 'food_logs',
+    'medication_logs', 'symptom_logs', 'mental_health_logs', 'kick_count_logs',
+]
+PROFILE_FIELDS = [
+    'patient_id', 'username', 'email', 'mobile', 'first_name', 'last_name', 'age', 'gender', 'blood_type',
+    'date_of_birth', 'height', 'weight', 'is_pregnant', 'pregnancy_status', 'pregnancy_week',
+    'last_period_date', 'expected_delivery_date', 'emergency_contact', 'emergency_contact_name',
+    'emergency_contact_phone', 'emergency_contact_relationship', 'address', 'city', 'state', 'zip_code',
+    'phone', 'medical_conditions', 'allergies', 'medications', 'status', 'created_at', 'last_updated',
+    'profile_completed_at', 'email_verified', 'verified_at', 'password_updated_at',
+]
+
+def calculate_current_pregnancy_week(last_period_date_str):
+    """
+    Calculate current pregnancy week based on last period date
+
+    Args:
+        last_period_date_str (str): Last period date in 'YYYY-MM-DD' format
+
+    Returns:
+        dict: Pregnancy information including current week, expected delivery, etc.
+    """
+    info = gestational_info({'last_period_date': last_period_date_str})
+    info['last_updated'] = datetime.now().isoformat()
+    return info
+
+
+@bp.route('/profile/<patient_id>', methods=['GET'])
+@token_required
+def get_profile(patient_id):
+    """
+    Get patient profile information with automatically calculated pregnancy week
+
+    The week is derived from the stored last period date (or due date) on
+    every read; the stored value is only advanced by the nightly job.
+    """
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+        
+        # Get patient from database
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({"error": "Patient not found"}), 404
+        
+        # Derive the current pregnancy week without writing it back
+        if patient.get('is_pregnant', False):
+            pregnancy_info = gestational_info(patient)
+            if not pregnancy_info.get('error'):
+                patient['pregnancy_week'] = pregnancy_info['current_week']
+                patient['expected_delivery_date'] = pregnancy_info['expected_delivery']
+                patient['pregnancy_last_updated'] = datetime.now().isoformat()
+
+        # Prepare response data
+        response_data = {
+            "patient_id": patient["patient_id"],
+            "username": patient["username"],
+            "email": patient["email"],
+            "mobile": patient["mobile"],
+            "first_name": patient.get("first_name"),
+            "last_name": patient.get("last_name"),
+            "age": patient.get("age"),
+            "blood_type": patient.get("blood_type"),
+            "is_pregnant": patient.get("is_pregnant"),
+            "last_period_date": patient.get("last_period_date"),
+            "pregnancy_week": patient.get("pregnancy_week"),
+            "expected_delivery_date": patient.get("expected_delivery_date"),
+            "pregnancy_last_updated": patient.get("pregnancy_last_updated"),
+            "emergency_contact": patient.get("emergency_contact"),
+            "preferences": patient.get("preferences")
+        }
+
+        return jsonify({
+            "success": True,
+            "patient": response_data,
+            "message": "Profile retrieved with auto-calculated pregnancy week"
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"❌ Error in get_profile: {e}")
+        return jsonify({"error": f"Failed to get profile: {str(e)}"}), 500
+
+
+@bp.route('/api/pregnancy/update-week/<patient_id>', methods=['POST'])
+@token_required
+def update_patient_pregnancy_week(patient_id):
+    """
+    Manually update pregnancy week for a specific patient
+
+    This endpoint can be called to force an update of the pregnancy week
+    without accessing the full profile.
+    """
+    try:
+        if db.patients_collection is None:
+            return jsonify({"error": "Database not connected"}), 500
+
+        # Get patient from database
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({"error": "Patient not found"}), 404
+
+        if not patient.get('is_pregnant', False):
+            return jsonify({"error": "Patient is not marked as pregnant"}), 400
+
+        if not patient.get('last_period_date'):
+            return jsonify({"error": "Patient is missing last period date"}), 400
+
+        # Calculate current pregnancy week
+        pregnancy_info = calculate_current_pregnancy_week(patient['last_period_date'])
+
+        if pregnancy_info and not pregnancy_info.get('error'):
+            # Update patient record
+            update_data = {
+                'pregnancy_week': pregnancy_info['current_week'],
+                'expected_delivery_date': pregnancy_info['expected_delivery'],
+                'pregnancy_last_updated': pregnancy_info['last_updated']
+            }
+
+            db.patients_collection.update_one(
+                {"patient_id": patient_id},
+                {"$set": update_data}
+            )
+            pregnancy_cache.invalidate(patient_id)
+
+            return jsonify({
+                'success': True,
+                'message': f'Pregnancy week updated to {pregnancy_info["current_week"]}',
+                'pregnancy_info': pregnancy_info,
+                'patient_id': patient_id
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'message': f'Error calculating pregnancy week: {pregnancy_info.get("error", "Unknown error")}'
+            }), 400
+
+    except Exception as e:
+        logger.error(f"❌ Error updating pregnancy week: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error updating pregnancy week: {str(e)}'
+        }), 500
+
+@bp.route('/patient-complete-profile/<email>', methods=['GET'])
+def get_patient_complete_profile(email):
+    """Get complete patient profile including all health data"""
+    try:
+        # Find patient by email
+        patient = db.patients_collection.find_one({"email": email}, {field: 1 for field in COMPLETE_PROFILE_FIELDS})
+        if not patient:
+            return jsonify({'success': False, 'message': 'Patient not found with this email'}), 404
+        
+        # Return complete patient profile with all data
+        complete_profile = {
+            'success': True,
+            'patient_id': patient.get('patient_id'),
+            'username': patient.get('username'),
+            'email': patient.get('email'),
+            'mobile': patient.get('mobile'),
+            'first_name': patient.get('first_name'),
+            'last_name': patient.get('last_name'),
+            'age': patient.get('age'),
+            'blood_type': patient.get('blood_type'),
+            'weight': patient.get('weight'),
+            'height': patient.get('height'),
+            'is_pregnant': patient.get('is_pregnant'),
+            'last_period_date': patient.get('last_period_date'),
+            'pregnancy_week': patient.get('pregnancy_week'),
+            'expected_delivery_date': patient.get('expected_delivery_date'),
+            'emergency_contact': patient.get('emergency_contact'),
+            'preferences': patient.get('preferences'),
+            'profile_completed_at': patient.get('profile_completed_at'),
+            'last_updated': patient.get('last_updated'),
+            'health_data': {
+                'sleep_logs': patient.get('sleep_logs', []),
+                'sleep_logs_count': len(patient.get('sleep_logs', [])),
+                'food_logs': patient.get('food_logs', []),
+                'food_logs_count': len(patient.get('food_logs', [])),
+                'medication_logs': patient.get('medication_logs', []),
+                'medication_logs_count': len(patient.get('medication_logs', [])),
+                'symptom_logs': patient.get('symptom_logs', []),
+                'symptom_logs_count': len(patient.get('symptom_logs', [])),
+                'mental_health_logs': patient.get('mental_health_logs', []),
+                'mental_health_logs_count': len(patient.get('mental_health_logs', [])),
+                'kick_count_logs': patient.get('kick_count_logs', []),
+                'kick_count_logs_count': len(patient.get('kick_count_logs', [])),
+            }
+        }
+        
+        return jsonify(complete_profile), 200
+        
+    except Exception as e:
+        logger.error(f"Error retrieving complete patient profile: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+# User Activity Management Endpoints
+@bp.route('/user-activities/<email>', methods=['GET'])
+def get_user_activities(email):
+    """Get all activities for a specific user"""
+    try:
+        activities = activity_tracker.get_user_activities(email)
+        return jsonify({
+            'success': True,
+            'user_email': email,
+            'activities': activities,
+            'total_sessions': len(activities)
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/session-activities/<session_id>', methods=['GET'])
+def get_session_activities(session_id):
+    """Get all activities for a specific session"""
+    try:
+        session = activity_tracker.get_session_activities(session_id)
+        if session:
+            return jsonify({
+                'success': True,
+                'session': session
+            }), 200
+        else:
+            return jsonify({'success': False, 'message': 'Session not found'}), 404
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/activity-summary/<email>', methods=['GET'])
+def get_activity_summary(email):
+    """Get summary of user activities"""
+    try:
+        summary = activity_tracker.get_activity_summary(email)
+        return jsonify({
+            'success': True,
+            'user_email': email,
+            'summary': summary,
+            'total_activities': sum(item['count'] for item in summary)
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/track-activity', methods=['POST'])
+def track_activity():
+    """Manually track a user activity"""
+    try:
+        data = request.get_json()
+        user_email = data.get('email')
+        activity_type = data.get('activity_type')
+        activity_data = data.get('activity_data', {})
+        session_id = data.get('session_id')
+        
+        if not user_email or not activity_type:
+            return jsonify({'success': False, 'message': 'Email and activity_type are required'}), 400
+        
+        # Log the activity
+        activity_id = activity_tracker.log_activity(
+            user_email=user_email,
+            activity_type=activity_type,
+            activity_data=activity_data,
+            session_id=session_id
+        )
+        
+        if activity_id:
+            return jsonify({
+                'success': True,
+                'message': 'Activity tracked successfully',
+                'activity_id': activity_id
+            }), 200
+        else:
+            return jsonify({'success': False, 'message': 'Failed to track activity'}), 500
+            
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/active-sessions/<email>', methods=['GET'])
+def get_active_sessions(email):
+    """Get all active sessions for a user"""
+    try:
+        active_sessions = list(activity_tracker.activities_collection.find(
+            {"user_email": email, "is_active": True},
+            {"_id": 0}
+        ))
+        
+        return jsonify({
+            'success': True,
+            'user_email': email,
+            'active_sessions': active_sessions,
+            'count': len(active_sessions)
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/get-current-pregnancy-week/<patient_id>', methods=['GET'])
+def get_current_pregnancy_week(patient_id):
+    """Get current pregnancy week for a specific patient"""
+    try:
+        logger.debug(f"🔍 Getting current pregnancy week for patient ID: {patient_id}")
+        
+        # Only the pregnancy fields, cached briefly
+        patient = pregnancy_cache.get(db.patients_collection, patient_id)
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        # Derived from the stored LMP/EDD; older documents fall back to a stored week
+        gestational_age = gestational_info(patient)
+        auto_fetched = gestational_age['current_week'] is not None
+        pregnancy_week = gestational_age['current_week'] if auto_fetched else 1  # Default fallback
+        pregnancy_info = (patient.get('health_data') or {}).get('pregnancy_info') or {}
+        
+        logger.info(f"✅ Retrieved pregnancy week: {pregnancy_week} for patient: {patient_id}")
+        
+        return jsonify({
+            'success': True,
+            'patientId': patient_id,
+            'patientEmail': patient.get('email'),
+            'current_pregnancy_week': pregnancy_week,
+            'pregnancy_info': pregnancy_info,
+            'gestational_age': gestational_age,
+            'auto_fetched': auto_fetched,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting current pregnancy week: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/get-patient-profile-by-email/<email>', methods=['GET'])
+def get_patient_profile_by_email(email):
+    """Get patient profile by email"""
+    try:
+        patient = db.patients_collection.find_one({"email": email})
+        if not patient:
+            return jsonify({'success': False, 'message': 'Patient not found'}), 404
+        
+        profile_data = {
+            'patient_id': patient.get('patient_id'),
+            'username': patient.get('username'),
+            'email': patient.get('email'),
+            'pregnancy_week': patient.get('pregnancy_week'),
+            # Add other fields as needed
+        }
+        
+        return jsonify({
+            'success': True,
+            'profile': profile_data
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+@bp.route('/get-patient-profile/<patient_id>', methods=['GET'])
+def get_patient_profile(patient_id):
+    """Get patient profile by patient ID (same pattern as kick count)"""
+    try:
+        logger.debug(f"🔍 Getting patient profile for patient ID: {patient_id}")
+        
+        # Find patient by Patient ID (same as kick count storage)
+        patient = db.patients_collection.find_one({"patient_id": patient_id}, {field: 1 for field in PROFILE_FIELDS})
+        if not patient:
+            return jsonify({
+                'success': False,
+                'message': f'Patient not found with ID: {patient_id}'
+            }), 404
+        
+        # Prepare profile data (complete structure with all fields)
+        profile_data = {
+            'patient_id': patient.get('patient_id'),
+            'username': patient.get('username'),
+            'email': patient.get('email'),
+            'mobile': patient.get('mobile'),
+            'first_name': patient.get('first_name'),
+            'last_name': patient.get('last_name'),
+            'age': patient.get('age'),
+            'gender': patient.get('gender'),
+            'blood_type': patient.get('blood_type'),
+            'date_of_birth': patient.get('date_of_birth'),
+            'height': patient.get('height'),
+            'weight': patient.get('weight'),
+            'is_pregnant': patient.get('is_pregnant'),
+            'pregnancy_status': patient.get('pregnancy_status'),
+            'pregnancy_week': patient.get('pregnancy_week'),
+            'last_period_date': patient.get('last_period_date'),
+            'expected_delivery_date': patient.get('expected_delivery_date'),
+            'emergency_contact': patient.get('emergency_contact'),
+            'emergency_contact_name': patient.get('emergency_contact_name'),
+            'emergency_contact_phone': patient.get('emergency_contact_phone'),
+            'emergency_contact_relationship': patient.get('emergency_contact_relationship'),
+            'address': patient.get('address'),
+            'city': patient.get('city'),
+            'state': patient.get('state'),
+            'zip_code': patient.get('zip_code'),
+            'phone': patient.get('phone'),
+            'medical_conditions': patient.get('medical_conditions', []),
+            'allergies': patient.get('allergies', []),
+            'medications': patient.get('medications', []),
+            'status': patient.get('status'),
+            'created_at': patient.get('created_at'),
+            'last_updated': patient.get('last_updated'),
+            'profile_completed_at': patient.get('profile_completed_at'),
+            'email_verified': patient.get('email_verified'),
+            'verified_at': patient.get('verified_at'),
+            'password_updated_at': patient.get('password_updated_at'),
+        }
+        
+        logger.info(f"✅ Patient profile retrieved successfully for patient ID: {patient_id}")
+        
+        return jsonify({
+            'success': True,
+            'profile': profile_data,
+            'message': 'Patient profile retrieved successfully'
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting patient profile by patient ID: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
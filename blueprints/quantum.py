@@ -0,0 +1,259 @@
+"""
+Quantum (vector search) and LLM management routes
+"""
+
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import (
+    LLM_MODEL, OPENAI_API_KEY, OPENAI_AVAILABLE, QDRANT_AVAILABLE, QDRANT_COLLECTION,
+    SENTENCE_TRANSFORMERS_AVAILABLE, TOP_K, llm_service, quantum_service
+)
+
+bp = Blueprint('quantum', __name__)
+logger = get_logger(__name__)
+
+# ==================== QUANTUM & LLM MANAGEMENT ENDPOINTS ====================
+
+@bp.route('/quantum/health', methods=['GET'])
+def quantum_health_check():
+    """Check quantum vector service health"""
+    return jsonify({
+        'success': True,
+        'qdrant_available': QDRANT_AVAILABLE,
+        'qdrant_connected': quantum_service.client is not None,
+        'embedding_model_available': SENTENCE_TRANSFORMERS_AVAILABLE,
+        'embedding_model_loaded': quantum_service.embedding_model is not None,
+        'collection_status': quantum_service.ensure_collection(),
+        'timestamp': datetime.now().isoformat()
+    })
+
+@bp.route('/quantum/collections', methods=['GET'])
+def quantum_collections():
+    """Get Qdrant collections information"""
+    if not quantum_service.client:
+            return jsonify({
+                'success': False,
+            'message': 'Qdrant client not available'
+        }), 503
+    
+    try:
+        collections = quantum_service.client.get_collections().collections
+        names = [c.name for c in collections]
+        return jsonify({
+            'success': True,
+            'collections': names,
+            'total_collections': len(names),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error getting collections: {str(e)}'
+        }), 500
+
+@bp.route('/quantum/collection-status/<collection_name>', methods=['GET'])
+def quantum_collection_status(collection_name):
+    """Get specific collection status and statistics"""
+    if not quantum_service.client:
+        return jsonify({
+            'success': False,
+            'message': 'Qdrant client not available'
+        }), 503
+    
+    try:
+        collection_info = quantum_service.client.get_collection(collection_name)
+        collection_stats = quantum_service.client.get_collection(collection_name).dict()
+        
+        return jsonify({
+            'success': True,
+            'collection_name': collection_name,
+            'status': collection_stats.get('status'),
+            'vectors_count': collection_stats.get('vectors_count', 0),
+            'points_count': collection_stats.get('points_count', 0),
+            'segments_count': collection_stats.get('segments_count', 0),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error getting collection status: {str(e)}'
+        }), 500
+
+@bp.route('/llm/health', methods=['GET'])
+def llm_health_check():
+    """Check LLM service health"""
+    return jsonify({
+        'success': True,
+        'openai_available': OPENAI_AVAILABLE,
+        'openai_configured': bool(OPENAI_API_KEY),
+        'llm_client_connected': llm_service.client is not None,
+        'model': LLM_MODEL,
+        'timestamp': datetime.now().isoformat()
+    })
+
+@bp.route('/llm/test', methods=['POST'])
+def llm_test():
+    """Test LLM functionality with a simple prompt"""
+    try:
+        data = request.get_json()
+        test_prompt = data.get('prompt', 'Hello, how are you?') if data else 'Hello, how are you?'
+        
+        if not llm_service.client:
+            return jsonify({
+                'success': False,
+                'message': 'LLM service not available'
+            }), 503
+        
+        response = llm_service.client.chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant. Respond briefly."},
+                {"role": "user", "content": test_prompt}
+            ],
+            temperature=0.1,
+            max_tokens=50
+        )
+        
+        content = response.choices[0].message.content.strip()
+        
+        return jsonify({
+            'success': True,
+            'test_prompt': test_prompt,
+            'response': content,
+            'model_used': LLM_MODEL,
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'LLM test failed: {str(e)}'
+        }), 500
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Request processing failed: {str(e)}'
+        }), 500
+
+@bp.route('/quantum/add-knowledge', methods=['POST'])
+def add_knowledge():
+    """Add knowledge document to Qdrant vector database"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        required_fields = ['text', 'source', 'trimester']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({
+                    'success': False,
+                    'message': f'Missing required field: {field}'
+                }), 400
+        
+        if not quantum_service.client or not quantum_service.embedding_model:
+            return jsonify({
+                'success': False,
+                'message': 'Quantum vector service not available'
+            }), 503
+        
+        # Generate embedding for the text
+        text_vector = quantum_service.embed_text(data['text'])
+        if not text_vector:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to generate text embedding'
+            }), 500
+        
+        # Create point structure
+        from qdrant_client.http.models import PointStruct
+        point = PointStruct(
+            id=str(uuid.uuid4()),
+            vector=text_vector,
+            payload={
+                "text": data['text'],
+                "source": data['source'],
+                "trimester": data['trimester'],
+                "tags": data.get('tags', []),
+                "triage": data.get('triage', 'general'),
+                "updated_at": datetime.now().isoformat()
+            }
+        )
+        
+        # Ensure collection exists
+        quantum_service.ensure_collection()
+        
+        # Upsert point
+        quantum_service.client.upsert(
+            collection_name=QDRANT_COLLECTION,
+            points=[point]
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': 'Knowledge document added successfully',
+            'document_id': point.id,
+            'vector_size': len(text_vector),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error adding knowledge: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+@bp.route('/quantum/search-knowledge', methods=['POST'])
+def search_knowledge():
+    """Search knowledge base using vector similarity"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        query_text = data.get('text', '').strip()
+        weeks_pregnant = data.get('weeks_pregnant', 1)
+        limit = data.get('limit', TOP_K)
+        
+        if not query_text:
+            return jsonify({
+                'success': False,
+                'message': 'Query text is required'
+            }), 400
+        
+        if not quantum_service.client or not quantum_service.embedding_model:
+            return jsonify({
+                'success': False,
+                'message': 'Quantum vector service not available'
+            }), 503
+        
+        # Search knowledge base
+        suggestions = quantum_service.search_knowledge(query_text, weeks_pregnant)
+        
+        return jsonify({
+            'success': True,
+            'query_text': query_text,
+            'weeks_pregnant': weeks_pregnant,
+            'suggestions': suggestions,
+            'total_found': len(suggestions),
+            'timestamp': datetime.now().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error searching knowledge: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
@@ -0,0 +1,652 @@
+"""
+Symptom assistance routes
+"""
+
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import DISCLAIMER_TEXT, activity_tracker, db, symptoms_service
+from streaming import requested_stream_mode, stream_events
+
+bp = Blueprint('symptoms', __name__)
+logger = get_logger(__name__)
+
+# ==================== SYMPTOM ASSISTANCE ENDPOINTS ====================
+
+@bp.route('/symptoms/health', methods=['GET'])
+def symptoms_health_check():
+    """Health check endpoint for symptoms service"""
+    return jsonify({
+        'success': True,
+        'message': 'Pregnancy Symptom Assistant is running',
+        'timestamp': datetime.now().isoformat()
+    })
+
+@bp.route('/symptoms/assist', methods=['POST'])
+def get_symptom_assistance():
+    """Get pregnancy symptom assistance using AI-powered vector search and LLM analysis"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        symptom_text = data.get('text', '').strip()
+        weeks_pregnant = data.get('weeks_pregnant', 1)
+        patient_id = data.get('patient_id')
+        user_id = data.get('user_id', patient_id)
+        
+        if not symptom_text:
+            return jsonify({
+                'success': False,
+                'message': 'Symptom description is required'
+            }), 400
+        
+        # Auto-fetch pregnancy week from patient profile if not provided
+        patient = None
+        if not weeks_pregnant and patient_id:
+            try:
+                patient = db.patients_collection.find_one({"patient_id": patient_id})
+                if patient and patient.get('pregnancy_week'):
+                    weeks_pregnant = patient['pregnancy_week']
+                    logger.info(f"✅ Auto-fetched pregnancy week: {weeks_pregnant}")
+            except Exception as e:
+                logger.warning(f"⚠️ Error fetching pregnancy week: {e}")
+        
+        # Determine trimester
+        if weeks_pregnant <= 12:
+            trimester = "First Trimester"
+        elif weeks_pregnant <= 26:
+            trimester = "Second Trimester"
+        else:
+            trimester = "Third Trimester"
+            
+        logger.debug(f"🔍 Analyzing symptoms: '{symptom_text}' for week {weeks_pregnant} ({trimester})")
+        patient_email = patient.get('email') if patient else None
+        
+        # Opt-in streaming: evidence first, then tokens, then the final body
+        stream_mode = requested_stream_mode()
+        if stream_mode:
+            def events():
+                ai_response = {}
+                for event, payload in symptoms_service.stream_symptom_analysis(symptom_text, weeks_pregnant):
+                    if event == 'result':
+                        ai_response = payload
+                    else:
+                        yield event, payload
+                log_symptom_consultation(patient_id, patient_email, symptom_text, weeks_pregnant, trimester)
+                yield 'result', symptom_assistance_body(symptom_text, weeks_pregnant, trimester, ai_response)
+            return stream_events(events(), stream_mode)
+        
+        # Use the new AI-powered symptoms service
+        try:
+            ai_response = symptoms_service.analyze_symptoms(
+                query=symptom_text,
+                weeks_pregnant=weeks_pregnant,
+                user_id=user_id
+            )
+            
+            # Log the symptom consultation
+            log_symptom_consultation(patient_id, patient_email, symptom_text, weeks_pregnant, trimester)
+            
+            # Return AI response
+            return jsonify(symptom_assistance_body(symptom_text, weeks_pregnant, trimester, ai_response)), 200
+            
+        except Exception as ai_error:
+            logger.warning(f"⚠️ AI analysis failed, using fallback: {ai_error}")
+            # Fallback to original logic if AI fails
+            return jsonify({
+                'success': False,
+                'message': f'AI analysis temporarily unavailable: {str(ai_error)}'
+            }), 500
+        
+    except Exception as e:
+        logger.error(f"Error getting symptom assistance: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'Error: {str(e)}'
+        }), 500
+
+def symptom_assistance_body(symptom_text, weeks_pregnant, trimester, ai_response):
+    """Response body for /symptoms/assist"""
+    # Generate additional recommendations
+    additional_recommendations = generate_symptom_recommendations(symptom_text, weeks_pregnant, trimester)
+    
+    return {
+        'success': True,
+        'symptom_text': symptom_text,
+        'pregnancy_week': weeks_pregnant,
+        'trimester': trimester,
+        'analysis_method': 'ai_analysis',
+        'primary_recommendation': ai_response.get('text', ''),
+        'additional_recommendations': additional_recommendations,
+        'red_flags_detected': [],
+        'knowledge_base_suggestions': 0,
+        'disclaimer': ai_response.get('disclaimers', DISCLAIMER_TEXT),
+        'timestamp': datetime.now().isoformat()
+    }
+
+def log_symptom_consultation(patient_id, patient_email, symptom_text, weeks_pregnant, trimester):
+    """Record the consultation in the activity log"""
+    if not patient_id:
+        return
+    try:
+        activity_tracker.log_activity(
+            user_email=patient_email,
+            activity_type="symptom_consultation",
+            activity_data={
+                "symptom_text": symptom_text,
+                "pregnancy_week": weeks_pregnant,
+                "trimester": trimester,
+                "patient_id": patient_id,
+                "analysis_method": "ai_analysis",
+                "red_flags_detected": [],
+                "suggestions_count": 0
+            }
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Warning: Could not log symptom consultation activity: {e}")
+
+def generate_symptom_recommendations(symptom_text, weeks_pregnant, trimester):
+    """Generate symptom-specific recommendations based on pregnancy week and trimester"""
+    symptom_lower = symptom_text.lower()
+    recommendations = []
+    
+    # Common pregnancy symptoms and recommendations
+    if any(word in symptom_lower for word in ['nausea', 'morning sickness', 'vomiting']):
+        recommendations.extend([
+            "Eat small, frequent meals throughout the day",
+            "Avoid spicy, greasy, or strong-smelling foods",
+            "Try ginger tea or ginger candies",
+            "Stay hydrated with small sips of water",
+            "Eat crackers or dry toast before getting out of bed"
+        ])
+    
+    if any(word in symptom_lower for word in ['fatigue', 'tired', 'exhausted']):
+        recommendations.extend([
+            "Get plenty of rest and sleep",
+            "Take short naps during the day",
+            "Maintain a regular sleep schedule",
+            "Stay hydrated and eat nutritious foods",
+            "Listen to your body and rest when needed"
+        ])
+    
+    if any(word in symptom_lower for word in ['back pain', 'backache', 'lower back']):
+        recommendations.extend([
+            "Practice good posture",
+            "Use proper body mechanics when lifting",
+            "Try gentle stretching exercises",
+            "Consider prenatal yoga or swimming",
+            "Use a pregnancy pillow for support while sleeping"
+        ])
+    
+    if any(word in symptom_lower for word in ['heartburn', 'acid reflux', 'indigestion']):
+        recommendations.extend([
+            "Eat smaller, more frequent meals",
+            "Avoid lying down immediately after eating",
+            "Limit spicy, acidic, or fatty foods",
+            "Try eating yogurt or drinking milk",
+            "Elevate your head while sleeping"
+        ])
+    
+    if any(word in symptom_lower for word in ['swelling', 'edema', 'water retention']):
+        recommendations.extend([
+            "Elevate your feet when possible",
+            "Avoid standing for long periods",
+            "Stay hydrated and limit salt intake",
+            "Wear comfortable, supportive shoes",
+            "Consider compression stockings if recommended by your doctor"
+        ])
+    
+    if any(word in symptom_lower for word in ['constipation', 'bowel', 'digestive']):
+        recommendations.extend([
+            "Increase fiber intake with fruits, vegetables, and whole grains",
+            "Stay hydrated by drinking plenty of water",
+            "Exercise regularly with your doctor's approval",
+            "Consider natural laxatives like prunes or prune juice",
+            "Don't ignore the urge to have a bowel movement"
+        ])
+    
+    # Trimester-specific advice
+    if trimester == "First Trimester":
+        recommendations.extend([
+            "Take prenatal vitamins as prescribed",
+            "Avoid alcohol, smoking, and recreational drugs",
+            "Get plenty of rest - your body is working hard",
+            "Eat a balanced diet rich in folic acid"
+        ])
+    elif trimester == "Second Trimester":
+        recommendations.extend([
+            "Continue with regular prenatal care",
+            "Start or continue gentle exercise routines",
+            "Focus on good nutrition and hydration",
+            "Consider childbirth education classes"
+        ])
+    else:  # Third Trimester
+        recommendations.extend([
+            "Prepare for labor and delivery",
+            "Practice relaxation and breathing techniques",
+            "Get plenty of rest and conserve energy",
+            "Have your hospital bag ready",
+            "Know the signs of labor"
+        ])
+    
+    # General pregnancy wellness advice
+    general_advice = [
+        "Always consult your healthcare provider for persistent or severe symptoms",
+        "Keep a symptom diary to track patterns",
+        "Stay hydrated and maintain a healthy diet",
+        "Get regular prenatal care and follow your doctor's recommendations",
+        "Trust your instincts - you know your body best"
+    ]
+    
+    # Combine specific and general recommendations
+    all_recommendations = recommendations + general_advice
+    
+    # Remove duplicates while preserving order
+    seen = set()
+    unique_recommendations = []
+    for rec in all_recommendations:
+        if rec not in seen:
+            seen.add(rec)
+            unique_recommendations.append(rec)
+    
+    return unique_recommendations
+
+@bp.route('/symptoms/save-symptom-log', methods=['POST'])
+def save_symptom_log():
+    """Save symptom log to patient profile"""
+    try:
+        data = request.get_json()
+        
+        # Debug logging
+        logger.debug("🔍 Received symptom log data", extra={"payload": data})
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        # Validate required fields
+        required_fields = ['patient_id', 'symptom_text', 'severity', 'category']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({
+                    'success': False,
+                    'message': f'Missing required field: {field}'
+                }), 400
+        
+        patient_id = data.get('patient_id')
+        symptom_text = data.get('symptom_text', '').strip()
+        severity = data.get('severity', 5)
+        category = data.get('category', 'General')
+        notes = data.get('notes', '')
+        
+        if not symptom_text:
+            return jsonify({
+                'success': False, 
+                'message': 'Symptom description is required'
+            }), 400
+        
+        logger.debug(f"🔍 Looking for patient with ID: {patient_id}")
+        
+        # Find patient by Patient ID
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        logger.debug(f"🔍 Found patient: {patient.get('patient_id')}")
+        
+        # Create symptom log entry
+        symptom_log_entry = {
+            'symptom_text': symptom_text,
+            'severity': severity,
+            'category': category,
+            'notes': notes,
+            'timestamp': data.get('timestamp', datetime.now().isoformat()),
+            'createdAt': datetime.now(),
+            'pregnancy_week': patient.get('pregnancy_week', 1),
+            'trimester': 'First' if patient.get('pregnancy_week', 1) <= 12 else 'Second' if patient.get('pregnancy_week', 1) <= 26 else 'Third'
+        }
+        
+        # Add symptom log to patient's symptom_logs array
+        result = db.patients_collection.update_one(
+            {"patient_id": patient_id},
+            {
+                "$push": {"symptom_logs": symptom_log_entry},
+                "$set": {"last_updated": datetime.now()}
+            }
+        )
+        
+        if result.modified_count > 0:
+            # Log the symptom log activity
+            activity_tracker.log_activity(
+                user_email=patient.get('email'),
+                activity_type="symptom_log_created",
+                activity_data={
+                    "symptom_log_id": "embedded_in_patient_doc",
+                    "symptom_data": symptom_log_entry,
+                    "patient_id": patient_id,
+                    "total_symptom_logs": len(patient.get('symptom_logs', [])) + 1
+                }
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': 'Symptom log saved successfully to patient profile',
+                'patientId': patient_id,
+                'patientEmail': patient.get('email'),
+                'symptomLogsCount': len(patient.get('symptom_logs', [])) + 1
+            }), 200
+        else:
+            return jsonify({'success': False, 'message': 'Failed to save symptom log to patient profile'}), 500
+            
+    except Exception as e:
+        logger.error(f"Error saving symptom log: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/symptoms/save-analysis-report', methods=['POST'])
+def save_symptom_analysis_report():
+    """Save complete symptom analysis report including AI recommendations"""
+    try:
+        data = request.get_json()
+        
+        # Debug logging
+        logger.debug("🔍 Received symptom analysis report data", extra={"payload": data})
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        # Validate required fields
+        required_fields = ['patient_id', 'symptom_text', 'weeks_pregnant']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({
+                    'success': False,
+                    'message': f'Missing required field: {field}'
+                }), 400
+        
+        patient_id = data.get('patient_id')
+        symptom_text = data.get('symptom_text', '').strip()
+        weeks_pregnant = data.get('weeks_pregnant', 1)
+        
+        if not symptom_text:
+            return jsonify({
+                'success': False,
+                'message': 'Symptom description is required'
+            }), 400
+        
+        logger.debug(f"🔍 Looking for patient with ID: {patient_id}")
+        
+        # Find patient by Patient ID
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        logger.debug(f"🔍 Found patient: {patient.get('patient_id')}")
+        
+        # Create comprehensive symptom analysis report
+        analysis_report = {
+            'symptom_text': symptom_text,
+            'weeks_pregnant': weeks_pregnant,
+            'trimester': 'First' if weeks_pregnant <= 12 else 'Second' if weeks_pregnant <= 26 else 'Third',
+            'severity': data.get('severity', 'Not specified'),
+            'notes': data.get('notes', ''),
+            'analysis_date': data.get('date', datetime.now().strftime('%d/%m/%Y')),
+            'timestamp': datetime.now().isoformat(),
+            'createdAt': datetime.now(),
+            
+            # AI Analysis Results
+            'ai_analysis': {
+                'analysis_method': data.get('analysis_method', 'quantum_llm'),
+                'primary_recommendation': data.get('primary_recommendation', ''),
+                'additional_recommendations': data.get('additional_recommendations', []),
+                'red_flags_detected': data.get('red_flags_detected', []),
+                'disclaimer': data.get('disclaimer', ''),
+                'urgency_level': data.get('urgency_level', 'moderate'),
+                'knowledge_base_suggestions_count': data.get('knowledge_base_suggestions_count', 0)
+            },
+            
+            # Patient Context
+            'patient_context': data.get('patient_context', {}),
+            
+            # Metadata
+            'report_id': str(ObjectId()),
+            'version': '1.0',
+            'source': 'flutter_app_quantum_llm'
+        }
+        
+        # Add analysis report to patient's symptom_analysis_reports array
+        result = db.patients_collection.update_one(
+                        {"patient_id": patient_id},
+            {
+                "$push": {"symptom_analysis_reports": analysis_report},
+                "$set": {"last_updated": datetime.now()}
+            }
+                    )
+            
+        if result.modified_count > 0:
+            # Log the symptom analysis activity
+            activity_tracker.log_activity(
+                user_email=patient.get('email'),
+                activity_type="symptom_analysis_report_created",
+                activity_data={
+                    "report_id": analysis_report['report_id'],
+                    "symptom_text": symptom_text,
+                    "pregnancy_week": weeks_pregnant,
+                    "trimester": analysis_report['trimester'],
+                    "red_flags_count": len(analysis_report['ai_analysis']['red_flags_detected']),
+                    "patient_id": patient_id,
+                    "total_analysis_reports": len(patient.get('symptom_analysis_reports', [])) + 1
+                }
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': 'Symptom analysis report saved successfully',
+                'report_id': analysis_report['report_id'],
+                'patientId': patient_id,
+                'patientEmail': patient.get('email'),
+                'analysisReportsCount': len(patient.get('symptom_analysis_reports', [])) + 1,
+                'timestamp': analysis_report['timestamp']
+            }), 200
+        else:
+            return jsonify({'success': False, 'message': 'Failed to save analysis report'}), 500
+        
+    except Exception as e:
+        logger.error(f"Error saving symptom analysis report: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/symptoms/get-symptom-history/<patient_id>', methods=['GET'])
+def get_symptom_history(patient_id):
+    """Get symptom history for a specific patient"""
+    try:
+        logger.debug(f"🔍 Getting symptom history for patient ID: {patient_id}")
+        
+        # Find patient by Patient ID
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        # Get symptom logs from patient document
+        symptom_logs = patient.get('symptom_logs', [])
+        
+        # Sort by newest first
+        symptom_logs.sort(key=lambda x: x.get('createdAt', datetime.min), reverse=True)
+        
+        # Convert datetime objects to strings for JSON serialization
+        for entry in symptom_logs:
+            if 'createdAt' in entry:
+                entry['createdAt'] = entry['createdAt'].isoformat()
+        
+        logger.info(f"✅ Retrieved {len(symptom_logs)} symptom logs for patient: {patient_id}")
+        
+        return jsonify({
+            'success': True,
+            'patientId': patient_id,
+            'symptom_logs': symptom_logs,
+            'totalEntries': len(symptom_logs)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting symptom history: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/symptoms/get-analysis-reports/<patient_id>', methods=['GET'])
+def get_analysis_reports(patient_id):
+    """Get only the AI analysis reports for a patient"""
+    try:
+        logger.debug(f"🔍 Getting analysis reports for patient ID: {patient_id}")
+        
+        # Find patient by Patient ID
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        # Get only analysis reports
+        analysis_reports = patient.get('symptom_analysis_reports', [])
+        
+        # Sort by timestamp (newest first)
+        analysis_reports.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        
+        # Format reports for display (remove sensitive fields)
+        formatted_reports = []
+        for report in analysis_reports:
+            formatted_report = {
+                'report_id': report.get('report_id'),
+                'symptom_text': report.get('symptom_text'),
+                'weeks_pregnant': report.get('weeks_pregnant'),
+                'trimester': report.get('trimester'),
+                'severity': report.get('severity'),
+                'analysis_date': report.get('analysis_date'),
+                'timestamp': report.get('timestamp'),
+                'ai_analysis': {
+                    'primary_recommendation': report.get('ai_analysis', {}).get('primary_recommendation'),
+                    'red_flags_detected': report.get('ai_analysis', {}).get('red_flags_detected', []),
+                    'urgency_level': report.get('ai_analysis', {}).get('urgency_level'),
+                    'analysis_method': report.get('ai_analysis', {}).get('analysis_method')
+                }
+            }
+            formatted_reports.append(formatted_report)
+        
+        logger.info(f"✅ Retrieved {len(formatted_reports)} analysis reports for patient: {patient_id}")
+        
+        return jsonify({
+            'success': True,
+            'patientId': patient_id,
+            'patientName': patient.get('username', 'Unknown'),
+            'analysisReports': formatted_reports,
+            'totalAnalysisReports': len(formatted_reports)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting analysis reports: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+# ==================== NEW AI-POWERED SYMPTOMS ENDPOINTS ====================
+
+@bp.route('/symptoms/knowledge/add', methods=['POST'])
+def add_symptom_knowledge():
+    """Add new knowledge to the symptoms database"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'message': 'No data provided'}), 400
+        
+        text = data.get('text', '').strip()
+        source = data.get('source', 'YourClinic')
+        tags = data.get('tags', [])
+        trimester = data.get('trimester', 'all')
+        
+        if not text:
+            return jsonify({'success': False, 'message': 'Text is required'}), 400
+        
+        # Add to MongoDB via symptoms service
+        doc_id = symptoms_service.save_knowledge_to_mongo(text, source, tags, trimester)
+        
+        if doc_id:
+            return jsonify({
+                'success': True,
+                'message': 'Knowledge added successfully',
+                'document_id': doc_id
+            }), 200
+        else:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to add knowledge'
+            }), 500
+            
+    except Exception as e:
+        logger.error(f"Error adding knowledge: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/symptoms/knowledge/bulk', methods=['POST'])
+def add_symptom_knowledge_bulk():
+    """Add multiple knowledge items to the symptoms database"""
+    try:
+        data = request.get_json()
+        if not data or 'items' not in data:
+            return jsonify({'success': False, 'message': 'Items array is required'}), 400
+        
+        items = data.get('items', [])
+        if not items:
+            return jsonify({'success': False, 'message': 'Items cannot be empty'}), 400
+        
+        # One insert_many for the whole batch
+        result = symptoms_service.save_knowledge_bulk(items)
+        added_count = len(result['inserted_ids'])
+        failed_items = result['failed_items']
+        
+        return jsonify({
+            'success': True,
+            'message': f'Added {added_count} knowledge items',
+            'added_count': added_count,
+            'failed_count': len(failed_items),
+            'failed_items': failed_items,
+            'document_ids': result['inserted_ids']
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error adding bulk knowledge: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/symptoms/ingest', methods=['POST'])
+def ingest_symptom_knowledge():
+    """Ingest new or changed knowledge from MongoDB into the vector database"""
+    try:
+        limit = request.args.get('limit', type=int)
+        full = request.args.get('full', 'false').lower() == 'true'
+        
+        report = symptoms_service.ingest_knowledge(limit=limit, full=full)
+        if not report.get('success'):
+            status = 409 if report.get('message') == 'Ingestion already running' else 500
+            return jsonify(report), status
+        
+        return jsonify({
+            **report,
+            'message': f"Ingested {report['processed']} documents ({report['docs_per_second']} docs/sec)",
+            'limit': limit
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error ingesting knowledge: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/symptoms/ingest/status', methods=['GET'])
+def symptom_ingestion_status():
+    """High-water mark, pending documents and the last ingestion run"""
+    try:
+        return jsonify({'success': True, **symptoms_service.knowledge_ingestion().status()}), 200
+    except Exception as e:
+        logger.error(f"Error getting ingestion status: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
@@ -0,0 +1,363 @@
+"""
+Daily tracking routes: sleep logs, kick sessions and food history
+"""
+
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import activity_tracker, db
+
+bp = Blueprint('tracking', __name__)
+logger = get_logger(__name__)
+
+@bp.route('/save-sleep-log', methods=['POST'])
+def save_sleep_log():
+    """Save sleep log data to MongoDB"""
+    try:
+        data = request.get_json()
+        
+        # Debug logging
+        logger.debug("🔍 Received sleep log data", extra={"payload": data})
+        
+        # Validate required fields
+        required_fields = ['userId', 'userRole', 'startTime', 'endTime', 'totalSleep', 'sleepRating']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'success': False, 'message': f'Missing required field: {field}'}), 400
+        
+        # Check if we have Patient ID for precise linking
+        patient_id = data.get('userId')
+        if not patient_id:
+            return jsonify({
+                'success': False, 
+                'message': 'Patient ID is required for precise patient linking. Please ensure you are logged in.',
+                'debug_info': {
+                    'received_userId': data.get('userId'),
+                    'received_data': data
+                }
+            }), 400
+        
+        # Create sleep log document
+        sleep_log = {
+            'userId': data['userId'],
+            'userRole': data['userRole'],
+            'username': data.get('username', 'unknown'),
+            'email': data.get('email', 'unknown'),  # Add email for better user linking
+            'startTime': data['startTime'],
+            'endTime': data['endTime'],
+            'totalSleep': data['totalSleep'],
+            'smartAlarmEnabled': data.get('smartAlarmEnabled', False),
+            'optimalWakeUpTime': data.get('optimalWakeUpTime', ''),
+            'sleepRating': data['sleepRating'],
+            'notes': data.get('notes', ''),
+            'timestamp': data.get('timestamp', datetime.now().isoformat()),
+            'createdAt': datetime.now(),
+        }
+        
+        # Store sleep log within the patient's document
+        if data['userRole'] == 'doctor':
+            # For doctors, store in separate collection (as before)
+            collection = db.doctors_collection
+            result = collection.insert_one(sleep_log)
+            
+            if result.inserted_id:
+                return jsonify({
+                    'success': True,
+                    'message': 'Sleep log saved successfully',
+                    'sleepLogId': str(result.inserted_id)
+                }), 200
+            else:
+                return jsonify({'success': False, 'message': 'Failed to save sleep log'}), 500
+        else:
+            # For patients, store within their patient document using Patient ID
+            patient_id = data.get('userId')
+            if not patient_id:
+                return jsonify({
+                    'success': False, 
+                    'message': 'Patient ID is required. Please ensure you are logged in.',
+                    'debug_info': {
+                        'received_userId': data.get('userId'),
+                        'received_data': data
+                    }
+                }), 400
+            
+            logger.debug(f"🔍 Looking for patient with ID: {patient_id}")
+            
+            # Find patient by Patient ID (more reliable than email)
+            patient = db.patients_collection.find_one({"patient_id": patient_id})
+            if not patient:
+                return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+            
+            logger.debug(f"🔍 Found patient: {patient.get('patient_id')}")
+            
+            # Create sleep log entry (without MongoDB _id)
+            sleep_log_entry = {
+                'startTime': data['startTime'],
+                'endTime': data['endTime'],
+                'totalSleep': data['totalSleep'],
+                'smartAlarmEnabled': data.get('smartAlarmEnabled', False),
+                'optimalWakeUpTime': data.get('optimalWakeUpTime', ''),
+                'sleepRating': data['sleepRating'],
+                'notes': data.get('notes', ''),
+                'timestamp': data.get('timestamp', datetime.now().isoformat()),
+                'createdAt': datetime.now(),
+            }
+            
+            # Add sleep log to patient's sleep_logs array using Patient ID
+            result = db.patients_collection.update_one(
+                {"patient_id": patient_id},
+                {
+                    "$push": {"sleep_logs": sleep_log_entry},
+                    "$set": {"last_updated": datetime.now()}
+                }
+            )
+            
+            if result.modified_count > 0:
+                # Log the sleep log activity
+                activity_tracker.log_activity(
+                    user_email=patient.get('email'),
+                    activity_type="sleep_log_created",
+                    activity_data={
+                        "sleep_log_id": "embedded_in_patient_doc",
+                        "sleep_data": sleep_log_entry,
+                        "patient_id": patient_id,
+                        "total_sleep_logs": len(patient.get('sleep_logs', [])) + 1
+                    }
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'message': 'Sleep log saved successfully to patient profile',
+                    'patientId': patient_id,
+                    'patientEmail': patient.get('email'),
+                    'sleepLogsCount': len(patient.get('sleep_logs', [])) + 1
+                }), 200
+            else:
+                return jsonify({'success': False, 'message': 'Failed to save sleep log to patient profile'}), 500
+            
+    except Exception as e:
+        logger.error(f"Error saving sleep log: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/get-sleep-logs/<username>', methods=['GET'])
+def get_sleep_logs(username):
+    """Get sleep logs for a specific user"""
+    try:
+        # Get user role from the username
+        user_doc = db.patients_collection.find_one({"username": username})
+        if not user_doc:
+            # Try doctors collection
+            user_doc = db.doctors_collection.find_one({"username": username})
+            if not user_doc:
+                return jsonify({'success': False, 'message': 'User not found'}), 404
+        
+        user_role = user_doc.get('role', 'patient')
+        
+        # Get sleep logs for this user
+        if user_role == 'doctor':
+            collection = db.doctors_collection
+        else:
+            collection = db.patients_collection
+        
+        # Find all sleep logs for this user
+        sleep_logs = list(collection.find(
+            {"username": username, "startTime": {"$exists": True}},
+            {"_id": 0}  # Exclude MongoDB _id
+        ))
+        
+        return jsonify({
+            'success': True,
+            'username': username,
+            'userRole': user_role,
+            'sleepLogs': sleep_logs,
+            'count': len(sleep_logs)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error retrieving sleep logs: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/get-sleep-logs-by-email/<email>', methods=['GET'])
+def get_sleep_logs_by_email(email):
+    """Get sleep logs for a specific user by email"""
+    try:
+        # Get user role from the email
+        user_doc = db.patients_collection.find_one({"email": email})
+        if not user_doc:
+            # Try doctors collection
+            user_doc = db.doctors_collection.find_one({"email": email})
+            if not user_doc:
+                return jsonify({'success': False, 'message': 'User not found with this email'}), 404
+        
+        user_role = user_doc.get('role', 'patient')
+        username = user_doc.get('username', 'unknown')
+        
+        # Get sleep logs for this user by email
+        if user_role == 'doctor':
+            # For doctors, get from separate collection
+            collection = db.doctors_collection
+            sleep_logs = list(collection.find(
+                {"email": email, "startTime": {"$exists": True}},
+                {"_id": 0}  # Exclude MongoDB _id
+            ))
+        else:
+            # For patients, get from their document's sleep_logs array
+            sleep_logs = user_doc.get('sleep_logs', [])
+        
+        return jsonify({
+            'success': True,
+            'email': email,
+            'username': username,
+            'userRole': user_role,
+            'sleepLogs': sleep_logs,
+            'count': len(sleep_logs)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error retrieving sleep logs by email: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/save-kick-session', methods=['POST'])
+def save_kick_session():
+    """Save kick session data to MongoDB"""
+    try:
+        data = request.get_json()
+        
+        # Debug logging
+        logger.debug("🔍 Received kick session data", extra={"payload": data})
+        
+        # Validate required fields
+        required_fields = ['userId', 'userRole', 'kickCount', 'sessionDuration']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'success': False, 'message': f'Missing required field: {field}'}), 400
+        
+        # Check if we have Patient ID for precise linking
+        patient_id = data.get('userId')
+        if not patient_id:
+            return jsonify({
+                'success': False, 
+                'message': 'Patient ID is required for precise patient linking. Please ensure you are logged in.',
+                'debug_info': {
+                    'received_userId': data.get('userId'),
+                    'received_data': data
+                }
+            }), 400
+        
+        logger.debug(f"🔍 Looking for patient with ID: {patient_id}")
+        
+        # Find patient by Patient ID (more reliable than email)
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        logger.debug(f"🔍 Found patient: {patient.get('patient_id')}")
+        
+        # Create kick session entry
+        kick_session_entry = {
+            'kickCount': data['kickCount'],
+            'sessionDuration': data['sessionDuration'],
+            'sessionStartTime': data.get('sessionStartTime'),
+            'sessionEndTime': data.get('sessionEndTime'),
+            'averageKicksPerMinute': data.get('averageKicksPerMinute', 0),
+            'notes': data.get('notes', ''),
+            'timestamp': data.get('timestamp', datetime.now().isoformat()),
+            'createdAt': datetime.now(),
+        }
+        
+        # Add kick session to patient's kick_count_logs array using Patient ID
+        result = db.patients_collection.update_one(
+            {"patient_id": patient_id},
+            {
+                "$push": {"kick_count_logs": kick_session_entry},
+                "$set": {"last_updated": datetime.now()}
+            }
+        )
+        
+        if result.modified_count > 0:
+            # Log the kick session activity
+            activity_tracker.log_activity(
+                user_email=patient.get('email'),
+                activity_type="kick_session_created",
+                activity_data={
+                    "kick_session_id": "embedded_in_patient_doc",
+                    "kick_data": kick_session_entry,
+                    "patient_id": patient_id,
+                    "total_kick_sessions": len(patient.get('kick_count_logs', [])) + 1
+                }
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': 'Kick session saved successfully to patient profile',
+                'patientId': patient_id,
+                'patientEmail': patient.get('email'),
+                'kickSessionsCount': len(patient.get('kick_count_logs', [])) + 1
+            }), 200
+        else:
+            return jsonify({'success': False, 'message': 'Failed to save kick session to patient profile'}), 500
+            
+    except Exception as e:
+        logger.error(f"Error saving kick session: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/get-kick-history/<patient_id>', methods=['GET'])
+def get_kick_history(patient_id):
+    """Get kick history for a specific patient"""
+    try:
+        # Find patient by Patient ID
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        # Get kick count logs
+        kick_logs = patient.get('health_data', {}).get('kick_count_logs', [])
+        
+        return jsonify({
+            'success': True,
+            'patientId': patient_id,
+            'kick_logs': kick_logs,
+            'totalSessions': len(kick_logs)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting kick history: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/get-food-history/<patient_id>', methods=['GET'])
+def get_food_history(patient_id):
+    """Get food history for a specific patient"""
+    try:
+        logger.debug(f"🔍 Getting food history for patient ID: {patient_id}")
+        
+        # Find patient by Patient ID
+        patient = db.patients_collection.find_one({"patient_id": patient_id})
+        if not patient:
+            return jsonify({'success': False, 'message': f'Patient not found with ID: {patient_id}'}), 404
+        
+        # Get food logs from patient document
+        food_logs = patient.get('food_logs', [])
+        
+        # Sort by newest first
+        food_logs.sort(key=lambda x: x.get('createdAt', datetime.min), reverse=True)
+        
+        # Convert datetime objects to strings for JSON serialization
+        for entry in food_logs:
+            if 'createdAt' in entry:
+                entry['createdAt'] = entry['createdAt'].isoformat()
+        
+        logger.info(f"✅ Retrieved {len(food_logs)} food entries for patient: {patient_id}")
+        
+        return jsonify({
+            'success': True,
+            'patientId': patient_id,
+            'food_logs': food_logs,
+            'totalEntries': len(food_logs)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting food history: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
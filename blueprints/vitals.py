@@ -0,0 +1,412 @@
+"""
+Vital signs routes, including vital sign OCR
+"""
+
+import os
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+
+from app_logging import get_logger
+from app_core import db, vital_ocr_service, vital_signs_ocr_service, vital_signs_service
+
+bp = Blueprint('vitals', __name__)
+logger = get_logger(__name__)
+
+# ==================== VITAL SIGNS ENDPOINTS ====================
+
+@bp.route('/vitals/record', methods=['POST'])
+def record_vital_sign():
+    """Record a new vital sign for a patient"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'message': 'No data provided'}), 400
+        
+        patient_id = data.get('patient_id')
+        if not patient_id:
+            return jsonify({'success': False, 'message': 'Patient ID is required'}), 400
+        
+        # Validate required fields
+        required_fields = ['type', 'value']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'success': False, 'message': f'Missing required field: {field}'}), 400
+        
+        # Record vital sign using service
+        result = vital_signs_service.record_vital_sign(patient_id, data)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 500
+            
+    except Exception as e:
+        logger.error(f"Error recording vital sign: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/record-batch', methods=['POST'])
+def record_vital_signs_batch():
+    """Record many readings at once (device/wearable sync)
+
+    Body: a JSON array of readings, {"patient_id": ..., "readings": [...]}, or
+    NDJSON (application/x-ndjson) with one reading per line. Readings without a
+    patient_id use the body's or the ?patient_id= one.
+    """
+    try:
+        patient_id = request.args.get('patient_id')
+        if request.mimetype == 'application/x-ndjson':
+            readings = []
+            for line in request.get_data(as_text=True).splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    readings.append(json.loads(line))
+                except ValueError:
+                    readings.append(None)  # reported as an invalid item
+        else:
+            data = request.get_json(silent=True)
+            if isinstance(data, dict):
+                patient_id = data.get('patient_id', patient_id)
+                readings = data.get('readings')
+            else:
+                readings = data
+        
+        if not isinstance(readings, list) or not readings:
+            return jsonify({'success': False, 'message': 'A non-empty list of readings is required'}), 400
+        limit = vital_signs_service.max_batch_size
+        if len(readings) > limit:
+            return jsonify({'success': False, 'message': f'Batch too large. Maximum {limit} readings allowed.'}), 413
+        
+        result = vital_signs_service.record_vital_signs_batch(readings, patient_id)
+        
+        if result['success']:
+            return jsonify(result), 200
+        # All readings rejected -> 400; database errors -> 500
+        return jsonify(result), 400 if 'results' in result else 500
+        
+    except Exception as e:
+        logger.error(f"Error recording vital sign batch: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/history/<patient_id>', methods=['GET'])
+def get_vital_signs_history(patient_id):
+    """Get vital signs history for a patient"""
+    try:
+        days = request.args.get('days', 30, type=int)
+        # raw (default), hourly, daily or auto (picked from the window size)
+        resolution = request.args.get('resolution', 'raw').lower()
+        
+        result = vital_signs_service.get_vital_signs_history(patient_id, days, resolution=resolution)
+        
+        if result['success']:
+            return jsonify(result), 200
+        elif result['message'].startswith('Unknown resolution'):
+            return jsonify(result), 400
+        else:
+            return jsonify(result), 500
+            
+    except Exception as e:
+        logger.error(f"Error getting vital signs history: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/analyze', methods=['POST'])
+def analyze_vital_signs():
+    """AI analysis of patient's vital signs"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'message': 'No data provided'}), 400
+        
+        patient_id = data.get('patient_id')
+        if not patient_id:
+            return jsonify({'success': False, 'message': 'Patient ID is required'}), 400
+        
+        days = data.get('days', 7)
+        
+        result = vital_signs_service.analyze_vital_signs(patient_id, days)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 500
+            
+    except Exception as e:
+        logger.error(f"Error analyzing vital signs: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/stats/<patient_id>', methods=['GET'])
+def get_vital_signs_stats(patient_id):
+    """Get vital signs statistics for a patient"""
+    try:
+        days = request.args.get('days', 30, type=int)
+        
+        result = vital_signs_service.get_vital_signs_stats(patient_id, days)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 500
+        
+    except Exception as e:
+        logger.error(f"Error getting vital signs stats: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/health-summary/<patient_id>', methods=['GET'])
+def get_health_summary(patient_id):
+    """Get comprehensive health summary for a patient"""
+    try:
+        result = vital_signs_service.get_health_summary(patient_id)
+        
+        if result['success']:
+            return jsonify(result), 200
+        else:
+            return jsonify(result), 500
+            
+    except Exception as e:
+        logger.error(f"Error getting health summary: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/alerts', methods=['POST'])
+def create_vital_alert():
+    """Create a new vital signs alert"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': False, 'message': 'No data provided'}), 400
+        
+        patient_id = data.get('patient_id')
+        if not patient_id:
+            return jsonify({'success': False, 'message': 'Patient ID is required'}), 400
+        
+        # Create alert
+        alert = {
+            "type": data.get('type'),
+            "severity": data.get('severity', 'medium'),
+            "message": data.get('message'),
+            "timestamp": datetime.now(),
+            "action_required": data.get('action_required', 'Monitor closely'),
+            "is_resolved": False,
+            "created_at": datetime.now()
+        }
+        
+        # Add to patient's vital_signs_alerts array
+        if db.patients_collection is not None:
+            result = db.patients_collection.update_one(
+                {"patient_id": patient_id},
+                {"$push": {"vital_signs_alerts": alert}}
+            )
+            
+            if result.acknowledged:
+                return jsonify({
+                    'success': True,
+                    'message': 'Alert created successfully',
+                    'alert': alert
+                }), 200
+            else:
+                return jsonify({'success': False, 'message': 'Failed to create alert'}), 500
+        else:
+            return jsonify({'success': False, 'message': 'Database not connected'}), 500
+            
+    except Exception as e:
+        logger.error(f"Error creating vital alert: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/alerts/<patient_id>', methods=['GET'])
+def get_vital_alerts(patient_id):
+    """Get vital signs alerts for a patient"""
+    try:
+        if db.patients_collection is None:
+            return jsonify({'success': False, 'message': 'Database not connected'}), 500
+        
+        # Find patient
+        patient = db.patients_collection.find_one({"patient_id": patient_id}, {"vital_signs_alerts": 1})
+        if not patient:
+            return jsonify({'success': False, 'message': 'Patient not found'}), 404
+        
+        # Get alerts
+        alerts = patient.get('vital_signs_alerts', [])
+        
+        # Filter by query parameters
+        severity = request.args.get('severity')
+        is_resolved = request.args.get('is_resolved')
+        
+        if severity:
+            alerts = [a for a in alerts if a.get('severity') == severity]
+        
+        if is_resolved is not None:
+            resolved = is_resolved.lower() == 'true'
+            alerts = [a for a in alerts if a.get('is_resolved', False) == resolved]
+        
+        # Sort by timestamp (newest first)
+        alerts.sort(key=lambda x: x.get('timestamp', datetime.now()), reverse=True)
+        
+        return jsonify({
+            'success': True,
+            'patient_id': patient_id,
+            'alerts': alerts,
+            'total_count': len(alerts)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting vital alerts: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/ocr', methods=['POST'])
+def process_vital_signs_ocr():
+    """Process vital signs document with OCR"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'success': False, 'message': 'No file provided'}), 400
+        
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'success': False, 'message': 'No file selected'}), 400
+        
+        # Save file temporarily
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
+            file.save(temp_file.name)
+            temp_file_path = temp_file.name
+        
+        try:
+            # Process with vital signs OCR service
+            result = vital_signs_ocr_service.process_document(temp_file_path)
+            
+            return jsonify({
+                'success': result['success'],
+                'message': result['message'],
+                'vital_signs': result['vital_signs'],
+                'extracted_text': result.get('extracted_text', ''),
+                'filename': file.filename
+            }), 200
+            
+        finally:
+            # Clean up temporary file
+            if os.path.exists(temp_file_path):
+                os.unlink(temp_file_path)
+                
+    except Exception as e:
+        logger.error(f"Error processing vital signs OCR: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vitals/process-text', methods=['POST'])
+def process_vital_signs_text():
+    """Process vital signs text for extraction"""
+    try:
+        data = request.get_json()
+        if not data or 'text' not in data:
+            return jsonify({'success': False, 'message': 'No text provided'}), 400
+        
+        text = data['text']
+        if not text.strip():
+            return jsonify({'success': False, 'message': 'Text cannot be empty'}), 400
+        
+        # Extract vital signs from text
+        vital_signs = vital_signs_ocr_service.extract_vital_signs_from_text(text)
+        
+        return jsonify({
+            'success': True,
+            'message': f'Extracted {len(vital_signs)} vital signs',
+            'vital_signs': vital_signs,
+            'original_text': text
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error processing vital signs text: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+# ==================== VITAL OCR ENDPOINTS ====================
+
+@bp.route('/vital-ocr/upload', methods=['POST'])
+def vital_ocr_upload():
+    """Upload document for enhanced OCR processing (PDF, TXT, DOC, DOCX, Images)"""
+    try:
+        if 'file' not in request.files:
+            return jsonify({'success': False, 'message': 'No file provided'}), 400
+        
+        file = request.files['file']
+        if file.filename == '':
+            return jsonify({'success': False, 'message': 'No file selected'}), 400
+        
+        # Validate file type
+        if not vital_ocr_service.validate_file_type(file.content_type, file.filename):
+            return jsonify({
+                'success': False, 
+                'message': f'Unsupported file type: {file.content_type}. Allowed types: {vital_ocr_service.allowed_types}'
+            }), 400
+        
+        # Read file content
+        file_content = file.read()
+        
+        # Process file using vital OCR service
+        result = vital_ocr_service.process_file(file_content, file.filename)
+        
+        return jsonify(result), 200 if result.get('success') else 400
+        
+    except Exception as e:
+        logger.error(f"Error processing vital OCR upload: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vital-ocr/base64', methods=['POST'])
+def vital_ocr_base64():
+    """Process base64 encoded image for OCR"""
+    try:
+        logger.debug("🔍 Vital OCR base64 endpoint called")
+        data = request.get_json()
+        logger.info(f"📥 Received data keys: {list(data.keys()) if data else 'None'}")
+        
+        if not data or 'image' not in data:
+            logger.error("❌ No image data provided")
+            return jsonify({'success': False, 'message': 'No image data provided'}), 400
+        
+        image_data = data['image']
+        logger.info(f"📄 Image data length: {len(image_data) if image_data else 0}")
+        
+        if not image_data or not image_data.strip():
+            logger.error("❌ Image data is empty")
+            return jsonify({'success': False, 'message': 'Image data cannot be empty'}), 400
+        
+        logger.info("🔄 Processing base64 image with vital OCR service...")
+        # Process base64 image using vital OCR service
+        result = vital_ocr_service.process_base64_image(image_data, "base64_image")
+        logger.info(f"📤 Vital OCR finished (success={result.get('success')})")
+        logger.debug("🔍 Vital OCR result", extra={"result": result})
+        
+        return jsonify(result), 200 if result.get('success') else 400
+        
+    except Exception as e:
+        logger.error(f"❌ Error processing vital OCR base64: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vital-ocr/formats', methods=['GET'])
+def get_vital_ocr_formats():
+    """Get supported file formats for vital OCR"""
+    try:
+        formats = vital_ocr_service.get_supported_formats()
+        return jsonify({
+            'success': True,
+            'supported_formats': formats,
+            'description': 'File formats supported by vital OCR service'
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting vital OCR formats: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
+
+@bp.route('/vital-ocr/status', methods=['GET'])
+def get_vital_ocr_status():
+    """Get vital OCR service status"""
+    try:
+        status = vital_ocr_service.get_webhook_status()
+        return jsonify({
+            'success': True,
+            'status': status
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting vital OCR status: {e}")
+        return jsonify({'success': False, 'message': f'Error: {str(e)}'}), 500
@@ -0,0 +1,214 @@
+"""
+Voice interaction routes
+"""
+
+import asyncio
+
+from flask import Blueprint, request, jsonify
+
+from app_core import token_required, voice_interaction_service
+from audio_transport import (AudioTooLarge, audio_mimetype, audio_response, decode_audio,
+                             upload_options, uploaded_audio, wants_binary_audio)
+
+bp = Blueprint('voice', __name__)
+
+# ============================================================================
+# VOICE INTERACTION ENDPOINTS
+# ============================================================================
+
+@bp.route('/api/voice/transcribe', methods=['POST'])
+@token_required
+def voice_transcribe():
+    """Transcribe audio to text (multipart file or raw/chunked audio body)"""
+    try:
+        upload = uploaded_audio(request)
+        if not upload:
+            return jsonify({
+                'success': False,
+                'error': 'No audio file provided'
+            }), 400
+        
+        audio_data, _ = upload
+        
+        # Transcribe audio
+        result = asyncio.run(voice_interaction_service.transcribe_audio(audio_data))
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(result), 200 if result['success'] else 400
+        
+    except AudioTooLarge as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error transcribing audio: {str(e)}'
+        }), 500
+
+@bp.route('/api/voice/transcribe-base64', methods=['POST'])
+@token_required
+def voice_transcribe_base64():
+    """Transcribe base64 encoded audio (binary and multipart uploads are also accepted)"""
+    try:
+        upload = uploaded_audio(request)
+        if upload:
+            result = asyncio.run(voice_interaction_service.transcribe_audio(upload[0]))
+        else:
+            data = request.get_json()
+            base64_audio = data.get('audio', '')
+            
+            if not base64_audio:
+                return jsonify({
+                    'success': False,
+                    'error': 'Base64 audio data is required'
+                }), 400
+            
+            # Transcribe base64 audio
+            result = asyncio.run(voice_interaction_service.transcribe_base64_audio(base64_audio))
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(result), 200 if result['success'] else 400
+        
+    except AudioTooLarge as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error transcribing base64 audio: {str(e)}'
+        }), 500
+
+@bp.route('/api/voice/ai-response', methods=['POST'])
+@token_required
+def voice_ai_response():
+    """Generate AI response for text input"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '').strip()
+        conversation_history = data.get('conversation_history', [])
+        
+        if not text:
+            return jsonify({
+                'success': False,
+                'error': 'Text input is required'
+            }), 400
+        
+        # Generate AI response
+        result = asyncio.run(voice_interaction_service.generate_ai_response(text, conversation_history))
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(result), 200 if result['success'] else 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error generating AI response: {str(e)}'
+        }), 500
+
+@bp.route('/api/voice/text-to-speech', methods=['POST'])
+@token_required
+def voice_text_to_speech():
+    """Convert text to speech"""
+    try:
+        data = request.get_json()
+        text = data.get('text', '').strip()
+        
+        if not text:
+            return jsonify({
+                'success': False,
+                'error': 'Text input is required'
+            }), 400
+        
+        # Convert text to speech
+        result = asyncio.run(voice_interaction_service.text_to_speech(text))
+        
+        # Raw audio for clients that asked for it (?format=binary or Accept: audio/*)
+        if result['success'] and wants_binary_audio(request):
+            audio = result['audio']
+            return audio_response(decode_audio(audio), audio_mimetype(audio.get('format')),
+                                  {'X-Audio-Provider': str(audio.get('provider', ''))})
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(result), 200 if result['success'] else 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error converting text to speech: {str(e)}'
+        }), 500
+
+@bp.route('/api/voice/process', methods=['POST'])
+@token_required
+def voice_process():
+    """Complete voice interaction pipeline: STT -> AI -> TTS"""
+    try:
+        upload = uploaded_audio(request)
+        if not upload:
+            return jsonify({
+                'success': False,
+                'error': 'No audio file provided'
+            }), 400
+        
+        # Get optional parameters (form fields or query string)
+        enable_tts = upload_options(request).get('enable_tts', 'true').lower() == 'true'
+        
+        # Process voice interaction
+        result = asyncio.run(voice_interaction_service.process_voice_interaction(upload[0], enable_tts))
+        
+        # Add patient ID to result
+        result['patient_id'] = request.user_data['patient_id']
+        
+        return jsonify(result), 200 if result['success'] else 400
+        
+    except AudioTooLarge as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error processing voice interaction: {str(e)}'
+        }), 500
+
+@bp.route('/api/voice/service-info', methods=['GET'])
+def voice_service_info():
+    """Get voice interaction service information"""
+    try:
+        service_info = voice_interaction_service.get_service_info()
+        return jsonify({
+            'success': True,
+            **service_info
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error getting service info: {str(e)}'
+        }), 500
+
+@bp.route('/api/voice/health', methods=['GET'])
+def voice_service_health():
+    """Check voice interaction service health"""
+    try:
+        health_status = voice_interaction_service.get_health_status()
+        return jsonify({
+            'success': True,
+            **health_status
+        }), 200
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Error checking service health: {str(e)}'
+        }), 500
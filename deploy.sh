@@ -10,7 +10,17 @@ python -m pip install setuptools wheel
 python -m pip install -r requirements-minimal.txt
 
 echo "✅ Dependencies installed successfully"
+
+# Pre-render baby size images
+python pregnancy_image_generator.py
+
+# Pre-generate story/question audio (skipped clips are synthesized on first play)
+python audio_library.py warm || echo "⚠️ Audio library warm-up incomplete - clips will be generated on first use"
+
+# Create or update MongoDB indexes (idempotent)
+python index_registry.py reconcile || echo "⚠️ Index reconcile failed - continuing with existing indexes"
 echo "🚀 Starting application..."
 
 # Start the application
-gunicorn --bind 0.0.0.0:$PORT app_simple:app
+# (run python scheduler_process.py as one separate process for reminders)
+gunicorn -c gunicorn.conf.py app_simple:app
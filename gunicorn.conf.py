@@ -0,0 +1,56 @@
+"""
+Gunicorn production profile
+
+    gunicorn -c gunicorn.conf.py app_simple:app
+
+- workers: WEB_CONCURRENCY, else 2 x cores + 1 capped at GUNICORN_MAX_WORKERS
+  (each worker holds its own lazily-loaded services, so memory sets the cap)
+- gthread workers with GUNICORN_THREADS threads: AI, OCR and e-mail routes
+  mostly wait on OpenAI/n8n/SMTP, so a worker keeps serving while one request
+  waits (GUNICORN_WORKER_CLASS=gevent works too when gevent is installed)
+- preload_app: the app is imported once in the master and shared
+  copy-on-write; each worker opens its own MongoDB connection after fork
+- max_requests with jitter: workers are recycled gracefully, one at a time,
+  so slow leaks cannot grow without bound
+- background schedulers never run in web workers; run scheduler_process.py
+  as one separate process
+"""
+
+import gc
+import os
+import multiprocessing
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or min(multiprocessing.cpu_count() * 2 + 1,
+                                                        int(os.getenv("GUNICORN_MAX_WORKERS", "8")))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# AI routes (GPT-4 analysis, OCR) can legitimately take a minute
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# Request logs and timings come from app_logging / request_metrics
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+# Heartbeat files on tmpfs; a disk-backed /tmp can stall workers in containers
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+def when_ready(server):
+    if preload_app:
+        # Keep the preloaded objects out of the collector so workers do not copy their pages
+        gc.freeze()
+    server.log.info(f"Serving with {workers} {worker_class} workers x {threads} threads "
+                    f"(preload={preload_app}, max_requests={max_requests})")
+
+def post_fork(server, worker):
+    if preload_app:
+        # MongoClient is not fork-safe: each worker connects on its own
+        from app_core import db
+        db.connect()
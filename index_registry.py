@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Index Registry - Declarative MongoDB indexes for the Patient Alert System
+
+Services declare the indexes their queries need with ``index_registry.register``.
+``reconcile`` compares the declarations with the live indexes and only creates
+missing ones or rebuilds those whose options changed, so it is safe to run on
+every deploy. The profiler report groups slow or collection-scanning queries by
+shape so missing indexes can be spotted.
+
+Usage:
+    python index_registry.py reconcile [--dry-run] [--drop-unmanaged]
+    python index_registry.py profile --slow-ms 100
+    python index_registry.py report [--slow-ms 100] [--limit 20]
+"""
+
+import os
+import sys
+import argparse
+import importlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Modules that declare indexes; imported by the CLI before reconciling
+INDEX_MODULES = ["app_core", "mental_health_service", "vital_signs_rollups", "knowledge_ingestion",
+                 "nutrition_rollups"]
+
+# Index options that make two indexes on the same keys different
+COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+def _normalize_keys(keys: Union[str, List[Tuple[str, Any]]]) -> Tuple[Tuple[str, Any], ...]:
+    if isinstance(keys, str):
+        return ((keys, 1),)
+    normalized = []
+    for field, direction in keys:
+        if isinstance(direction, float) and direction.is_integer():
+            direction = int(direction)
+        normalized.append((field, direction))
+    return tuple(normalized)
+
+def _index_options(info: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: info[key] for key in COMPARED_OPTIONS if info.get(key) not in (None, False)}
+
+class IndexRegistry:
+    """Collection -> declared indexes, reconciled against a live database"""
+
+    def __init__(self):
+        self._indexes: Dict[str, List[Dict[str, Any]]] = {}
+
+    def register(self, collection: str, keys: Union[str, List[Tuple[str, Any]]],
+                 owner: str = "app", **options) -> Dict[str, Any]:
+        """Declare an index; registering the same keys twice keeps the latest options"""
+        spec = {
+            "collection": collection,
+            "keys": _normalize_keys(keys),
+            "options": {key: value for key, value in options.items() if value not in (None, False)},
+            "owner": owner
+        }
+        specs = self._indexes.setdefault(collection, [])
+        specs[:] = [s for s in specs if s["keys"] != spec["keys"]]
+        specs.append(spec)
+        return spec
+
+    def declared(self, collection: Optional[str] = None) -> List[Dict[str, Any]]:
+        if collection is not None:
+            return list(self._indexes.get(collection, []))
+        return [spec for specs in self._indexes.values() for spec in specs]
+
+    @property
+    def collections(self) -> List[str]:
+        return list(self._indexes.keys())
+
+    def covers(self, collection: str, fields: List[str]) -> bool:
+        """True when a declared index starts with one of the given fields"""
+        return any(spec["keys"][0][0] in fields for spec in self._indexes.get(collection, []))
+
+    def reconcile(self, db, dry_run: bool = False, drop_unmanaged: bool = False) -> Dict[str, List[str]]:
+        """Create missing indexes and rebuild changed ones; returns what was done"""
+        report = {"created": [], "rebuilt": [], "unchanged": [], "dropped": [], "errors": []}
+
+        for collection_name, specs in self._indexes.items():
+            collection = db[collection_name]
+            try:
+                existing = collection.index_information()
+            except Exception as e:
+                report["errors"].append(f"{collection_name}: {e}")
+                continue
+            by_keys = {_normalize_keys(info["key"]): (name, info) for name, info in existing.items()}
+            managed = set()
+
+            for spec in specs:
+                label = f"{collection_name}.{'+'.join(field for field, _ in spec['keys'])}"
+                current = by_keys.get(spec["keys"])
+                try:
+                    if current and _index_options(current[1]) == spec["options"]:
+                        managed.add(current[0])
+                        report["unchanged"].append(label)
+                        continue
+                    if current:
+                        if not dry_run:
+                            collection.drop_index(current[0])
+                        report["rebuilt"].append(label)
+                    else:
+                        report["created"].append(label)
+                    if not dry_run:
+                        managed.add(collection.create_index(list(spec["keys"]), **spec["options"]))
+                except Exception as e:
+                    report["errors"].append(f"{label}: {e}")
+
+            if drop_unmanaged:
+                declared_keys = {spec["keys"] for spec in specs}
+                for name, info in existing.items():
+                    if name != "_id_" and name not in managed and _normalize_keys(info["key"]) not in declared_keys:
+                        try:
+                            if not dry_run:
+                                collection.drop_index(name)
+                            report["dropped"].append(f"{collection_name}.{name}")
+                        except Exception as e:
+                            report["errors"].append(f"{collection_name}.{name}: {e}")
+
+        return report
+
+def query_shape(query: Any) -> Any:
+    """Replace literal values in a filter with their type so queries group by shape"""
+    if isinstance(query, dict):
+        return {key: query_shape(value) for key, value in sorted(query.items())}
+    if isinstance(query, list):
+        return [query_shape(value) for value in query[:1]]
+    return type(query).__name__
+
+def _profile_filter(entry: Dict[str, Any]) -> Dict[str, Any]:
+    command = entry.get("command") or {}
+    return command.get("filter") or command.get("q") or entry.get("query") or {}
+
+def _filter_fields(query: Dict[str, Any]) -> List[str]:
+    fields = []
+    for key, value in query.items():
+        if key in ("$and", "$or") and isinstance(value, list):
+            for clause in value:
+                fields.extend(_filter_fields(clause))
+        elif not key.startswith("$"):
+            fields.append(key)
+    return fields
+
+def summarize_profile(entries: List[Dict[str, Any]], slow_ms: int = 100, limit: int = 20,
+                      registry: Optional["IndexRegistry"] = None) -> List[Dict[str, Any]]:
+    """Group profiler entries by namespace, operation and query shape"""
+    groups: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for entry in entries:
+        ns = entry.get("ns", "")
+        if ns.endswith(".system.profile"):
+            continue
+        collscan = "COLLSCAN" in (entry.get("planSummary") or "")
+        millis = entry.get("millis", 0)
+        if millis < slow_ms and not collscan:
+            continue
+
+        query = _profile_filter(entry)
+        shape = query_shape(query)
+        key = (ns, entry.get("op", ""), repr(shape))
+        group = groups.setdefault(key, {
+            "namespace": ns,
+            "op": entry.get("op"),
+            "shape": shape,
+            "fields": _filter_fields(query),
+            "count": 0,
+            "total_ms": 0,
+            "max_ms": 0,
+            "collscan": False,
+            "docs_examined": 0,
+            "returned": 0
+        })
+        group["count"] += 1
+        group["total_ms"] += millis
+        group["max_ms"] = max(group["max_ms"], millis)
+        group["collscan"] = group["collscan"] or collscan
+        group["docs_examined"] += entry.get("docsExamined", 0)
+        group["returned"] += entry.get("nreturned", 0)
+
+    report = []
+    for group in groups.values():
+        group["avg_ms"] = round(group["total_ms"] / group["count"], 1)
+        if registry is not None and group["collscan"] and group["fields"]:
+            collection = group["namespace"].split(".", 1)[-1]
+            group["declared_index"] = registry.covers(collection, group["fields"])
+        report.append(group)
+    report.sort(key=lambda g: g["total_ms"], reverse=True)
+    return report[:limit]
+
+def enable_profiler(db, slow_ms: int = 100) -> Dict[str, Any]:
+    """Profile operations slower than slow_ms on this database"""
+    return db.command("profile", 1, slowms=slow_ms)
+
+def slow_query_report(db, slow_ms: int = 100, limit: int = 20, scan: int = 5000) -> List[Dict[str, Any]]:
+    """Slow or unindexed queries from system.profile, most expensive first"""
+    entries = list(db["system.profile"].find().sort("ts", -1).limit(scan))
+    return summarize_profile(entries, slow_ms=slow_ms, limit=limit, registry=index_registry)
+
+# Global registry; services register their indexes at import time
+index_registry = IndexRegistry()
+
+def _connect():
+    import pymongo
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=10000)
+    return client[os.getenv("DB_NAME", "patients_db")]
+
+def register_all():
+    """Import every module in INDEX_MODULES so all declarations exist before reconciling
+
+    Some of them (e.g. the rollups) are otherwise only imported lazily, on the
+    first request that needs them.
+    """
+    for module in INDEX_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            print(f"⚠️ Could not load index declarations from {module}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage MongoDB indexes and inspect slow queries")
+    sub = parser.add_subparsers(dest="command", required=True)
+    reconcile_parser = sub.add_parser("reconcile", help="create/rebuild declared indexes")
+    reconcile_parser.add_argument("--dry-run", action="store_true")
+    reconcile_parser.add_argument("--drop-unmanaged", action="store_true", help="drop indexes that are not declared")
+    profile_parser = sub.add_parser("profile", help="enable the profiler for slow operations")
+    profile_parser.add_argument("--slow-ms", type=int, default=100)
+    report_parser = sub.add_parser("report", help="summarize slow or unindexed queries")
+    report_parser.add_argument("--slow-ms", type=int, default=100)
+    report_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    db = _connect()
+
+    if args.command == "reconcile":
+        register_all()
+        report = index_registry.reconcile(db, dry_run=args.dry_run, drop_unmanaged=args.drop_unmanaged)
+        prefix = "🔍 [dry run] " if args.dry_run else ""
+        for action in ("created", "rebuilt", "dropped"):
+            for label in report[action]:
+                print(f"{prefix}✅ {action}: {label}")
+        print(f"{prefix}✅ {len(report['unchanged'])} indexes already up to date")
+        for error in report["errors"]:
+            print(f"❌ {error}")
+        sys.exit(1 if report["errors"] else 0)
+
+    if args.command == "profile":
+        enable_profiler(db, args.slow_ms)
+        print(f"✅ Profiling operations slower than {args.slow_ms} ms on {db.name}")
+        return
+
+    register_all()
+    report = slow_query_report(db, slow_ms=args.slow_ms, limit=args.limit)
+    if not report:
+        print("✅ No slow or unindexed queries in system.profile")
+        return
+    print(f"\n🐢 Slow or unindexed queries ({db.name})")
+    print("=" * 70)
+    for group in report:
+        flag = " COLLSCAN" if group["collscan"] else ""
+        if group.get("declared_index"):
+            flag += " (index declared - run reconcile)"
+        print(f"{group['total_ms']:>8} ms total | {group['count']:>5}x | avg {group['avg_ms']} ms | "
+              f"{group['op']} {group['namespace']}{flag}")
+        print(f"           shape: {group['shape']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+JSON Provider - Compact, fast JSON responses for jsonify()
+
+``install_json(app)`` replaces Flask's JSON provider:
+
+- orjson is used when installed (several times faster on the large profile,
+  history and OCR payloads); otherwise the standard library encoder
+- output is always compact (no indentation, no key sorting)
+- BSON values are encoded wherever they are nested, in the same pass:
+  ``datetime``/``date`` as ISO 8601, ``ObjectId`` as its hex string,
+  ``Decimal128`` as a decimal string, ``Binary``/bytes as base64 and
+  ``DBRef`` as ``{"$ref", "$id"}``. Handlers return MongoDB documents as
+  they are instead of converting fields in their own loops
+- ``?fields=success,doctors.name,doctors.specialty`` returns only the listed
+  (dotted) paths of a JSON response; lists are projected per element, and
+  ``success``/``message``/``error`` are always kept
+
+OCR responses carry a ``bbox`` (four corner points) per text box, which most
+clients never draw. ``omit_bboxes`` drops them unless the request asks with
+``include_bbox=true`` (default: OCR_INCLUDE_BBOX).
+"""
+
+import os
+import json
+import uuid
+import base64
+import decimal
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterable, Optional
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    from bson import DBRef, Decimal128, ObjectId, Timestamp
+    BSON_AVAILABLE = True
+except ImportError:
+    BSON_AVAILABLE = False
+
+JSON_FAST_ENCODER = os.getenv("JSON_FAST_ENCODER", "true").lower() == "true"
+JSON_PARTIAL_FIELDS = os.getenv("JSON_PARTIAL_FIELDS", "true").lower() == "true"
+OCR_INCLUDE_BBOX = os.getenv("OCR_INCLUDE_BBOX", "false").lower() == "true"
+# Top-level keys a ?fields= response always keeps, so clients can still tell errors apart
+ALWAYS_KEPT_FIELDS = ("success", "message", "error")
+
+def json_default(value: Any) -> Any:
+    """Encode the non-JSON types handlers return (called only for those; plain values never get here)"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if BSON_AVAILABLE:
+        if isinstance(value, ObjectId):
+            return str(value)
+        if isinstance(value, Decimal128):
+            return str(value.to_decimal())
+        if isinstance(value, Timestamp):
+            return value.as_datetime().isoformat()
+        if isinstance(value, DBRef):
+            return {"$ref": value.collection, "$id": value.id}
+    # bson.Binary is a bytes subclass
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(bytes(value)).decode("ascii")
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def field_tree(fields: Iterable[str]) -> Dict[str, Any]:
+    """"a.b,a.c,d" -> {"a": {"b": {}, "c": {}}, "d": {}}; an empty subtree keeps the whole value"""
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        parts = [part for part in field.strip().split(".") if part]
+        for i, part in enumerate(parts):
+            if part in node and not node[part]:
+                break  # a shorter path already keeps the whole value
+            node = node.setdefault(part, {})
+            if i == len(parts) - 1:
+                node.clear()
+    return tree
+
+def select_fields(value: Any, tree: Dict[str, Any]) -> Any:
+    """Keep only the paths in tree; lists are projected element by element"""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [select_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: select_fields(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+def requested_fields() -> Optional[Dict[str, Any]]:
+    """The ?fields= projection of the current request, if any"""
+    if not JSON_PARTIAL_FIELDS or not has_request_context():
+        return None
+    fields = request.args.get("fields")
+    if not fields:
+        return None
+    tree = field_tree(fields.split(","))
+    for key in ALWAYS_KEPT_FIELDS:
+        tree[key] = {}
+    return tree
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Compact JSON through orjson when available, with BSON type support and ?fields= projection"""
+
+    compact = True
+    sort_keys = False
+    use_orjson = ORJSON_AVAILABLE and JSON_FAST_ENCODER
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if self.use_orjson and not kwargs:
+            try:
+                return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            except TypeError:
+                # e.g. integers beyond 64 bits; the standard encoder handles those
+                pass
+        kwargs.setdefault("default", json_default)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("separators", (",", ":"))
+        return json.dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        tree = requested_fields()
+        if tree and isinstance(obj, dict):
+            obj = select_fields(obj, tree)
+        return self._app.response_class(f"{self.dumps(obj)}\n", mimetype=self.mimetype)
+
+def install_json(app):
+    """Serve jsonify() through FastJSONProvider"""
+    app.json = FastJSONProvider(app)
+    return app.json
+
+def include_bbox_requested() -> bool:
+    value = request.args.get("include_bbox") or request.form.get("include_bbox")
+    if value is None:
+        return OCR_INCLUDE_BBOX
+    return value.lower() in ("1", "true", "yes")
+
+def omit_bboxes(payload: Any) -> Any:
+    """Drop OCR bounding boxes unless the request asked for them (in place; returns payload)"""
+    if include_bbox_requested():
+        return payload
+    stack = [payload]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            item.pop("bbox", None)
+            stack.extend(value for value in item.values() if isinstance(value, (dict, list)))
+        elif isinstance(item, list):
+            stack.extend(value for value in item if isinstance(value, (dict, list)))
+    return payload
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Knowledge Ingestion - Incremental MongoDB -> vector index pipeline
+
+Knowledge documents are read in (updated_at, _id) order, starting from a
+high-water mark. Only new or changed documents are embedded. Embedding runs in
+large batches. Each batch is upserted to the index in QDRANT_BATCH_SIZE chunks
+on parallel workers while the next batch is being embedded. The high-water mark
+only advances once every chunk of a batch is stored, and point ids are derived
+from the Mongo _id, so a crashed run resumes where it stopped and re-upserting
+a batch is harmless.
+
+Usage:
+    python knowledge_ingestion.py [--limit N] [--full]
+"""
+
+import os
+import time
+import uuid
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from index_registry import index_registry
+
+KNOWLEDGE_COLLECTION = os.getenv("MONGO_COLLECTION", "pregnancy_knowledge")
+QDRANT_COLLECTION = os.getenv("QDRANT_COLLECTION", "pregnancy_knowledge")
+# Documents embedded per model call
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "512"))
+# Points per Qdrant upsert request, and how many requests run at once
+QDRANT_BATCH_SIZE = int(os.getenv("QDRANT_BATCH_SIZE", "128"))
+QDRANT_UPLOAD_WORKERS = int(os.getenv("QDRANT_UPLOAD_WORKERS", "4"))
+STATE_COLLECTION = "ingestion_state"
+
+# Stable point ids: the same Mongo document always maps to the same point
+POINT_NAMESPACE = uuid.UUID("5b0a3c38-7d1e-4f4e-9a49-2f8a7c1d6e90")
+PAYLOAD_FIELDS = ("text", "source", "tags", "trimester", "updated_at")
+
+index_registry.register(KNOWLEDGE_COLLECTION, [("updated_at", 1), ("_id", 1)], owner="symptoms")
+
+def point_id(doc_id: Any) -> str:
+    return str(uuid.uuid5(POINT_NAMESPACE, str(doc_id)))
+
+def knowledge_document(item: Dict[str, Any], now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """A knowledge item as stored in MongoDB, or None when it has no text"""
+    text = (item.get("text") or "").strip() if isinstance(item, dict) else ""
+    if not text:
+        return None
+    return {
+        "text": text,
+        "source": item.get("source", "YourClinic"),
+        "tags": item.get("tags", []),
+        "trimester": item.get("trimester", "all"),
+        "updated_at": now or datetime.utcnow()
+    }
+
+class QdrantIndex:
+    """Qdrant collection; created with the embedding size on first upsert"""
+    persistent = True
+
+    def __init__(self, client, collection_name: str = QDRANT_COLLECTION):
+        self.client = client
+        self.collection_name = collection_name
+        self.name = f"qdrant:{collection_name}"
+        self._ready = False
+
+    def ensure(self, vector_size: int):
+        if self._ready:
+            return
+        from qdrant_client.http import models
+        existing = {c.name for c in self.client.get_collections().collections}
+        if self.collection_name not in existing:
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE)
+            )
+            print(f"✅ Created Qdrant collection {self.collection_name}")
+        self._ready = True
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        from qdrant_client.http import models
+        self.ensure(vectors.shape[1])
+        self.client.upsert(
+            collection_name=self.collection_name,
+            points=models.Batch(ids=ids, vectors=vectors.tolist(), payloads=payloads),
+            wait=True
+        )
+
+class LocalVectorIndex:
+    """In-process stand-in for Qdrant (development and tests); nothing is persisted"""
+    persistent = False
+
+    def __init__(self, name: str = "local"):
+        self.name = name
+        self.points: Dict[str, Tuple[np.ndarray, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def upsert(self, ids: List[str], vectors: np.ndarray, payloads: List[Dict[str, Any]]):
+        with self._lock:
+            for pid, vector, payload in zip(ids, vectors, payloads):
+                self.points[pid] = (np.asarray(vector, dtype=float), payload)
+
+    def search(self, vector: List[float], limit: int = 5, trimester: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Cosine similarity search, optionally limited to one trimester"""
+        with self._lock:
+            items = [(pid, v, p) for pid, (v, p) in self.points.items()
+                     if trimester is None or p.get("trimester") == trimester]
+        if not items:
+            return []
+        matrix = np.stack([v for _, v, _ in items])
+        query = np.asarray(vector, dtype=float)
+        scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+        best = np.argsort(-scores)[:limit]
+        return [{"id": items[i][0], "score": float(scores[i]), "payload": items[i][2]} for i in best]
+
+class KnowledgeIngestion:
+    """Embeds new or changed knowledge documents and upserts them into a vector index"""
+
+    def __init__(self, db, embed: Callable[[List[str]], List[List[float]]], index,
+                 collection_name: str = KNOWLEDGE_COLLECTION, embed_batch_size: int = EMBED_BATCH_SIZE,
+                 upload_batch_size: int = QDRANT_BATCH_SIZE, upload_workers: int = QDRANT_UPLOAD_WORKERS):
+        self.db = db
+        self.embed = embed
+        self.index = index
+        self.collection_name = collection_name
+        self.embed_batch_size = embed_batch_size
+        self.upload_batch_size = upload_batch_size
+        self.upload_workers = upload_workers
+        self.state_key = f"{collection_name}->{index.name}"
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._running = threading.Lock()
+        # A non-persistent index forgets its points on restart, so its mark must too
+        self._memory_state: Optional[Dict[str, Any]] = None
+
+    @property
+    def collection(self):
+        return self.db[self.collection_name]
+
+    # ---- high-water mark ----
+
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.index.persistent:
+            return self._memory_state
+        state = self.db[STATE_COLLECTION].find_one({"_id": self.state_key})
+        return state.get("high_water") if state else None
+
+    def _save_checkpoint(self, high_water: Optional[Dict[str, Any]], processed: int):
+        if not self.index.persistent:
+            self._memory_state = high_water
+            return
+        self.db[STATE_COLLECTION].update_one(
+            {"_id": self.state_key},
+            {"$set": {"high_water": high_water, "updated_at": datetime.utcnow()}, "$inc": {"documents": processed}},
+            upsert=True
+        )
+
+    def reset(self):
+        """Forget the high-water mark so the next run re-embeds everything"""
+        self._save_checkpoint(None, 0)
+
+    def pending_query(self, high_water: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Documents after the high-water mark in (updated_at, _id) order"""
+        if not high_water:
+            return {}
+        updated_at, last_id = high_water.get("updated_at"), high_water["_id"]
+        if updated_at is None:
+            # Legacy documents without updated_at sort first
+            return {"$or": [{"updated_at": None, "_id": {"$gt": last_id}}, {"updated_at": {"$type": "date"}}]}
+        return {"$or": [{"updated_at": {"$gt": updated_at}}, {"updated_at": updated_at, "_id": {"$gt": last_id}}]}
+
+    def pending_count(self) -> int:
+        return self.collection.count_documents(self.pending_query(self.checkpoint()))
+
+    # ---- writes ----
+
+    def bulk_insert(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert knowledge items with one insert_many; items without text are returned as failed"""
+        now = datetime.utcnow()
+        documents, failed = [], []
+        for item in items:
+            doc = knowledge_document(item, now)
+            if doc is None:
+                failed.append(item)
+            else:
+                documents.append(doc)
+        ids = []
+        if documents:
+            ids = [str(i) for i in self.collection.insert_many(documents, ordered=False).inserted_ids]
+        return {"inserted_ids": ids, "failed_items": failed}
+
+    # ---- ingestion ----
+
+    def _batches(self, high_water, limit: Optional[int]):
+        cursor = self.collection.find(self.pending_query(high_water), {f: 1 for f in PAYLOAD_FIELDS}) \
+            .sort([("updated_at", 1), ("_id", 1)]).batch_size(self.embed_batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+        batch = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= self.embed_batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _upload(self, pool: ThreadPoolExecutor, docs: List[Dict[str, Any]], vectors: np.ndarray) -> list:
+        ids = [point_id(doc["_id"]) for doc in docs]
+        payloads = [{**{f: doc.get(f) for f in PAYLOAD_FIELDS if f != "updated_at"}, "mongo_id": str(doc["_id"])}
+                    for doc in docs]
+        size = self.upload_batch_size
+        return [pool.submit(self.index.upsert, ids[i:i + size], vectors[i:i + size], payloads[i:i + size])
+                for i in range(0, len(docs), size)]
+
+    def _commit(self, pending, report: Dict[str, Any]):
+        """Wait for a batch's uploads, then move the high-water mark past it"""
+        futures, docs = pending
+        started = time.perf_counter()
+        wait(futures)
+        report["upload_wait_seconds"] += time.perf_counter() - started
+        for future in futures:
+            future.result()  # re-raise the first upload error; the mark stays put
+        last = docs[-1]
+        self._save_checkpoint({"updated_at": last.get("updated_at"), "_id": last["_id"]}, len(docs))
+        report["processed"] += len(docs)
+        report["batches"] += 1
+
+    def run(self, limit: Optional[int] = None, full: bool = False) -> Dict[str, Any]:
+        """Embed and upsert everything after the high-water mark (or everything with full=True)"""
+        if not self._running.acquire(blocking=False):
+            return {"success": False, "message": "Ingestion already running"}
+        started = time.perf_counter()
+        report = {"processed": 0, "batches": 0, "embed_seconds": 0.0, "upload_wait_seconds": 0.0}
+        try:
+            if full:
+                self.reset()
+            pending = None
+            with ThreadPoolExecutor(max_workers=self.upload_workers) as pool:
+                try:
+                    for docs in self._batches(self.checkpoint(), limit):
+                        embed_started = time.perf_counter()
+                        vectors = np.asarray(self.embed([doc.get("text", "") for doc in docs]), dtype=np.float32)
+                        report["embed_seconds"] += time.perf_counter() - embed_started
+                        # Uploads for this batch overlap with embedding the next one
+                        uploads = (self._upload(pool, docs, vectors), docs)
+                        if pending:
+                            self._commit(pending, report)
+                        pending = uploads
+                    if pending:
+                        self._commit(pending, report)
+                except Exception:
+                    # Keep the work of a batch whose uploads did complete
+                    if pending:
+                        try:
+                            self._commit(pending, report)
+                        except Exception:
+                            pass
+                    raise
+            report["success"] = True
+        except Exception as e:
+            print(f"❌ Knowledge ingestion stopped after {report['processed']} documents: {e}")
+            report.update({"success": False, "message": str(e)})
+        finally:
+            self._running.release()
+
+        elapsed = time.perf_counter() - started
+        report.update({
+            "seconds": round(elapsed, 3),
+            "docs_per_second": round(report["processed"] / elapsed, 1) if elapsed > 0 else 0.0,
+            "embed_seconds": round(report["embed_seconds"], 3),
+            "upload_wait_seconds": round(report["upload_wait_seconds"], 3),
+            "index": self.index.name,
+            "remaining": self.pending_count(),
+            "finished_at": datetime.utcnow().isoformat()
+        })
+        if report["success"]:
+            print(f"✅ Ingested {report['processed']} knowledge documents in {report['seconds']}s "
+                  f"({report['docs_per_second']} docs/s)")
+        self.last_report = report
+        return report
+
+    def status(self) -> Dict[str, Any]:
+        high_water = self.checkpoint()
+        return {
+            "index": self.index.name,
+            "running": self._running.locked(),
+            "high_water": {"updated_at": high_water.get("updated_at").isoformat() if high_water.get("updated_at") else None,
+                           "_id": str(high_water["_id"])} if high_water else None,
+            "pending_documents": self.pending_count(),
+            "last_run": self.last_report
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed new or changed knowledge documents into the vector index")
+    parser.add_argument("--limit", type=int, help="stop after this many documents")
+    parser.add_argument("--full", action="store_true", help="ignore the high-water mark and re-embed everything")
+    args = parser.parse_args()
+
+    from symptoms_service import symptoms_service
+    report = symptoms_service.ingest_knowledge(limit=args.limit, full=args.full)
+    if not report.get("success"):
+        print(f"❌ {report.get('message')}")
+        raise SystemExit(1)
+    print(f"   {report['batches']} batches, embedding {report['embed_seconds']}s, "
+          f"waiting on uploads {report['upload_wait_seconds']}s, {report['remaining']} documents left")
+
+if __name__ == "__main__":
+    main()
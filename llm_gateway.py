@@ -0,0 +1,266 @@
+"""
+LLM Gateway - Shared OpenAI access for every AI feature
+
+One OpenAI client (and HTTP connection pool) per provider, created on first use.
+Calls go through per-model concurrency limits; when a model is saturated,
+waiting calls are admitted by priority (interactive chat before batch
+generation) and then arrival order. Tokens, latency and errors are accounted
+per feature.
+
+Services get a drop-in client with ``llm_gateway.client_for(feature, priority)``;
+it exposes ``chat.completions.create`` like ``openai.OpenAI`` and is None when
+OpenAI is not configured, so existing fallbacks keep working.
+"""
+
+import os
+import time
+import heapq
+import itertools
+import threading
+import importlib.util
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+
+from request_metrics import record_outbound
+
+# Queue priorities: lower is served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_STANDARD = 5
+PRIORITY_BATCH = 10
+
+def _parse_limits(value: str) -> Dict[str, int]:
+    """Parse "gpt-4=4,gpt-3.5-turbo=16,default=8" into a dict"""
+    limits = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            model, limit = item.split("=", 1)
+            try:
+                limits[model.strip()] = max(1, int(limit))
+            except ValueError:
+                continue
+    return limits
+
+class LLMQueueTimeout(Exception):
+    """Raised when a call waits longer than LLM_QUEUE_TIMEOUT for a model slot"""
+
+class ModelLimiter:
+    """Concurrency limit for one model with a priority-ordered wait queue"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def acquire(self, priority: int, timeout: Optional[float] = None) -> float:
+        """Block until a slot is free and this call is first in line; returns seconds waited"""
+        ticket = (priority, next(self._sequence))
+        started = time.perf_counter()
+        deadline = started + timeout if timeout else None
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            while self.active >= self.limit or self._waiting[0] != ticket:
+                remaining = deadline - time.perf_counter() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                    self._condition.notify_all()
+                    raise LLMQueueTimeout(f"No model slot free after {timeout}s")
+                self._condition.wait(remaining)
+            heapq.heappop(self._waiting)
+            self.active += 1
+            # The next waiter may also fit under the limit
+            self._condition.notify_all()
+        return time.perf_counter() - started
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+class LLMGateway:
+    """Pooled provider clients, per-model limits and per-feature accounting"""
+
+    def __init__(self):
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        self.model_limits = _parse_limits(os.getenv("LLM_MODEL_CONCURRENCY", "gpt-4=4,default=8"))
+        self.queue_timeout = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))
+        self.max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))
+        self.request_timeout = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+        self._clients: Dict[str, Any] = {}
+        self._limiters: Dict[str, ModelLimiter] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(self.api_key) and self.api_key != "your_openai_api_key_here" \
+            and importlib.util.find_spec("openai") is not None
+
+    def client(self, provider: str = "openai"):
+        """The shared, pooled client for a provider"""
+        if provider not in self._clients:
+            with self._lock:
+                if provider not in self._clients:
+                    if provider != "openai":
+                        raise ValueError(f"Unknown LLM provider '{provider}'")
+                    import httpx
+                    from openai import OpenAI
+                    http_client = httpx.Client(
+                        limits=httpx.Limits(max_connections=self.max_connections,
+                                            max_keepalive_connections=self.max_connections),
+                        timeout=self.request_timeout
+                    )
+                    self._clients[provider] = OpenAI(api_key=self.api_key, http_client=http_client)
+                    print(f"✅ LLM gateway: {provider} client initialized "
+                          f"(pool of {self.max_connections} connections)")
+        return self._clients[provider]
+
+    def client_for(self, feature: str, priority: int = PRIORITY_STANDARD) -> Optional["GatewayClient"]:
+        """Drop-in OpenAI-style client that routes a feature's calls through the gateway"""
+        if not self.available:
+            return None
+        return GatewayClient(self, feature, priority)
+
+    def limiter(self, model: str) -> ModelLimiter:
+        if model not in self._limiters:
+            with self._lock:
+                if model not in self._limiters:
+                    limit = self.model_limits.get(model, self.model_limits.get("default", 8))
+                    self._limiters[model] = ModelLimiter(limit)
+        return self._limiters[model]
+
+    def _record(self, feature: str, model: str, latency: float, queued: float,
+                usage=None, error: Optional[Exception] = None):
+        # Queue time is ours, not OpenAI's
+        record_outbound("openai", latency, failed=error is not None)
+        with self._lock:
+            stats = self._stats.setdefault(feature, {
+                "requests": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "total_latency_ms": 0.0, "max_latency_ms": 0.0, "total_queue_ms": 0.0,
+                "models": {}, "last_error": None
+            })
+            stats["requests"] += 1
+            stats["models"][model] = stats["models"].get(model, 0) + 1
+            stats["total_latency_ms"] += latency * 1000
+            stats["max_latency_ms"] = max(stats["max_latency_ms"], latency * 1000)
+            stats["total_queue_ms"] += queued * 1000
+            if usage is not None:
+                stats["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+                stats["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+            if error is not None:
+                stats["errors"] += 1
+                stats["last_error"] = str(error)
+
+    def chat_completion(self, feature: str, priority: int = PRIORITY_STANDARD, **kwargs):
+        """chat.completions.create through the model's limiter, with accounting"""
+        model = kwargs.get("model", "gpt-3.5-turbo")
+        limiter = self.limiter(model)
+        queued = limiter.acquire(priority, self.queue_timeout)
+        started = time.perf_counter()
+
+        if kwargs.get("stream"):
+            kwargs.setdefault("stream_options", {"include_usage": True})
+            try:
+                try:
+                    stream = self.client().chat.completions.create(**kwargs)
+                except TypeError:
+                    # openai releases before stream_options
+                    kwargs.pop("stream_options")
+                    stream = self.client().chat.completions.create(**kwargs)
+            except Exception as e:
+                limiter.release()
+                self._record(feature, model, time.perf_counter() - started, queued, error=e)
+                raise
+            return GatewayStream(self, stream, feature, model, limiter, started, queued)
+
+        try:
+            response = self.client().chat.completions.create(**kwargs)
+        except Exception as e:
+            self._record(feature, model, time.perf_counter() - started, queued, error=e)
+            raise
+        finally:
+            limiter.release()
+        self._record(feature, model, time.perf_counter() - started, queued, usage=getattr(response, "usage", None))
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-feature accounting and per-model queue state"""
+        with self._lock:
+            features = {}
+            for feature, stats in self._stats.items():
+                features[feature] = dict(
+                    stats,
+                    models=dict(stats["models"]),
+                    avg_latency_ms=round(stats["total_latency_ms"] / stats["requests"], 1),
+                    avg_queue_ms=round(stats["total_queue_ms"] / stats["requests"], 1),
+                    total_tokens=stats["prompt_tokens"] + stats["completion_tokens"]
+                )
+            models = {
+                model: {"limit": limiter.limit, "active": limiter.active, "waiting": limiter.waiting}
+                for model, limiter in self._limiters.items()
+            }
+        return {"available": self.available, "features": features, "models": models}
+
+class GatewayStream:
+    """Streamed completion that holds its model slot until consumed, closed or dropped"""
+
+    def __init__(self, gateway: LLMGateway, stream, feature: str, model: str,
+                 limiter: ModelLimiter, started: float, queued: float):
+        self._gateway = gateway
+        self._stream = stream
+        self._feature = feature
+        self._model = model
+        self._limiter = limiter
+        self._started = started
+        self._queued = queued
+        self._usage = None
+        self._finished = False
+
+    def __iter__(self) -> Iterator[Any]:
+        try:
+            for chunk in self._stream:
+                self._usage = getattr(chunk, "usage", None) or self._usage
+                yield chunk
+        except Exception as e:
+            self._finish(e)
+            raise
+        finally:
+            self._finish()
+
+    def _finish(self, error: Optional[Exception] = None):
+        if self._finished:
+            return
+        self._finished = True
+        self._limiter.release()
+        self._gateway._record(self._feature, self._model, time.perf_counter() - self._started,
+                              self._queued, usage=self._usage, error=error)
+
+    def close(self):
+        close = getattr(self._stream, "close", None)
+        if close:
+            close()
+        self._finish()
+
+    def __del__(self):
+        self._finish()
+
+class GatewayClient:
+    """OpenAI-compatible facade bound to one feature and priority"""
+
+    def __init__(self, gateway: LLMGateway, feature: str, priority: int):
+        self.gateway = gateway
+        self.feature = feature
+        self.priority = priority
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        return self.gateway.chat_completion(self.feature, self.priority, **kwargs)
+
+# Global gateway
+llm_gateway = LLMGateway()
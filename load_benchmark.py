@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Load test the hot endpoints against a seeded patient population
+
+Seeds synthetic patients whose embedded arrays (hydration, vitals,
+appointments, food, medication) have realistic sizes, then drives the hot
+endpoints at a fixed concurrency and reports p50/p95/p99 latency and req/s per
+endpoint. Results are compared with a stored baseline and regressions fail
+the run (exit code 1).
+
+Backends:
+    mongomock (default)  in-process app on an in-memory MongoDB, no server needed
+    mongod               in-process app on MONGO_URI, seeded into a scratch database
+    --url URL            an already running server. With mongod it must use the same
+                         MONGO_URI/DB_NAME; with mongomock start it on its own seeded
+                         population (same BENCH_PATIENTS), e.g.
+                             BENCH_PATIENTS=200 gunicorn -c gunicorn.conf.py 'load_benchmark:seeded_app()'
+                             python load_benchmark.py --serve-dev      # the Flask dev server
+OpenAI and n8n calls are answered by canned stubs in-process.
+
+Usage:
+    python load_benchmark.py --patients 200 --requests 300 --concurrency 8
+    python load_benchmark.py --save-baseline               # record load_benchmark_baseline.json
+    python load_benchmark.py --url http://localhost:8000 --baseline gunicorn_baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+BASELINE_FILE = "load_benchmark_baseline.json"
+PASSWORD = "Bench-Password-1"
+ENDPOINTS = ("login", "hydration_stats", "doctor_appointments", "vitals_history", "upcoming_dosages")
+DEFAULT_SIZES = {"vitals": 720, "hydration": 240, "appointments": 12, "food": 90, "medications": 6}
+VITAL_TYPES = {"heartRate": (60, 100), "bloodPressure": (100, 140), "temperature": (36.1, 37.5), "spO2": (94, 100)}
+
+def percentile(samples: List[float], q: float) -> float:
+    return float(np.percentile(samples, q)) if samples else 0.0
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms) and throughput for one endpoint"""
+    return {
+        "requests": len(samples) + errors,
+        "errors": errors,
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "rps": round((len(samples) + errors) / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                        tolerance: float) -> List[str]:
+    """Endpoints whose p95 grew or whose throughput fell by more than tolerance"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base["p95_ms"] and result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms vs baseline {base['p95_ms']} ms")
+        if base["rps"] and result["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rps']} req/s vs baseline {base['rps']} req/s")
+        if result["errors"] > base.get("errors", 0):
+            regressions.append(f"{name}: {result['errors']} errors vs baseline {base.get('errors', 0)}")
+    return regressions
+
+def synthetic_patient(index: int, password_hash: str, sizes: Dict[str, int], now: datetime) -> Dict[str, Any]:
+    """One patient document with embedded arrays of the given sizes, newest entries last"""
+    rng = random.Random(index)
+    patient_id = f"BENCH{index:06d}"
+    vitals = []
+    for i in range(sizes["vitals"]):
+        vital_type = list(VITAL_TYPES)[i % len(VITAL_TYPES)]
+        low, high = VITAL_TYPES[vital_type]
+        at = now - timedelta(hours=sizes["vitals"] - i)
+        vitals.append({"type": vital_type, "value": round(rng.uniform(low, high), 1), "unit": "",
+                       "timestamp": at.isoformat(), "created_at": at.isoformat(), "notes": ""})
+    hydration = []
+    for i in range(sizes["hydration"]):
+        at = now - timedelta(hours=3 * (sizes["hydration"] - i))
+        hydration.append({"hydration_id": f"{patient_id}-H{i}", "patient_id": patient_id,
+                          "hydration_type": rng.choice(["water", "juice", "tea"]),
+                          "amount_ml": 250.0, "amount_oz": 8.45, "timestamp": at.isoformat(),
+                          "created_at": at.isoformat()})
+    appointments = []
+    for i in range(sizes["appointments"]):
+        day = (now + timedelta(days=i - sizes["appointments"] // 2)).strftime("%Y-%m-%d")
+        appointments.append({"appointment_id": f"{patient_id}-A{i}", "appointment_date": day,
+                             "appointment_time": "10:00", "appointment_type": "checkup",
+                             "appointment_status": rng.choice(["scheduled", "completed"]), "notes": ""})
+    food = [{"food_input": "rice and dal", "meal_type": rng.choice(["breakfast", "lunch", "dinner"]),
+             "nutritional_breakdown": {"estimated_calories": 450}, "timestamp": (now - timedelta(hours=8 * i)).isoformat()}
+            for i in range(sizes["food"])]
+    medications = [{"medication_name": f"Medication {i}", "medication_type": "prescription", "is_prescription_mode": False,
+                    "dosages": [{"dosage": "500mg", "time": f"{8 + 4 * d:02d}:00", "frequency": "daily",
+                                 "reminder_enabled": True} for d in range(3)],
+                    "createdAt": (now - timedelta(days=i)).isoformat()}
+                   for i in range(sizes["medications"])]
+    return {
+        "patient_id": patient_id,
+        "username": f"bench{index}",
+        "email": f"bench{index}@example.com",
+        "password_hash": password_hash,
+        "status": "active",
+        "first_name": "Bench",
+        "last_name": str(index),
+        "is_pregnant": True,
+        "last_period_date": (now - timedelta(weeks=20)).date().isoformat(),
+        "vital_signs_logs": vitals,
+        "hydration_records": hydration,
+        "hydration_goal": {"daily_goal_ml": 2500, "daily_goal_oz": 84.5},
+        "appointments": appointments,
+        "food_data": food,
+        "medication_logs": medications
+    }
+
+def seed(patients_collection, count: int, password_hash: str, sizes: Dict[str, int]) -> List[str]:
+    now = datetime.now().replace(microsecond=0)
+    patients_collection.delete_many({"patient_id": {"$regex": "^BENCH"}})
+    ids = []
+    batch = []
+    for index in range(count):
+        batch.append(synthetic_patient(index, password_hash, sizes, now))
+        ids.append(batch[-1]["patient_id"])
+        if len(batch) == 100:
+            patients_collection.insert_many(batch)
+            batch = []
+    if batch:
+        patients_collection.insert_many(batch)
+    patients_collection.create_index("patient_id")
+    patients_collection.create_index("email")
+    return ids
+
+def use_mongomock():
+    """Point every MongoClient created from here on at one in-memory server"""
+    import mongomock
+    import pymongo
+
+    server = mongomock.MongoClient()
+    pymongo.MongoClient = lambda *args, **kwargs: server
+
+def configure(backend: str, database: str = "load_benchmark"):
+    """Environment for the app modules; must run before they are imported"""
+    os.environ.setdefault("LOG_MODE", "quiet")
+    os.environ.setdefault("METRICS_SLOW_REQUEST_MS", "60000")
+    os.environ["ENABLED_FEATURES"] = "core,auth,hydration,appointments,vitals,medication"
+    if backend == "mongomock":
+        os.environ["MONGO_URI"] = "mongodb://mongomock"
+        use_mongomock()
+    else:
+        os.environ["DB_NAME"] = database
+
+def seeded_app():
+    """The app on a freshly seeded mongomock population (BENCH_PATIENTS), for --url runs"""
+    configure("mongomock")
+    from app_core import db, hash_password
+    mock_external_calls()
+    seed(db.patients_collection, int(os.getenv("BENCH_PATIENTS", "200")), hash_password(PASSWORD), DEFAULT_SIZES)
+    from app_simple import create_app
+    return create_app()
+
+def mock_external_calls():
+    """Canned OpenAI and n8n answers so AI routes never leave the process"""
+    import requests
+    from llm_gateway import llm_gateway
+
+    def post(url, *args, **kwargs):
+        return SimpleNamespace(status_code=200, text="{}", json=lambda: {"success": True})
+
+    requests.post = post
+    completion = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="{}"), delta=SimpleNamespace(content=None))],
+        usage=None)
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: completion)))
+    llm_gateway.client = lambda provider="openai": fake
+
+def endpoint_requests(patient_ids: List[str], tokens: Dict[str, str]) -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """Request factories per endpoint: each call picks a random patient"""
+    def pick():
+        return random.choice(patient_ids)
+
+    def login():
+        return {"method": "POST", "path": "/login", "json": {"login_identifier": pick(), "password": PASSWORD}}
+
+    def hydration_stats():
+        patient_id = pick()
+        return {"method": "GET", "path": "/api/hydration/stats", "headers": {"Authorization": f"Bearer {tokens[patient_id]}"}}
+
+    def doctor_appointments():
+        token = tokens[patient_ids[0]]
+        return {"method": "GET", "path": f"/doctor/appointments?date={datetime.now().strftime('%Y-%m-%d')}",
+                "headers": {"Authorization": f"Bearer {token}"}}
+
+    def vitals_history():
+        return {"method": "GET", "path": f"/vitals/history/{pick()}?days=30"}
+
+    def upcoming_dosages():
+        return {"method": "GET", "path": f"/medication/get-upcoming-dosages/{pick()}"}
+
+    return {"login": login, "hydration_stats": hydration_stats, "doctor_appointments": doctor_appointments,
+            "vitals_history": vitals_history, "upcoming_dosages": upcoming_dosages}
+
+def in_process_sender(app) -> Callable[[Dict[str, Any]], int]:
+    local = threading.local()
+
+    def send(spec):
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        response = local.client.open(spec["path"], method=spec["method"], json=spec.get("json"),
+                                     headers=spec.get("headers"))
+        return response.status_code
+    return send
+
+def http_sender(base_url: str) -> Callable[[Dict[str, Any]], int]:
+    import requests
+    local = threading.local()
+
+    def send(spec):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        response = local.session.request(spec["method"], base_url.rstrip("/") + spec["path"],
+                                         json=spec.get("json"), headers=spec.get("headers"), timeout=60)
+        return response.status_code
+    return send
+
+def drive(send: Callable[[Dict[str, Any]], int], make_request: Callable[[], Dict[str, Any]],
+          total: int, concurrency: int) -> Dict[str, Any]:
+    """total requests from concurrency workers; non-2xx responses count as errors"""
+    samples: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def one(_):
+        spec = make_request()
+        started = time.perf_counter()
+        try:
+            ok = 200 <= send(spec) < 300
+        except Exception:
+            ok = False
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            if ok:
+                samples.append(elapsed)
+            else:
+                errors[0] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    return summarize(samples, errors[0], time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the hot endpoints")
+    parser.add_argument("--backend", choices=["mongomock", "mongod"], default="mongomock")
+    parser.add_argument("--url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--database", default="load_benchmark", help="scratch database for --backend mongod")
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--vitals", type=int, default=DEFAULT_SIZES["vitals"], help="vital sign readings per patient")
+    parser.add_argument("--hydration", type=int, default=DEFAULT_SIZES["hydration"], help="hydration records per patient")
+    parser.add_argument("--appointments", type=int, default=DEFAULT_SIZES["appointments"])
+    parser.add_argument("--food", type=int, default=DEFAULT_SIZES["food"])
+    parser.add_argument("--medications", type=int, default=DEFAULT_SIZES["medications"])
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95/throughput change vs baseline")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded patients")
+    parser.add_argument("--serve-dev", action="store_true",
+                        help="serve seeded_app() with the Flask dev server as app_simple.py runs it, then exit")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    if args.serve_dev:
+        os.environ.setdefault("BENCH_PATIENTS", str(args.patients))
+        seeded_app().run(host="0.0.0.0", port=args.port, debug=True, use_reloader=True, reloader_type="stat")
+        return
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        print(f"❌ Unknown endpoints: {', '.join(sorted(unknown))} (use {', '.join(ENDPOINTS)})")
+        sys.exit(1)
+    random.seed(args.seed)
+    configure(args.backend, args.database)
+    from app_core import db, generate_jwt_token, hash_password
+    mock_external_calls()
+    if db.patients_collection is None:
+        print("❌ Database not reachable")
+        sys.exit(1)
+
+    sizes = {"vitals": args.vitals, "hydration": args.hydration, "appointments": args.appointments,
+             "food": args.food, "medications": args.medications}
+    if args.url and args.backend == "mongomock":
+        # The server seeded its own population (seeded_app); patient IDs are deterministic
+        patient_ids = [f"BENCH{index:06d}" for index in range(args.patients)]
+        sizes = DEFAULT_SIZES
+    else:
+        print(f"⏳ Seeding {args.patients} patients ({sizes})...")
+        patient_ids = seed(db.patients_collection, args.patients, hash_password(PASSWORD), sizes)
+    tokens = {pid: generate_jwt_token({"patient_id": pid, "email": f"{pid}@example.com"}) for pid in patient_ids}
+
+    if args.url:
+        send = http_sender(args.url)
+        target = args.url
+    else:
+        from app_simple import create_app
+        send = in_process_sender(create_app())
+        target = f"in-process ({args.backend})"
+
+    factories = endpoint_requests(patient_ids, tokens)
+    results = {}
+    print(f"🚀 {args.requests} requests per endpoint at concurrency {args.concurrency} against {target}")
+    for name in endpoints:
+        send(factories[name]())  # warm caches and lazy services outside the measurement
+        results[name] = drive(send, factories[name], args.requests, args.concurrency)
+        r = results[name]
+        print(f"{name:>20}: p50 {r['p50_ms']:>8.2f} ms | p95 {r['p95_ms']:>8.2f} ms | p99 {r['p99_ms']:>8.2f} ms | "
+              f"{r['rps']:>7.1f} req/s | {r['errors']} errors")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "target": target,
+        "patients": args.patients,
+        "sizes": sizes,
+        "concurrency": args.concurrency,
+        "requests_per_endpoint": args.requests,
+        "endpoints": results
+    }
+
+    exit_code = 0
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("concurrency") != args.concurrency or baseline.get("patients") != args.patients:
+            print(f"\n⚠️ Baseline was recorded with {baseline.get('patients')} patients at concurrency "
+                  f"{baseline.get('concurrency')}; comparison is approximate")
+        regressions = compare_to_baseline(results, baseline.get("endpoints", {}), args.tolerance)
+        report["regressions"] = regressions
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance:.0%} of {args.baseline}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            exit_code = 1
+        else:
+            print(f"\n✅ Within {args.tolerance:.0%} of baseline {args.baseline}")
+    else:
+        print(f"\n⚠️ No baseline at {args.baseline} (run with --save-baseline)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Report written to {args.output}")
+    if not args.keep:
+        db.patients_collection.delete_many({"patient_id": {"$regex": "^BENCH"}})
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
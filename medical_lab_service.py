@@ -14,6 +14,7 @@ from typing import Dict, Any, List, Optional, Tuple
 from PIL import Image
 import requests
 from dotenv import load_dotenv
+from llm_gateway import llm_gateway
 
 # Load environment variables
 load_dotenv()
@@ -32,9 +33,8 @@ class MedicalLabService:
         
         # Initialize OpenAI client
         try:
-            if self.openai_api_key and self.openai_api_key != "your_openai_api_key_here":
-                import openai
-                self._openai_client = openai.OpenAI(api_key=self.openai_api_key)
+            self._openai_client = llm_gateway.client_for("medical_lab")
+            if self._openai_client:
                 print("✅ Medical Lab OpenAI client initialized")
             else:
                 print("⚠️ OpenAI API key not found, using fallback mode")
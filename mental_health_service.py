@@ -9,15 +9,39 @@ import random
 import json
 import requests
 import io
+import base64
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import openai
 from dotenv import load_dotenv
 from pymongo import MongoClient
+from index_registry import index_registry
+from streaming import stream_chat_completion, relay_tokens
+from llm_gateway import llm_gateway, PRIORITY_INTERACTIVE
+from audio_library import audio_library, audio_id_for
+from request_metrics import track_outbound
 
 # Load environment variables
 load_dotenv()
 
+# Assessment history is listed per patient, newest first
+index_registry.register("mental_health_assessments", [("patient_id", 1), ("created_at", -1)], owner="mental_health")
+index_registry.register("mental_health_assessments", [("patient_id", 1), ("type", 1), ("created_at", -1)], owner="mental_health")
+
+# Assessment voice (Adam voice - good for Tamil); part of every clip's audio id
+TTS_VOICE_ID = "pNInz6obpgDQGcFmaJgB"
+TTS_MODEL_ID = "eleven_multilingual_v2"  # Better for Tamil
+TTS_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.5,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
+AUDIO_URL = "/api/mental-health/audio/{audio_id}"
+
+class AudioGenerationError(Exception):
+    """Text-to-speech failed or is not configured"""
+
 class MentalHealthService:
     """Mental Health Service for story generation and assessment"""
     
@@ -25,6 +49,7 @@ class MentalHealthService:
         """Initialize the Mental Health Service"""
         self.openai_client = None
         self.elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY")
+        self._audio_texts = None
         
         # Initialize database connection (use same as main app)
         try:
@@ -41,11 +66,10 @@ class MentalHealthService:
             self.db = None
             self.mental_health_collection = None
         
-        # Initialize OpenAI client
+        # Shared OpenAI client; chat is interactive so it is served first
         try:
-            openai_api_key = os.getenv("OPENAI_API_KEY")
-            if openai_api_key and openai_api_key != "your_openai_api_key_here":
-                self.openai_client = openai.OpenAI(api_key=openai_api_key)
+            self.openai_client = llm_gateway.client_for("mental_health", PRIORITY_INTERACTIVE)
+            if self.openai_client:
                 print("✅ Mental Health OpenAI client initialized")
             else:
                 print("⚠️ OpenAI API key not found, using fallback mode")
@@ -159,66 +183,7 @@ class MentalHealthService:
         try:
             if scenario == "pregnancy_mental_health":
                 # Use complete story templates
-                selected_story = random.choice(self.complete_stories)
-                
-                # Generate questions based on the story
-                questions = [
-                    {
-                        "question": f"{selected_story['title']} கதையில் முக்கிய பாத்திரம் யார்?",
-                        "options": ["மீனா", "கல்யாணி", "பிரியா", "ரேகா", "சுமதி"],
-                        "correct_answer": 0
-                    },
-                    {
-                        "question": "கதையில் முக்கிய பிரச்சினை என்ன?",
-                        "options": [
-                            "கிராமத்தில் பெரிய பிரச்சினை", 
-                            "தனிமை மற்றும் கவலை", 
-                            "கோபம் மற்றும் எரிச்சல்", 
-                            "பயம் மற்றும் நம்பிக்கை இழப்பு"
-                        ],
-                        "correct_answer": 0
-                    },
-                    {
-                        "question": "கதையின் முக்கிய பாடம் என்ன?",
-                        "options": [
-                            "ஒற்றுமை வலிமை", 
-                            "பொறுமை அமைதி தரும்", 
-                            "குடும்ப ஆதரவு எல்லாம்", 
-                            "நம்பிக்கை பயத்தை வெல்கிறது"
-                        ],
-                        "correct_answer": 0
-                    },
-                    {
-                        "question": "கதையில் பிரச்சினை எப்படி தீர்ந்தது?",
-                        "options": [
-                            "ஒன்றாக சேர்ந்து தீர்த்தனர்", 
-                            "தனித்தனியாக சமாளித்தனர்", 
-                            "மருத்துவரின் உதவியுடன்", 
-                            "அரசாங்க உதவியுடன்"
-                        ],
-                        "correct_answer": 0
-                    },
-                    {
-                        "question": "நீங்கள் இதே நிலையில் இருந்தால் என்ன செய்வீர்கள்?",
-                        "options": [
-                            "குடும்பத்திடம் ஆதரவு கேட்பேன்", 
-                            "தனியாக சமாளிக்க முயற்சிப்பேன்", 
-                            "மருத்துவரை அணுகுவேன்", 
-                            "ஓய்வு எடுத்து சிந்திப்பேன்"
-                        ],
-                        "correct_answer": 0
-                    }
-                ]
-                
-                return {
-                    "story_id": f"story_{random.randint(1000, 9999)}",
-                    "title": selected_story['title'],
-                    "content": selected_story['content'],
-                    "questions": questions,
-                    "character_name": "மீனா",
-                    "scenario": scenario,
-                    "success": True
-                }
+                return self._complete_story(random.choice(self.complete_stories), scenario)
             else:
                 # Use OpenAI for other scenarios
                 if not self.openai_client:
@@ -312,8 +277,10 @@ class MentalHealthService:
     
     def _get_fallback_story(self) -> Dict[str, Any]:
         """Get fallback story when OpenAI is not available"""
-        selected_story = random.choice(self.complete_stories)
-        
+        return self._complete_story(random.choice(self.complete_stories))
+    
+    def _complete_story(self, selected_story: Dict[str, str], scenario: str = "pregnancy_mental_health") -> Dict[str, Any]:
+        """Assessment story response for one of the complete stories"""
         questions = [
             {
                 "question": f"{selected_story['title']} கதையில் முக்கிய பாத்திரம் யார்?",
@@ -362,13 +329,18 @@ class MentalHealthService:
             }
         ]
         
+        # Library clips; synthesized on first play if not pre-generated
+        for question in questions:
+            question["audio_url"] = AUDIO_URL.format(audio_id=self.tts_audio_id(question["question"]))
+        
         return {
             "story_id": f"story_{random.randint(1000, 9999)}",
             "title": selected_story['title'],
             "content": selected_story['content'],
+            "audio_url": AUDIO_URL.format(audio_id=self.tts_audio_id(selected_story['content'])),
             "questions": questions,
             "character_name": "மீனா",
-            "scenario": "pregnancy_mental_health",
+            "scenario": scenario,
             "success": True
         }
     
@@ -642,8 +614,66 @@ class MentalHealthService:
                 "long_term": "விரிவான மன ஆரோக்கிய பராமரிப்பு திட்டத்தைத் தொடங்குங்கள்"
             }
     
-    def generate_audio(self, text: str) -> Dict[str, Any]:
-        """Generate Tamil audio using ElevenLabs"""
+    def tts_audio_id(self, text: str) -> str:
+        """Audio library id for this text in the assessment voice"""
+        return audio_id_for(text, voice_id=TTS_VOICE_ID, model_id=TTS_MODEL_ID, voice_settings=TTS_VOICE_SETTINGS)
+
+    def story_audio_texts(self) -> List[str]:
+        """Every story and question text the assessment can play"""
+        texts = []
+        for story in self.complete_stories:
+            texts.append(story['content'])
+            for question in self._complete_story(story)['questions']:
+                if question['question'] not in texts:
+                    texts.append(question['question'])
+        return texts
+
+    def _synthesize(self, text: str) -> bytes:
+        """Tamil speech from ElevenLabs; raises AudioGenerationError on failure"""
+        # ElevenLabs API call
+        url = f"https://api.elevenlabs.io/v1/text-to-speech/{TTS_VOICE_ID}"
+        
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": self.elevenlabs_api_key
+        }
+        
+        data = {
+            "text": text,
+            "model_id": TTS_MODEL_ID,
+            "voice_settings": TTS_VOICE_SETTINGS
+        }
+        
+        with track_outbound("elevenlabs"):
+            response = requests.post(url, json=data, headers=headers, timeout=15)
+        
+        if response.status_code != 200:
+            raise AudioGenerationError("ElevenLabs API error")
+        
+        if not response.content or len(response.content) < 1000:
+            raise AudioGenerationError("Audio response too small")
+        
+        return response.content
+
+    def _tts_configured(self) -> bool:
+        return bool(self.elevenlabs_api_key) and self.elevenlabs_api_key != "your_elevenlabs_api_key_here"
+
+    def library_audio(self, text: str) -> Dict[str, Any]:
+        """Synthesize text once into the audio library; later calls are served from disk"""
+        audio_id = self.tts_audio_id(text)
+        if not audio_library.lookup(audio_id) and not self._tts_configured():
+            raise AudioGenerationError("ElevenLabs API key not configured")
+        path, created = audio_library.get_or_create(audio_id, lambda: self._synthesize(text))
+        return {
+            "audio_id": audio_id,
+            "audio_url": AUDIO_URL.format(audio_id=audio_id),
+            "path": path,
+            "cached": not created
+        }
+
+    def generate_audio(self, text: str, include_data: bool = True) -> Dict[str, Any]:
+        """Generate Tamil audio using ElevenLabs, cached in the audio library"""
         try:
             if not text or not text.strip():
                 return {
@@ -658,62 +688,28 @@ class MentalHealthService:
                     "error": "Text is too long. Maximum 5000 characters allowed."
                 }
             
-            if not self.elevenlabs_api_key or self.elevenlabs_api_key == "your_elevenlabs_api_key_here":
-                return {
-                    "success": False,
-                    "error": "ElevenLabs API key not configured",
-                    "fallback": True
-                }
-            
-            # Use a Tamil voice (Adam voice - good for Tamil)
-            voice_id = "pNInz6obpgDQGcFmaJgB"
-            
-            # ElevenLabs API call
-            url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-            
-            headers = {
-                "Accept": "audio/mpeg",
-                "Content-Type": "application/json",
-                "xi-api-key": self.elevenlabs_api_key
-            }
-            
-            data = {
-                "text": text,
-                "model_id": "eleven_multilingual_v2",  # Better for Tamil
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.5,
-                    "style": 0.0,
-                    "use_speaker_boost": True
-                }
-            }
-            
-            response = requests.post(url, json=data, headers=headers, timeout=15)
-            
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "error": "ElevenLabs API error",
-                    "fallback": True
-                }
-            
-            if not response.content or len(response.content) < 1000:
+            try:
+                clip = self.library_audio(text)
+            except AudioGenerationError as e:
                 return {
                     "success": False,
-                    "error": "Audio response too small",
+                    "error": str(e),
                     "fallback": True
                 }
             
-            # Return audio data as base64
-            import base64
-            audio_base64 = base64.b64encode(response.content).decode('utf-8')
-            
-            return {
+            result = {
                 "success": True,
-                "audio_data": audio_base64,
+                "audio_id": clip["audio_id"],
+                "audio_url": clip["audio_url"],
                 "audio_type": "audio/mpeg",
-                "size": len(response.content)
+                "size": os.path.getsize(clip["path"]),
+                "cached": clip["cached"]
             }
+            if include_data:
+                # Older clients play the base64 data; new ones stream audio_url
+                with open(clip["path"], "rb") as f:
+                    result["audio_data"] = base64.b64encode(f.read()).decode('utf-8')
+            return result
             
         except Exception as e:
             print(f"Audio generation error: {e}")
@@ -723,6 +719,74 @@ class MentalHealthService:
                 "fallback": True
             }
 
+    def audio_for_id(self, audio_id: str) -> Optional[str]:
+        """Path of a library clip; known story/question clips are synthesized on first use"""
+        path = audio_library.lookup(audio_id)
+        if path:
+            return path
+        text = self._library_texts().get(audio_id)
+        if text is None:
+            return None
+        return self.library_audio(text)["path"]
+
+    def _library_texts(self) -> Dict[str, str]:
+        if self._audio_texts is None:
+            self._audio_texts = {self.tts_audio_id(text): text for text in self.story_audio_texts()}
+        return self._audio_texts
+
+    def warm_audio_library(self) -> Dict[str, Any]:
+        """Synthesize every story and question that is not in the library yet"""
+        report = {"generated": 0, "cached": 0, "errors": []}
+        for text in self.story_audio_texts():
+            try:
+                if self.library_audio(text)["cached"]:
+                    report["cached"] += 1
+                else:
+                    report["generated"] += 1
+            except Exception as e:
+                report["errors"].append(f"{text[:30]}...: {e}")
+        return report
+
+    def _chat_request(self, message: str, context: str = None, mood: str = None,
+                      session_id: str = None, user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Chat completion arguments for a mental health chat message"""
+        # Build context-aware prompt
+        system_prompt = self._build_chat_system_prompt(mood, user_profile)
+        
+        # Create conversation context
+        conversation_context = self._build_conversation_context(context, session_id)
+        
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"{conversation_context}\n\nUser: {message}"}
+            ],
+            "max_tokens": 500,
+            "temperature": 0.7
+        }
+    
+    def _chat_result(self, message: str, ai_response: str, context: str = None,
+                     mood: str = None, session_id: str = None) -> Dict[str, Any]:
+        """Structured chat reply returned to the client"""
+        # Generate suggestions based on the response
+        suggestions = self._generate_suggestions(message, ai_response, mood)
+        
+        return {
+            "success": True,
+            "message": ai_response,
+            "message_type": "supportive",
+            "suggestions": suggestions,
+            "metadata": {
+                "mood": mood,
+                "context": context,
+                "session_id": session_id,
+                "timestamp": datetime.now().isoformat()
+            },
+            "session_id": session_id,
+            "requires_follow_up": self._requires_follow_up(message, ai_response)
+        }
+    
     def generate_chat_response(self, message: str, patient_id: str, context: str = None, 
                              mood: str = None, session_id: str = None, 
                              user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -731,47 +795,39 @@ class MentalHealthService:
             if not self.openai_client:
                 return self._generate_fallback_chat_response(message, mood)
             
-            # Build context-aware prompt
-            system_prompt = self._build_chat_system_prompt(mood, user_profile)
-            
-            # Create conversation context
-            conversation_context = self._build_conversation_context(context, session_id)
-            
             # Generate response using OpenAI
             response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"{conversation_context}\n\nUser: {message}"}
-                ],
-                max_tokens=500,
-                temperature=0.7
+                **self._chat_request(message, context, mood, session_id, user_profile)
             )
             
             ai_response = response.choices[0].message.content.strip()
             
-            # Generate suggestions based on the response
-            suggestions = self._generate_suggestions(message, ai_response, mood)
-            
-            return {
-                "success": True,
-                "message": ai_response,
-                "message_type": "supportive",
-                "suggestions": suggestions,
-                "metadata": {
-                    "mood": mood,
-                    "context": context,
-                    "session_id": session_id,
-                    "timestamp": datetime.now().isoformat()
-                },
-                "session_id": session_id,
-                "requires_follow_up": self._requires_follow_up(message, ai_response)
-            }
+            return self._chat_result(message, ai_response, context, mood, session_id)
             
         except Exception as e:
             print(f"Chat response generation error: {e}")
             return self._generate_fallback_chat_response(message, mood)
     
+    def stream_chat_response(self, message: str, patient_id: str, context: str = None,
+                             mood: str = None, session_id: str = None,
+                             user_profile: Dict[str, Any] = None) -> Iterator[Tuple[str, Any]]:
+        """Streaming generate_chat_response: yields token deltas, then the final result"""
+        if self.openai_client:
+            parts = []
+            try:
+                request_kwargs = self._chat_request(message, context, mood, session_id, user_profile)
+                yield from relay_tokens(stream_chat_completion(self.openai_client, **request_kwargs), parts)
+                yield "result", self._chat_result(message, "".join(parts).strip(), context, mood, session_id)
+                return
+            except Exception as e:
+                if parts:
+                    raise
+                print(f"Chat response streaming error: {e}")
+        
+        result = self._generate_fallback_chat_response(message, mood)
+        yield "token", {"text": result["message"]}
+        yield "result", result
+    
     def _build_chat_system_prompt(self, mood: str = None, user_profile: Dict[str, Any] = None) -> str:
         """Build system prompt for mental health chat"""
         base_prompt = """You are a compassionate AI mental health support assistant for pregnant women. 
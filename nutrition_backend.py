@@ -5,10 +5,15 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 import json
+import uuid
+from nutrition_rollups import meal_key, nutrition_rollups, replaced_entry
 
 # Load environment variables
 load_dotenv()
 
+# Imported after load_dotenv so the gateway sees OPENAI_API_KEY from .env
+from llm_gateway import llm_gateway, PRIORITY_INTERACTIVE
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)
@@ -49,6 +54,25 @@ class NutritionDatabase:
 # Initialize database
 db = NutritionDatabase()
 
+def earlier_food_data(user_id, food_entry):
+    """Stored entries a new food entry may replace in the rollup (read before it is pushed)"""
+    if meal_key(food_entry) is None:
+        return []
+    patient = db.patients_collection.find_one({"patient_id": user_id}, {"food_data": 1})
+    return (patient or {}).get('food_data', [])
+
+def record_nutrition(user_id, food_entry, earlier_entries=()):
+    """Add a saved food entry to the patient's daily rollup (see nutrition_rollups.py)
+
+    A save of a meal that is already in earlier_entries (same analysis) replaces it
+    in the rollup instead of counting the meal again.
+    """
+    try:
+        nutrition_rollups.record(db.patients_collection.database, user_id, food_entry,
+                                 replaces=replaced_entry(food_entry, list(earlier_entries)))
+    except Exception as e:
+        print(f"⚠️ Could not update nutrition rollup for {user_id}: {e}")
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -177,6 +201,9 @@ def save_food_entry():
             'created_at': datetime.now(),
             'entry_type': 'basic'
         }
+        if data.get('analysis_id'):
+            food_entry['analysis_id'] = data['analysis_id']
+        earlier_entries = earlier_food_data(data['userId'], food_entry)
         
         # Save to Patient_test database
         result = db.patients_collection.update_one(
@@ -192,6 +219,7 @@ def save_food_entry():
         )
         
         if result.modified_count > 0:
+            record_nutrition(data['userId'], food_entry, earlier_entries)
             print(f"✅ Food entry saved in Patient_test for user: {data['userId']}")
             return jsonify({
                 'success': True,
@@ -455,49 +483,20 @@ def get_daily_calorie_summary(user_id):
                 'message': 'Database not available'
             }), 500
         
-        # Find the patient by patient_id
-        patient = db.patients_collection.find_one({"patient_id": user_id})
-        if not patient:
+        # Only check the patient exists; the totals come from the daily rollup
+        if db.patients_collection.find_one({"patient_id": user_id}, {"_id": 1}) is None:
             return jsonify({
                 'success': False,
                 'message': f'Patient not found with ID: {user_id}'
             }), 404
         
-        # Get today's date
         today = datetime.now().date()
-        
-        # Get food entries for today from the patient's food_data array
-        all_food_data = patient.get('food_data', [])
-        
-        # Filter for today's entries
-        today_entries = []
-        for entry in all_food_data:
-            if 'created_at' in entry:
-                entry_date = entry['created_at']
-                if isinstance(entry_date, datetime):
-                    if entry_date.date() == today:
-                        today_entries.append(entry)
-                elif isinstance(entry_date, str):
-                    try:
-                        entry_date_obj = datetime.fromisoformat(entry_date.replace('Z', '+00:00'))
-                        if entry_date_obj.date() == today:
-                            today_entries.append(entry)
-                    except:
-                        continue
-        
-        # Calculate summary
-        total_calories = 0
-        total_protein = 0
-        total_carbs = 0
-        total_fat = 0
-        meals_eaten = len(today_entries)
-        
-        for entry in today_entries:
-            nutritional = entry.get('nutritional_breakdown', {})
-            total_calories += nutritional.get('estimated_calories', 0)
-            total_protein += nutritional.get('protein_grams', 0)
-            total_carbs += nutritional.get('carbohydrates_grams', 0)
-            total_fat += nutritional.get('fat_grams', 0)
+        rollup = nutrition_rollups.day(db.patients_collection.database, user_id, today)
+        total_calories = rollup['calories']
+        total_protein = rollup['protein_grams']
+        total_carbs = rollup['carbohydrates_grams']
+        total_fat = rollup['fat_grams']
+        meals_eaten = rollup['meal_count']
         
         # Mock recommendations (in real app, these would come from nutrition database)
         recommended_calories = 2200  # Example for pregnant woman
@@ -573,17 +572,14 @@ def analyze_food_with_gpt4():
                 'message': 'OpenAI API key not configured'
             }), 500
         
-        try:
-            from openai import OpenAI
-        except ImportError:
+        # Shared, pooled OpenAI client
+        client = llm_gateway.client_for('nutrition', PRIORITY_INTERACTIVE)
+        if client is None:
             return jsonify({
                 'success': False,
                 'message': 'OpenAI package not installed. Run: pip install openai'
             }), 500
         
-        # Initialize OpenAI client
-        client = OpenAI(api_key=openai_api_key)
-        
         # Create comprehensive GPT-4 prompt for food analysis
         prompt = f"""
         Analyze this food item for a pregnant woman at week {pregnancy_week}:
@@ -664,6 +660,8 @@ def analyze_food_with_gpt4():
         try:
             # Parse the JSON response from GPT-4
             analysis_data = json.loads(gpt_response)
+            # Stored with the entry and echoed back by save-food-entry, which links the two saves
+            analysis_data['analysis_id'] = f"analysis_{uuid.uuid4().hex}"
             
             # Store the analysis in the Patient_test database
             if user_id and db.patients_collection is not None:
@@ -693,12 +691,11 @@ def analyze_food_with_gpt4():
                 )
                 
                 if result.modified_count > 0:
+                    record_nutrition(user_id, food_data_entry)
                     print(f"✅ Food data with GPT-4 analysis stored in Patient_test for user: {user_id}")
-                    analysis_data['analysis_id'] = f"analysis_{datetime.now().timestamp()}"
                 else:
-                    print(f"⚠️ Patient not found or no changes made for user: {user_id}")
                     # Still return the analysis even if storage fails
-                    analysis_data['analysis_id'] = f"analysis_{datetime.now().timestamp()}"
+                    print(f"⚠️ Patient not found or no changes made for user: {user_id}")
             
             return jsonify({
                 'success': True,
@@ -901,17 +898,14 @@ def transcribe_audio():
                 'message': 'OpenAI API key not configured'
             }), 500
         
-        # Import OpenAI client
-        try:
-            from openai import OpenAI
-        except ImportError:
+        if not llm_gateway.available:
             return jsonify({
                 'success': False,
                 'message': 'OpenAI package not installed. Run: pip install openai'
             }), 500
         
-        # Initialize OpenAI client
-        client = OpenAI(api_key=openai_api_key)
+        # Whisper is not a chat completion: use the gateway's shared pooled client directly
+        client = llm_gateway.client()
         
         # Convert base64 to bytes
         import base64
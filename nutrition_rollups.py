@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Nutrition Rollups - Per-day calorie and macro totals maintained on write
+
+Saving a food entry (basic or GPT-4 analysed) also adds its calories,
+protein, carbohydrates and fat to the patient's bucket for that day with
+``$inc`` and counts it as a meal. A daily summary is then one small document
+read instead of loading all of ``food_data`` and re-parsing ``created_at``;
+``range`` serves weekly/monthly trends from the same buckets.
+
+Entries are bucketed by their own ``timestamp`` (when the meal was eaten), so
+backdated entries land on the right day. An analysed meal is usually saved
+twice: once by the GPT-4 analysis and again when the app saves the entry with
+that analysis attached. Both carry the same ``analysis_id``, and the later
+save replaces the earlier one in the buckets, so each meal is counted once.
+Older entries without an id are linked only by identical analysis, food text
+and day.
+
+Usage:
+    python nutrition_rollups.py rebuild     # recompute rollups from stored food_data
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from index_registry import index_registry
+from vital_signs_analytics import to_datetime
+
+ROLLUP_COLLECTION = "nutrition_daily_rollups"
+# Rollup field -> key in a nutritional_breakdown
+MACRO_FIELDS = {
+    "calories": "estimated_calories",
+    "protein_grams": "protein_grams",
+    "carbohydrates_grams": "carbohydrates_grams",
+    "fat_grams": "fat_grams",
+}
+# Longest range one request may read
+MAX_RANGE_DAYS = int(os.getenv("NUTRITION_MAX_RANGE_DAYS", "366"))
+
+index_registry.register(ROLLUP_COLLECTION, [("patient_id", 1), ("date", -1)], owner="nutrition", unique=True)
+
+def _number(value) -> float:
+    """350, "350" or "about 350 kcal" -> 350.0; anything else -> 0"""
+    if isinstance(value, bool):
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = re.search(r"-?\d+(?:\.\d+)?", value)
+        if match:
+            return float(match.group())
+    return 0.0
+
+def entry_macros(entry: Dict[str, Any]) -> Dict[str, float]:
+    """Macros of a food_data entry: its own breakdown, else the one from its GPT-4 analysis"""
+    breakdown = entry.get("nutritional_breakdown") or {}
+    if not breakdown:
+        for key in ("analysis", "gpt4_analysis"):
+            analysis = entry.get(key)
+            if isinstance(analysis, dict) and analysis.get("nutritional_breakdown"):
+                breakdown = analysis["nutritional_breakdown"]
+                break
+    if not isinstance(breakdown, dict):
+        breakdown = {}
+    return {field: _number(breakdown.get(source)) for field, source in MACRO_FIELDS.items()}
+
+def entry_day(entry: Dict[str, Any]) -> datetime:
+    """Midnight of the day an entry was eaten (BSON has no date type)"""
+    eaten = to_datetime(entry.get("timestamp"), None) or to_datetime(entry.get("created_at"), None) or datetime.now()
+    return datetime.combine(eaten.date(), datetime.min.time())
+
+def meal_key(entry: Dict[str, Any]) -> Optional[str]:
+    """Identifies the analysed meal an entry saves: its analysis_id, else a digest of the analysis
+
+    Entries saved before analysis ids existed are matched only when the analysis,
+    the food text and the day are all identical; identical GPT-4 output for a
+    different food or day is a separate meal. Entries without an analysis (or,
+    for legacy ones, without food text) return None and are always separate meals.
+    """
+    if entry.get("analysis_id"):
+        return str(entry["analysis_id"])
+    for key in ("analysis", "gpt4_analysis"):
+        analysis = entry.get(key)
+        if isinstance(analysis, dict) and analysis:
+            if analysis.get("analysis_id"):
+                return str(analysis["analysis_id"])
+            food = str(entry.get("food_input") or entry.get("food_details") or "").strip().lower()
+            if not food:
+                return None
+            content = json.dumps([analysis, food, entry_day(entry).date().isoformat()], sort_keys=True, default=str)
+            return "sha1:" + hashlib.sha1(content.encode("utf-8")).hexdigest()
+    return None
+
+def replaced_entry(entry: Dict[str, Any], earlier: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The most recent earlier entry for the same analysed meal, which entry replaces in the rollups"""
+    key = meal_key(entry)
+    if key is None:
+        return None
+    for other in reversed(earlier):
+        if other is not entry and meal_key(other) == key:
+            return other
+    return None
+
+def _as_day(value) -> datetime:
+    if isinstance(value, datetime):
+        value = value.date()
+    return datetime.combine(value, datetime.min.time())
+
+def _empty_day(day: datetime) -> Dict[str, Any]:
+    return {"date": day.date().isoformat(), **{field: 0 for field in MACRO_FIELDS}, "meal_count": 0}
+
+def _rounded(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    day = {"date": bucket["date"].date().isoformat(), "meal_count": int(bucket.get("meal_count", 0))}
+    for field in MACRO_FIELDS:
+        day[field] = round(bucket.get(field, 0), 1)
+    return day
+
+class NutritionRollups:
+    """Maintains and reads the per-patient per-day nutrition buckets"""
+
+    def __init__(self, collection_name: str = ROLLUP_COLLECTION):
+        self.collection_name = collection_name
+
+    def collection(self, database):
+        return database[self.collection_name]
+
+    def record(self, database, patient_id: str, entry: Dict[str, Any],
+               replaces: Optional[Dict[str, Any]] = None):
+        """Add one saved food entry to its day's bucket, first taking out the entry it replaces
+
+        Pass ``replaces=replaced_entry(entry, earlier_entries)`` so a meal saved
+        again (e.g. after its GPT-4 analysis) is not counted twice.
+        """
+        collection = self.collection(database)
+        if replaces is not None:
+            macros = entry_macros(replaces)
+            collection.update_one(
+                {"patient_id": patient_id, "date": entry_day(replaces)},
+                {"$inc": {**{field: -value for field, value in macros.items()}, "meal_count": -1},
+                 "$set": {"updated_at": datetime.now()}}
+            )
+        collection.update_one(
+            {"patient_id": patient_id, "date": entry_day(entry)},
+            {"$inc": {**entry_macros(entry), "meal_count": 1}, "$set": {"updated_at": datetime.now()}},
+            upsert=True
+        )
+
+    def day(self, database, patient_id: str, day: Optional[date] = None) -> Dict[str, Any]:
+        """Totals for one day (today by default); zeros when nothing was logged"""
+        day = _as_day(day or datetime.now())
+        bucket = self.collection(database).find_one({"patient_id": patient_id, "date": day}, {"_id": 0})
+        return _rounded(bucket) if bucket else _empty_day(day)
+
+    def range(self, database, patient_id: str, start: date, end: date) -> Dict[str, Any]:
+        """Daily totals for [start, end] oldest first (missing days as zeros), with totals and averages"""
+        start, end = _as_day(start), _as_day(end)
+        found = {bucket["date"]: bucket for bucket in self.collection(database).find(
+            {"patient_id": patient_id, "date": {"$gte": start, "$lte": end}}, {"_id": 0})}
+        days = []
+        day = start
+        while day <= end:
+            days.append(_rounded(found[day]) if day in found else _empty_day(day))
+            day += timedelta(days=1)
+        totals = {field: round(sum(d[field] for d in days), 1) for field in MACRO_FIELDS}
+        totals["meal_count"] = sum(d["meal_count"] for d in days)
+        logged = [d for d in days if d["meal_count"]]
+        averages = {field: round(totals[field] / len(logged), 1) if logged else 0 for field in MACRO_FIELDS}
+        return {"days": days, "totals": totals, "daily_averages": averages, "days_logged": len(logged)}
+
+    def rebuild(self, database, patient_id: str, entries: List[Dict[str, Any]]) -> int:
+        """Replace a patient's buckets with ones computed from all of their food entries"""
+        # Only the latest save of each analysed meal counts
+        latest = {key: entry for entry in entries for key in [meal_key(entry)] if key is not None}
+        buckets: Dict[datetime, Dict[str, float]] = {}
+        for entry in entries:
+            key = meal_key(entry)
+            if key is not None and latest[key] is not entry:
+                continue
+            bucket = buckets.setdefault(entry_day(entry), {**{field: 0.0 for field in MACRO_FIELDS}, "meal_count": 0})
+            for field, value in entry_macros(entry).items():
+                bucket[field] += value
+            bucket["meal_count"] += 1
+        collection = self.collection(database)
+        collection.delete_many({"patient_id": patient_id})
+        if buckets:
+            now = datetime.now()
+            collection.insert_many([{"patient_id": patient_id, "date": day, **totals, "updated_at": now}
+                                    for day, totals in buckets.items()])
+        return len(buckets)
+
+# Global instance
+nutrition_rollups = NutritionRollups()
+
+def main():
+    import pymongo
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    if command != "rebuild":
+        print(f"❌ Unknown command '{command}' (use rebuild)")
+        sys.exit(1)
+
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=10000)
+    database = client[os.getenv("DB_NAME", "patients_db")]
+    patients = database["Patient_test"]
+    rebuilt = 0
+    for patient in patients.find({"food_data.0": {"$exists": True}}, {"patient_id": 1, "food_data": 1}):
+        if patient.get("patient_id"):
+            nutrition_rollups.rebuild(database, patient["patient_id"], patient["food_data"])
+            rebuilt += 1
+    print(f"✅ Rebuilt nutrition rollups for {rebuilt} patients")
+
+if __name__ == "__main__":
+    main()
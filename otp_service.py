@@ -6,6 +6,8 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 
+from request_metrics import track_outbound
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -61,14 +63,15 @@ def send_otp(email: str) -> str | None:
         msg.attach(MIMEText(body, 'plain'))
         
         # Create SMTP session
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(sender_email, email, text)
-        server.quit()
+        with track_outbound("smtp"):
+            server = smtplib.SMTP('smtp.gmail.com', 587)
+            server.starttls()
+            server.login(sender_email, sender_password)
+            
+            # Send email
+            text = msg.as_string()
+            server.sendmail(sender_email, email, text)
+            server.quit()
         
         print(f"✅ OTP sent successfully to {email}")
         return otp
@@ -1,19 +1,42 @@
-# Optional matplotlib import
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    print("⚠️ matplotlib not available, using fallback mode")
-    MATPLOTLIB_AVAILABLE = False
-    plt = None
-    patches = None
-
+import os
+import sys
+import json
+import mmap
+import hashlib
+import threading
 from io import BytesIO
 import base64
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import math
 
+# matplotlib is imported lazily on first render so that worker startup and the
+# request path never pay for it when a pre-rendered bundle is available.
+MATPLOTLIB_AVAILABLE = None
+plt = None
+patches = None
+
+def _load_matplotlib() -> bool:
+    """Import matplotlib on first use with a headless backend"""
+    global MATPLOTLIB_AVAILABLE, plt, patches
+    if MATPLOTLIB_AVAILABLE is None:
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as _plt
+            import matplotlib.patches as _patches
+            plt, patches = _plt, _patches
+            MATPLOTLIB_AVAILABLE = True
+        except ImportError:
+            print("⚠️ matplotlib not available, using fallback mode")
+            MATPLOTLIB_AVAILABLE = False
+    return MATPLOTLIB_AVAILABLE
+
+BABY_IMAGE_STYLES = ("matplotlib", "simple")
+BABY_IMAGE_BUNDLE_PATH = os.getenv(
+    "BABY_IMAGE_BUNDLE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "baby_size_images.bin")
+)
+
 class BabySizeImageGenerator:
     def __init__(self):
         self.week_sizes = {
@@ -61,8 +84,13 @@ class BabySizeImageGenerator:
     
     def generate_baby_size_image(self, week: int) -> str:
         """Generate a detailed baby size visualization image"""
-        if not MATPLOTLIB_AVAILABLE or plt is None:
+        if not _load_matplotlib():
             return self._generate_fallback_image(week)
+        return base64.b64encode(self.render_baby_size_png(week)).decode()
+    
+    def render_baby_size_png(self, week: int) -> bytes:
+        """Render the detailed baby size visualization as raw PNG bytes"""
+        _load_matplotlib()
             
         if week < 1 or week > 40:
             week = 1
@@ -116,19 +144,22 @@ class BabySizeImageGenerator:
         ax.spines['bottom'].set_visible(False)
         ax.spines['left'].set_visible(False)
         
-        # Convert to base64
+        # Render to PNG bytes
         buffer = BytesIO()
         plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        plt.close()
+        plt.close(fig)
         
-        return image_base64
+        return buffer.getvalue()
     
     def generate_simple_baby_image(self, week: int) -> str:
         """Generate a simple baby size visualization"""
-        if not MATPLOTLIB_AVAILABLE or plt is None:
+        if not _load_matplotlib():
             return self._generate_fallback_image(week)
+        return base64.b64encode(self.render_simple_png(week)).decode()
+    
+    def render_simple_png(self, week: int) -> bytes:
+        """Render the simple baby size visualization as raw PNG bytes"""
+        _load_matplotlib()
             
         if week < 1 or week > 40:
             week = 1
@@ -163,14 +194,12 @@ class BabySizeImageGenerator:
         for spine in ax.spines.values():
             spine.set_visible(False)
         
-        # Convert to base64
+        # Render to PNG bytes
         buffer = BytesIO()
         plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-        buffer.seek(0)
-        image_base64 = base64.b64encode(buffer.getvalue()).decode()
-        plt.close()
+        plt.close(fig)
         
-        return image_base64
+        return buffer.getvalue()
     
     def _add_comparison_objects(self, ax, size_cm):
         """Add comparison objects to the image"""
@@ -214,5 +243,134 @@ class BabySizeImageGenerator:
         text_bytes = fallback_text.encode('utf-8')
         return base64.b64encode(text_bytes).decode('utf-8')
 
+class BabySizeImageBundle:
+    """Pre-rendered baby size images for every week and style.
+    
+    The bundle is a single binary file: an 8-byte magic, a 4-byte header
+    length, a JSON index of ``"<week>:<style>" -> offset/length/etag`` and the
+    concatenated PNG blobs. It is memory-mapped so all workers share the same
+    page cache. Missing entries (or a missing bundle) are rendered once on
+    first use and kept in memory.
+    """
+    
+    MAGIC = b"BSIMG1\x00\x00"
+    
+    def __init__(self, path: str = BABY_IMAGE_BUNDLE_PATH, generator: Optional[BabySizeImageGenerator] = None):
+        self.path = path
+        self.generator = generator or BabySizeImageGenerator()
+        self._index = {}
+        self._mmap = None
+        self._data_start = 0
+        self._rendered = {}
+        self._lock = threading.Lock()
+        self.load()
+    
+    @staticmethod
+    def normalize_style(style: str) -> str:
+        """Map a requested style onto a rendered style (unknown styles use the detailed image)"""
+        return "simple" if style == "simple" else "matplotlib"
+    
+    @staticmethod
+    def _key(week: int, style: str) -> str:
+        return f"{week}:{style}"
+    
+    def load(self) -> bool:
+        """Memory-map the bundle file if it exists"""
+        if not os.path.exists(self.path):
+            print(f"⚠️ Baby image bundle not found at {self.path}, images will be rendered on first use")
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if mapped[:len(self.MAGIC)] != self.MAGIC:
+                raise ValueError("invalid bundle header")
+            header_start = len(self.MAGIC) + 4
+            header_length = int.from_bytes(mapped[len(self.MAGIC):header_start], "little")
+            header = json.loads(mapped[header_start:header_start + header_length].decode("utf-8"))
+            self._index = header.get("entries", {})
+            self._data_start = header_start + header_length
+            self._mmap = mapped
+            print(f"✅ Baby image bundle loaded ({len(self._index)} images)")
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not load baby image bundle: {e}")
+            self._index = {}
+            self._mmap = None
+            return False
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._mmap is not None
+    
+    def get_image(self, week: int, style: str = "matplotlib") -> Optional[Tuple[bytes, str]]:
+        """Return ``(png_bytes, etag)`` for a week/style, or None if no image can be produced"""
+        style = self.normalize_style(style)
+        key = self._key(week, style)
+        
+        entry = self._index.get(key)
+        if entry is not None and self._mmap is not None:
+            start = self._data_start + entry["offset"]
+            return self._mmap[start:start + entry["length"]], entry["etag"]
+        
+        cached = self._rendered.get(key)
+        if cached is not None:
+            return cached
+        
+        with self._lock:
+            cached = self._rendered.get(key)
+            if cached is None:
+                if not _load_matplotlib():
+                    return None
+                png = self._render(week, style)
+                cached = (png, hashlib.sha1(png).hexdigest())
+                self._rendered[key] = cached
+        return cached
+    
+    def _render(self, week: int, style: str) -> bytes:
+        if style == "simple":
+            return self.generator.render_simple_png(week)
+        return self.generator.render_baby_size_png(week)
+    
+    def build(self, path: Optional[str] = None) -> Dict:
+        """Render all weeks and styles and write them to a bundle file"""
+        path = path or self.path
+        if not _load_matplotlib():
+            raise RuntimeError("matplotlib is required to build the baby image bundle")
+        
+        entries = {}
+        blobs = []
+        offset = 0
+        for week in range(1, 41):
+            for style in BABY_IMAGE_STYLES:
+                png = self._render(week, style)
+                entries[self._key(week, style)] = {
+                    "offset": offset,
+                    "length": len(png),
+                    "etag": hashlib.sha1(png).hexdigest()
+                }
+                blobs.append(png)
+                offset += len(png)
+        
+        header = json.dumps({"entries": entries}, separators=(",", ":")).encode("utf-8")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(len(header).to_bytes(4, "little"))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+        
+        if path == self.path:
+            self.load()
+        return {"path": path, "images": len(entries), "bytes": os.path.getsize(path)}
+
 # Create global instance
 baby_size_generator = BabySizeImageGenerator()
+
+if __name__ == "__main__":
+    # Pre-render the bundle at build/deploy time:  python pregnancy_image_generator.py [output_path]
+    output_path = sys.argv[1] if len(sys.argv) > 1 else BABY_IMAGE_BUNDLE_PATH
+    result = BabySizeImageBundle(path=output_path, generator=baby_size_generator).build()
+    print(f"✅ Wrote {result['images']} baby size images ({result['bytes']} bytes) to {result['path']}")
@@ -1,9 +1,14 @@
-import openai
+import asyncio
 import os
 from typing import Optional
 from pregnancy_models import BabySize, SymptomInfo, ScreeningInfo, WellnessInfo, NutritionInfo
+from llm_gateway import llm_gateway, PRIORITY_BATCH
+from single_flight import SingleFlight
 import json
 
+# Bump when the week prompts change so in-flight calls for old prompts are not shared
+PROMPT_VERSION = 1
+
 class PregnancyOpenAIService:
     def __init__(self):
         self.api_key = os.getenv('OPENAI_API_KEY')
@@ -13,7 +18,12 @@ class PregnancyOpenAIService:
         if not self.api_key:
             raise ValueError("OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
         
-        openai.api_key = self.api_key
+        # Week content is generated content, queued behind interactive chat
+        self.client = llm_gateway.client_for("pregnancy_content", PRIORITY_BATCH)
+        if self.client is None:
+            raise ValueError("OpenAI is not available. Install the openai package.")
+        # Identical concurrent requests (same week and section) share one upstream call
+        self.flights = SingleFlight()
     
     async def get_baby_size_for_week(self, week: int) -> BabySize:
         """Get AI-generated baby size information for a specific week"""
@@ -29,7 +39,7 @@ class PregnancyOpenAIService:
         """
         
         try:
-            response = await self._call_openai(prompt)
+            response = await self._call_openai(prompt, "baby_size", week)
             data = json.loads(response)
             
             return BabySize(
@@ -60,7 +70,7 @@ class PregnancyOpenAIService:
         """
         
         try:
-            response = await self._call_openai(prompt)
+            response = await self._call_openai(prompt, "baby_details", week)
             return json.loads(response)
         except Exception as e:
             print(f"OpenAI detailed info generation failed: {e}")
@@ -80,7 +90,7 @@ class PregnancyOpenAIService:
         """
         
         try:
-            response = await self._call_openai(prompt)
+            response = await self._call_openai(prompt, "symptoms", week)
             data = json.loads(response)
             
             return SymptomInfo(
@@ -112,7 +122,7 @@ class PregnancyOpenAIService:
         """
         
         try:
-            response = await self._call_openai(prompt)
+            response = await self._call_openai(prompt, "screening", week)
             data = json.loads(response)
             
             return ScreeningInfo(
@@ -144,7 +154,7 @@ class PregnancyOpenAIService:
         """
         
         try:
-            response = await self._call_openai(prompt)
+            response = await self._call_openai(prompt, "wellness", week)
             data = json.loads(response)
             
             return WellnessInfo(
@@ -176,7 +186,7 @@ class PregnancyOpenAIService:
         """
         
         try:
-            response = await self._call_openai(prompt)
+            response = await self._call_openai(prompt, "nutrition", week)
             data = json.loads(response)
             
             return NutritionInfo(
@@ -194,19 +204,24 @@ class PregnancyOpenAIService:
                 hydration_tips=["Drink plenty of water"]
             )
     
-    async def _call_openai(self, prompt: str) -> str:
-        """Make a call to OpenAI API"""
+    async def _call_openai(self, prompt: str, section: str, week: int) -> str:
+        """Make a call to OpenAI API, coalesced with identical in-flight calls"""
+        key = (section, week, PROMPT_VERSION, self.model)
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful pregnancy and healthcare assistant. Provide accurate, medical information in JSON format."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=0.7
-            )
-            return response.choices[0].message.content
+            return await asyncio.to_thread(self.flights.do, key, lambda: self._complete(prompt))
         except Exception as e:
             print(f"OpenAI API call failed: {e}")
             raise e
+
+    def _complete(self, prompt: str) -> str:
+        """Blocking chat completion through the gateway"""
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a helpful pregnancy and healthcare assistant. Provide accurate, medical information in JSON format."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=self.max_tokens,
+            temperature=0.7
+        )
+        return response.choices[0].message.content
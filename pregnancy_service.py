@@ -5,13 +5,15 @@ from datetime import datetime, timedelta
 from pregnancy_models import *
 from pregnancy_data_service import PregnancyDataService
 from pregnancy_openai_service import PregnancyOpenAIService
-from pregnancy_image_generator import BabySizeImageGenerator
+from pregnancy_image_generator import BabySizeImageGenerator, BabySizeImageBundle
+import base64
 import json
 
 class PregnancyService:
     def __init__(self):
         self.data_service = PregnancyDataService()
         self.image_generator = BabySizeImageGenerator()
+        self.image_bundle = BabySizeImageBundle(generator=self.image_generator)
         self.openai_service = None
         
         # Initialize OpenAI service if available
@@ -62,7 +64,10 @@ class PregnancyService:
                     "message": "Week must be between 1 and 40"
                 }
             
-            if style == "simple":
+            image = self.image_bundle.get_image(week, style)
+            if image is not None:
+                image_data = base64.b64encode(image[0]).decode()
+            elif style == "simple":
                 image_data = self.image_generator.generate_simple_baby_image(week)
             else:
                 image_data = self.image_generator.generate_baby_size_image(week)
@@ -80,6 +85,22 @@ class PregnancyService:
                 "message": f"Error generating image: {str(e)}"
             }
     
+    def get_baby_size_image_bytes(self, week: int, style: str = "matplotlib") -> Optional[Dict]:
+        """Get pre-rendered baby size PNG bytes and ETag, or None if unavailable"""
+        if week < 1 or week > 40:
+            return None
+        image = self.image_bundle.get_image(week, style)
+        if image is None:
+            return None
+        png_bytes, etag = image
+        return {
+            "week": week,
+            "style": self.image_bundle.normalize_style(style),
+            "content": png_bytes,
+            "etag": etag,
+            "mimetype": "image/png"
+        }
+    
     async def get_ai_baby_size(self, week: int) -> Dict:
         """Get AI-powered baby size information"""
         try:
@@ -292,6 +313,7 @@ class PregnancyService:
         return {
             "success": True,
             "openai_available": self.openai_service is not None,
+            "request_coalescing": self.openai_service.flights.stats() if self.openai_service else None,
             "message": "OpenAI service status retrieved successfully"
         }
     
@@ -11,6 +11,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from llm_gateway import llm_gateway
+
 # OpenAI integration (if available)
 try:
     import openai
@@ -47,7 +49,7 @@ class PregnancyTrackingService:
         self.openai_client = None
         if OPENAI_AVAILABLE and os.getenv('OPENAI_API_KEY'):
             try:
-                self.openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+                self.openai_client = llm_gateway.client_for('pregnancy_tracking')
             except Exception as e:
                 print(f"Warning: OpenAI initialization failed: {e}")
                 self.openai_client = None
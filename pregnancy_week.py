@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Pregnancy Week - Gestational age derived at read time
+
+The current week is computed from the stored LMP (``last_period_date``) or,
+failing that, the EDD (``expected_delivery_date``, LMP = EDD - 280 days), so
+reading a profile never writes to it. Lookups by patient go through a small
+TTL cache of the pregnancy fields only. Once a day the advancer stores the
+current week for every pregnant patient in one bulk write, for queries and
+reminders that filter on ``pregnancy_week``.
+
+Usage:
+    python pregnancy_week.py advance
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo import UpdateMany
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+GESTATION_DAYS = 280
+MAX_WEEK = 42
+
+# The only fields needed to answer "which week is this patient in"
+PREGNANCY_PROJECTION = {
+    "_id": 0,
+    "patient_id": 1,
+    "email": 1,
+    "is_pregnant": 1,
+    "last_period_date": 1,
+    "expected_delivery_date": 1,
+    "pregnancy_week": 1,
+    "health_data.pregnancy_week": 1,
+    "health_data.pregnancy_info": 1,
+}
+
+CACHE_TTL_SECONDS = int(os.getenv("PREGNANCY_CACHE_TTL", "300"))
+# Local hour at which the background advancer runs
+ADVANCE_HOUR = int(os.getenv("PREGNANCY_ADVANCE_HOUR", "2"))
+
+def _to_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).date()
+        except ValueError:
+            return None
+    return None
+
+def _stored_week(patient: Dict[str, Any]) -> Optional[int]:
+    """Week written by older code paths, checked in their historical order"""
+    health_data = patient.get("health_data") or {}
+    for value in (patient.get("pregnancy_week"), health_data.get("pregnancy_week"),
+                  (health_data.get("pregnancy_info") or {}).get("current_week")):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+def gestational_info(patient: Dict[str, Any], today: Optional[date] = None) -> Dict[str, Any]:
+    """Current week, due date and days pregnant from the patient's LMP or EDD"""
+    today = today or date.today()
+    pregnancy_info = (patient.get("health_data") or {}).get("pregnancy_info") or {}
+    lmp = _to_date(patient.get("last_period_date")) or _to_date(pregnancy_info.get("last_period_date"))
+    source = "last_period_date"
+    if lmp is None:
+        edd = _to_date(patient.get("expected_delivery_date"))
+        if edd is not None:
+            lmp = edd - timedelta(days=GESTATION_DAYS)
+            source = "expected_delivery_date"
+
+    if lmp is None:
+        week = _stored_week(patient)
+        return {
+            "current_week": week,
+            "expected_delivery": patient.get("expected_delivery_date"),
+            "days_pregnant": None,
+            "source": "stored" if week is not None else None,
+            "error": None if week is not None else "No last period date or due date on file"
+        }
+    if lmp > today:
+        return {"current_week": None, "expected_delivery": None, "days_pregnant": None, "source": source,
+                "error": "Last period date cannot be in the future"}
+
+    days = (today - lmp).days
+    return {
+        "current_week": max(1, min(MAX_WEEK, days // 7)),
+        "expected_delivery": (lmp + timedelta(days=GESTATION_DAYS)).isoformat(),
+        "days_pregnant": days,
+        "last_period_date": lmp.isoformat(),
+        "source": source,
+        "error": None
+    }
+
+class PregnancyProjectionCache:
+    """Pregnancy fields per patient, kept for CACHE_TTL_SECONDS"""
+
+    def __init__(self, ttl: float = CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, collection, patient_id: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(patient_id)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        self.misses += 1
+        projection = collection.find_one({"patient_id": patient_id}, PREGNANCY_PROJECTION)
+        if projection is not None:
+            with self._lock:
+                self._entries[patient_id] = (now + self.ttl, projection)
+        return projection
+
+    def invalidate(self, patient_id: Optional[str] = None):
+        """Drop one patient (after a profile edit) or everything"""
+        with self._lock:
+            if patient_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(patient_id, None)
+
+# Global instance
+pregnancy_cache = PregnancyProjectionCache()
+
+def advance_pregnancy_weeks(patients_collection, today: Optional[date] = None) -> Dict[str, int]:
+    """Store today's week for every pregnant patient whose stored week is behind, in one bulk write"""
+    today = today or date.today()
+    by_week: Dict[int, list] = {}
+    report = {"patients": 0, "advanced": 0, "unchanged": 0, "skipped": 0}
+    for patient in patients_collection.find({"is_pregnant": True}, PREGNANCY_PROJECTION):
+        report["patients"] += 1
+        info = gestational_info(patient, today)
+        if info["error"] or info["source"] == "stored" or not patient.get("patient_id"):
+            report["skipped"] += 1
+            continue
+        if patient.get("pregnancy_week") == info["current_week"]:
+            report["unchanged"] += 1
+            continue
+        by_week.setdefault(info["current_week"], []).append(patient["patient_id"])
+
+    # One UpdateMany per week (at most 42) in a single bulk write
+    operations = [
+        UpdateMany({"patient_id": {"$in": patient_ids}},
+                   {"$set": {"pregnancy_week": week, "pregnancy_last_updated": datetime.now().isoformat()}})
+        for week, patient_ids in sorted(by_week.items())
+    ]
+    if operations:
+        patients_collection.bulk_write(operations, ordered=False)
+        pregnancy_cache.invalidate()
+    report["advanced"] = sum(len(ids) for ids in by_week.values())
+    return report
+
+def _seconds_until(hour: int) -> float:
+    now = datetime.now()
+    run_at = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+def pregnancy_week_scheduler(patients_collection):
+    """Background loop: advance stored weeks once a day at ADVANCE_HOUR"""
+    while True:
+        time.sleep(_seconds_until(ADVANCE_HOUR))
+        try:
+            report = advance_pregnancy_weeks(patients_collection)
+            logger.info(f"✅ Pregnancy weeks advanced for {report['advanced']} of {report['patients']} patients")
+        except Exception:
+            logger.exception("❌ Error advancing pregnancy weeks")
+
+def start_pregnancy_week_scheduler(patients_collection):
+    """Start the daily pregnancy week advancer in a background thread"""
+    if patients_collection is None:
+        logger.warning("⚠️ Pregnancy week scheduler not started: database not connected")
+        return None
+    thread = threading.Thread(target=pregnancy_week_scheduler, args=(patients_collection,), daemon=True)
+    thread.start()
+    logger.info(f"✅ Pregnancy week scheduler started (daily at {ADVANCE_HOUR:02d}:00)")
+    return thread
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "advance"
+    if command != "advance":
+        print(f"❌ Unknown command '{command}' (use advance)")
+        sys.exit(1)
+    import pymongo
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=10000)
+    report = advance_pregnancy_weeks(client[os.getenv("DB_NAME", "patients_db")]["Patient_test"])
+    print(f"✅ Pregnancy weeks: {report['advanced']} advanced, {report['unchanged']} unchanged, "
+          f"{report['skipped']} without usable dates ({report['patients']} pregnant patients)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Request Metrics - Per-route latency, payload size, MongoDB and outbound HTTP time
+
+``install_metrics(app)`` times every request and attributes to its route
+(the URL rule, e.g. ``/vitals/history/<patient_id>``):
+- latency, request size and response size histograms
+- MongoDB command count and time, from a pymongo CommandListener
+- outbound call count and time per target (openai, n8n, elevenlabs, smtp),
+  from ``track_outbound`` / ``record_outbound`` at the call sites
+Everything is served in Prometheus text format at ``GET /metrics``. Requests
+slower than METRICS_SLOW_REQUEST_MS are logged with a per-stage breakdown and
+kept for ``GET /metrics/slow-requests``.
+
+Counters live in the worker process; scrape each worker (or run one worker
+per scrape target).
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from flask import Response, jsonify, request
+from pymongo import monitoring
+
+from app_logging import get_logger
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Bearer token required by /metrics when set
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+SLOW_REQUEST_MS = float(os.getenv("METRICS_SLOW_REQUEST_MS", "1000"))
+SLOW_REQUEST_HISTORY = int(os.getenv("METRICS_SLOW_REQUEST_HISTORY", "100"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+logger = get_logger(__name__)
+
+class RequestTimer:
+    """Stage timings of the request running on this thread"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_commands = 0
+        self.db_seconds = 0.0
+        self.outbound: Dict[str, List[float]] = {}
+
+    def add_outbound(self, target: str, seconds: float):
+        calls = self.outbound.setdefault(target, [0, 0.0])
+        calls[0] += 1
+        calls[1] += seconds
+
+_current = threading.local()
+
+def current_timer() -> Optional[RequestTimer]:
+    return getattr(_current, "timer", None)
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        out = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            out.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        out.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        out.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        out.append(f"{name}_count{{{labels}}} {self.count}")
+        return out
+
+class RouteStats:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.request_size = Histogram(SIZE_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.statuses: Dict[int, int] = {}
+        self.db_commands = 0
+        self.db_seconds = 0.0
+        self.outbound: Dict[str, List[float]] = {}
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class RequestMetrics:
+    """Process-wide metric registry"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.mongo_commands: Dict[str, List[float]] = {}
+        self.outbound: Dict[str, Histogram] = {}
+        self.outbound_errors: Dict[str, int] = {}
+        self.in_flight = 0
+        self.slow_requests: Deque[Dict[str, Any]] = deque(maxlen=SLOW_REQUEST_HISTORY)
+
+    def begin(self):
+        _current.timer = RequestTimer()
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, route: str, method: str, status: int, request_bytes: int,
+               response_bytes: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Record the request on this thread; returns its stage breakdown if it was slow"""
+        timer = current_timer()
+        _current.timer = None
+        if timer is None:
+            return None
+        elapsed = time.perf_counter() - timer.started
+        with self._lock:
+            self.in_flight -= 1
+            stats = self.routes.setdefault((route, method), RouteStats())
+            stats.latency.observe(elapsed)
+            stats.request_size.observe(request_bytes)
+            if response_bytes is not None:
+                stats.response_size.observe(response_bytes)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.db_commands += timer.db_commands
+            stats.db_seconds += timer.db_seconds
+            for target, (calls, seconds) in timer.outbound.items():
+                totals = stats.outbound.setdefault(target, [0, 0.0])
+                totals[0] += calls
+                totals[1] += seconds
+
+        if elapsed * 1000 < SLOW_REQUEST_MS:
+            return None
+        outbound_seconds = sum(seconds for _, seconds in timer.outbound.values())
+        breakdown = {
+            "route": route,
+            "method": method,
+            "status": status,
+            "total_ms": round(elapsed * 1000, 1),
+            "db_ms": round(timer.db_seconds * 1000, 1),
+            "db_commands": timer.db_commands,
+            "outbound_ms": {target: round(seconds * 1000, 1) for target, (_, seconds) in timer.outbound.items()},
+            "app_ms": round(max(0.0, elapsed - timer.db_seconds - outbound_seconds) * 1000, 1),
+            "request_bytes": request_bytes,
+            "response_bytes": response_bytes,
+            "at": time.time()
+        }
+        with self._lock:
+            self.slow_requests.append(breakdown)
+        return breakdown
+
+    def record_mongo(self, command: str, seconds: float, failed: bool = False):
+        timer = current_timer()
+        if timer is not None:
+            timer.db_commands += 1
+            timer.db_seconds += seconds
+        with self._lock:
+            totals = self.mongo_commands.setdefault(command, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            if failed:
+                totals[2] += 1
+
+    def record_outbound(self, target: str, seconds: float, failed: bool = False):
+        timer = current_timer()
+        if timer is not None:
+            timer.add_outbound(target, seconds)
+        with self._lock:
+            self.outbound.setdefault(target, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            if failed:
+                self.outbound_errors[target] = self.outbound_errors.get(target, 0) + 1
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        out = [
+            "# HELP http_request_duration_seconds Request latency per route",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            routes = sorted(self.routes.items())
+            for (route, method), stats in routes:
+                out += stats.latency.lines("http_request_duration_seconds",
+                                           f'route="{_escape(route)}",method="{method}"')
+            out += ["# HELP http_request_size_bytes Request body size per route",
+                    "# TYPE http_request_size_bytes histogram"]
+            for (route, method), stats in routes:
+                out += stats.request_size.lines("http_request_size_bytes", f'route="{_escape(route)}",method="{method}"')
+            out += ["# HELP http_response_size_bytes Response body size per route (streamed responses excluded)",
+                    "# TYPE http_response_size_bytes histogram"]
+            for (route, method), stats in routes:
+                out += stats.response_size.lines("http_response_size_bytes", f'route="{_escape(route)}",method="{method}"')
+            out += ["# HELP http_requests_total Requests per route and status",
+                    "# TYPE http_requests_total counter"]
+            for (route, method), stats in routes:
+                for status, count in sorted(stats.statuses.items()):
+                    out.append(f'http_requests_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {count}')
+            out += ["# HELP http_request_db_commands_total MongoDB commands issued while serving the route",
+                    "# TYPE http_request_db_commands_total counter"]
+            for (route, method), stats in routes:
+                out.append(f'http_request_db_commands_total{{route="{_escape(route)}",method="{method}"}} {stats.db_commands}')
+            out += ["# HELP http_request_db_seconds_total MongoDB time spent while serving the route",
+                    "# TYPE http_request_db_seconds_total counter"]
+            for (route, method), stats in routes:
+                out.append(f'http_request_db_seconds_total{{route="{_escape(route)}",method="{method}"}} {stats.db_seconds:.6f}')
+            out += ["# HELP http_request_outbound_seconds_total Outbound HTTP/SMTP time spent while serving the route",
+                    "# TYPE http_request_outbound_seconds_total counter"]
+            for (route, method), stats in routes:
+                for target, (_, seconds) in sorted(stats.outbound.items()):
+                    out.append(f'http_request_outbound_seconds_total{{route="{_escape(route)}",method="{method}",'
+                               f'target="{target}"}} {seconds:.6f}')
+            out += ["# HELP http_request_outbound_calls_total Outbound calls made while serving the route",
+                    "# TYPE http_request_outbound_calls_total counter"]
+            for (route, method), stats in routes:
+                for target, (calls, _) in sorted(stats.outbound.items()):
+                    out.append(f'http_request_outbound_calls_total{{route="{_escape(route)}",method="{method}",'
+                               f'target="{target}"}} {calls}')
+            out += ["# HELP http_requests_in_flight Requests being served",
+                    "# TYPE http_requests_in_flight gauge",
+                    f"http_requests_in_flight {self.in_flight}"]
+            out += ["# HELP mongodb_commands_total MongoDB commands by name (requests and background work)",
+                    "# TYPE mongodb_commands_total counter"]
+            for command, (count, _, _) in sorted(self.mongo_commands.items()):
+                out.append(f'mongodb_commands_total{{command="{command}"}} {count}')
+            out += ["# HELP mongodb_command_seconds_total MongoDB command time by name",
+                    "# TYPE mongodb_command_seconds_total counter"]
+            for command, (_, seconds, _) in sorted(self.mongo_commands.items()):
+                out.append(f'mongodb_command_seconds_total{{command="{command}"}} {seconds:.6f}')
+            out += ["# HELP mongodb_command_failures_total Failed MongoDB commands by name",
+                    "# TYPE mongodb_command_failures_total counter"]
+            for command, (_, _, failures) in sorted(self.mongo_commands.items()):
+                out.append(f'mongodb_command_failures_total{{command="{command}"}} {failures}')
+            out += ["# HELP outbound_request_duration_seconds Outbound call latency by target (requests and background work)",
+                    "# TYPE outbound_request_duration_seconds histogram"]
+            for target, histogram in sorted(self.outbound.items()):
+                out += histogram.lines("outbound_request_duration_seconds", f'target="{target}"')
+            out += ["# HELP outbound_request_failures_total Failed outbound calls by target",
+                    "# TYPE outbound_request_failures_total counter"]
+            for target, count in sorted(self.outbound_errors.items()):
+                out.append(f'outbound_request_failures_total{{target="{target}"}} {count}')
+        return "\n".join(out) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.routes.clear()
+            self.mongo_commands.clear()
+            self.outbound.clear()
+            self.outbound_errors.clear()
+            self.slow_requests.clear()
+
+# Global instance
+request_metrics = RequestMetrics()
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Feeds pymongo command durations into the metrics; events fire on the calling thread"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        request_metrics.record_mongo(event.command_name, event.duration_micros / 1e6)
+
+    def failed(self, event):
+        request_metrics.record_mongo(event.command_name, event.duration_micros / 1e6, failed=True)
+
+if METRICS_ENABLED:
+    # Applies to every MongoClient created after this import (app_core imports it first)
+    monitoring.register(MongoCommandListener())
+
+def record_outbound(target: str, seconds: float, failed: bool = False):
+    request_metrics.record_outbound(target, seconds, failed)
+
+@contextmanager
+def track_outbound(target: str):
+    """Time an outbound call (openai, n8n, elevenlabs, smtp) for the current route and globally"""
+    started = time.perf_counter()
+    failed = False
+    try:
+        yield
+    except Exception:
+        failed = True
+        raise
+    finally:
+        record_outbound(target, time.perf_counter() - started, failed)
+
+def _route_label() -> str:
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+def install_metrics(app):
+    """Time every request of app and serve /metrics and /metrics/slow-requests"""
+    if not METRICS_ENABLED or app.extensions.get("request_metrics"):
+        return
+    app.extensions["request_metrics"] = request_metrics
+
+    @app.before_request
+    def _start_request_timer():
+        request_metrics.begin()
+
+    @app.after_request
+    def _record_request_metrics(response):
+        if response.is_streamed or response.direct_passthrough:
+            response_bytes = None
+        else:
+            response_bytes = response.calculate_content_length()
+        slow = request_metrics.finish(_route_label(), request.method, response.status_code,
+                                      request.content_length or 0, response_bytes)
+        if slow is not None:
+            logger.warning(f"🐢 Slow request {slow['method']} {slow['route']} took {slow['total_ms']} ms",
+                           extra={"stages": slow})
+        return response
+
+    def metrics():
+        if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+            return jsonify({"error": "Unauthorized"}), 401
+        return Response(request_metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    def slow_requests():
+        if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+            return jsonify({"error": "Unauthorized"}), 401
+        return jsonify({"success": True, "threshold_ms": SLOW_REQUEST_MS,
+                        "requests": list(reversed(request_metrics.slow_requests))}), 200
+
+    app.add_url_rule("/metrics", "metrics", metrics, methods=["GET"])
+    app.add_url_rule("/metrics/slow-requests", "slow_requests", slow_requests, methods=["GET"])
@@ -0,0 +1,68 @@
+"""
+Response Compression - Negotiated brotli/gzip for large responses
+
+``install_compression(app)`` compresses JSON and text responses of at least
+COMPRESS_MIN_BYTES when the client's Accept-Encoding allows it. Brotli is
+preferred when the ``brotli`` package is installed; gzip otherwise. Small
+responses are sent as-is (compressing them costs more than it saves), and
+streamed, already-encoded and 204/304 responses are never touched.
+"""
+
+import os
+import gzip
+from typing import Optional
+
+from flask import request
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+COMPRESS_ENABLED = os.getenv("COMPRESS_ENABLED", "true").lower() == "true"
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+# Brotli 11 is far too slow for per-request use; 4-5 beats gzip 6 at similar cost
+COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/javascript", "text/html", "text/plain",
+                          "text/css", "text/csv", "text/xml", "application/xml", "image/svg+xml"}
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Best encoding the client accepts: br, then gzip"""
+    if BROTLI_AVAILABLE and accept_encodings.quality("br") > 0:
+        return "br"
+    if accept_encodings.quality("gzip") > 0:
+        return "gzip"
+    return None
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+def compress_response(response):
+    if not COMPRESS_ENABLED:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (response.direct_passthrough or response.is_streamed or response.status_code in (204, 304)
+            or response.status_code < 200 or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    if response.get_etag()[0]:
+        # The encoded bytes differ from what a strong ETag was computed over
+        response.set_etag(response.get_etag()[0], weak=True)
+    return response
+
+def install_compression(app):
+    """Compress responses in an after_request hook"""
+    app.after_request(compress_response)
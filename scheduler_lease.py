@@ -0,0 +1,171 @@
+"""
+Scheduler Lease - Run a periodic job once per cluster
+
+Every scheduler process competes for lease documents in ``scheduler_leases``
+(one per job partition). The holder of partition p runs the job for the
+patients with ``patient_partition(patient_id, partitions) == p`` and renews the
+lease from a heartbeat thread; a lease that is not renewed within
+SCHEDULER_LEASE_SECONDS expires and another process takes it over. The time
+of the last run is kept on the lease, so a takeover keeps the job's cadence.
+
+With REMINDER_PARTITIONS=1 (the default) this is plain leader election. When
+one leader cannot keep up, raise REMINDER_PARTITIONS and cap
+SCHEDULER_MAX_PARTITIONS_PER_NODE so the partitions spread across processes.
+"""
+
+import os
+import time
+import uuid
+import zlib
+import socket
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+LEASE_COLLECTION = "scheduler_leases"
+LEASE_SECONDS = int(os.getenv("SCHEDULER_LEASE_SECONDS", "90"))
+HEARTBEAT_SECONDS = int(os.getenv("SCHEDULER_HEARTBEAT_SECONDS", "30"))
+# Allowance for clock differences between nodes when judging our own lease
+CLOCK_SKEW_SECONDS = 5
+PARTITIONS = int(os.getenv("REMINDER_PARTITIONS", "1"))
+# 0 = as many partitions as are free
+MAX_PARTITIONS_PER_NODE = int(os.getenv("SCHEDULER_MAX_PARTITIONS_PER_NODE", "0"))
+
+def node_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+def patient_partition(patient_id: str, partitions: int) -> int:
+    """Stable partition of a patient (crc32, not the per-process salted hash())"""
+    return zlib.crc32(str(patient_id).encode("utf-8")) % partitions if partitions > 1 else 0
+
+class MongoLease:
+    """A named lease held by one owner until it expires or is released"""
+
+    def __init__(self, collection, name: str, owner: str, ttl: int = LEASE_SECONDS):
+        self.collection = collection
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.last_run_at: Optional[datetime] = None
+        self._deadline: Optional[float] = None
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free or expired, or extend it if we hold it"""
+        started = time.monotonic()
+        now = datetime.utcnow()
+        try:
+            lease = self.collection.find_one_and_update(
+                {"_id": self.name, "$or": [{"owner": self.owner}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.ttl), "heartbeat_at": now}},
+                upsert=True, return_document=ReturnDocument.AFTER)
+        except DuplicateKeyError:
+            # Held by someone else: the filter missed and the upsert collided on _id
+            lease = None
+        if lease is None or lease.get("owner") != self.owner:
+            self._deadline = None
+            return False
+        self.last_run_at = lease.get("last_run_at")
+        self._deadline = started + self.ttl - CLOCK_SKEW_SECONDS
+        return True
+
+    renew = acquire
+
+    @property
+    def held(self) -> bool:
+        return self._deadline is not None and time.monotonic() < self._deadline
+
+    def mark_run(self, at: datetime):
+        self.last_run_at = at
+        self.collection.update_one({"_id": self.name, "owner": self.owner}, {"$set": {"last_run_at": at}})
+
+    def release(self):
+        if self._deadline is not None:
+            self.collection.update_one({"_id": self.name, "owner": self.owner},
+                                       {"$set": {"expires_at": datetime.utcnow()}})
+        self._deadline = None
+
+class PartitionedScheduler:
+    """Runs task(partition, partitions, lease) every interval for each partition this node holds"""
+
+    def __init__(self, database, job: str, task: Callable[[int, int, MongoLease], int], interval: float,
+                 partitions: int = PARTITIONS, max_partitions: int = MAX_PARTITIONS_PER_NODE,
+                 owner: Optional[str] = None, heartbeat: float = HEARTBEAT_SECONDS):
+        self.job = job
+        self.task = task
+        self.interval = interval
+        self.partitions = max(1, partitions)
+        self.max_partitions = max_partitions or self.partitions
+        self.heartbeat_seconds = heartbeat
+        self.owner = owner or node_id()
+        collection = database[LEASE_COLLECTION]
+        self.leases = [MongoLease(collection, f"{job}:{p}", self.owner) for p in range(self.partitions)]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def held(self) -> List[int]:
+        return [p for p, lease in enumerate(self.leases) if lease.held]
+
+    def heartbeat(self) -> List[int]:
+        """Renew held leases, then claim free ones up to max_partitions"""
+        with self._lock:
+            for lease in self.leases:
+                if lease.held:
+                    lease.renew()
+            for lease in self.leases:
+                if len(self.held()) >= self.max_partitions:
+                    break
+                if not lease.held:
+                    lease.acquire()
+            return self.held()
+
+    def run_due(self) -> int:
+        """Run the task for every held partition whose last run is at least interval ago"""
+        processed = 0
+        for partition, lease in enumerate(self.leases):
+            now = datetime.utcnow()
+            if not lease.held:
+                continue
+            if lease.last_run_at is not None and (now - lease.last_run_at).total_seconds() < self.interval:
+                continue
+            try:
+                processed += self.task(partition, self.partitions, lease) or 0
+            finally:
+                if lease.held:
+                    lease.mark_run(now)
+        return processed
+
+    def _keep_alive(self):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.warning(f"⚠️ {self.job} lease heartbeat failed: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.heartbeat()
+                self.run_due()
+            except Exception:
+                logger.exception(f"❌ Error in {self.job} scheduler")
+            self._stop.wait(self.heartbeat_seconds)
+
+    def start(self) -> threading.Thread:
+        """Heartbeat and run loops in daemon threads; returns the run loop thread"""
+        threading.Thread(target=self._keep_alive, name=f"{self.job}-heartbeat", daemon=True).start()
+        thread = threading.Thread(target=self._run, name=f"{self.job}-scheduler", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            for lease in self.leases:
+                lease.release()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Scheduler Process - Background jobs outside the web workers
+
+Runs the medication reminder check and the nightly pregnancy week advancer.
+Web workers never start these. Medication reminders are leader-elected through
+MongoDB leases (scheduler_lease.py), so several scheduler processes can run
+for failover and still send each reminder once; the pregnancy week advancer is
+idempotent. It exits non-zero if a scheduler thread dies so the platform
+restarts it, and releases its leases on SIGTERM so another process takes over.
+
+Usage:
+    python scheduler_process.py
+"""
+
+import sys
+import signal
+import threading
+
+from app_logging import configure_logging, get_logger
+
+# Before app_core connects, so startup messages already reach the log stream
+configure_logging()
+
+import app_core  # noqa: E402
+from app_core import db, start_medication_reminder_scheduler  # noqa: E402
+from pregnancy_week import start_pregnancy_week_scheduler  # noqa: E402
+
+logger = get_logger(__name__)
+
+HEALTH_CHECK_SECONDS = 60
+
+def main():
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    threads = {
+        "medication reminders": start_medication_reminder_scheduler(),
+        "pregnancy weeks": start_pregnancy_week_scheduler(db.patients_collection),
+    }
+    if not any(threads.values()):
+        logger.error("❌ No scheduler could be started")
+        sys.exit(1)
+    logger.info(f"✅ Scheduler process running: {', '.join(name for name, thread in threads.items() if thread)}")
+
+    while not stop.wait(HEALTH_CHECK_SECONDS):
+        dead = [name for name, thread in threads.items() if thread is not None and not thread.is_alive()]
+        if dead:
+            logger.error(f"❌ Scheduler thread stopped: {', '.join(dead)}")
+            sys.exit(1)
+    if app_core.medication_reminder_scheduler is not None:
+        app_core.medication_reminder_scheduler.stop()
+    logger.info("👋 Scheduler process stopped")
+
+if __name__ == "__main__":
+    main()
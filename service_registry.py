@@ -0,0 +1,155 @@
+"""
+Service Registry - Lazy loading of heavy subsystems for app_simple.py
+Defers importing and initialising each service until the first route needs it,
+optionally warming selected services in a background thread after startup.
+"""
+
+import os
+import sys
+import time
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+def current_rss_mb() -> Optional[float]:
+    """Return the current resident set size of this process in MB (None where unavailable, e.g. Windows)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        # Unix only; not importable on Windows
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is KB on Linux and bytes on macOS; it is the peak, not current, RSS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+class ServiceRegistry:
+    """Registry of named service factories that are created on first use"""
+
+    def __init__(self, lazy: bool = True):
+        self.lazy = lazy
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self.created_at = time.perf_counter()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> "LazyService":
+        """Register a factory and return a proxy that loads the service on first access"""
+        self._factories[name] = factory
+        self._locks[name] = threading.Lock()
+        self._stats[name] = {"loaded": False, "load_time_ms": None, "rss_delta_mb": None, "error": None}
+        return LazyService(self, name)
+
+    def get(self, name: str) -> Any:
+        """Return the service instance, creating it on first call (thread-safe)"""
+        if name in self._instances:
+            return self._instances[name]
+
+        with self._locks[name]:
+            if name in self._instances:
+                return self._instances[name]
+
+            rss_before = current_rss_mb()
+            started = time.perf_counter()
+            try:
+                instance = self._factories[name]()
+            except Exception as e:
+                self._stats[name]["error"] = str(e)
+                print(f"❌ Failed to load service '{name}': {e}")
+                raise
+
+            rss_after = current_rss_mb()
+            self._stats[name].update({
+                "loaded": True,
+                "load_time_ms": round((time.perf_counter() - started) * 1000, 1),
+                "rss_delta_mb": None if rss_before is None or rss_after is None else round(rss_after - rss_before, 1),
+                "loaded_at": datetime.now().isoformat(),
+                "error": None
+            })
+            self._instances[name] = instance
+            print(f"✅ Service '{name}' loaded in {self._stats[name]['load_time_ms']} ms")
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._factories.keys())
+
+    def load_all(self, names: Optional[List[str]] = None):
+        """Load services synchronously; failures are recorded and skipped"""
+        for name in names or self.names:
+            try:
+                self.get(name)
+            except Exception:
+                continue
+
+    def warm_up(self, names: Optional[List[str]] = None) -> threading.Thread:
+        """Load services in a background daemon thread"""
+        names = [n for n in (names or self.names) if n in self._factories]
+        thread = threading.Thread(target=self.load_all, args=(names,), name="service-warmup", daemon=True)
+        thread.start()
+        print(f"🔥 Warming services in background: {', '.join(names)}")
+        return thread
+
+    def report(self) -> Dict[str, Any]:
+        """Per-service load status, load time and RSS delta"""
+        rss_mb = current_rss_mb()
+        return {
+            "lazy": self.lazy,
+            "uptime_seconds": round(time.perf_counter() - self.created_at, 1),
+            "rss_mb": None if rss_mb is None else round(rss_mb, 1),
+            "services": {name: dict(stats) for name, stats in self._stats.items()}
+        }
+
+class LazyService:
+    """Proxy that forwards attribute access to a registry-managed service"""
+
+    __slots__ = ("_registry", "_name")
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._registry.get(self._name), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._registry.get(self._name), attr, value)
+
+    def __bool__(self) -> bool:
+        # Services that are unavailable resolve to None
+        return bool(self._registry.get(self._name))
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._registry.is_loaded(self._name) else "not loaded"
+        return f"<LazyService {self._name} ({state})>"
+
+def _parse_service_list(value: str, available: List[str]) -> List[str]:
+    value = (value or "").strip()
+    if not value:
+        return []
+    if value.lower() == "all":
+        return list(available)
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+def start_services(registry: ServiceRegistry) -> Optional[threading.Thread]:
+    """Apply LAZY_SERVICES / SERVICE_WARMUP settings once all services are registered"""
+    if not registry.lazy:
+        registry.load_all()
+        return None
+
+    warm = _parse_service_list(os.getenv("SERVICE_WARMUP", ""), registry.names)
+    if warm:
+        return registry.warm_up(warm)
+    return None
+
+# Global registry; set LAZY_SERVICES=false to restore eager loading
+services = ServiceRegistry(lazy=os.getenv("LAZY_SERVICES", "true").lower() != "false")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark and import-time profiler for app_simple.py
+
+Boots the app in a fresh interpreter (lazy and eager service loading), records
+wall-clock import time and RSS, and parses ``python -X importtime`` output into
+a report of the slowest imports. Save the JSON report per release and pass it
+back with --baseline to see the difference.
+
+Usage:
+    python startup_benchmark.py --runs 3 --output startup_report.json
+    python startup_benchmark.py --baseline startup_report.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+from typing import Dict, List
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BOOT_SCRIPT = """
+import json, time, resource
+started = time.perf_counter()
+import app_simple
+elapsed = time.perf_counter() - started
+from service_registry import current_rss_mb
+print("STARTUP_RESULT " + json.dumps({
+    "import_seconds": elapsed,
+    "rss_mb": current_rss_mb(),
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded_services": [name for name in app_simple.services.names if app_simple.services.is_loaded(name)]
+}))
+"""
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Parse ``-X importtime`` lines into per-module self/cumulative microseconds"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        name = parts[2].rstrip()
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000
+        })
+    return modules
+
+def run_boot(lazy: bool) -> Dict:
+    """Import app_simple once in a fresh interpreter"""
+    env = dict(os.environ, LAZY_SERVICES="true" if lazy else "false", PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT_SCRIPT],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    result_line = next((l for l in proc.stdout.splitlines() if l.startswith("STARTUP_RESULT ")), None)
+    if proc.returncode != 0 or result_line is None:
+        raise RuntimeError(f"app_simple failed to start (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+    result = json.loads(result_line[len("STARTUP_RESULT "):])
+    result["imports"] = parse_importtime(proc.stderr)
+    return result
+
+def summarize(runs: List[Dict], top: int) -> Dict:
+    """Median timings across runs plus the slowest top-level imports of the first run"""
+    top_level = [m for m in runs[0]["imports"] if m["depth"] == 1]
+    top_level.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+    return {
+        "runs": len(runs),
+        "import_seconds": round(statistics.median(r["import_seconds"] for r in runs), 3),
+        "rss_mb": round(statistics.median(r["rss_mb"] for r in runs), 1),
+        "max_rss_mb": round(statistics.median(r["max_rss_mb"] for r in runs), 1),
+        "loaded_services": runs[0]["loaded_services"],
+        "slowest_imports": [
+            {"module": m["module"], "cumulative_ms": round(m["cumulative_ms"], 1), "self_ms": round(m["self_ms"], 1)}
+            for m in top_level[:top]
+        ]
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=APP_DIR, text=True).strip()
+    except Exception:
+        return "unknown"
+
+def print_report(report: Dict, baseline: Dict = None):
+    print(f"\n🚀 Startup benchmark ({report['revision']}, {report['created_at']})")
+    print("=" * 70)
+    for mode, summary in report["modes"].items():
+        line = (f"{mode:>6}: import {summary['import_seconds']:.3f}s | "
+                f"RSS {summary['rss_mb']:.1f} MB | peak {summary['max_rss_mb']:.1f} MB")
+        if baseline and mode in baseline.get("modes", {}):
+            base = baseline["modes"][mode]
+            line += (f" | Δ {summary['import_seconds'] - base['import_seconds']:+.3f}s, "
+                     f"{summary['rss_mb'] - base['rss_mb']:+.1f} MB")
+        print(line)
+
+    for mode, summary in report["modes"].items():
+        print(f"\n📦 Slowest top-level imports ({mode})")
+        for m in summary["slowest_imports"]:
+            print(f"   {m['cumulative_ms']:9.1f} ms  {m['module']}")
+        if summary["loaded_services"]:
+            print(f"   services loaded at boot: {', '.join(summary['loaded_services'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app_simple.py startup time and memory")
+    parser.add_argument("--runs", type=int, default=3, help="boots per mode (median is reported)")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--mode", choices=["lazy", "eager", "both"], default="both")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    args = parser.parse_args()
+
+    modes = ["lazy", "eager"] if args.mode == "both" else [args.mode]
+    report = {
+        "revision": git_revision(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "modes": {}
+    }
+    for mode in modes:
+        print(f"⏱️ Booting app_simple ({mode}) x{args.runs}...")
+        runs = [run_boot(lazy=(mode == "lazy")) for _ in range(args.runs)]
+        report["modes"][mode] = summarize(runs, args.top)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Streaming responses for LLM-backed endpoints
+
+Clients opt in with ``?stream=sse`` / ``?stream=ndjson`` or an ``Accept`` header of
+``text/event-stream`` / ``application/x-ndjson``. Endpoints yield ``(event, data)``
+pairs: ``evidence`` first (retrieval results), then ``token`` deltas as the model
+produces them, and finally ``result`` with the same body the blocking endpoint
+returns. Failures after the stream has started are sent as an ``error`` event.
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from flask import Response, request, stream_with_context
+
+from app_logging import get_logger
+
+logger = get_logger(__name__)
+
+STREAM_MIMETYPES = {
+    "sse": "text/event-stream",
+    "ndjson": "application/x-ndjson",
+}
+
+def requested_stream_mode(req=None) -> Optional[str]:
+    """Return 'sse', 'ndjson' or None when the client did not ask for streaming"""
+    req = req or request
+    mode = (req.args.get("stream") or "").lower()
+    if mode in STREAM_MIMETYPES:
+        return mode
+    if mode in ("1", "true"):
+        return "sse"
+    accept = req.headers.get("Accept", "")
+    if "text/event-stream" in accept:
+        return "sse"
+    if "application/x-ndjson" in accept:
+        return "ndjson"
+    return None
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def format_event(mode: str, event: str, data: Any) -> str:
+    payload = json.dumps(data, default=_json_default)
+    if mode == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return json.dumps({"event": event, "data": data}, default=_json_default) + "\n"
+
+def stream_events(events: Iterable[Tuple[str, Any]], mode: str) -> Response:
+    """Wrap an (event, data) generator in a streaming Flask response"""
+    def generate():
+        try:
+            for event, data in events:
+                yield format_event(mode, event, data)
+        except Exception as e:
+            logger.error(f"❌ Stream failed: {e}")
+            yield format_event(mode, "error", {"success": False, "message": f"Error: {str(e)}"})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=STREAM_MIMETYPES[mode],
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # disable proxy buffering so tokens arrive as they are sent
+        }
+    )
+
+def stream_chat_completion(client, **kwargs) -> Iterator[str]:
+    """Yield content deltas from an OpenAI chat completion"""
+    for chunk in client.chat.completions.create(stream=True, **kwargs):
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            yield delta
+
+def relay_tokens(tokens: Iterable[str], parts: list) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """Forward deltas as token events while collecting them into parts"""
+    for delta in tokens:
+        parts.append(delta)
+        yield "token", {"text": delta}
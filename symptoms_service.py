@@ -6,10 +6,12 @@ Provides AI-powered pregnancy symptom analysis using vector embeddings and LLM
 import os
 import json
 import numpy as np
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 from pymongo import MongoClient
 import openai
+from streaming import stream_chat_completion, relay_tokens
+from llm_gateway import llm_gateway, PRIORITY_INTERACTIVE
+from knowledge_ingestion import KnowledgeIngestion, LocalVectorIndex, QdrantIndex, knowledge_document
 # Optional imports with fallbacks
 try:
     from sentence_transformers import SentenceTransformer
@@ -45,6 +47,7 @@ class SymptomsService:
         self.openai_client = None
         self.mongo_client = None
         self.db = None
+        self._ingestion = None
         self._initialize_services()
     
     def _initialize_services(self):
@@ -77,9 +80,8 @@ class SymptomsService:
             
             # Initialize OpenAI client
             if OPENAI_AVAILABLE and openai is not None:
-                openai_api_key = os.getenv('OPENAI_API_KEY')
-                if openai_api_key:
-                    self.openai_client = openai.OpenAI(api_key=openai_api_key)
+                self.openai_client = llm_gateway.client_for('symptoms', PRIORITY_INTERACTIVE)
+                if self.openai_client:
                     print("✅ OpenAI client initialized")
                 else:
                     print("⚠️ OpenAI API key not found, using fallback mode")
@@ -111,11 +113,16 @@ class SymptomsService:
             print(f"❌ Error generating embeddings: {e}")
             return np.random.random(384).tolist()
     
+    def get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed many texts in one model call"""
+        batch_size = int(os.getenv('EMBED_MODEL_BATCH_SIZE', '64'))
+        return self.embedding_model.encode(texts, batch_size=batch_size, show_progress_bar=False).tolist()
+    
     def retrieve_knowledge(self, query: str, weeks_pregnant: int, top_k: int = 5) -> List[Dict]:
         """Retrieve relevant knowledge from vector database"""
         try:
             if not self.qdrant_client:
-                return []
+                return self._retrieve_local(query, weeks_pregnant, top_k)
             
             # Generate query embedding
             query_embedding = self.get_embeddings(query)
@@ -157,52 +164,93 @@ class SymptomsService:
             print(f"❌ Error retrieving knowledge: {e}")
             return []
     
+    def _retrieve_local(self, query: str, weeks_pregnant: int, top_k: int) -> List[Dict]:
+        """Search the in-process index filled by ingest_knowledge when Qdrant is not configured"""
+        if self._ingestion is None or not getattr(self._ingestion.index, 'points', None):
+            return []
+        trimester = self._get_trimester(weeks_pregnant)
+        hits = self._ingestion.index.search(self.get_embeddings(query), top_k,
+                                            None if trimester == "all" else trimester)
+        return [{
+            'id': hit['id'],
+            'text': hit['payload'].get('text', ''),
+            'source': hit['payload'].get('source', 'Unknown'),
+            'score': hit['score'],
+            'metadata': hit['payload']
+        } for hit in hits]
+    
+    def _summary_request(self, query: str, weeks_pregnant: int, suggestions: List[Dict]) -> Dict:
+        """Chat completion arguments for summarising retrieved evidence"""
+        # Prepare context from suggestions
+        context_text = "\n\n".join([s['text'] for s in suggestions])
+        
+        # System prompt
+        system_prompt = os.getenv(
+            'SUMMARY_SYSTEM_PROMPT',
+            "You are a cautious medical assistant supporting an obstetrician. "
+            "Your ONLY knowledge source is the evidence bullets provided in the user message. "
+            "Do NOT use outside knowledge.\n\n"
+            "Primary task:\n"
+            "- Based on the evidence, determine the overall urgency level (mild, moderate, urgent) for the patient's symptoms.\n"
+            "- Provide a concise, trimester-specific guidance summary for a pregnant patient.\n\n"
+            "Instructions:\n"
+            "- Use 3–5 short bullets.\n"
+            "- Include one bullet explicitly stating when to seek urgent care, based on evidence triage tags.\n"
+            "- Be clear, factual, and non-alarmist.\n"
+            "- If evidence is conflicting or insufficient, state that clearly.\n"
+            "- Do NOT invent facts not present in evidence.\n"
+            "- Do NOT recommend medications, dosages, diagnostic codes, or brand names.\n"
+            "- Do NOT make definitive diagnoses; frame as possible concerns and next steps.\n"
+            "- Keep lay-friendly tone; avoid jargon where possible.\n"
+            "- Assume this is general guidance, not a substitute for clinical judgment.\n\n"
+            "Output format:\n"
+            "- Start with: 'Urgency level: <mild/moderate/urgent/uncertain>'\n"
+            "- Then list plain text bullets (no numbering, no markdown headings).\n"
+            "- Each bullet ≤ 25 words."
+        )
+        
+        # User message
+        user_message = f"Patient query: {query}\n\nPregnancy week: {weeks_pregnant}\n\nEvidence:\n{context_text}"
+        
+        return {
+            'model': os.getenv('LLM_MODEL', 'gpt-4o-mini'),
+            'messages': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            'max_tokens': 500,
+            'temperature': 0.3
+        }
+    
+    def _fallback_request(self, query: str, weeks_pregnant: int) -> Dict:
+        """Chat completion arguments for answering without retrieved evidence"""
+        system_prompt = os.getenv(
+            'FALLBACK_SYSTEM_PROMPT',
+            "You are a cautious pregnancy symptom assistant. Provide 3-5 concise, trimester-aware self-care suggestions, "
+            "avoid medications/doses, include when to seek urgent care, and always add a medical disclaimer."
+        )
+        
+        user_message = f"Patient query: {query}\n\nPregnancy week: {weeks_pregnant}"
+        
+        return {
+            'model': os.getenv('LLM_MODEL', 'gpt-4o-mini'),
+            'messages': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            'max_tokens': 300,
+            'temperature': 0.3
+        }
+    
     def generate_llm_response(self, query: str, weeks_pregnant: int, suggestions: List[Dict]) -> Optional[Dict]:
         """Generate LLM response based on retrieved suggestions"""
         try:
             if not self.openai_client or not suggestions:
                 return None
             
-            # Prepare context from suggestions
-            context_text = "\n\n".join([s['text'] for s in suggestions])
-            
-            # System prompt
-            system_prompt = os.getenv(
-                'SUMMARY_SYSTEM_PROMPT',
-                "You are a cautious medical assistant supporting an obstetrician. "
-                "Your ONLY knowledge source is the evidence bullets provided in the user message. "
-                "Do NOT use outside knowledge.\n\n"
-                "Primary task:\n"
-                "- Based on the evidence, determine the overall urgency level (mild, moderate, urgent) for the patient's symptoms.\n"
-                "- Provide a concise, trimester-specific guidance summary for a pregnant patient.\n\n"
-                "Instructions:\n"
-                "- Use 3–5 short bullets.\n"
-                "- Include one bullet explicitly stating when to seek urgent care, based on evidence triage tags.\n"
-                "- Be clear, factual, and non-alarmist.\n"
-                "- If evidence is conflicting or insufficient, state that clearly.\n"
-                "- Do NOT invent facts not present in evidence.\n"
-                "- Do NOT recommend medications, dosages, diagnostic codes, or brand names.\n"
-                "- Do NOT make definitive diagnoses; frame as possible concerns and next steps.\n"
-                "- Keep lay-friendly tone; avoid jargon where possible.\n"
-                "- Assume this is general guidance, not a substitute for clinical judgment.\n\n"
-                "Output format:\n"
-                "- Start with: 'Urgency level: <mild/moderate/urgent/uncertain>'\n"
-                "- Then list plain text bullets (no numbering, no markdown headings).\n"
-                "- Each bullet ≤ 25 words."
-            )
-            
-            # User message
-            user_message = f"Patient query: {query}\n\nPregnancy week: {weeks_pregnant}\n\nEvidence:\n{context_text}"
-            
             # Call OpenAI
             response = self.openai_client.chat.completions.create(
-                model=os.getenv('LLM_MODEL', 'gpt-4o-mini'),
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
-                max_tokens=500,
-                temperature=0.3
+                **self._summary_request(query, weeks_pregnant, suggestions)
             )
             
             return {
@@ -219,22 +267,8 @@ class SymptomsService:
         try:
             if self.openai_client:
                 # Use LLM for fallback
-                system_prompt = os.getenv(
-                    'FALLBACK_SYSTEM_PROMPT',
-                    "You are a cautious pregnancy symptom assistant. Provide 3-5 concise, trimester-aware self-care suggestions, "
-                    "avoid medications/doses, include when to seek urgent care, and always add a medical disclaimer."
-                )
-                
-                user_message = f"Patient query: {query}\n\nPregnancy week: {weeks_pregnant}"
-                
                 response = self.openai_client.chat.completions.create(
-                    model=os.getenv('LLM_MODEL', 'gpt-4o-mini'),
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_message}
-                    ],
-                    max_tokens=300,
-                    temperature=0.3
+                    **self._fallback_request(query, weeks_pregnant)
                 )
                 
                 return {
@@ -292,23 +326,48 @@ class SymptomsService:
             print(f"❌ Error analyzing symptoms: {e}")
             return self.generate_fallback_response(query, weeks_pregnant)
     
+    def stream_symptom_analysis(self, query: str, weeks_pregnant: int) -> Iterator[Tuple[str, Any]]:
+        """Streaming analyze_symptoms: yields evidence, then token deltas, then the final result"""
+        suggestions = self.retrieve_knowledge(query, weeks_pregnant)
+        yield 'evidence', [
+            {'id': s['id'], 'text': s['text'], 'source': s['source'], 'score': s['score']}
+            for s in suggestions
+        ]
+        
+        if self.openai_client:
+            if suggestions:
+                request_kwargs = self._summary_request(query, weeks_pregnant, suggestions)
+            else:
+                request_kwargs = self._fallback_request(query, weeks_pregnant)
+            parts = []
+            try:
+                yield from relay_tokens(stream_chat_completion(self.openai_client, **request_kwargs), parts)
+                yield 'result', {
+                    'text': ''.join(parts),
+                    'disclaimers': os.getenv('DISCLAIMER_TEXT', 'This information is educational and not a medical diagnosis.')
+                }
+                return
+            except Exception as e:
+                if parts:
+                    raise
+                print(f"❌ Error streaming LLM response: {e}")
+        
+        # Static fallback, sent as a single token
+        response = self.generate_fallback_response(query, weeks_pregnant)
+        yield 'token', {'text': response['text']}
+        yield 'result', response
+    
     def save_knowledge_to_mongo(self, text: str, source: str = "YourClinic", 
                                tags: List[str] = None, trimester: str = "all") -> str:
         """Save knowledge to MongoDB for later ingestion"""
         try:
-            if not self.db:
+            if self.db is None:
                 return None
             
             collection_name = os.getenv('MONGO_COLLECTION', 'pregnancy_knowledge')
             collection = self.db[collection_name]
             
-            doc = {
-                'text': text,
-                'source': source,
-                'tags': tags or [],
-                'trimester': trimester,
-                'updated_at': datetime.utcnow()
-            }
+            doc = knowledge_document({'text': text, 'source': source, 'tags': tags or [], 'trimester': trimester})
             
             result = collection.insert_one(doc)
             return str(result.inserted_id)
@@ -316,6 +375,27 @@ class SymptomsService:
         except Exception as e:
             print(f"❌ Error saving knowledge to MongoDB: {e}")
             return None
-
+    
+    def save_knowledge_bulk(self, items: List[Dict]) -> Dict[str, Any]:
+        """Save many knowledge items with one insert_many"""
+        if self.db is None:
+            return {"inserted_ids": [], "failed_items": items}
+        return self.knowledge_ingestion().bulk_insert(items)
+    
+    def knowledge_ingestion(self) -> KnowledgeIngestion:
+        """Ingestion engine into Qdrant, or into an in-process index when Qdrant is not configured"""
+        if self._ingestion is None:
+            index = QdrantIndex(self.qdrant_client) if self.qdrant_client else LocalVectorIndex()
+            self._ingestion = KnowledgeIngestion(self.db, self.get_embeddings_batch, index)
+        return self._ingestion
+    
+    def ingest_knowledge(self, limit: Optional[int] = None, full: bool = False) -> Dict[str, Any]:
+        """Embed new or changed knowledge documents into the vector index"""
+        if self.db is None:
+            return {"success": False, "message": "MongoDB not connected"}
+        if self.embedding_model is None:
+            return {"success": False, "message": "Embedding model not available"}
+        return self.knowledge_ingestion().run(limit=limit, full=full)
+    
 # Global instance
 symptoms_service = SymptomsService()
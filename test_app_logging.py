@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test PHI redaction, per-route sampling and the queue-backed log handler
+"""
+
+import io
+import json
+import queue
+import logging
+from logging.handlers import QueueListener
+
+from flask import Flask
+
+import app_logging
+from app_logging import (AsyncQueueHandler, JsonFormatter, RedactionFilter, SamplingFilter,
+                         _parse_sample_rates, redact, request_overhead)
+
+def make_logger(name, rates="default=1"):
+    """A logger wired like configure_logging, writing JSON lines to a buffer"""
+    log_queue = queue.Queue(maxsize=100)
+    handler = AsyncQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(_parse_sample_rates(rates)))
+    handler.addFilter(RedactionFilter())
+    buffer = io.StringIO()
+    output = logging.StreamHandler(buffer)
+    output.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, output)
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger, handler, listener, buffer
+
+def lines(listener, buffer):
+    listener.start()
+    listener.stop()
+    return [json.loads(line) for line in buffer.getvalue().splitlines()]
+
+def test_redaction():
+    """PHI fields and patterns are masked in messages and structured payloads"""
+    print("📝 Testing App Logging")
+    print("=" * 50)
+    payload = {"userId": "PAT1", "email": "a@b.com", "notes": "felt dizzy",
+               "nested": [{"phone": "5551234567", "kicks": 12}]}
+    masked = redact(payload)
+    assert masked["userId"] == "PAT1" and masked["email"] == "[REDACTED]" and masked["notes"] == "[REDACTED]"
+    assert masked["nested"][0] == {"phone": "[REDACTED]", "kicks": 12}
+    assert payload["email"] == "a@b.com"
+    appointment = redact({"appointment_id": "APT1", "patient_name": "Jane Doe", "reason": "bleeding",
+                          "patient_mobile": "5551234567"})
+    assert appointment == {"appointment_id": "APT1", "patient_name": "[REDACTED]", "reason": "[REDACTED]",
+                           "patient_mobile": "[REDACTED]"}
+
+    logger, _, listener, buffer = make_logger("test.redaction")
+    logger.info("📧 OTP sent to jane.doe@example.com, call +1 555 123 4567")
+    logger.debug("🔍 Received sleep log data", extra={"payload": payload})
+    logger.info("Auth header Bearer abc.def.ghi")
+    logger.info("✅ Saved log for PAT1760000000ABC12F at 2026-10-19 12:00:00")
+    first, second, third, fourth = lines(listener, buffer)
+    assert "example.com" not in first["message"] and "4567" not in first["message"]
+    assert second["payload"]["email"] == "[REDACTED]" and second["payload"]["userId"] == "PAT1"
+    assert "abc.def" not in third["message"]
+    assert fourth["message"].endswith("PAT1760000000ABC12F at 2026-10-19 12:00:00")
+    print("✅ Emails, phone numbers, tokens and PHI fields redacted")
+
+def test_sampling_per_route():
+    """DEBUG/INFO follow the route's rate; warnings and errors are always kept"""
+    sampling = SamplingFilter(_parse_sample_rates("vitals.*=0,profile.get_profile=0.5,default=1"))
+    assert sampling.rate_for("vitals.get_vital_signs_history") == 0.0
+    assert sampling.rate_for("profile.get_profile") == 0.5
+    assert sampling.rate_for("auth.login") == 1.0 and sampling.rate_for(None) == 1.0
+
+    app = Flask(__name__)
+    logger, handler, listener, buffer = make_logger("test.sampling", "vitals.*=0")
+
+    @app.route("/vitals/history", endpoint="vitals.history")
+    def history():
+        for _ in range(5):
+            logger.info("📊 history read")
+        logger.warning("⚠️ slow query")
+        return "ok"
+
+    app.test_client().get("/vitals/history")
+    records = lines(listener, buffer)
+    assert [r["level"] for r in records] == ["WARNING"]
+    assert records[0]["route"] == "vitals.history"
+    print("✅ Per-route sampling drops INFO but keeps warnings")
+
+def test_queue_never_blocks():
+    """A full queue drops records instead of blocking the caller"""
+    logger, handler, listener, buffer = make_logger("test.full")
+    handler.queue = queue.Queue(maxsize=3)
+    for i in range(10):
+        logger.info("record %d", i)
+    assert handler.enqueued == 3 and handler.dropped_full == 7
+    print("✅ Full queue drops records without blocking")
+
+def test_request_overhead():
+    """configure_logging records the time each request spends logging"""
+    app = Flask(__name__)
+    app_logging.configure_logging(app, stream=io.StringIO())
+    log = app_logging.get_logger("test.overhead")
+
+    @app.route("/ping")
+    def ping():
+        log.info("ping from %s", "PAT1")
+        return "pong"
+
+    before = request_overhead.stats()["requests"]
+    app.test_client().get("/ping")
+    stats = app_logging.logging_stats()
+    assert stats["configured"] and stats["per_request"]["requests"] == before + 1
+    assert stats["per_request"]["max_us_per_request"] > 0
+    app_logging.flush_logs()
+    print(f"✅ Logging overhead per request: {stats['per_request']['avg_us_per_request']} us")
+
+if __name__ == "__main__":
+    test_redaction()
+    test_sampling_per_route()
+    test_queue_never_blocks()
+    test_request_overhead()
+    print("\n🎉 All app logging tests passed!")
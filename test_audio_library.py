@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the content-addressed TTS audio library used by mental health assessments
+"""
+
+import os
+import time
+import base64
+import tempfile
+import threading
+
+from flask import Flask, send_file
+
+import mental_health_service as mhs
+from audio_library import AudioLibrary, audio_id_for
+
+FAKE_MP3 = b"ID3" + bytes(range(256)) * 8
+
+def make_service(library):
+    """Mental health service with a temporary library and counted synthesis"""
+    mhs.audio_library = library
+    service = mhs.MentalHealthService()
+    service.elevenlabs_api_key = "test-key"
+    service.synthesized = []
+
+    def synthesize(text):
+        service.synthesized.append(text)
+        time.sleep(0.05)
+        return FAKE_MP3
+    service._synthesize = synthesize
+    return service
+
+def test_library_content_addressing():
+    """Ids depend on text and voice options; clips are stored once"""
+    print("🔊 Testing Audio Library")
+    print("=" * 50)
+    assert audio_id_for("வணக்கம்", voice_id="a") == audio_id_for("வணக்கம்", voice_id="a")
+    assert audio_id_for("வணக்கம்", voice_id="a") != audio_id_for("வணக்கம்", voice_id="b")
+
+    with tempfile.TemporaryDirectory() as root:
+        library = AudioLibrary(root)
+        audio_id = audio_id_for("hello")
+        calls = []
+
+        def synthesize():
+            calls.append(1)
+            time.sleep(0.1)
+            return FAKE_MP3
+
+        threads = [threading.Thread(target=library.get_or_create, args=(audio_id, synthesize)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        path, created = library.get_or_create(audio_id, synthesize)
+        assert len(calls) == 1 and not created
+        assert open(path, "rb").read() == FAKE_MP3
+        assert library.lookup("../../etc/passwd") is None
+        assert library.stats()["clips"] == 1
+    print("   ✅ 6 requests for one clip, 1 synthesis")
+
+def test_generate_audio_cached_and_story_urls():
+    """generate_audio synthesizes once and stories link to library clips"""
+    with tempfile.TemporaryDirectory() as root:
+        service = make_service(AudioLibrary(root))
+        story = service.complete_stories[0]["content"]
+
+        first = service.generate_audio(story)
+        second = service.generate_audio(story, include_data=False)
+        assert first["success"] and not first["cached"]
+        assert base64.b64decode(first["audio_data"]) == FAKE_MP3
+        assert second["cached"] and "audio_data" not in second
+        assert second["audio_url"] == f"/api/mental-health/audio/{second['audio_id']}"
+        assert service.synthesized == [story]
+
+        response = service.generate_story()
+        assert response["audio_url"].startswith("/api/mental-health/audio/")
+        assert all("audio_url" in q for q in response["questions"])
+
+        # Known story/question clips are synthesized on first play; unknown ids are not
+        question = service.complete_stories[1]["title"] + " கதையில் முக்கிய பாத்திரம் யார்?"
+        assert service.audio_for_id(service.tts_audio_id(question))
+        assert service.audio_for_id(audio_id_for("unknown")) is None
+
+        report = service.warm_audio_library()
+        assert report["errors"] == []
+        assert report["generated"] + report["cached"] == len(service.story_audio_texts())
+        assert len(service.synthesized) == len(service.story_audio_texts())
+    print("   ✅ Base64 kept for old clients, audio_url for new ones")
+
+def test_range_requests():
+    """Clips are served with HTTP range support"""
+    with tempfile.TemporaryDirectory() as root:
+        library = AudioLibrary(root)
+        audio_id = audio_id_for("range")
+        path = library.store(audio_id, FAKE_MP3)
+
+        app = Flask(__name__)
+
+        @app.route("/audio/<audio_id>")
+        def audio(audio_id):
+            return send_file(library.lookup(audio_id), mimetype="audio/mpeg", conditional=True, etag=audio_id)
+
+        client = app.test_client()
+        response = client.get(f"/audio/{audio_id}", headers={"Range": "bytes=0-99"})
+        assert response.status_code == 206
+        assert response.data == FAKE_MP3[:100]
+        assert response.headers["Content-Range"] == f"bytes 0-99/{os.path.getsize(path)}"
+        assert client.get(f"/audio/{audio_id}", headers={"If-None-Match": f'"{audio_id}"'}).status_code == 304
+    print("   ✅ 206 partial content and 304 revalidation")
+
+if __name__ == "__main__":
+    test_library_content_addressing()
+    test_generate_audio_cached_and_story_urls()
+    test_range_requests()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test binary, multipart and chunked audio transport for voice endpoints
+"""
+
+import io
+import base64
+
+from flask import Flask, jsonify, request
+
+import audio_transport
+from audio_transport import (AudioTooLarge, audio_mimetype, audio_response, decode_audio,
+                             upload_options, uploaded_audio, wants_binary_audio)
+
+AUDIO = bytes(range(256)) * 1024  # 256 KB
+
+def make_app():
+    app = Flask(__name__)
+
+    @app.route("/transcribe", methods=["POST"])
+    def transcribe():
+        try:
+            upload = uploaded_audio(request)
+        except AudioTooLarge as e:
+            return jsonify({"error": str(e)}), 413
+        if not upload:
+            audio = base64.b64decode(request.get_json()["audio"])
+            return jsonify({"size": len(audio), "source": "base64"})
+        return jsonify({"size": len(upload[0]), "mimetype": upload[1], "options": upload_options(request),
+                        "ok": upload[0] == AUDIO})
+
+    @app.route("/tts", methods=["POST"])
+    def tts():
+        audio = {"audio_data": base64.b64encode(AUDIO).decode(), "format": "wav"}
+        if wants_binary_audio(request):
+            return audio_response(decode_audio(audio), audio_mimetype(audio["format"]))
+        return jsonify(audio)
+
+    return app
+
+def test_uploads():
+    """Multipart, raw and chunked bodies all reach the handler as bytes"""
+    print("🎙️ Testing Audio Transport")
+    print("=" * 50)
+    client = make_app().test_client()
+
+    multipart = client.post("/transcribe", data={"file": (io.BytesIO(AUDIO), "voice.webm", "audio/webm"),
+                                                 "context": "food_tracking"},
+                            content_type="multipart/form-data").get_json()
+    assert multipart["ok"] and multipart["mimetype"] == "audio/webm"
+    assert multipart["options"] == {"context": "food_tracking"}
+    print("   ✅ Multipart upload")
+
+    raw = client.post("/transcribe?enable_tts=false", data=AUDIO, content_type="audio/wav").get_json()
+    assert raw["ok"] and raw["options"] == {"enable_tts": "false"}
+    print("   ✅ Raw binary body")
+
+    chunked = client.post("/transcribe", input_stream=io.BytesIO(AUDIO), content_type="application/octet-stream",
+                          headers={"Transfer-Encoding": "chunked"},
+                          environ_overrides={"wsgi.input_terminated": True}).get_json()
+    assert chunked["ok"]
+    print("   ✅ Chunked transfer body")
+
+    legacy = client.post("/transcribe", json={"audio": base64.b64encode(AUDIO).decode()}).get_json()
+    assert legacy == {"size": len(AUDIO), "source": "base64"}
+    print("   ✅ Base64 JSON still accepted")
+
+def test_upload_limit():
+    """Bodies over the limit are rejected without reading them fully"""
+    client = make_app().test_client()
+    original = audio_transport.MAX_AUDIO_BYTES
+    audio_transport.MAX_AUDIO_BYTES = 1024
+    try:
+        response = client.post("/transcribe", data=AUDIO, content_type="audio/wav")
+        assert response.status_code == 413
+    finally:
+        audio_transport.MAX_AUDIO_BYTES = original
+
+    try:
+        audio_transport.read_audio_stream(io.BytesIO(AUDIO), limit=100 * 1024)
+        assert False, "limit should be enforced"
+    except AudioTooLarge:
+        pass
+    print("   ✅ Oversized uploads rejected with 413")
+
+def test_binary_responses():
+    """Raw audio is returned when asked for, base64 JSON otherwise"""
+    client = make_app().test_client()
+
+    response = client.post("/tts?format=binary")
+    assert response.mimetype == "audio/wav" and response.data == AUDIO
+
+    response = client.post("/tts", headers={"Accept": "audio/*"})
+    assert response.data == AUDIO
+
+    response = client.post("/tts", headers={"Accept": "*/*"})
+    assert base64.b64decode(response.get_json()["audio_data"]) == AUDIO
+    print(f"   ✅ Binary TTS response {len(AUDIO)} bytes vs {len(response.data)} bytes as JSON")
+
+if __name__ == "__main__":
+    test_uploads()
+    test_upload_limit()
+    test_binary_responses()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test the pre-rendered baby size image bundle
+"""
+
+import os
+import tempfile
+from pregnancy_image_generator import BabySizeImageBundle, BABY_IMAGE_STYLES
+
+def test_baby_image_bundle():
+    """Build a bundle, reload it and read images back"""
+    print("👶 Testing Baby Size Image Bundle")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle_path = os.path.join(tmp_dir, "baby_size_images.bin")
+
+        print("1. Building bundle...")
+        result = BabySizeImageBundle(path=bundle_path).build()
+        assert result["images"] == 40 * len(BABY_IMAGE_STYLES)
+        print(f"   ✅ {result['images']} images, {result['bytes']} bytes")
+
+        print("\n2. Loading bundle...")
+        bundle = BabySizeImageBundle(path=bundle_path)
+        assert bundle.is_loaded
+        print("   ✅ Bundle memory-mapped")
+
+        print("\n3. Reading images...")
+        for week in (1, 20, 40):
+            for style in BABY_IMAGE_STYLES:
+                png, etag = bundle.get_image(week, style)
+                assert png.startswith(b"\x89PNG")
+                assert etag
+        print("   ✅ PNG bytes returned for all styles")
+
+        # Unknown styles fall back to the detailed image
+        assert bundle.get_image(12, "unknown") == bundle.get_image(12, "matplotlib")
+        print("   ✅ Unknown style falls back to detailed image")
+
+if __name__ == "__main__":
+    test_baby_image_bundle()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Test feature set resolution for blueprint mounting
+"""
+
+from blueprints import FEATURES, resolve_features
+
+def test_resolve_features():
+    """Feature sets expand to features and core is always mounted"""
+    print("🧩 Testing Feature Resolution")
+    print("=" * 50)
+
+    assert resolve_features("all") == list(FEATURES)
+    print("   ✅ 'all' mounts every blueprint")
+
+    appointments = resolve_features("appointments")
+    assert appointments == ["core", "auth", "profile", "appointments", "doctors"]
+    assert "medication" not in appointments
+    print(f"   ✅ appointments -> {appointments}")
+
+    assert resolve_features("vitals, hydration") == ["core", "vitals", "hydration"]
+    print("   ✅ Individual features keep core")
+
+    try:
+        resolve_features("unknown")
+        assert False, "Unknown feature should raise"
+    except ValueError as e:
+        print(f"   ✅ Unknown feature rejected: {e}")
+
+if __name__ == "__main__":
+    test_resolve_features()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test declarative index reconciliation and the slow query report
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+import mongomock
+from index_registry import IndexRegistry, summarize_profile, query_shape
+
+def make_registry():
+    registry = IndexRegistry()
+    registry.register("Patient_test", "patient_id", unique=True, sparse=True)
+    registry.register("Patient_test", "appointments.appointment_id", owner="appointments")
+    registry.register("mental_health_logs", [("patient_id", 1), ("date", 1), ("type", 1)])
+    return registry
+
+def test_reconcile_is_idempotent():
+    """First run creates indexes, second run changes nothing"""
+    print("🔍 Testing Index Reconciliation")
+    print("=" * 50)
+    db = mongomock.MongoClient().db
+    registry = make_registry()
+
+    report = registry.reconcile(db)
+    assert len(report["created"]) == 3 and not report["errors"]
+    assert "appointments.appointment_id_1" in db.Patient_test.index_information()
+    print("   ✅ Missing indexes created")
+
+    report = registry.reconcile(db)
+    assert report["created"] == [] and report["rebuilt"] == [] and len(report["unchanged"]) == 3
+    print("   ✅ Second run leaves indexes untouched")
+
+def test_reconcile_rebuilds_changed_and_drops_unmanaged():
+    """Indexes with different options are rebuilt; undeclared ones are only dropped on request"""
+    db = mongomock.MongoClient().db
+    db.mental_health_logs.create_index([("patient_id", 1), ("date", 1), ("type", 1)], unique=True)
+    db.mental_health_logs.create_index("legacy_field")
+    registry = make_registry()
+
+    dry_run = registry.reconcile(db, dry_run=True, drop_unmanaged=True)
+    assert dry_run["rebuilt"] == ["mental_health_logs.patient_id+date+type"]
+    assert db.mental_health_logs.index_information()["patient_id_1_date_1_type_1"].get("unique")
+
+    report = registry.reconcile(db, drop_unmanaged=True)
+    assert report["dropped"] == ["mental_health_logs.legacy_field_1"]
+    info = db.mental_health_logs.index_information()
+    assert not info["patient_id_1_date_1_type_1"].get("unique")
+    assert "legacy_field_1" not in info
+
+def test_summarize_profile():
+    """Profiler entries group by query shape and flag collection scans"""
+    entries = [
+        {"ns": "patients_db.Patient_test", "op": "query", "millis": 250, "planSummary": "COLLSCAN",
+         "docsExamined": 5000, "nreturned": 1, "command": {"filter": {"appointments.appointment_id": "A1"}}},
+        {"ns": "patients_db.Patient_test", "op": "query", "millis": 180, "planSummary": "COLLSCAN",
+         "docsExamined": 5000, "nreturned": 1, "command": {"filter": {"appointments.appointment_id": "A2"}}},
+        {"ns": "patients_db.Patient_test", "op": "query", "millis": 2, "planSummary": "IXSCAN { patient_id: 1 }",
+         "command": {"filter": {"patient_id": "PAT1"}}},
+        {"ns": "patients_db.system.profile", "op": "query", "millis": 500},
+    ]
+    report = summarize_profile(entries, slow_ms=100, registry=make_registry())
+    assert len(report) == 1
+    assert report[0]["count"] == 2 and report[0]["max_ms"] == 250 and report[0]["collscan"]
+    assert report[0]["declared_index"] is True
+    assert query_shape({"a": 1, "b": {"$in": ["x", "y"]}}) == {"a": "int", "b": {"$in": ["str"]}}
+
+# Runs in a fresh interpreter, where the rollup modules have not been imported yet
+STARTUP_RECONCILE = """
+import json, os
+import load_benchmark
+load_benchmark.configure("mongomock")
+os.environ["RECONCILE_INDEXES_ON_STARTUP"] = "true"
+import app_core
+database = app_core.db.patients_collection.database
+print(json.dumps({name: [info.get("unique", False) for info in database[name].index_information().values()]
+                  for name in ("vital_signs_rollups", "nutrition_daily_rollups", "medication_reminder_sends")}))
+"""
+
+def test_startup_reconcile_includes_lazy_modules():
+    """Reconcile on connect also creates the indexes of lazily imported modules"""
+    result = subprocess.run([sys.executable, "-c", STARTUP_RECONCILE], capture_output=True, text=True, timeout=120,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    indexes = json.loads(result.stdout.strip().splitlines()[-1])
+    assert True in indexes["vital_signs_rollups"] and True in indexes["nutrition_daily_rollups"]
+    assert len(indexes["medication_reminder_sends"]) == 2
+    print("   ✅ Rollup unique indexes created at connect")
+
+if __name__ == "__main__":
+    test_reconcile_is_idempotent()
+    test_reconcile_rebuilds_changed_and_drops_unmanaged()
+    test_summarize_profile()
+    test_startup_reconcile_includes_lazy_modules()
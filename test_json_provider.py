@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test compact JSON responses, BSON encoding, ?fields= projection, OCR bbox omission
+and negotiated response compression
+"""
+
+import gzip
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from bson import Binary, DBRef, Decimal128, ObjectId
+from flask import Flask, jsonify
+
+import response_compression
+from json_provider import FastJSONProvider, field_tree, install_json, omit_bboxes
+from response_compression import install_compression
+
+OCR_RESULT = {"success": True, "results": [{"text": f"Line {i}", "confidence": 0.9,
+                                            "bbox": [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]}
+                                           for i in range(50)]}
+
+def make_app():
+    app = Flask(__name__)
+    install_json(app)
+    install_compression(app)
+
+    @app.route("/document")
+    def document():
+        return jsonify({"_id": ObjectId("65a1b2c3d4e5f6a7b8c9d0e1"), "created_at": datetime(2024, 1, 2, 3, 4, 5),
+                        "logs": [{"timestamp": datetime(2024, 1, 2, 3, 4, 5, 600000)}]})
+
+    @app.route("/ocr")
+    def ocr():
+        return jsonify(omit_bboxes(json.loads(json.dumps(OCR_RESULT))))
+
+    @app.route("/doctors")
+    def doctors():
+        # As a handler returns documents straight from MongoDB
+        return jsonify({"success": True, "total_count": 2, "doctors": [
+            {"_id": ObjectId(), "name": f"Dr. {name}", "specialty": "Obstetrics", "fee": Decimal128("120.50"),
+             "photo": Binary(b"\x89PNG"), "clinic": DBRef("clinics", "CL1"),
+             "created_at": datetime(2024, 1, 1), "schedule": [{"day": "Mon", "updated_at": datetime(2024, 2, 1)}]}
+            for name in ("A", "B")]})
+
+    @app.route("/big")
+    def big():
+        return jsonify({"readings": [{"value": i, "unit": "mmHg"} for i in range(500)]})
+
+    return app
+
+def test_bson_types_and_compact_output():
+    """datetime and ObjectId are encoded natively and output is compact"""
+    print("🗜️ Testing JSON Provider and Compression")
+    print("=" * 50)
+    body = make_app().test_client().get("/document").get_data(as_text=True)
+    assert json.loads(body) == {"_id": "65a1b2c3d4e5f6a7b8c9d0e1", "created_at": "2024-01-02T03:04:05",
+                                "logs": [{"timestamp": "2024-01-02T03:04:05.600000"}]}
+    assert ": " not in body and "\n  " not in body
+    print("✅ ObjectId/datetime encoded, compact output")
+
+def test_stdlib_fallback_matches():
+    """The standard library path produces the same JSON as orjson"""
+    provider = FastJSONProvider(Flask(__name__))
+    value = {"at": datetime(2024, 5, 6, 7, 8, 9), "id": ObjectId("65a1b2c3d4e5f6a7b8c9d0e1"), "n": 1.5}
+    provider.use_orjson = False
+    assert provider.dumps(value) == '{"at":"2024-05-06T07:08:09","id":"65a1b2c3d4e5f6a7b8c9d0e1","n":1.5}'
+    print("✅ Fallback encoder output")
+
+def test_nested_bson_types():
+    """BSON values are encoded however deeply they are nested"""
+    doctor = make_app().test_client().get("/doctors").get_json()["doctors"][0]
+    assert len(doctor["_id"]) == 24 and doctor["fee"] == "120.50" and doctor["photo"] == "iVBORw=="
+    assert doctor["clinic"] == {"$ref": "clinics", "$id": "CL1"}
+    assert doctor["schedule"][0]["updated_at"] == "2024-02-01T00:00:00"
+    assert FastJSONProvider(Flask(__name__)).dumps({"d": Decimal("1.10")}) == '{"d":"1.10"}'
+    print("✅ ObjectId, Decimal128, Binary, DBRef and nested datetimes encoded")
+
+def test_partial_fields():
+    """?fields= keeps only the listed paths, per list element"""
+    assert field_tree(["a.b", "a.c", "d", "d.e"]) == {"a": {"b": {}, "c": {}}, "d": {}}
+    client = make_app().test_client()
+    body = client.get("/doctors?fields=doctors.name,doctors.schedule.day").get_json()
+    assert body == {"success": True, "doctors": [{"name": "Dr. A", "schedule": [{"day": "Mon"}]},
+                                                 {"name": "Dr. B", "schedule": [{"day": "Mon"}]}]}
+    assert client.get("/doctors?fields=total_count").get_json() == {"success": True, "total_count": 2}
+    print("✅ Partial-field responses")
+
+def test_bbox_omission():
+    """OCR boxes are dropped unless include_bbox=true"""
+    client = make_app().test_client()
+    results = client.get("/ocr").get_json()["results"]
+    assert len(results) == 50 and all("bbox" not in result for result in results)
+    results = client.get("/ocr?include_bbox=true").get_json()["results"]
+    assert all(len(result["bbox"]) == 4 for result in results)
+    print("✅ bbox omitted by default, returned on request")
+
+def test_compression_negotiation():
+    """Large responses are gzipped for clients that accept it; small ones are not"""
+    client = make_app().test_client()
+    plain = client.get("/big")
+    assert "Content-Encoding" not in plain.headers
+    compressed = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.data) == plain.data
+    assert len(compressed.data) < len(plain.data) / 5
+    print(f"✅ gzip: {len(plain.data)} -> {len(compressed.data)} bytes")
+
+    small = client.get("/document", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+    refused = client.get("/big", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "Content-Encoding" not in refused.headers
+    print("✅ Small and refused responses sent uncompressed")
+
+    if response_compression.BROTLI_AVAILABLE:
+        brotli_response = client.get("/big", headers={"Accept-Encoding": "gzip, br"})
+        assert brotli_response.headers["Content-Encoding"] == "br"
+        assert response_compression.brotli.decompress(brotli_response.data) == plain.data
+        print("✅ brotli preferred when available")
+
+if __name__ == "__main__":
+    test_bson_types_and_compact_output()
+    test_stdlib_fallback_matches()
+    test_nested_bson_types()
+    test_partial_fields()
+    test_bbox_omission()
+    test_compression_negotiation()
+    print("\n🎉 All JSON provider and compression tests passed!")
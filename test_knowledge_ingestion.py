@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test incremental knowledge ingestion: bulk insert, high-water mark, resume after a crash
+"""
+
+import mongomock
+from datetime import datetime, timedelta
+
+from knowledge_ingestion import KnowledgeIngestion, LocalVectorIndex, point_id
+
+def fake_embed(texts):
+    """Deterministic 8-dimensional vectors; counts calls"""
+    fake_embed.calls.append(len(texts))
+    return [[float(len(t) % 7), float(sum(map(ord, t)) % 13), 1.0, 0, 0, 0, 0, 0] for t in texts]
+fake_embed.calls = []
+
+class PersistentIndex(LocalVectorIndex):
+    """Local index that keeps its high-water mark in MongoDB, failing on demand"""
+    persistent = True
+
+    def __init__(self):
+        super().__init__("test-index")
+        self.fail_after = None
+        self.upserts = 0
+
+    def upsert(self, ids, vectors, payloads):
+        if self.fail_after is not None and self.upserts >= self.fail_after:
+            raise ConnectionError("Qdrant unavailable")
+        self.upserts += 1
+        super().upsert(ids, vectors, payloads)
+
+def make_engine(db, index):
+    return KnowledgeIngestion(db, fake_embed, index, embed_batch_size=100, upload_batch_size=25, upload_workers=4)
+
+def test_bulk_insert_and_incremental_run():
+    """Only documents after the high-water mark are embedded"""
+    print("📚 Testing Knowledge Ingestion")
+    print("=" * 50)
+    db = mongomock.MongoClient().db
+    engine = make_engine(db, LocalVectorIndex())
+    items = [{"text": f"Tip {i}: stay hydrated", "trimester": "second"} for i in range(250)]
+    result = engine.bulk_insert(items + [{"text": "   "}, "not an item"])
+    assert len(result["inserted_ids"]) == 250 and len(result["failed_items"]) == 2
+
+    fake_embed.calls.clear()
+    report = engine.run()
+    assert report["success"] and report["processed"] == 250 and report["remaining"] == 0
+    assert fake_embed.calls == [100, 100, 50]
+    assert len(engine.index.points) == 250
+    assert report["docs_per_second"] > 0
+    print(f"   ✅ 250 documents in {report['batches']} batches ({report['docs_per_second']} docs/s)")
+
+    fake_embed.calls.clear()
+    assert engine.run()["processed"] == 0 and fake_embed.calls == []
+
+    changed = db.pregnancy_knowledge.find_one()
+    db.pregnancy_knowledge.update_one({"_id": changed["_id"]},
+                                      {"$set": {"text": "Updated tip", "updated_at": datetime.utcnow() + timedelta(seconds=1)}})
+    engine.bulk_insert([{"text": "New tip"}])
+    report = engine.run()
+    assert report["processed"] == 2
+    assert engine.index.points[point_id(changed["_id"])][1]["text"] == "Updated tip"
+    assert len(engine.index.points) == 251
+    hits = engine.index.search(fake_embed(["Updated tip"])[0], limit=1)
+    assert hits[0]["payload"]["text"] == "Updated tip"
+    print("   ✅ Re-run embeds only the changed and the new document")
+
+def test_resume_after_crash():
+    """A failed upload leaves the mark at the last complete batch; the next run finishes the rest"""
+    db = mongomock.MongoClient().db
+    index = PersistentIndex()
+    engine = make_engine(db, index)
+    engine.bulk_insert([{"text": f"Item {i}"} for i in range(300)])
+
+    index.fail_after = 5  # batch 1 is 4 chunks; batch 2 fails on its second chunk
+    report = engine.run()
+    assert not report["success"] and "Qdrant unavailable" in report["message"]
+    assert report["processed"] == 100 and report["remaining"] == 200
+    print(f"   ✅ Crash after {report['processed']} documents, {report['remaining']} remaining")
+
+    # A fresh engine (new process) resumes from the mark stored in MongoDB
+    index.fail_after = None
+    resumed = make_engine(db, index).run()
+    assert resumed["success"] and resumed["processed"] == 200
+    assert len(index.points) == 300
+    assert make_engine(db, index).status()["pending_documents"] == 0
+    print("   ✅ Resumed run embedded the remaining 200 documents")
+
+if __name__ == "__main__":
+    test_bulk_insert_and_incremental_run()
+    test_resume_after_crash()
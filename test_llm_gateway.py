@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the shared LLM gateway: priority admission, streaming slots and accounting
+"""
+
+import time
+import threading
+from types import SimpleNamespace
+
+from llm_gateway import LLMGateway, ModelLimiter, GatewayClient, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+
+class FakeCompletions:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, stream=False, **kwargs):
+        self.calls += 1
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        if stream:
+            return iter([
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hi"))], usage=None),
+                SimpleNamespace(choices=[], usage=usage),
+            ])
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="Hi"))], usage=usage)
+
+def make_gateway():
+    gateway = LLMGateway()
+    gateway._clients["openai"] = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    return gateway
+
+def test_priority_admission():
+    """A waiting interactive call is admitted before an earlier batch call"""
+    print("🤖 Testing LLM Gateway")
+    print("=" * 50)
+    limiter = ModelLimiter(1)
+    limiter.acquire(PRIORITY_BATCH)
+    order = []
+
+    def worker(name, priority):
+        limiter.acquire(priority, timeout=5)
+        order.append(name)
+        limiter.release()
+
+    batch = threading.Thread(target=worker, args=("batch", PRIORITY_BATCH))
+    batch.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE))
+    interactive.start()
+    time.sleep(0.05)
+
+    limiter.release()
+    batch.join()
+    interactive.join()
+    assert order == ["interactive", "batch"]
+    assert limiter.active == 0 and limiter.waiting == 0
+    print("   ✅ Interactive calls jump the queue")
+
+def test_accounting_and_stream_slots():
+    """Tokens and requests are counted per feature; streams hold the slot until consumed"""
+    gateway = make_gateway()
+    client = GatewayClient(gateway, "nutrition", PRIORITY_INTERACTIVE)
+
+    response = client.chat.completions.create(model="gpt-4", messages=[])
+    assert response.choices[0].message.content == "Hi"
+
+    stream = client.chat.completions.create(model="gpt-4", messages=[], stream=True)
+    assert gateway.limiter("gpt-4").active == 1
+    assert [c.choices[0].delta.content for c in stream if c.choices] == ["Hi"]
+    assert gateway.limiter("gpt-4").active == 0
+
+    stats = gateway.stats()
+    feature = stats["features"]["nutrition"]
+    assert feature["requests"] == 2 and feature["errors"] == 0
+    assert feature["total_tokens"] == 30
+    assert stats["models"]["gpt-4"]["limit"] == 4
+    print("   ✅ Per-feature tokens counted and stream slot released")
+
+def test_errors_release_slot():
+    """Failed calls are counted and free their slot"""
+    gateway = make_gateway()
+
+    def fail(**kwargs):
+        raise RuntimeError("rate limited")
+    gateway._clients["openai"].chat.completions.create = fail
+
+    client = GatewayClient(gateway, "symptoms", PRIORITY_INTERACTIVE)
+    try:
+        client.chat.completions.create(model="gpt-4o-mini", messages=[])
+        assert False, "error should propagate"
+    except RuntimeError:
+        pass
+    assert gateway.limiter("gpt-4o-mini").active == 0
+    assert gateway.stats()["features"]["symptoms"]["errors"] == 1
+
+if __name__ == "__main__":
+    test_priority_admission()
+    test_accounting_and_stream_slots()
+    test_errors_release_slot()
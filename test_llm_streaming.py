@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test SSE/NDJSON streaming of LLM responses
+"""
+
+import json
+from types import SimpleNamespace
+from flask import Flask
+
+from streaming import format_event, requested_stream_mode, stream_events
+from symptoms_service import SymptomsService
+
+class FakeOpenAIClient:
+    """Chat completions client that streams a fixed reply word by word"""
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, stream=False, **kwargs):
+        self.calls.append(dict(kwargs, stream=stream))
+        words = self.reply.split(" ")
+        return [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + (" " if i < len(words) - 1 else "")))])
+            for i, word in enumerate(words)
+        ]
+
+def test_stream_mode_and_format():
+    """Clients opt in via query string or Accept header"""
+    print("📡 Testing LLM Streaming")
+    print("=" * 50)
+    app = Flask(__name__)
+    with app.test_request_context("/?stream=ndjson"):
+        assert requested_stream_mode() == "ndjson"
+    with app.test_request_context("/", headers={"Accept": "text/event-stream"}):
+        assert requested_stream_mode() == "sse"
+    with app.test_request_context("/"):
+        assert requested_stream_mode() is None
+
+    assert format_event("sse", "token", {"text": "Hi"}) == 'event: token\ndata: {"text": "Hi"}\n\n'
+    assert json.loads(format_event("ndjson", "token", {"text": "Hi"})) == {"event": "token", "data": {"text": "Hi"}}
+    print("   ✅ Stream mode negotiation and event format")
+
+def test_symptom_stream_evidence_first():
+    """Evidence is emitted before tokens and the result joins the tokens"""
+    service = SymptomsService.__new__(SymptomsService)
+    service.openai_client = FakeOpenAIClient("Urgency level: mild. Rest and hydrate.")
+    service.retrieve_knowledge = lambda query, weeks: [
+        {"id": "1", "text": "Nausea is common in the first trimester", "source": "KB", "score": 0.9, "metadata": {}}
+    ]
+
+    events = list(service.stream_symptom_analysis("nausea", 8))
+    assert events[0][0] == "evidence" and events[0][1][0]["id"] == "1"
+    tokens = [data["text"] for event, data in events if event == "token"]
+    assert len(tokens) > 1
+    assert events[-1] == ("result", {"text": "".join(tokens), "disclaimers": events[-1][1]["disclaimers"]})
+    assert service.openai_client.calls[0]["stream"] is True
+    print("   ✅ Evidence first, then tokens, then result")
+
+def test_stream_response_reports_errors():
+    """Errors after the stream started become an error event"""
+    app = Flask(__name__)
+
+    @app.route("/stream")
+    def stream():
+        def events():
+            yield "token", {"text": "partial"}
+            raise RuntimeError("model went away")
+        return stream_events(events(), "ndjson")
+
+    response = app.test_client().get("/stream")
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["event"] for line in lines] == ["token", "error"]
+    print("   ✅ Mid-stream failure sent as error event")
+
+if __name__ == "__main__":
+    test_stream_mode_and_format()
+    test_symptom_stream_evidence_first()
+    test_stream_response_reports_errors()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test the load benchmark's seeding, latency summary and baseline comparison
+"""
+
+import mongomock
+
+from load_benchmark import compare_to_baseline, seed, summarize
+
+SIZES = {"vitals": 48, "hydration": 16, "appointments": 4, "food": 6, "medications": 2}
+
+def test_seed_population():
+    """Seeded patients carry embedded arrays of the requested sizes"""
+    print("🏋️ Testing Load Benchmark")
+    print("=" * 50)
+    patients = mongomock.MongoClient().db.patients
+    ids = seed(patients, 5, "hash", SIZES)
+    assert ids == [f"BENCH{i:06d}" for i in range(5)]
+    patient = patients.find_one({"patient_id": "BENCH000003"})
+    assert len(patient["vital_signs_logs"]) == 48 and len(patient["hydration_records"]) == 16
+    assert len(patient["appointments"]) == 4 and len(patient["medication_logs"][0]["dosages"]) == 3
+    assert patient["vital_signs_logs"][-1]["timestamp"] > patient["vital_signs_logs"][0]["timestamp"]
+
+    # Re-seeding replaces the population instead of duplicating it
+    seed(patients, 3, "hash", SIZES)
+    assert patients.count_documents({}) == 3
+    print("✅ Synthetic population seeded")
+
+def test_summary_and_regressions():
+    """p95 growth, throughput loss and new errors beyond tolerance are regressions"""
+    result = summarize([float(ms) for ms in range(1, 101)], errors=0, elapsed=2.0)
+    assert result["requests"] == 100 and result["rps"] == 50.0
+    assert result["p50_ms"] == 50.5 and 95 <= result["p95_ms"] <= 96
+
+    baseline = {"vitals_history": {"p95_ms": 80.0, "rps": 60.0, "errors": 0},
+                "login": {"p95_ms": 100.0, "rps": 10.0, "errors": 0}}
+    current = {"vitals_history": result,
+               "login": {"p95_ms": 110.0, "rps": 9.0, "errors": 0},
+               "new_endpoint": {"p95_ms": 1.0, "rps": 1.0, "errors": 0}}
+    regressions = compare_to_baseline(current, baseline, tolerance=0.15)
+    assert len(regressions) == 2 and all(r.startswith("vitals_history:") for r in regressions)
+    assert compare_to_baseline(current, baseline, tolerance=0.25) == []
+    current["login"]["errors"] = 2
+    assert any(r.startswith("login: 2 errors") for r in compare_to_baseline(current, baseline, 0.25))
+    print("✅ Regressions flagged against the baseline")
+
+if __name__ == "__main__":
+    test_seed_population()
+    test_summary_and_regressions()
+    print("\n🎉 All load benchmark tests passed!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the per-day nutrition rollups and range summaries
+"""
+
+import mongomock
+from datetime import date, datetime
+
+from nutrition_rollups import NutritionRollups, entry_day, entry_macros, replaced_entry
+
+def basic_entry(calories, protein, created_at, **extra):
+    return {"type": "basic_entry", "created_at": created_at,
+            "nutritional_breakdown": {"estimated_calories": calories, "protein_grams": protein,
+                                      "carbohydrates_grams": 30, "fat_grams": 10}, **extra}
+
+def test_entry_macros():
+    """Macros come from the entry or its GPT-4 analysis; numeric strings are accepted"""
+    print("🥗 Testing Nutrition Rollups")
+    print("=" * 50)
+    assert entry_macros(basic_entry(400, 20, datetime.now()))["calories"] == 400
+    analysed = {"type": "gpt4_analysis", "analysis": {"nutritional_breakdown": {
+        "estimated_calories": "about 350 kcal", "protein_grams": "12.5"}}}
+    assert entry_macros(analysed) == {"calories": 350.0, "protein_grams": 12.5,
+                                      "carbohydrates_grams": 0.0, "fat_grams": 0.0}
+    backend = {"entry_type": "gpt4_analyzed", "gpt4_analysis": {"nutritional_breakdown": {"fat_grams": 9}}}
+    assert entry_macros(backend)["fat_grams"] == 9
+    assert entry_macros({"food_input": "tea"})["calories"] == 0
+    print("✅ Basic and GPT-4 entries parsed")
+
+def test_daily_buckets():
+    """Each saved entry increments its day's bucket"""
+    database = mongomock.MongoClient().db
+    rollups = NutritionRollups()
+    rollups.record(database, "PAT1", basic_entry(400, 20, datetime(2024, 3, 1, 8, 0)))
+    rollups.record(database, "PAT1", basic_entry(600, 25, "2024-03-01T19:30:00"))
+    rollups.record(database, "PAT1", basic_entry(500, 30, datetime(2024, 3, 2, 12, 0)))
+    rollups.record(database, "PAT2", basic_entry(900, 40, datetime(2024, 3, 1, 9, 0)))
+
+    day = rollups.day(database, "PAT1", date(2024, 3, 1))
+    assert day == {"date": "2024-03-01", "meal_count": 2, "calories": 1000, "protein_grams": 45,
+                   "carbohydrates_grams": 60, "fat_grams": 20}
+    assert rollups.day(database, "PAT1", date(2024, 3, 5))["meal_count"] == 0
+    assert database["nutrition_daily_rollups"].count_documents({}) == 3
+    print("✅ Mixed datetime/ISO created_at entries land in the same daily bucket")
+
+def test_backdated_entry():
+    """An entry is bucketed by when it was eaten (timestamp), not when it was saved"""
+    entry = basic_entry(400, 20, datetime(2024, 3, 5, 9, 0), timestamp="2024-03-03T20:15:00")
+    assert entry_day(entry) == datetime(2024, 3, 3)
+    print("✅ Backdated entry lands on its own day")
+
+def test_analysed_meal_counted_once():
+    """Saving the entry for an analysed meal replaces the analysis in the rollup"""
+    database = mongomock.MongoClient().db
+    rollups = NutritionRollups()
+    analysis = {"analysis_id": "analysis_1", "nutritional_breakdown": {"estimated_calories": 350, "protein_grams": 12}}
+    analysed = {"type": "gpt4_analysis", "analysis": analysis, "timestamp": "2024-03-02T12:00:00",
+                "created_at": datetime(2024, 3, 2, 12, 0)}
+    saved = basic_entry(350, 12, datetime(2024, 3, 2, 12, 1), timestamp="2024-03-01T19:00:00",
+                        gpt4_analysis=dict(analysis))
+    other = basic_entry(200, 5, datetime(2024, 3, 2, 13, 0))
+    entries = []
+    for entry in (analysed, saved, other):
+        rollups.record(database, "PAT1", entry, replaces=replaced_entry(entry, entries))
+        entries.append(entry)
+
+    trend = rollups.range(database, "PAT1", date(2024, 3, 1), date(2024, 3, 2))
+    assert [(d["meal_count"], d["calories"]) for d in trend["days"]] == [(1, 350), (1, 200)]
+    incremental = trend
+    rollups.rebuild(database, "PAT1", entries)
+    assert rollups.range(database, "PAT1", date(2024, 3, 1), date(2024, 3, 2)) == incremental
+    print("✅ Analysis and its saved entry count as one meal, on the saved day")
+
+    output = {"nutritional_breakdown": {"estimated_calories": 500}}
+    legacy = {"type": "gpt4_analysis", "food_input": "Paneer wrap", "analysis": dict(output),
+              "timestamp": "2024-03-04T12:00:00"}
+    echo = basic_entry(500, 0, datetime(2024, 3, 4, 12, 5), food_input="paneer wrap", gpt4_analysis=dict(output))
+    assert replaced_entry(echo, [legacy]) is legacy
+    assert replaced_entry(other, [legacy, echo]) is None
+    print("✅ Entries saved before analysis ids are matched by analysis, food and day")
+
+    # Identical GPT-4 output for another food, another day or without food text is a separate meal
+    next_day = dict(legacy, timestamp="2024-03-05T12:00:00")
+    other_food = dict(legacy, food_input="Veg wrap")
+    no_food = {"type": "gpt4_analysis", "analysis": dict(output), "timestamp": "2024-03-04T13:00:00"}
+    assert replaced_entry(next_day, [legacy]) is None and replaced_entry(other_food, [legacy]) is None
+    assert replaced_entry(dict(no_food), [no_food]) is None
+    database = mongomock.MongoClient().db
+    assert rollups.rebuild(database, "PAT1", [legacy, other_food, next_day, no_food, dict(no_food)]) == 2
+    assert rollups.range(database, "PAT1", date(2024, 3, 4), date(2024, 3, 5))["totals"]["meal_count"] == 5
+    print("✅ Legacy meals with identical analyses stay separate meals")
+
+def test_range_and_rebuild():
+    """A range fills missing days; rebuild matches incremental updates"""
+    database = mongomock.MongoClient().db
+    rollups = NutritionRollups()
+    entries = [basic_entry(400, 20, datetime(2024, 3, 1, 8)), basic_entry(600, 25, datetime(2024, 3, 1, 19)),
+               basic_entry(500, 30, datetime(2024, 3, 3, 12))]
+    for entry in entries:
+        rollups.record(database, "PAT1", entry)
+
+    trend = rollups.range(database, "PAT1", date(2024, 2, 29), date(2024, 3, 3))
+    assert [d["date"] for d in trend["days"]] == ["2024-02-29", "2024-03-01", "2024-03-02", "2024-03-03"]
+    assert [d["calories"] for d in trend["days"]] == [0, 1000, 0, 500]
+    assert trend["totals"]["calories"] == 1500 and trend["totals"]["meal_count"] == 3
+    assert trend["days_logged"] == 2 and trend["daily_averages"]["calories"] == 750
+    print("✅ Range with empty days, totals and averages")
+
+    incremental = rollups.range(database, "PAT1", date(2024, 3, 1), date(2024, 3, 3))
+    assert rollups.rebuild(database, "PAT1", entries) == 2
+    assert rollups.range(database, "PAT1", date(2024, 3, 1), date(2024, 3, 3)) == incremental
+    print("✅ Rebuild from food_data matches the $inc rollups")
+
+if __name__ == "__main__":
+    test_entry_macros()
+    test_daily_buckets()
+    test_backdated_entry()
+    test_analysed_meal_counted_once()
+    test_range_and_rebuild()
+    print("\n🎉 All nutrition rollup tests passed!")
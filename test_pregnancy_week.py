@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test read-time pregnancy week derivation, the projection cache and the nightly advancer
+"""
+
+import mongomock
+from datetime import date, timedelta
+
+from pregnancy_week import PregnancyProjectionCache, advance_pregnancy_weeks, gestational_info
+
+TODAY = date(2026, 10, 19)
+
+class ReplayCollection:
+    """Counts bulk writes; mongomock's bulk_write does not accept current pymongo operations"""
+    def __init__(self, collection):
+        self.collection = collection
+        self.bulk_writes = []
+
+    def bulk_write(self, operations, **kwargs):
+        self.bulk_writes.append(len(operations))
+        for op in operations:
+            self.collection.update_many(op._filter, op._doc)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+def test_gestational_info():
+    """LMP first, then EDD, then legacy stored weeks"""
+    print("🤰 Testing Pregnancy Week")
+    print("=" * 50)
+    lmp = TODAY - timedelta(days=20 * 7 + 3)
+    info = gestational_info({"last_period_date": lmp.isoformat()}, TODAY)
+    assert info["current_week"] == 20 and info["days_pregnant"] == 143
+    assert info["expected_delivery"] == (lmp + timedelta(days=280)).isoformat()
+
+    edd = gestational_info({"expected_delivery_date": (TODAY + timedelta(weeks=10)).isoformat()}, TODAY)
+    assert edd["current_week"] == 30 and edd["source"] == "expected_delivery_date"
+
+    legacy = gestational_info({"health_data": {"pregnancy_info": {"current_week": "12"}}}, TODAY)
+    assert legacy["current_week"] == 12 and legacy["source"] == "stored"
+    assert gestational_info({"pregnancy_week": ""}, TODAY)["error"]
+    assert gestational_info({"last_period_date": (TODAY + timedelta(days=1)).isoformat()}, TODAY)["error"]
+    assert gestational_info({"last_period_date": (TODAY - timedelta(weeks=50)).isoformat()}, TODAY)["current_week"] == 42
+    print("   ✅ Week from LMP, EDD or stored value")
+
+def test_projection_cache():
+    """Repeated reads hit the cache until invalidated"""
+    collection = mongomock.MongoClient().db.Patient_test
+    collection.insert_one({"patient_id": "PAT1", "is_pregnant": True, "last_period_date": "2026-05-01",
+                           "food_logs": [{"meal": "x"}] * 10})
+    cache = PregnancyProjectionCache(ttl=60)
+    first = cache.get(collection, "PAT1")
+    assert "food_logs" not in first and first["last_period_date"] == "2026-05-01"
+    cache.get(collection, "PAT1")
+    assert (cache.hits, cache.misses) == (1, 1)
+    collection.update_one({"patient_id": "PAT1"}, {"$set": {"last_period_date": "2026-06-01"}})
+    cache.invalidate("PAT1")
+    assert cache.get(collection, "PAT1")["last_period_date"] == "2026-06-01"
+    assert cache.get(collection, "NOBODY") is None
+    print("   ✅ Projection cached without the rest of the document")
+
+def test_advance_pregnancy_weeks():
+    """One bulk write with one UpdateMany per week; up-to-date patients are untouched"""
+    collection = ReplayCollection(mongomock.MongoClient().db.Patient_test)
+    for i in range(30):
+        lmp = TODAY - timedelta(weeks=10 + i % 3, days=1)
+        collection.insert_one({"patient_id": f"PAT{i}", "is_pregnant": True,
+                               "last_period_date": lmp.isoformat(), "pregnancy_week": 9})
+    collection.insert_one({"patient_id": "CURRENT", "is_pregnant": True,
+                           "last_period_date": (TODAY - timedelta(weeks=9)).isoformat(), "pregnancy_week": 9})
+    collection.insert_one({"patient_id": "NODATE", "is_pregnant": True, "pregnancy_week": 15})
+    collection.insert_one({"patient_id": "NOTPREGNANT", "is_pregnant": False, "last_period_date": "2026-01-01"})
+
+    report = advance_pregnancy_weeks(collection, TODAY)
+    assert report == {"patients": 32, "advanced": 30, "unchanged": 1, "skipped": 1}
+    assert collection.bulk_writes == [3]
+    weeks = sorted({p["pregnancy_week"] for p in collection.find({"patient_id": {"$regex": "^PAT"}})})
+    assert weeks == [10, 11, 12]
+    assert collection.find_one({"patient_id": "NODATE"})["pregnancy_week"] == 15
+    assert "pregnancy_week" not in collection.find_one({"patient_id": "NOTPREGNANT"})
+
+    assert advance_pregnancy_weeks(collection, TODAY)["advanced"] == 0
+    assert collection.bulk_writes == [3]
+    print("   ✅ 30 patients advanced with 3 UpdateMany operations in one bulk write")
+
+if __name__ == "__main__":
+    test_gestational_info()
+    test_projection_cache()
+    test_advance_pregnancy_weeks()
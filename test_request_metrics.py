@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test per-route request metrics, the MongoDB command listener and the slow-request log
+"""
+
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from flask import Flask, jsonify
+
+import request_metrics
+from request_metrics import Histogram, MongoCommandListener, install_metrics, track_outbound
+
+@contextmanager
+def slow_threshold(ms):
+    """Temporarily change METRICS_SLOW_REQUEST_MS"""
+    previous = request_metrics.SLOW_REQUEST_MS
+    request_metrics.SLOW_REQUEST_MS = ms
+    try:
+        yield
+    finally:
+        request_metrics.SLOW_REQUEST_MS = previous
+
+def make_app():
+    app = Flask(__name__)
+    install_metrics(app)
+    listener = MongoCommandListener()
+
+    @app.route("/vitals/history/<patient_id>")
+    def history(patient_id):
+        # What pymongo would report for two finds
+        listener.succeeded(SimpleNamespace(command_name="find", duration_micros=2000))
+        listener.succeeded(SimpleNamespace(command_name="find", duration_micros=3000))
+        with track_outbound("openai"):
+            time.sleep(0.01)
+        return jsonify({"patient_id": patient_id, "readings": list(range(100))})
+
+    return app
+
+def test_histogram_buckets():
+    """Buckets are cumulative and end with +Inf"""
+    print("📈 Testing Request Metrics")
+    print("=" * 50)
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+    lines = histogram.lines("latency", 'route="/x"')
+    assert lines[:3] == ['latency_bucket{route="/x",le="0.1"} 1', 'latency_bucket{route="/x",le="1"} 2',
+                         'latency_bucket{route="/x",le="+Inf"} 3']
+    assert lines[-1] == 'latency_count{route="/x"} 3'
+    print("✅ Cumulative buckets")
+
+def test_route_metrics():
+    """Latency, size, DB and outbound time are attributed to the URL rule"""
+    request_metrics.request_metrics.reset()
+    client = make_app().test_client()
+    for patient_id in ("PAT1", "PAT2"):
+        assert client.get(f"/vitals/history/{patient_id}").status_code == 200
+    client.get("/missing")
+
+    body = client.get("/metrics").get_data(as_text=True)
+    route = 'route="/vitals/history/<patient_id>",method="GET"'
+    assert f"http_request_duration_seconds_count{{{route}}} 2" in body
+    assert f'http_requests_total{{{route},status="200"}} 2' in body
+    assert f"http_request_db_commands_total{{{route}}} 4" in body
+    assert f"http_request_db_seconds_total{{{route}}} 0.010000" in body
+    assert f'http_request_outbound_calls_total{{{route},target="openai"}} 2' in body
+    assert f'http_response_size_bytes_bucket{{{route},le="1024"}} 2' in body
+    assert 'http_requests_total{route="unmatched",method="GET",status="404"} 1' in body
+    assert 'mongodb_commands_total{command="find"} 4' in body
+    assert 'outbound_request_duration_seconds_count{target="openai"} 2' in body
+    print("✅ Per-route latency, size, MongoDB and outbound metrics exported")
+
+def test_slow_request_log():
+    """Requests over the threshold keep a per-stage breakdown"""
+    request_metrics.request_metrics.reset()
+    client = make_app().test_client()
+    with slow_threshold(5):
+        client.get("/vitals/history/PAT1")
+    slow = client.get("/metrics/slow-requests").get_json()["requests"]
+    assert len(slow) == 1
+    stages = slow[0]
+    assert stages["route"] == "/vitals/history/<patient_id>" and stages["db_commands"] == 2
+    assert stages["db_ms"] == 5.0 and stages["outbound_ms"]["openai"] >= 10
+    assert stages["total_ms"] >= stages["outbound_ms"]["openai"] and stages["app_ms"] >= 0
+    print(f"✅ Slow request breakdown: {stages['total_ms']} ms total, {stages['app_ms']} ms in app code")
+
+def test_metrics_token():
+    """METRICS_TOKEN protects the endpoints when set"""
+    client = make_app().test_client()
+    previous = request_metrics.METRICS_TOKEN
+    request_metrics.METRICS_TOKEN = "secret"
+    try:
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer secret"}).status_code == 200
+    finally:
+        request_metrics.METRICS_TOKEN = previous
+    print("✅ Metrics token enforced")
+
+if __name__ == "__main__":
+    test_histogram_buckets()
+    test_route_metrics()
+    test_slow_request_log()
+    test_metrics_token()
+    print("\n🎉 All request metrics tests passed!")
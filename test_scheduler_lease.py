@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test the MongoDB lease, leader election and patient partitioning of the reminder scheduler
+"""
+
+import time
+import logging
+from datetime import datetime, timedelta
+
+import mongomock
+
+from scheduler_lease import MongoLease, PartitionedScheduler, patient_partition
+
+def make_database():
+    return mongomock.MongoClient()["scheduler_test"]
+
+def test_single_leader():
+    """Only one owner holds a lease until it expires or is released"""
+    print("🗳️ Testing Scheduler Leases")
+    print("=" * 50)
+    collection = make_database()["scheduler_leases"]
+    first = MongoLease(collection, "job:0", "node-a", ttl=60)
+    second = MongoLease(collection, "job:0", "node-b", ttl=60)
+
+    assert first.acquire() and first.held
+    assert not second.acquire() and not second.held
+    assert first.renew()
+    print("✅ Second node cannot take a held lease")
+
+    # Simulate node-a dying: its lease runs out
+    collection.update_one({"_id": "job:0"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+    assert second.acquire()
+    assert collection.find_one({"_id": "job:0"})["owner"] == "node-b"
+    assert not first.renew() and not first.held
+    print("✅ Expired lease is taken over")
+
+    second.release()
+    assert first.acquire()
+    print("✅ Released lease is free immediately")
+
+def test_partitions():
+    """Patients map to a stable partition and every partition is used"""
+    patient_ids = [f"PAT{1700000000000 + i}ABCDEF" for i in range(400)]
+    counts = [0, 0, 0, 0]
+    for patient_id in patient_ids:
+        counts[patient_partition(patient_id, 4)] += 1
+    assert patient_partition("PAT1", 4) == patient_partition("PAT1", 4)
+    assert all(count > 50 for count in counts), counts
+    assert patient_partition("PAT1", 1) == 0
+    print(f"✅ 400 patients over 4 partitions: {counts}")
+
+def test_scheduler_runs_once_per_cluster():
+    """Two schedulers split the partitions and each partition runs once per interval"""
+    database = make_database()
+    runs = []
+
+    def task(partition, partitions, lease):
+        assert lease.held
+        runs.append(partition)
+        return 1
+
+    node_a = PartitionedScheduler(database, "reminders", task, interval=3600, partitions=4, max_partitions=2, owner="a")
+    node_b = PartitionedScheduler(database, "reminders", task, interval=3600, partitions=4, max_partitions=2, owner="b")
+    assert node_a.heartbeat() == [0, 1]
+    assert node_b.heartbeat() == [2, 3]
+    assert node_a.run_due() == 2 and node_b.run_due() == 2
+    assert sorted(runs) == [0, 1, 2, 3]
+    print("✅ Partitions split between nodes, each run once")
+
+    # Within the interval nothing runs again, also not after a takeover
+    assert node_a.run_due() == 0
+    node_a.stop()
+    node_b.max_partitions = 4
+    assert node_b.heartbeat() == [0, 1, 2, 3]
+    assert node_b.run_due() == 0 and len(runs) == 4
+    print("✅ Takeover keeps the cadence from the lease's last run")
+
+def test_lease_lost_mid_run():
+    """A task can see that its lease was lost and stop"""
+    database = make_database()
+    seen = []
+
+    def task(partition, partitions, lease):
+        lease._deadline = time.monotonic() - 1
+        seen.append(lease.held)
+        return 0
+
+    scheduler = PartitionedScheduler(database, "reminders", task, interval=60, owner="a")
+    scheduler.heartbeat()
+    scheduler.run_due()
+    assert seen == [False]
+    # The lost lease did not record a run, so the new holder runs it
+    assert database["scheduler_leases"].find_one({"_id": "reminders:0"}).get("last_run_at") is None
+    print("✅ Lost lease is visible to the task and the run is not recorded")
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def test_scheduler_errors_logged():
+    """A failing run is logged at ERROR with its traceback instead of printed"""
+    handler = Records()
+    logger = logging.getLogger("scheduler_lease")
+    logger.addHandler(handler)
+    calls = []
+
+    def task(partition, partitions, lease):
+        calls.append(partition)
+        raise RuntimeError("mail server down")
+
+    scheduler = PartitionedScheduler(make_database(), "reminders", task, interval=0, owner="a", heartbeat=0.01)
+    try:
+        scheduler.start()
+        deadline = time.monotonic() + 5
+        while not handler.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        scheduler.stop()
+        logger.removeHandler(handler)
+    record = handler.records[0]
+    assert calls and record.levelno == logging.ERROR and record.exc_info[0] is RuntimeError
+    assert "reminders" in record.getMessage()
+    print("✅ Scheduler errors reach the log stream with a traceback")
+
+if __name__ == "__main__":
+    test_single_leader()
+    test_partitions()
+    test_scheduler_runs_once_per_cluster()
+    test_lease_lost_mid_run()
+    test_scheduler_errors_logged()
+    print("\n🎉 All scheduler lease tests passed!")
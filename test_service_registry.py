@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test lazy service loading in the service registry
+"""
+
+import sys
+from contextlib import contextmanager
+
+import service_registry
+from service_registry import ServiceRegistry
+
+@contextmanager
+def without_memory_sources():
+    """Simulate Windows: no /proc and no resource module"""
+    def missing(*args, **kwargs):
+        raise OSError("no /proc")
+    previous = sys.modules.get("resource")
+    service_registry.open = missing
+    sys.modules["resource"] = None
+    try:
+        yield
+    finally:
+        del service_registry.open
+        if previous is None:
+            sys.modules.pop("resource", None)
+        else:
+            sys.modules["resource"] = previous
+
+def test_service_registry():
+    """Services are created once, on first attribute access"""
+    print("🧩 Testing Service Registry")
+    print("=" * 50)
+
+    created = []
+
+    class DummyService:
+        def __init__(self):
+            created.append(self)
+            self.name = "dummy"
+
+        def ping(self):
+            return "pong"
+
+    registry = ServiceRegistry(lazy=True)
+    dummy_service = registry.register("dummy", DummyService)
+    missing_service = registry.register("missing", lambda: None)
+
+    print("1. Registering does not create the service...")
+    assert created == []
+    assert not registry.is_loaded("dummy")
+    print("   ✅ Not loaded")
+
+    print("\n2. First access loads the service...")
+    assert dummy_service.ping() == "pong"
+    assert dummy_service.name == "dummy"
+    assert len(created) == 1
+    print("   ✅ Loaded once")
+
+    print("\n3. Unavailable services are falsy...")
+    assert not missing_service
+    print("   ✅ None resolves to False")
+
+    report = registry.report()
+    assert report["services"]["dummy"]["loaded"]
+    assert report["services"]["dummy"]["load_time_ms"] is not None
+    print(f"\n📊 Report: {report['services']['dummy']}")
+
+def test_memory_unavailable():
+    """Without /proc or resource (Windows) memory is reported as unavailable"""
+    with without_memory_sources():
+        assert service_registry.current_rss_mb() is None
+        registry = ServiceRegistry(lazy=True)
+        registry.register("dummy", object)
+        registry.get("dummy")
+        report = registry.report()
+    assert report["rss_mb"] is None and report["services"]["dummy"]["rss_delta_mb"] is None
+    assert report["services"]["dummy"]["loaded"]
+    print("✅ Services load without memory statistics")
+
+if __name__ == "__main__":
+    test_service_registry()
+    test_memory_unavailable()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test single-flight coalescing of identical concurrent pregnancy AI calls
+"""
+
+import json
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from single_flight import SingleFlight
+from pregnancy_openai_service import PregnancyOpenAIService
+
+def run_concurrently(count, target):
+    """Start count threads together and collect their results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_calls_share_one_result():
+    """Concurrent callers with the same key run the function once"""
+    print("🔁 Testing Single-Flight Coalescing")
+    print("=" * 50)
+    flights = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return "week 12"
+
+    results = run_concurrently(8, lambda: flights.do(("symptoms", 12), slow))
+    assert results == ["week 12"] * 8
+    assert len(calls) == 1
+    stats = flights.stats()
+    assert stats == {"upstream_calls": 1, "coalesced_calls": 7, "in_flight": 0}
+
+    # Finished calls are not cached
+    flights.do(("symptoms", 12), slow)
+    assert len(calls) == 2
+    print("   ✅ 8 concurrent callers, 1 upstream call")
+
+def test_errors_reach_every_waiter():
+    """An upstream failure is raised to all coalesced callers"""
+    flights = SingleFlight()
+
+    def fail():
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    results = run_concurrently(4, lambda: flights.do("key", fail))
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.stats()["in_flight"] == 0
+    print("   ✅ Failure propagated to every waiter")
+
+def test_pregnancy_sections_are_keyed_by_week_and_section():
+    """Requests from separate event loops coalesce per (week, section)"""
+    prompts = []
+
+    def create(**kwargs):
+        prompts.append(kwargs["messages"][1]["content"])
+        time.sleep(0.2)
+        content = json.dumps({"common_symptoms": ["Fatigue"], "severity_level": "mild"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    service = PregnancyOpenAIService.__new__(PregnancyOpenAIService)
+    service.model = "gpt-3.5-turbo"
+    service.max_tokens = 500
+    service.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    service.flights = SingleFlight()
+
+    # Flask runs each async view in its own event loop and thread
+    results = run_concurrently(6, lambda: asyncio.run(service.get_early_symptoms(12)))
+    assert all(r.common_symptoms == ["Fatigue"] for r in results)
+    assert len(prompts) == 1
+
+    run_concurrently(2, lambda: asyncio.run(service.get_early_symptoms(13)))
+    run_concurrently(2, lambda: asyncio.run(service.get_wellness_tips(12)))
+    assert len(prompts) == 3
+    print("   ✅ 6 requests for week 12 symptoms made 1 OpenAI call")
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_result()
+    test_errors_reach_every_waiter()
+    test_pregnancy_sections_are_keyed_by_week_and_section()
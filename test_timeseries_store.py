@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the time-series storage backend for vital signs and hydration
+"""
+
+import mongomock
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import timeseries_store
+from timeseries_store import TimeSeriesCollection, hydration_fields, hydration_window
+from vital_signs_service import VitalSignsService
+
+class MockDB:
+    def __init__(self):
+        self.patients_collection = mongomock.MongoClient().db.Patient_test
+
+@contextmanager
+def backend(name):
+    previous, timeseries_store.TIMESERIES_BACKEND = timeseries_store.TIMESERIES_BACKEND, name
+    try:
+        yield
+    finally:
+        timeseries_store.TIMESERIES_BACKEND = previous
+
+def test_insert_and_window():
+    """Measurements round-trip to the embedded record shape and are range-scanned newest first"""
+    print("📈 Testing Time-Series Store")
+    print("=" * 50)
+    database = mongomock.MongoClient().db
+    series = TimeSeriesCollection("vitals", "type")
+    now = datetime(2026, 10, 1, 12, 0)
+    records = [{"type": "heartRate", "value": 70 + i, "timestamp": now - timedelta(hours=i)} for i in range(48)]
+    records.append({"type": "spO2", "value": 98, "timestamp": (now - timedelta(hours=1)).isoformat()})
+    assert series.insert(database, "PAT1", records) == 49
+    series.insert(database, "PAT2", records[:5])
+
+    day = series.window(database, "PAT1", now - timedelta(days=1), now + timedelta(seconds=1))
+    assert len(day) == 26
+    assert day[0] == {"type": "heartRate", "value": 70, "timestamp": now, "patient_id": "PAT1"}
+    assert all(a["timestamp"] >= b["timestamp"] for a, b in zip(day, day[1:]))
+    assert [r["value"] for r in series.window(database, "PAT1", types=["spO2"])] == [98]
+    print(f"   ✅ 24h window: {len(day)} readings, newest first")
+
+def test_hydration_window_both_backends():
+    """Both layouts return the same day of hydration records with ISO timestamps"""
+    db = MockDB()
+    day = datetime(2026, 10, 1)
+    records = [
+        {"hydration_type": "water", "amount_ml": 250, "timestamp": (day + timedelta(hours=9)).isoformat()},
+        {"hydration_type": "tea", "amount_ml": 200, "timestamp": (day + timedelta(hours=15)).isoformat()},
+        {"hydration_type": "water", "amount_ml": 300, "timestamp": (day - timedelta(hours=2)).isoformat()},
+        {"hydration_type": "water", "amount_ml": 100, "timestamp": "not a date"},
+    ]
+    patient = {"patient_id": "PAT1", "hydration_records": records}
+    db.patients_collection.insert_one(dict(patient))
+
+    embedded = hydration_window(patient, db.patients_collection, day, day + timedelta(days=1))
+    assert [r["amount_ml"] for r in embedded] == [200, 250]
+
+    with backend("timeseries"):
+        report = timeseries_store.hydration_series.migrate(db.patients_collection)
+        assert report == {"patients": 1, "records": 4, "skipped": 0, "unset": 0}
+        assert timeseries_store.hydration_series.migrate(db.patients_collection)["skipped"] == 1
+        series = hydration_window({"patient_id": "PAT1"}, db.patients_collection, day, day + timedelta(days=1))
+    assert [(r["amount_ml"], r["timestamp"]) for r in series] == [(r["amount_ml"], r["timestamp"]) for r in embedded]
+    print("   ✅ Embedded and time-series hydration windows match; migrate is re-runnable")
+
+def test_migrate_unset_and_projection():
+    """migrate --unset shrinks patient documents; handlers only load the embedded records when used"""
+    db = MockDB()
+    records = [{"hydration_type": "water", "amount_ml": 250, "timestamp": datetime(2026, 10, 1, h).isoformat()}
+               for h in range(8, 12)]
+    db.patients_collection.insert_many([{"patient_id": "PAT1", "hydration_goal": {"daily_goal_ml": 2000},
+                                         "hydration_records": list(records)},
+                                        {"patient_id": "PAT2", "hydration_records": list(records)}])
+    with backend("timeseries"):
+        series = timeseries_store.hydration_series
+        assert series.migrate(db.patients_collection)["unset"] == 0
+        # PAT2 logged one more embedded record after the copy: its array is kept
+        db.patients_collection.update_one({"patient_id": "PAT2"}, {"$push": {"hydration_records": records[0]}})
+        report = series.migrate(db.patients_collection, unset=True)
+        assert report["skipped"] == 2 and report["unset"] == 1
+        patient = db.patients_collection.find_one({"patient_id": "PAT1"})
+        assert "hydration_records" not in patient and patient["hydration_goal"]["daily_goal_ml"] == 2000
+        assert len(db.patients_collection.find_one({"patient_id": "PAT2"})["hydration_records"]) == 5
+        assert len(hydration_window({"patient_id": "PAT1"}, db.patients_collection)) == 4
+        assert hydration_fields("hydration_goal") == {"patient_id": 1, "hydration_goal": 1}
+    assert hydration_fields() == {"patient_id": 1, "hydration_records": 1}
+    print("   ✅ Verified copies unset from Patient_test; projections skip embedded arrays")
+
+def test_vital_signs_service_timeseries():
+    """With the backend enabled readings skip the patient document and history reads a window"""
+    with backend("timeseries"):
+        db = MockDB()
+        service = VitalSignsService(db)
+        now = datetime.now()
+        readings = [{"type": "heartRate", "value": 72, "timestamp": (now - timedelta(days=d)).isoformat()}
+                    for d in range(10)]
+        service.record_vital_signs_batch(readings, patient_id="PAT1")
+        assert service.record_vital_sign("PAT1", {"type": "spO2", "value": 90})["success"]
+
+        patient = db.patients_collection.find_one({"patient_id": "PAT1"})
+        assert "vital_signs_logs" not in patient
+        assert patient["vital_signs_alerts"][0]["type"] == "spO2"
+
+        history = service.get_vital_signs_history("PAT1", days=3)
+        assert history["success"] and history["total_count"] == 4
+        assert service.get_vital_signs_history("PAT1", days=30)["total_count"] == 11
+        assert not service.get_vital_signs_history("NOBODY", days=3)["success"]
+        print("   ✅ Vitals recorded to the time-series collection; history is a 3-day range scan")
+
+if __name__ == "__main__":
+    test_insert_and_window()
+    test_hydration_window_both_backends()
+    test_migrate_unset_and_projection()
+    test_vital_signs_service_timeseries()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized vital signs analytics and the single-fetch service paths
+"""
+
+import mongomock
+from datetime import datetime, timedelta
+from vital_signs_analytics import VitalSignsAnalytics
+from vital_signs_service import VitalSignsService
+
+class CountingCollection:
+    """Wraps a mongomock collection and counts find_one calls"""
+    def __init__(self, collection):
+        self.collection = collection
+        self.find_one_calls = 0
+
+    def find_one(self, *args, **kwargs):
+        self.find_one_calls += 1
+        return self.collection.find_one(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+class MockDB:
+    def __init__(self):
+        self.patients_collection = CountingCollection(mongomock.MongoClient().db.patients)
+
+def make_logs(now):
+    logs = []
+    for i, hr in enumerate([72, 74, 73, 75, 71, 140]):
+        logs.append({"type": "heartRate", "value": hr, "timestamp": now - timedelta(hours=6 - i)})
+    logs.append({"type": "bloodPressure", "value": 120, "secondary_value": 80, "timestamp": now - timedelta(minutes=30)})
+    logs.append({"type": "temperature", "value": 36.8, "timestamp": now - timedelta(days=3)})
+    return logs
+
+def test_vital_signs_analytics():
+    """Anomalies, trends, EWS, statistics and windows over columnar series"""
+    print("📈 Testing Vital Signs Analytics")
+    print("=" * 50)
+
+    now = datetime.now()
+    analytics = VitalSignsAnalytics.from_logs(make_logs(now), now=now)
+
+    print("1. Windows...")
+    assert len(analytics) == 8
+    assert len(analytics.window(days=1)) == 7
+    assert analytics.window(days=1).records()[0]["type"] == "bloodPressure"
+    print("   ✅ Readings filtered by time, newest first")
+
+    print("\n2. Anomalies and trends...")
+    anomalies = analytics.anomalies()
+    assert len(anomalies) == 1 and anomalies[0]["type"] == "heartRate"
+    assert anomalies[0]["reason"].startswith("Value 140 ")
+    trend = next(t for t in analytics.trends() if t["type"] == "heartRate")
+    assert trend["trend"] == "increasing"
+    print("   ✅ Spike detected and trend increasing")
+
+    print("\n3. Early warning score...")
+    ews = analytics.early_warning_score()
+    assert ews["score"] == 3 and ews["risk_level"] == "medium"
+    assert ews["factors"] == ["Heart rate 140 BPM (abnormal)"]
+    print("   ✅ Latest heart rate scored")
+
+    print("\n4. Statistics...")
+    stats = analytics.statistics()
+    assert stats["heartRate"]["count"] == 6
+    assert stats["heartRate"]["latest_value"] == 140
+    assert stats["heartRate"]["max_value"] == 140.0
+    assert stats["heartRate"]["rolling_average"] == round((74 + 73 + 75 + 71 + 140) / 5, 2)
+    print("   ✅ Averages and rolling statistics computed")
+
+def test_health_summary_fetches_once():
+    """Health summary analyses the same fetched document"""
+    db = MockDB()
+    db.patients_collection.insert_one({"patient_id": "PAT1", "vital_signs_logs": make_logs(datetime.now())})
+    service = VitalSignsService(db=db)
+
+    result = service.get_health_summary("PAT1")
+    assert result["success"]
+    assert result["health_summary"]["recent_vital_signs_count"] == 7
+    assert result["health_summary"]["analysis"]["early_warning_score"]["score"] == 3
+    assert db.patients_collection.find_one_calls == 1
+
+    assert service.get_vital_signs_stats("PAT1", 30)["statistics"]["temperature"]["count"] == 1
+    assert service.get_vital_signs_history("missing")["success"] is False
+
+if __name__ == "__main__":
+    test_vital_signs_analytics()
+    test_health_summary_fetches_once()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test batch vital signs ingestion: validation, one write per patient, batch alerts
+"""
+
+import mongomock
+from datetime import datetime, timedelta, timezone
+from vital_signs_service import VitalSignsService
+
+class CountingCollection:
+    """Wraps a mongomock collection and counts write calls"""
+    def __init__(self, collection):
+        self.collection = collection
+        self.bulk_writes = []
+        self.update_one_calls = 0
+
+    def bulk_write(self, operations, **kwargs):
+        self.bulk_writes.append(len(operations))
+        # mongomock's bulk_write does not accept current pymongo UpdateOne objects
+        for op in operations:
+            self.collection.update_one(op._filter, op._doc, upsert=op._upsert)
+
+    def update_one(self, *args, **kwargs):
+        self.update_one_calls += 1
+        return self.collection.update_one(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+class MockDB:
+    def __init__(self):
+        self.patients_collection = CountingCollection(mongomock.MongoClient().db.patients)
+
+def test_record_vital_signs_batch():
+    """A day of readings for two patients is validated and written in one bulk_write"""
+    print("⌚ Testing Batch Vital Signs Ingestion")
+    print("=" * 50)
+    db = MockDB()
+    service = VitalSignsService(db)
+    start = datetime(2026, 10, 1, 8, 0)
+
+    readings = [{"type": "heartRate", "value": 70 + i % 10, "timestamp": (start + timedelta(minutes=i)).isoformat()}
+                for i in range(1440)]
+    readings += [
+        {"type": "heartRate", "value": 130, "timestamp": start.isoformat()},
+        {"type": "heartRate", "value": 120},
+        {"type": "spO2", "value": 91, "patient_id": "PAT2"},
+        {"type": "heartRate"},
+        {"value": 72},
+        {"type": "temperature", "value": "warm"},
+        {"type": "temperature", "value": 37, "timestamp": "yesterday"},
+        "not a reading",
+    ]
+
+    result = service.record_vital_signs_batch(readings, patient_id="PAT1")
+    assert result["success"]
+    assert result["accepted"] == 1443 and result["rejected"] == 5
+    assert result["patients"] == 2
+    assert db.patients_collection.bulk_writes == [2]
+    assert db.patients_collection.update_one_calls == 0
+    print(f"   ✅ {result['accepted']} readings, 1 bulk_write with {result['patients']} upserts")
+
+    errors = {r["index"]: r["error"] for r in result["results"] if not r["success"]}
+    assert list(errors.values()) == [
+        "Missing or non-numeric field: value",
+        "Missing required field: type",
+        "Missing or non-numeric field: value",
+        "Invalid timestamp",
+        "Reading must be a JSON object",
+    ]
+    assert sum(r.get("alert", False) for r in result["results"]) == 3
+    print(f"   ✅ Per-item errors: {sorted(set(errors.values()))}")
+
+    patient = db.patients_collection.find_one({"patient_id": "PAT1"})
+    assert len(patient["vital_signs_logs"]) == 1442
+    assert patient["vital_signs_logs"][0]["timestamp"] == start
+    alerts = patient["vital_signs_alerts"]
+    assert len(alerts) == 1
+    assert alerts[0]["reading_count"] == 2 and "(130) in 2 readings" in alerts[0]["message"]
+    pat2 = db.patients_collection.find_one({"patient_id": "PAT2"})
+    assert pat2["vital_signs_alerts"][0]["message"] == "spO2 is below normal range (91)"
+    print("   ✅ One alert per patient, type and direction")
+
+    history = service.get_vital_signs_history("PAT1", days=3650)
+    assert history["total_count"] == 1442
+
+def test_offset_timestamps_converted():
+    """Device timestamps with a UTC offset are converted to naive local time, not truncated"""
+    db = MockDB()
+    service = VitalSignsService(db)
+    readings = [{"type": "heartRate", "value": 72, "timestamp": "2026-10-01T14:30:00+05:30"},
+                {"type": "heartRate", "value": 74, "timestamp": "2026-10-01T09:00:00Z"},
+                {"type": "heartRate", "value": 76, "timestamp": "2026-10-01T09:00:00"}]
+    assert service.record_vital_signs_batch(readings, "PAT1")["accepted"] == 3
+    logs = db.patients_collection.find_one({"patient_id": "PAT1"})["vital_signs_logs"]
+    expected = datetime(2026, 10, 1, 9, 0, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    assert logs[0]["timestamp"] == logs[1]["timestamp"] == expected
+    assert logs[0]["timestamp"].tzinfo is None and logs[2]["timestamp"] == datetime(2026, 10, 1, 9, 0)
+    print("   ✅ +05:30 and Z timestamps stored as the same local instant")
+
+def test_batch_limits():
+    """Empty batches are fine; oversized ones are refused"""
+    service = VitalSignsService(MockDB())
+    assert service.record_vital_signs_batch([], "PAT1")["accepted"] == 0
+    service.max_batch_size = 2
+    result = service.record_vital_signs_batch([{"type": "heartRate", "value": 70}] * 3, "PAT1")
+    assert not result["success"] and "Batch too large" in result["message"]
+    print("   ✅ Batch size limit enforced")
+
+if __name__ == "__main__":
+    test_record_vital_signs_batch()
+    test_offset_timestamps_converted()
+    test_batch_limits()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test single-pass vital sign extraction from OCR text
+"""
+
+from vital_signs_ocr_service import vital_signs_ocr_service, scan_vital_signs
+
+def readings(text):
+    return [(v['type'], v['value'], v['secondary_value'])
+            for v in vital_signs_ocr_service.extract_vital_signs_from_text(text)]
+
+def test_vital_signs_extraction():
+    """Extract each vital type once, with priority for labelled values"""
+    print("🩺 Testing Vital Signs Extraction")
+    print("=" * 50)
+
+    print("1. Standard report...")
+    result = vital_signs_ocr_service.process_document("report.png")
+    assert readings(result['extracted_text']) == [
+        ('heartRate', 75.0, None),
+        ('bloodPressure', 120.0, 80.0),
+        ('temperature', 36.5, None),
+        ('spO2', 98.0, None),
+        ('respiratoryRate', 16.0, None),
+    ]
+    for vital in result['vital_signs']:
+        assert vital['confidence'] == 0.9 and vital['source'] == 'ocr_extraction'
+    print("   ✅ All five vital signs extracted")
+
+    print("\n2. Overlapping patterns...")
+    # Labelled value with unit is a single hit, not one per matching pattern
+    text = "BP 118/76 mmHg  Pulse 82 bpm  O2 Sat 97 %  RR 18 breaths/min"
+    assert len(list(scan_vital_signs(text))) == 4
+    print("   ✅ One raw hit per reading")
+
+    print("\n3. Units and false positives...")
+    assert readings("Temp 98.6 F") == [('temperature', 37.0, None)]
+    assert readings("Date 12/10/2024, fundal height 28 cm") == []
+    assert readings("systolic 132 mmHg, diastolic 86 mmHg") == [('bloodPressure', 132.0, 86.0)]
+    assert readings("96% SpO2 and 150/90 mmHg") == [('spO2', 96.0, None), ('bloodPressure', 150.0, 90.0)]
+    print("   ✅ Fahrenheit converted, dates and lengths ignored")
+
+if __name__ == "__main__":
+    test_vital_signs_extraction()
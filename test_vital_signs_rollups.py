@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test the hourly/daily vital sign rollups and resolution selection
+"""
+
+import mongomock
+from datetime import datetime, timedelta
+from pymongo.errors import BulkWriteError
+
+from vital_signs_rollups import VitalSignsRollups
+from vital_signs_service import VitalSignsService
+
+class ReplayCollection:
+    """mongomock's bulk_write does not accept current pymongo UpdateOne objects"""
+    def __init__(self, collection):
+        self.collection = collection
+
+    def bulk_write(self, operations, **kwargs):
+        for op in operations:
+            self.collection.update_one(op._filter, op._doc, upsert=op._upsert)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+class ReplayDatabase:
+    def __init__(self, database):
+        self.database = database
+
+    def __getitem__(self, name):
+        return ReplayCollection(self.database[name])
+
+class RacingCollection(ReplayCollection):
+    """Another writer creates the first bucket just before our upsert, once"""
+    def __init__(self, collection):
+        super().__init__(collection)
+        self.raced = False
+
+    def bulk_write(self, operations, **kwargs):
+        if not self.raced:
+            self.raced = True
+            self.collection.insert_one(dict(operations[0]._filter, count=1, sum=50.0))
+            raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000, "errmsg": "E11000 duplicate key"}]})
+        super().bulk_write(operations, **kwargs)
+
+class RacingDatabase(ReplayDatabase):
+    def __getitem__(self, name):
+        return RacingCollection(self.database[name])
+
+class MockDB:
+    def __init__(self):
+        database = ReplayDatabase(mongomock.MongoClient().db)
+        self.patients_collection = database["Patient_test"]
+        self.patients_collection.database = database
+
+def test_rollup_buckets():
+    """Buckets hold count/sum/min/max/last; late readings do not replace the latest value"""
+    print("📊 Testing Vital Sign Rollups")
+    print("=" * 50)
+    database = ReplayDatabase(mongomock.MongoClient().db)
+    rollups = VitalSignsRollups()
+    hour = datetime(2026, 10, 1, 9, 0)
+    readings = [{"type": "heartRate", "value": v, "timestamp": hour + timedelta(minutes=10 * i)}
+                for i, v in enumerate([70, 90, 60, 80])]
+    readings.append({"type": "bloodPressure", "value": 120, "secondary_value": 80, "timestamp": hour})
+    readings.append({"type": "bloodPressure", "value": 130, "secondary_value": 90, "timestamp": hour.isoformat()})
+    rollups.update(database, "PAT1", readings)
+    rollups.update(database, "PAT1", [{"type": "heartRate", "value": 100, "timestamp": hour + timedelta(minutes=5)}])
+
+    points = rollups.series(database, "PAT1", "hourly", types=["heartRate"])
+    assert len(points) == 1
+    point = points[0]
+    assert (point["count"], point["min"], point["max"], point["last"]) == (5, 60, 100, 80)
+    assert point["mean"] == point["value"] == 80
+    assert point["timestamp"] == hour
+
+    blood_pressure = rollups.series(database, "PAT1", "daily", types=["bloodPressure"])[0]
+    assert blood_pressure["timestamp"] == datetime(2026, 10, 1)
+    assert blood_pressure["secondary"] == {"mean": 85, "min": 80, "max": 90, "last": 90}
+    print("   ✅ min/max/mean/last per bucket, diastolic tracked for blood pressure")
+
+def test_upsert_race_retried():
+    """Losing the race to create a bucket retries instead of failing the write"""
+    database = RacingDatabase(mongomock.MongoClient().db)
+    rollups = VitalSignsRollups()
+    hour = datetime(2026, 10, 1, 9, 0)
+    rollups.update(database, "PAT1", [{"type": "heartRate", "value": 70, "timestamp": hour}])
+    point = rollups.series(database, "PAT1", "hourly")[0]
+    assert point["count"] == 2 and point["mean"] == 60
+    print("   ✅ DuplicateKeyError on a new bucket is retried as an update")
+
+def test_history_resolution():
+    """History returns rollups for long windows and raw readings for short sparse ones"""
+    db = MockDB()
+    service = VitalSignsService(db)
+    now = datetime.now().replace(minute=30, second=0, microsecond=0)
+    readings = [{"type": "heartRate", "value": 60 + (i % 40), "timestamp": (now - timedelta(minutes=30 * i)).isoformat()}
+                for i in range(30 * 48)]
+    assert service.record_vital_signs_batch(readings, patient_id="PAT1")["accepted"] == 1440
+
+    raw = service.get_vital_signs_history("PAT1", days=30)
+    daily = service.get_vital_signs_history("PAT1", days=30, resolution="auto")
+    assert raw["total_count"] == 1440 and raw["resolution"] == "raw"
+    assert daily["resolution"] == "daily" and 30 <= daily["total_count"] <= 31
+    assert sum(point["count"] for point in daily["vital_signs"]) == 1440
+    print(f"   ✅ 30 days: {raw['total_count']} raw readings -> {daily['total_count']} daily points")
+
+    week = service.get_vital_signs_history("PAT1", days=14, resolution="auto")
+    assert week["resolution"] == "hourly" and week["total_count"] <= 14 * 24 + 1
+    assert service.get_vital_signs_history("PAT1", days=1, resolution="auto")["resolution"] == "raw"
+    assert not service.get_vital_signs_history("PAT1", days=7, resolution="weekly")["success"]
+    print(f"   ✅ 14 days -> hourly ({week['total_count']} points), 1 day -> raw")
+
+def test_sparse_long_window_stays_raw():
+    """A long window with few readings is returned raw rather than as daily buckets"""
+    db = MockDB()
+    service = VitalSignsService(db)
+    now = datetime.now()
+    readings = [{"type": "bloodPressureSystolic", "value": 110 + i, "timestamp": (now - timedelta(days=3 * i)).isoformat()}
+                for i in range(40)]
+    assert service.record_vital_signs_batch(readings, patient_id="PAT1")["accepted"] == 40
+    rollups = VitalSignsRollups()
+    assert rollups.pick_resolution(db.patients_collection.database, "PAT1", 180) == "raw"
+    history = service.get_vital_signs_history("PAT1", days=180, resolution="auto")
+    assert history["resolution"] == "raw" and history["total_count"] == 40
+    print("   ✅ 180 days with 40 readings -> raw")
+
+if __name__ == "__main__":
+    test_rollup_buckets()
+    test_upsert_race_retried()
+    test_history_resolution()
+    test_sparse_long_window_stays_raw()
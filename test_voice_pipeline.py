@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the streaming voice pipeline offline with the mock STT/AI/TTS services
+"""
+
+import json
+import asyncio
+from types import SimpleNamespace
+
+import voice_pipeline
+from voice_pipeline import VoicePipelineWebSocketService
+from voice_interaction_service import MockSTTService, MockAIService, MockTTSService
+
+class FakeWebSocket:
+    """Replays client messages and records what the server sends"""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.sent = []
+
+    def __aiter__(self):
+        return self._replay()
+
+    async def _replay(self):
+        for message in self.messages:
+            yield message
+            await asyncio.sleep(0.01)  # let partial transcripts run
+
+    async def send(self, message):
+        self.sent.append(message if isinstance(message, bytes) else json.loads(message))
+
+def make_service(tts_latency=0.0):
+    voice = SimpleNamespace(stt_service=MockSTTService(latency=0.01), ai_service=MockAIService(latency=0.05),
+                            tts_service=MockTTSService(latency=tts_latency))
+    return VoicePipelineWebSocketService(voice)
+
+def events(sent, kind=None):
+    return [m for m in sent if isinstance(m, dict) and (kind is None or m["type"] == kind)]
+
+def test_streaming_turn():
+    """Partial transcripts, tokens and audio chunks arrive in order with stage latencies"""
+    print("🎙️ Testing Voice Pipeline")
+    print("=" * 50)
+    voice_pipeline.PARTIAL_INTERVAL_BYTES = 3200
+    service = make_service()
+    frames = [b"\x00" * 1600] * 6
+    socket = FakeWebSocket(frames + [json.dumps({"type": "end"})])
+    asyncio.run(service.handle(socket))
+
+    kinds = [m["type"] if isinstance(m, dict) else "bytes" for m in socket.sent]
+    assert "partial_transcript" in kinds
+    assert kinds.index("partial_transcript") < kinds.index("final_transcript") < kinds.index("ai_token")
+    assert kinds[-1] == "turn_complete"
+
+    tokens = "".join(m["text"] for m in events(socket.sent, "ai_token"))
+    assert tokens.strip() == events(socket.sent, "ai_response")[0]["text"]
+
+    # Every audio header is followed by its binary frame
+    for i, message in enumerate(socket.sent):
+        if isinstance(message, dict) and message["type"] == "audio":
+            assert isinstance(socket.sent[i + 1], bytes) and len(socket.sent[i + 1]) == message["size"]
+
+    latency = events(socket.sent, "turn_complete")[0]["latency"]
+    for stage in ("stt_first_partial_ms", "stt_ms", "ai_first_token_ms", "ai_ms",
+                  "tts_first_audio_ms", "end_to_end_ms", "total_ms"):
+        assert latency[stage] is not None, stage
+    assert latency["audio_chunks"] >= 1
+    assert service.stats()["turns"] == 1
+    print(f"   ✅ End of speech to first audio: {latency['end_to_end_ms']} ms")
+
+def test_tts_starts_before_ai_finishes():
+    """Sentences are synthesized while the AI is still generating"""
+    class TwoSentenceAI:
+        async def stream_response(self, text, history=None):
+            for delta in ["First sentence. ", "Second ", "sentence."]:
+                await asyncio.sleep(0.05)
+                yield delta
+
+    service = make_service()
+    service.voice_service.ai_service = TwoSentenceAI()
+    socket = FakeWebSocket([b"\x00" * 100, json.dumps({"type": "end"})])
+    asyncio.run(service.handle(socket))
+
+    kinds = [m["type"] if isinstance(m, dict) else "bytes" for m in socket.sent]
+    assert kinds.count("audio") == 2
+    assert kinds.index("audio") < kinds.index("ai_response")
+    print("   ✅ First sentence spoken before the AI response completed")
+
+def test_cancel_and_errors():
+    """Barge-in cancels the reply; bad input is reported, not fatal"""
+    service = make_service(tts_latency=0.5)
+    socket = FakeWebSocket([json.dumps({"type": "end"}), "not json", json.dumps({"type": "bogus"}),
+                            b"\x00" * 100, json.dumps({"type": "end"}), json.dumps({"type": "cancel"})])
+    asyncio.run(service.handle(socket))
+
+    errors = [m["error"] for m in events(socket.sent, "error")]
+    assert errors[0] == "No audio received"
+    assert "Control messages must be JSON" in errors
+    assert "Turn cancelled" in errors
+    assert not events(socket.sent, "turn_complete")
+    print(f"   ✅ Errors reported: {errors}")
+
+if __name__ == "__main__":
+    test_streaming_turn()
+    test_tts_starts_before_ai_finishes()
+    test_cancel_and_errors()
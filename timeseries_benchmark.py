@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedded-array layout against MongoDB time-series collections
+
+Loads the same synthetic vital signs into both layouts in a scratch database,
+then compares storage size and the latency of a window query (the last N days
+of one patient). Needs a real MongoDB 5.0+ (MONGO_URI); the scratch database is
+dropped afterwards unless --keep is given.
+
+Usage:
+    python timeseries_benchmark.py --patients 50 --readings 20000 --output timeseries_report.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pymongo
+
+from timeseries_store import TimeSeriesCollection
+
+VITAL_TYPES = {
+    "heartRate": (60, 100),
+    "bloodPressure": (100, 140),
+    "temperature": (36.1, 37.5),
+    "spO2": (94, 100),
+    "respiratoryRate": (12, 20),
+}
+
+def synthetic_readings(count: int, end: datetime) -> List[Dict]:
+    """One reading per minute going back from end, cycling through vital types"""
+    types = list(VITAL_TYPES)
+    readings = []
+    for i in range(count):
+        vital_type = types[i % len(types)]
+        low, high = VITAL_TYPES[vital_type]
+        readings.append({
+            "type": vital_type,
+            "value": round(random.uniform(low, high), 1),
+            "unit": "",
+            "notes": "",
+            "timestamp": end - timedelta(minutes=i),
+            "created_at": end - timedelta(minutes=i)
+        })
+    return readings
+
+def load(database, series: TimeSeriesCollection, patients: int, readings: int, end: datetime):
+    embedded = database["embedded_patients"]
+    for p in range(patients):
+        patient_id = f"BENCH{p:05d}"
+        records = synthetic_readings(readings, end)
+        embedded.insert_one({"patient_id": patient_id, "vital_signs_logs": records})
+        series.insert(database, patient_id, records)
+    embedded.create_index("patient_id")
+
+def storage(database, name: str) -> Dict:
+    stats = database.command("collStats", name)
+    return {
+        "documents": stats.get("count", 0),
+        "size_mb": round(stats.get("size", 0) / 1024 / 1024, 2),
+        "storage_mb": round(stats.get("storageSize", 0) / 1024 / 1024, 2),
+        "index_mb": round(stats.get("totalIndexSize", 0) / 1024 / 1024, 2)
+    }
+
+def time_queries(query, patients: int, iterations: int) -> Dict:
+    samples = []
+    for i in range(iterations):
+        patient_id = f"BENCH{i % patients:05d}"
+        started = time.perf_counter()
+        count = query(patient_id)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "readings_returned": count,
+        "median_ms": round(statistics.median(samples), 2),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "max_ms": round(samples[-1], 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedded arrays with time-series collections")
+    parser.add_argument("--patients", type=int, default=20)
+    parser.add_argument("--readings", type=int, default=10000, help="readings per patient (one per minute)")
+    parser.add_argument("--days", type=float, default=1, help="window size for the query benchmark")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--database", default="timeseries_benchmark")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=10000)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError as e:
+        print(f"❌ MongoDB not reachable: {e}")
+        sys.exit(1)
+
+    client.drop_database(args.database)
+    database = client[args.database]
+    series = TimeSeriesCollection("vital_signs_series", "type")
+    end = datetime.now().replace(microsecond=0)
+
+    print(f"⏳ Loading {args.patients} patients x {args.readings} readings into both layouts...")
+    load(database, series, args.patients, args.readings, end)
+    start = end - timedelta(days=args.days)
+
+    def embedded_window(patient_id):
+        patient = database["embedded_patients"].find_one({"patient_id": patient_id}, {"vital_signs_logs": 1})
+        return sum(1 for r in patient["vital_signs_logs"] if r["timestamp"] >= start)
+
+    def series_window(patient_id):
+        return len(series.window(database, patient_id, start))
+
+    timeseries_storage = storage(database, "vital_signs_series")
+    buckets = database.command("collStats", "vital_signs_series").get("timeseries", {})
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "patients": args.patients,
+        "readings_per_patient": args.readings,
+        "window_days": args.days,
+        "embedded": {**storage(database, "embedded_patients"),
+                     **time_queries(embedded_window, args.patients, args.iterations)},
+        "timeseries": {**timeseries_storage, "buckets": buckets.get("bucketCount"),
+                       **time_queries(series_window, args.patients, args.iterations)}
+    }
+
+    print("\n📈 Embedded arrays vs time-series collection")
+    print("=" * 70)
+    for name in ("embedded", "timeseries"):
+        r = report[name]
+        print(f"{name:>11}: {r['storage_mb']:>8.2f} MB on disk ({r['size_mb']:.2f} MB data, "
+              f"{r['index_mb']:.2f} MB index) | window query median {r['median_ms']:.2f} ms, "
+              f"p95 {r['p95_ms']:.2f} ms ({r['readings_returned']} readings)")
+
+    if not args.keep:
+        client.drop_database(args.database)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
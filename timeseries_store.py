@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Time-series storage backend for vital signs and hydration
+
+By default readings are embedded as arrays in the patient document. With
+TIMESERIES_BACKEND=timeseries they go to MongoDB time-series collections
+instead. Each reading is one measurement with ``timestamp`` as the time field and
+``meta = {patient_id, type}`` as the meta field, so MongoDB buckets and
+compresses a patient's readings per type. Window queries become range scans
+on (meta.patient_id, timestamp) instead of loading the whole patient document.
+
+Usage:
+    python timeseries_store.py setup      # create the collections and indexes
+    python timeseries_store.py migrate    # copy embedded arrays into the time-series collections
+    python timeseries_store.py migrate --unset   # ...then remove each copied array from Patient_test
+"""
+
+import os
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from vital_signs_analytics import to_datetime
+
+# "embedded" (arrays in Patient_test) or "timeseries"
+TIMESERIES_BACKEND = os.getenv("TIMESERIES_BACKEND", "embedded").lower()
+
+def timeseries_enabled() -> bool:
+    return TIMESERIES_BACKEND == "timeseries"
+
+class TimeSeriesCollection:
+    """One time-series collection of patient readings, grouped by a type field"""
+
+    def __init__(self, name: str, type_field: str, granularity: str = "minutes",
+                 iso_timestamps: bool = False, embedded_field: Optional[str] = None):
+        self.name = name
+        self.type_field = type_field
+        self.granularity = granularity
+        # Hydration records have always exposed ISO strings; vitals expose datetimes
+        self.iso_timestamps = iso_timestamps
+        # Array in the patient document that this collection replaces
+        self.embedded_field = embedded_field
+        self._ready = set()
+
+    def collection(self, database):
+        """The collection in this database, created as time-series on first use"""
+        if id(database) not in self._ready:
+            self.ensure(database)
+            self._ready.add(id(database))
+        return database[self.name]
+
+    def ensure(self, database):
+        if self.name not in database.list_collection_names():
+            try:
+                database.create_collection(self.name, timeseries={
+                    "timeField": "timestamp",
+                    "metaField": "meta",
+                    "granularity": self.granularity
+                })
+                print(f"✅ Created time-series collection {self.name}")
+            except CollectionInvalid:
+                pass  # created concurrently
+            except (OperationFailure, NotImplementedError) as e:
+                # MongoDB < 5.0 (or a test double): a regular collection with the same layout
+                print(f"⚠️ {self.name}: time-series collections unavailable ({e}); using a regular collection")
+        database[self.name].create_index([("meta.patient_id", 1), ("meta.type", 1), ("timestamp", -1)])
+
+    def to_measurement(self, patient_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        body = {key: value for key, value in record.items() if key not in (self.type_field, "patient_id", "_id")}
+        body["timestamp"] = to_datetime(record.get("timestamp"), datetime.now())
+        body["meta"] = {"patient_id": patient_id, "type": record.get(self.type_field)}
+        return body
+
+    def to_record(self, measurement: Dict[str, Any]) -> Dict[str, Any]:
+        """A measurement in the shape the embedded layout returns"""
+        meta = measurement.get("meta") or {}
+        record = {key: value for key, value in measurement.items() if key not in ("_id", "meta")}
+        record[self.type_field] = meta.get("type")
+        record["patient_id"] = meta.get("patient_id")
+        if self.iso_timestamps:
+            for key, value in record.items():
+                if isinstance(value, datetime):
+                    record[key] = value.isoformat()
+        return record
+
+    def insert(self, database, patient_id: str, records: Iterable[Dict[str, Any]]) -> int:
+        measurements = [self.to_measurement(patient_id, record) for record in records]
+        if measurements:
+            self.collection(database).insert_many(measurements, ordered=False)
+        return len(measurements)
+
+    def window(self, database, patient_id: str, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Readings in [start, end), newest first, via a range scan"""
+        query: Dict[str, Any] = {"meta.patient_id": patient_id}
+        if types:
+            query["meta.type"] = {"$in": types}
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gte"] = start
+            if end:
+                query["timestamp"]["$lt"] = end
+        cursor = self.collection(database).find(query).sort("timestamp", -1)
+        return [self.to_record(measurement) for measurement in cursor]
+
+    def migrate(self, patients_collection, unset: bool = False) -> Dict[str, int]:
+        """Copy every patient's embedded array into this collection
+
+        With unset, the array is then removed from the patient document once the
+        collection holds at least as many measurements for the patient, so the
+        documents actually shrink. The array is left alone if it grew meanwhile.
+        """
+        database = patients_collection.database
+        collection = self.collection(database)
+        report = {"patients": 0, "records": 0, "skipped": 0, "unset": 0}
+        for patient in patients_collection.find({self.embedded_field: {"$exists": True, "$ne": []}},
+                                                {"patient_id": 1, self.embedded_field: 1}):
+            patient_id = patient["patient_id"]
+            records = patient.get(self.embedded_field, [])
+            # Safe to re-run: patients that already have measurements are not copied again
+            if collection.find_one({"meta.patient_id": patient_id}, {"_id": 1}):
+                report["skipped"] += 1
+            else:
+                report["records"] += self.insert(database, patient_id, records)
+                report["patients"] += 1
+            if unset and collection.count_documents({"meta.patient_id": patient_id}) >= len(records):
+                result = patients_collection.update_one(
+                    {"patient_id": patient_id, self.embedded_field: {"$size": len(records)}},
+                    {"$unset": {self.embedded_field: ""}}
+                )
+                report["unset"] += result.modified_count
+        return report
+
+# Global collections
+vital_signs_series = TimeSeriesCollection("vital_signs_series", "type", embedded_field="vital_signs_logs")
+hydration_series = TimeSeriesCollection("hydration_series", "hydration_type", iso_timestamps=True,
+                                        embedded_field="hydration_records")
+
+def hydration_fields(*fields: str) -> Dict[str, int]:
+    """Patient projection for a hydration handler: the given fields, plus the embedded records if used"""
+    projection = {"patient_id": 1, **{field: 1 for field in fields}}
+    if not timeseries_enabled():
+        projection["hydration_records"] = 1
+    return projection
+
+def hydration_window(patient: Dict[str, Any], patients_collection, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """A patient's hydration records in [start, end), newest first, from either backend"""
+    if timeseries_enabled():
+        return hydration_series.window(patients_collection.database, patient["patient_id"], start, end)
+    records = []
+    for record in patient.get("hydration_records", []):
+        timestamp = to_datetime(record.get("timestamp"), None)
+        if timestamp is None:
+            continue  # skip records with an invalid timestamp
+        if (start is None or timestamp >= start) and (end is None or timestamp < end):
+            records.append((timestamp, record))
+    records.sort(key=lambda item: item[0], reverse=True)
+    return [record for _, record in records]
+
+def _connect():
+    import pymongo
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=10000)
+    return client[os.getenv("DB_NAME", "patients_db")]
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else "setup"
+    database = _connect()
+    series = (vital_signs_series, hydration_series)
+    if command == "setup":
+        for collection in series:
+            collection.ensure(database)
+        print("✅ Time-series collections ready")
+    elif command == "migrate":
+        unset = "--unset" in sys.argv[2:]
+        for collection in series:
+            collection.ensure(database)
+            report = collection.migrate(database["Patient_test"], unset=unset)
+            print(f"✅ {collection.name}: {report['records']} records from {report['patients']} patients "
+                  f"({report['skipped']} already migrated)"
+                  + (f", {report['unset']} embedded arrays removed" if unset else ""))
+    else:
+        print(f"❌ Unknown command '{command}' (use setup or migrate)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
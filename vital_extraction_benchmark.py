@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark for vital sign extraction from OCR text
+
+Compares the previous multi-pattern extractor (one ``re.finditer`` per pattern,
+compiled from strings on every call) with the single-pass engine in
+vital_signs_ocr_service.py. Reports throughput and the duplicate rate, i.e. the
+share of raw hits that were the same reading reported again and discarded by
+deduplication.
+
+Usage:
+    python vital_extraction_benchmark.py --iterations 2000
+    python vital_extraction_benchmark.py --corpus ocr_samples/ --output vital_extraction_report.json
+
+--corpus accepts a directory of .txt files or a JSON file containing a list of strings.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from typing import Dict, List
+
+from vital_signs_ocr_service import scan_vital_signs, vital_signs_ocr_service
+
+# Representative OCR outputs from vital sign reports, monitors and clinic notes
+SAMPLE_CORPUS = [
+    """
+    Patient Vital Signs Report
+    Heart Rate: 75 BPM
+    Blood Pressure: 120/80 mmHg
+    Temperature: 36.5°C
+    SpO2: 98%
+    Respiratory Rate: 16 breaths/min
+    """,
+    """
+    CITY MATERNITY CLINIC  Date: 12/10/2024  Visit 3/12
+    Vitals  BP 118/76 mmHg   Pulse 82 bpm   Temp 98.6 F
+    O2 Sat 97 %   RR 18   Weight 64 kg   Fundal height 28 cm
+    """,
+    """
+    MONITOR READOUT
+    HR 88 bpm  SpO2 99 %  NIBP 126/84 mmHg
+    RESP 20 breaths/min  TEMP 37.1 C
+    Alarm limits HR 50/120  SpO2 90/100
+    """,
+    """
+    Antenatal check-up - week 24
+    Blood pressure - 132 / 86
+    systolic 132 mmHg, diastolic 86 mmHg
+    heart rate 79, oxygen saturation 96%
+    temperature 36.9 c ; respiratory rate 17 breaths/min
+    Next visit 01/11/2024
+    """,
+    """
+    Home log
+    Mon  BP 121/79  HR 71 bpm  97% SpO2
+    Tue  BP 119/81  HR 74 bpm  98% SpO2
+    Wed  BP 124/82  HR 76 bpm  98% SpO2
+    """,
+]
+
+def legacy_extract(text: str) -> List[Dict]:
+    """The previous extractor, returning raw hits before deduplication"""
+    text = text.strip()
+    hits = []
+    groups = [
+        ('heartRate', [
+            r'heart\s*rate[:\s]*(\d+)\s*bpm', r'hr[:\s]*(\d+)\s*bpm', r'pulse[:\s]*(\d+)\s*bpm',
+            r'(\d+)\s*bpm', r'heart\s*rate[:\s]*(\d+)', r'hr[:\s]*(\d+)', r'pulse[:\s]*(\d+)'
+        ]),
+        ('bloodPressure', [
+            r'blood\s*pressure[:\s]*(\d+)\s*/\s*(\d+)', r'bp[:\s]*(\d+)\s*/\s*(\d+)',
+            r'(\d+)\s*/\s*(\d+)\s*mmhg', r'(\d+)\s*/\s*(\d+)',
+            r'systolic[:\s]*(\d+).*diastolic[:\s]*(\d+)', r'systolic[:\s]*(\d+).*diastolic[:\s]*(\d+)'
+        ]),
+        ('temperature', [
+            r'temperature[:\s]*(\d+\.?\d*)\s*°?[cf]', r'temp[:\s]*(\d+\.?\d*)\s*°?[cf]',
+            r'(\d+\.?\d*)\s*°?[cf]', r'temperature[:\s]*(\d+\.?\d*)', r'temp[:\s]*(\d+\.?\d*)'
+        ]),
+        ('spO2', [
+            r'spo2[:\s]*(\d+)\s*%', r'oxygen\s*saturation[:\s]*(\d+)\s*%', r'o2\s*sat[:\s]*(\d+)\s*%',
+            r'(\d+)\s*%\s*spo2', r'spo2[:\s]*(\d+)', r'oxygen\s*saturation[:\s]*(\d+)'
+        ]),
+        ('respiratoryRate', [
+            r'respiratory\s*rate[:\s]*(\d+)\s*breaths?/min', r'rr[:\s]*(\d+)\s*breaths?/min',
+            r'breathing\s*rate[:\s]*(\d+)\s*breaths?/min', r'(\d+)\s*breaths?/min',
+            r'respiratory\s*rate[:\s]*(\d+)', r'rr[:\s]*(\d+)'
+        ]),
+    ]
+    for vital_type, patterns in groups:
+        for pattern in patterns:
+            for match in re.finditer(pattern, text, re.IGNORECASE):
+                value = float(match.group(1))
+                secondary = None
+                if vital_type == 'heartRate':
+                    valid = 30 <= value <= 200
+                elif vital_type == 'bloodPressure':
+                    secondary = float(match.group(2))
+                    valid = 60 <= value <= 250 and 30 <= secondary <= 150
+                elif vital_type == 'temperature':
+                    if 'f' in match.group(0).lower():
+                        value = (value - 32) * 5/9
+                    value = round(value, 1)
+                    valid = 30 <= value <= 45
+                elif vital_type == 'spO2':
+                    valid = 70 <= value <= 100
+                else:
+                    valid = 8 <= value <= 40
+                if valid:
+                    hits.append({'type': vital_type, 'value': value, 'secondary_value': secondary,
+                                 'timestamp': datetime.now().isoformat()})
+    return hits
+
+def load_corpus(path: str) -> List[str]:
+    if os.path.isdir(path):
+        texts = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".txt"):
+                with open(os.path.join(path, name), encoding="utf-8", errors="replace") as f:
+                    texts.append(f.read())
+        return texts
+    with open(path) as f:
+        return list(json.load(f))
+
+def duplicate_stats(raw_hits: List[List[Dict]]) -> Dict:
+    """Raw hits vs unique readings per document, summed over the corpus"""
+    raw = unique = 0
+    for hits in raw_hits:
+        raw += len(hits)
+        unique += len({(h['type'], h['value'], h['secondary_value']) for h in hits})
+    return {
+        "raw_hits": raw,
+        "unique_readings": unique,
+        "duplicate_rate": round((raw - unique) / raw, 3) if raw else 0.0
+    }
+
+def time_extractor(extract, corpus: List[str], iterations: int) -> Dict:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in corpus:
+            extract(text)
+    elapsed = time.perf_counter() - started
+    documents = iterations * len(corpus)
+    megabytes = iterations * sum(len(t) for t in corpus) / (1024 * 1024)
+    return {
+        "seconds": round(elapsed, 3),
+        "docs_per_second": round(documents / elapsed, 1),
+        "mb_per_second": round(megabytes / elapsed, 2),
+        "us_per_doc": round(elapsed / documents * 1e6, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vital sign extraction from OCR text")
+    parser.add_argument("--corpus", help="directory of .txt OCR outputs or JSON list of strings")
+    parser.add_argument("--iterations", type=int, default=1000, help="passes over the corpus")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else SAMPLE_CORPUS
+    if not corpus:
+        print("❌ Corpus is empty")
+        sys.exit(1)
+
+    print(f"⏱️ Extracting vitals from {len(corpus)} documents x{args.iterations}...")
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "documents": len(corpus),
+        "iterations": args.iterations,
+        "legacy": {
+            **time_extractor(legacy_extract, corpus, args.iterations),
+            **duplicate_stats([legacy_extract(t) for t in corpus])
+        },
+        "single_pass": {
+            **time_extractor(vital_signs_ocr_service.extract_vital_signs_from_text, corpus, args.iterations),
+            **duplicate_stats([list(scan_vital_signs(t.strip())) for t in corpus])
+        }
+    }
+
+    print("\n🩺 Vital sign extraction benchmark")
+    print("=" * 70)
+    for name in ("legacy", "single_pass"):
+        r = report[name]
+        print(f"{name:>12}: {r['docs_per_second']:>9.1f} docs/s | {r['us_per_doc']:>7.1f} µs/doc | "
+              f"{r['raw_hits']} raw hits, {r['unique_readings']} unique, "
+              f"duplicate rate {r['duplicate_rate']:.1%}")
+    speedup = report["single_pass"]["docs_per_second"] / report["legacy"]["docs_per_second"]
+    print(f"\n🚀 Speed-up: {speedup:.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
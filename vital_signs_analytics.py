@@ -0,0 +1,249 @@
+"""
+Vital Signs Analytics - Vectorized analysis over per-type NumPy series
+Built once per request from a patient's vital_signs_logs and shared by
+history, analysis, statistics and the health summary.
+"""
+
+import numpy as np
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+# Early Warning Score bands per type: (label, unit, [(low, high, points), ...]).
+# A reading outside (low, high) scores the points of the widest band it breaks.
+EWS_BANDS = {
+    'heartRate': ("Heart rate", " BPM", [(40, 130, 3), (50, 110, 2), (60, 100, 1)]),
+    'bloodPressure': ("Blood pressure", " mmHg", [(90, 180, 3), (100, 160, 2), (110, 140, 1)]),
+    'temperature': ("Temperature", "°C", [(35, 39, 3), (36, 38, 2), (36.5, 37.5, 1)]),
+}
+EWS_SEVERITY = {3: "abnormal", 2: "elevated", 1: "slightly elevated"}
+
+ANOMALY_Z_THRESHOLD = 2.0
+ROLLING_WINDOW = 5
+
+def to_datetime(value, default: datetime) -> datetime:
+    """Naive local datetime (as datetime.now() returns); timestamps with an offset are converted, not truncated"""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return default
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value
+    return default
+
+def to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+class VitalSignsAnalytics:
+    """Vital sign logs as time-sorted columns with vectorized analytics"""
+
+    def __init__(self, logs: List[Dict], timestamps: np.ndarray, types: np.ndarray,
+                 values: np.ndarray, now: datetime):
+        # All columns are sorted by timestamp, oldest first
+        self.logs = logs
+        self.timestamps = timestamps
+        self.types = types
+        self.values = values
+        self.now = now
+        self._series: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_logs(cls, logs: List[Dict], now: Optional[datetime] = None) -> "VitalSignsAnalytics":
+        """Build the columns from vital_signs_logs; readings without a timestamp count as now"""
+        now = now or datetime.now()
+        logs = logs or []
+        timestamps = np.array([to_datetime(log.get('timestamp'), now) for log in logs], dtype='datetime64[us]')
+        order = np.argsort(timestamps, kind='stable')
+        return cls(
+            logs=[logs[i] for i in order],
+            timestamps=timestamps[order],
+            types=np.array([log.get('type') or '' for log in logs], dtype=object)[order],
+            values=np.array([to_float(log.get('value', 0)) for log in logs], dtype=float)[order],
+            now=now
+        )
+
+    def window(self, days: Optional[float] = None, hours: Optional[float] = None) -> "VitalSignsAnalytics":
+        """Readings from the last days/hours, as a new analytics view"""
+        start = self.now - timedelta(days=days or 0, hours=hours or 0)
+        first = int(np.searchsorted(self.timestamps, np.datetime64(start, 'us'), side='left'))
+        return VitalSignsAnalytics(self.logs[first:], self.timestamps[first:], self.types[first:],
+                                   self.values[first:], self.now)
+
+    def __len__(self) -> int:
+        return len(self.logs)
+
+    def records(self) -> List[Dict]:
+        """Original log entries, newest first"""
+        return self.logs[::-1]
+
+    @property
+    def vital_types(self) -> List[str]:
+        """Types present, most recently recorded first"""
+        seen = []
+        for vs_type in self.types[::-1]:
+            if vs_type and vs_type not in seen:
+                seen.append(vs_type)
+        return seen
+
+    def series(self, vs_type: str) -> Dict[str, Any]:
+        """Numeric readings of one type: positions into logs, timestamps and values (oldest first)"""
+        if vs_type not in self._series:
+            positions = np.flatnonzero((self.types == vs_type) & ~np.isnan(self.values))
+            self._series[vs_type] = {
+                "positions": positions,
+                "timestamps": self.timestamps[positions],
+                "values": self.values[positions]
+            }
+        return self._series[vs_type]
+
+    def z_scores(self, vs_type: str) -> np.ndarray:
+        """Absolute z-score of every reading of a type (zeros when there is no spread)"""
+        values = self.series(vs_type)["values"]
+        std = values.std() if len(values) else 0.0
+        if std == 0:
+            return np.zeros(len(values))
+        return np.abs((values - values.mean()) / std)
+
+    def rolling_statistics(self, vs_type: str, window: int = ROLLING_WINDOW) -> Dict[str, np.ndarray]:
+        """Rolling mean/std over the last `window` readings, one entry per full window"""
+        values = self.series(vs_type)["values"]
+        window = min(window, len(values))
+        if window == 0:
+            return {"mean": np.array([]), "std": np.array([])}
+        windows = np.lib.stride_tricks.sliding_window_view(values, window)
+        return {"mean": windows.mean(axis=1), "std": windows.std(axis=1)}
+
+    def anomalies(self, suggest_action=None) -> List[Dict]:
+        """Readings more than two standard deviations from their type's mean"""
+        anomalies = []
+        for vs_type in self.vital_types:
+            series = self.series(vs_type)
+            if len(series["values"]) < 3:  # Need at least 3 data points
+                continue
+
+            z_scores = self.z_scores(vs_type)
+            mean_val = series["values"].mean()
+            for i in np.flatnonzero(z_scores > ANOMALY_Z_THRESHOLD)[::-1]:
+                log = self.logs[series["positions"][i]]
+                value = log.get('value', 0)
+                z_score = z_scores[i]
+                anomalies.append({
+                    "type": vs_type,
+                    "is_anomaly": True,
+                    "confidence": float(min(z_score / 2.0, 1.0)),
+                    "reason": f"Value {value} is {z_score:.2f} standard deviations from mean",
+                    "suggested_action": suggest_action(vs_type, series["values"][i], mean_val) if suggest_action else None,
+                    "timestamp": log.get('timestamp')
+                })
+        return anomalies
+
+    def trends(self) -> List[Dict]:
+        """Change between the mean of the older and newer half of each type's readings"""
+        trends = []
+        for vs_type in self.vital_types:
+            series = self.series(vs_type)
+            values = series["values"]
+            if len(values) < 2:
+                continue
+
+            half = len(values) // 2
+            first_avg = values[:half].mean()
+            second_avg = values[half:].mean()
+            change_percentage = float((second_avg - first_avg) / first_avg * 100) if first_avg != 0 else 0.0
+
+            if abs(change_percentage) < 5:
+                trend = "stable"
+            elif change_percentage > 0:
+                trend = "increasing"
+            else:
+                trend = "decreasing"
+
+            span = series["timestamps"][-1] - series["timestamps"][0]
+            trends.append({
+                "type": vs_type,
+                "trend": trend,
+                "change_percentage": round(change_percentage, 2),
+                "confidence": min(abs(change_percentage) / 10, 1.0),
+                "period_days": int(span // np.timedelta64(1, 'D'))
+            })
+        return trends
+
+    @staticmethod
+    def ews_points(vs_type: str, values: np.ndarray) -> np.ndarray:
+        """Early Warning Score points for every value of a type"""
+        points = np.zeros(len(values), dtype=int)
+        for low, high, band_points in EWS_BANDS[vs_type][2]:
+            breaks = (values < low) | (values > high)
+            points = np.where((points == 0) & breaks, band_points, points)
+        return points
+
+    def early_warning_score(self) -> Optional[Dict[str, Any]]:
+        """Early Warning Score from the latest reading of each scored type"""
+        if not len(self):
+            return None
+
+        score = 0
+        factors = []
+        for vs_type, (label, unit, _) in EWS_BANDS.items():
+            series = self.series(vs_type)
+            if not len(series["values"]):
+                continue
+            points = int(self.ews_points(vs_type, series["values"][-1:])[0])
+            if points:
+                score += points
+                value = self.logs[series["positions"][-1]].get('value', 0)
+                factors.append(f"{label} {value}{unit} ({EWS_SEVERITY[points]})")
+
+        # Determine risk level
+        if score >= 7:
+            risk_level = "critical"
+        elif score >= 4:
+            risk_level = "high"
+        elif score >= 2:
+            risk_level = "medium"
+        else:
+            risk_level = "low"
+
+        recommendations = {
+            "critical": "Seek immediate medical attention",
+            "high": "Contact healthcare provider urgently",
+            "medium": "Monitor closely and consider contacting healthcare provider",
+            "low": "Continue regular monitoring"
+        }
+
+        return {
+            "score": score,
+            "risk_level": risk_level,
+            "factors": factors,
+            "recommendations": [recommendations[risk_level]],
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def statistics(self, rolling_window: int = ROLLING_WINDOW) -> Dict[str, Dict[str, Any]]:
+        """Count, latest, average, min/max, spread and rolling average per type"""
+        stats = {}
+        for vs_type in self.vital_types:
+            series = self.series(vs_type)
+            values = series["values"]
+            if not len(values):
+                continue
+            latest = self.logs[series["positions"][-1]]
+            rolling = self.rolling_statistics(vs_type, rolling_window)
+            stats[vs_type] = {
+                "count": len(values),
+                "values": values[::-1].tolist(),
+                "latest_value": latest.get('value'),
+                "latest_timestamp": latest.get('timestamp'),
+                "average": round(float(values.mean()), 2),
+                "min_value": float(values.min()),
+                "max_value": float(values.max()),
+                "std_dev": round(float(values.std()), 2),
+                "rolling_average": round(float(rolling["mean"][-1]), 2),
+                "rolling_std": round(float(rolling["std"][-1]), 2)
+            }
+        return stats
@@ -7,175 +7,101 @@ import os
 import re
 import json
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Extraction rules in priority order: (vital type, pattern). All rules are
+# compiled into one alternation and the text is scanned once; where rules
+# overlap, the leftmost match wins and, at the same position, the earlier rule.
+# Labelled rules come first so they consume their value (and unit) before a
+# generic unit-only rule can report the same number again.
+_LABEL_SEP = r'[:=\-\s]*'
+VITAL_SIGN_RULES = [
+    # Labelled readings, unit optional
+    ('bloodPressure', r'\b(?:blood\s*pressure|b\.?p\.?)' + _LABEL_SEP + r'(\d+)\s*/\s*(\d+)(?:\s*mm\s*hg)?'),
+    ('bloodPressure', r'\bsystolic' + _LABEL_SEP + r'(\d+)[^\n]*?\bdiastolic' + _LABEL_SEP + r'(\d+)'),
+    ('heartRate', r'\b(?:heart\s*rate|pulse(?:\s*rate)?|hr)' + _LABEL_SEP + r'(\d+)(?:\s*bpm)?'),
+    ('temperature', r'\btemp(?:erature)?' + _LABEL_SEP + r'(\d+(?:\.\d+)?)(?:\s*°?\s*([cf])\b)?'),
+    ('spO2', r'\b(?:spo2|sp02|oxygen\s*saturation|o2\s*sat(?:uration)?)' + _LABEL_SEP + r'(\d+)(?:\s*%)?'),
+    ('respiratoryRate', r'\b(?:respiratory\s*rate|breathing\s*rate|resp(?:iration)?\s*rate|rr)' + _LABEL_SEP + r'(\d+)(?:\s*breaths?\s*/\s*min)?'),
+    # Unlabelled readings identified by their unit
+    ('bloodPressure', r'\b(\d+)\s*/\s*(\d+)\s*mm\s*hg'),
+    ('heartRate', r'\b(\d+)\s*bpm'),
+    ('spO2', r'\b(\d+)\s*%\s*(?:spo2|sp02|o2)'),
+    ('respiratoryRate', r'\b(\d+)\s*breaths?\s*/\s*min'),
+    ('temperature', r'\b(\d+(?:\.\d+)?)\s*°?\s*([cf])\b'),
+    # Bare "120/80" as a last resort
+    ('bloodPressure', r'\b(\d+)\s*/\s*(\d+)\b'),
+]
+
+def _compile_rules(rules):
+    """Join rules into one named-group alternation; returns (regex, {group index: (type, n groups)})"""
+    parts = [f'(?P<r{i}>{pattern})' for i, (_, pattern) in enumerate(rules)]
+    combined = re.compile('|'.join(parts), re.IGNORECASE)
+    rule_groups = {
+        combined.groupindex[f'r{i}']: (vital_type, re.compile(pattern).groups)
+        for i, (vital_type, pattern) in enumerate(rules)
+    }
+    return combined, rule_groups
+
+VITAL_SIGN_PATTERN, _RULE_GROUPS = _compile_rules(VITAL_SIGN_RULES)
+
+def _to_reading(vital_type: str, groups: tuple) -> Optional[Dict[str, Any]]:
+    """Convert captured groups to a reading, or None when out of the plausible range"""
+    value = float(groups[0])
+    secondary = None
+    if vital_type == 'heartRate':
+        valid = 30 <= value <= 200
+    elif vital_type == 'bloodPressure':
+        secondary = float(groups[1])
+        valid = 60 <= value <= 250 and 30 <= secondary <= 150
+    elif vital_type == 'temperature':
+        # Convert Fahrenheit to Celsius if needed
+        if groups[1] and groups[1].lower() == 'f':
+            value = (value - 32) * 5/9
+        value = round(value, 1)
+        valid = 30 <= value <= 45
+    elif vital_type == 'spO2':
+        valid = 70 <= value <= 100
+    else:
+        valid = 8 <= value <= 40
+    if not valid:
+        return None
+    return {'type': vital_type, 'value': value, 'secondary_value': secondary}
+
+def scan_vital_signs(text: str) -> Iterator[Dict[str, Any]]:
+    """Single pass over the text yielding every plausible reading, in text order"""
+    for match in VITAL_SIGN_PATTERN.finditer(text):
+        index = match.lastindex
+        vital_type, n_groups = _RULE_GROUPS[index]
+        reading = _to_reading(vital_type, match.groups()[index:index + n_groups])
+        if reading:
+            yield reading
+
 class VitalSignsOCRService:
     def __init__(self):
         """Initialize the vital signs OCR service"""
         self.supported_formats = ['.jpg', '.jpeg', '.png', '.pdf', '.tiff', '.bmp']
         
     def extract_vital_signs_from_text(self, text: str) -> List[Dict[str, Any]]:
-        """Extract vital signs from OCR text using regex patterns"""
-        vital_signs = []
-        
-        # Clean the text
-        text = text.strip()
-        
-        # Heart Rate patterns
-        heart_rate_patterns = [
-            r'heart\s*rate[:\s]*(\d+)\s*bpm',
-            r'hr[:\s]*(\d+)\s*bpm',
-            r'pulse[:\s]*(\d+)\s*bpm',
-            r'(\d+)\s*bpm',
-            r'heart\s*rate[:\s]*(\d+)',
-            r'hr[:\s]*(\d+)',
-            r'pulse[:\s]*(\d+)'
-        ]
-        
-        # Blood Pressure patterns
-        bp_patterns = [
-            r'blood\s*pressure[:\s]*(\d+)\s*/\s*(\d+)',
-            r'bp[:\s]*(\d+)\s*/\s*(\d+)',
-            r'(\d+)\s*/\s*(\d+)\s*mmhg',
-            r'(\d+)\s*/\s*(\d+)',
-            r'systolic[:\s]*(\d+).*diastolic[:\s]*(\d+)',
-            r'systolic[:\s]*(\d+).*diastolic[:\s]*(\d+)'
-        ]
-        
-        # Temperature patterns
-        temp_patterns = [
-            r'temperature[:\s]*(\d+\.?\d*)\s*°?[cf]',
-            r'temp[:\s]*(\d+\.?\d*)\s*°?[cf]',
-            r'(\d+\.?\d*)\s*°?[cf]',
-            r'temperature[:\s]*(\d+\.?\d*)',
-            r'temp[:\s]*(\d+\.?\d*)'
-        ]
-        
-        # SpO2 patterns
-        spo2_patterns = [
-            r'spo2[:\s]*(\d+)\s*%',
-            r'oxygen\s*saturation[:\s]*(\d+)\s*%',
-            r'o2\s*sat[:\s]*(\d+)\s*%',
-            r'(\d+)\s*%\s*spo2',
-            r'spo2[:\s]*(\d+)',
-            r'oxygen\s*saturation[:\s]*(\d+)'
-        ]
-        
-        # Respiratory Rate patterns
-        rr_patterns = [
-            r'respiratory\s*rate[:\s]*(\d+)\s*breaths?/min',
-            r'rr[:\s]*(\d+)\s*breaths?/min',
-            r'breathing\s*rate[:\s]*(\d+)\s*breaths?/min',
-            r'(\d+)\s*breaths?/min',
-            r'respiratory\s*rate[:\s]*(\d+)',
-            r'rr[:\s]*(\d+)'
-        ]
-        
-        # Extract Heart Rate
-        for pattern in heart_rate_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match.group(1))
-                    if 30 <= value <= 200:  # Reasonable heart rate range
-                        vital_signs.append({
-                            'type': 'heartRate',
-                            'value': value,
-                            'secondary_value': None,
-                            'confidence': 0.9,
-                            'source': 'ocr_extraction',
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except (ValueError, IndexError):
-                    continue
-        
-        # Extract Blood Pressure
-        for pattern in bp_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    systolic = float(match.group(1))
-                    diastolic = float(match.group(2))
-                    if 60 <= systolic <= 250 and 30 <= diastolic <= 150:  # Reasonable BP range
-                        vital_signs.append({
-                            'type': 'bloodPressure',
-                            'value': systolic,
-                            'secondary_value': diastolic,
-                            'confidence': 0.9,
-                            'source': 'ocr_extraction',
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except (ValueError, IndexError):
-                    continue
-        
-        # Extract Temperature
-        for pattern in temp_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match.group(1))
-                    # Convert Fahrenheit to Celsius if needed
-                    if 'f' in match.group(0).lower():
-                        value = (value - 32) * 5/9
-                    if 30 <= value <= 45:  # Reasonable temperature range
-                        vital_signs.append({
-                            'type': 'temperature',
-                            'value': round(value, 1),
-                            'secondary_value': None,
-                            'confidence': 0.9,
-                            'source': 'ocr_extraction',
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except (ValueError, IndexError):
-                    continue
-        
-        # Extract SpO2
-        for pattern in spo2_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match.group(1))
-                    if 70 <= value <= 100:  # Reasonable SpO2 range
-                        vital_signs.append({
-                            'type': 'spO2',
-                            'value': value,
-                            'secondary_value': None,
-                            'confidence': 0.9,
-                            'source': 'ocr_extraction',
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except (ValueError, IndexError):
-                    continue
-        
-        # Extract Respiratory Rate
-        for pattern in rr_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    value = float(match.group(1))
-                    if 8 <= value <= 40:  # Reasonable respiratory rate range
-                        vital_signs.append({
-                            'type': 'respiratoryRate',
-                            'value': value,
-                            'secondary_value': None,
-                            'confidence': 0.9,
-                            'source': 'ocr_extraction',
-                            'timestamp': datetime.now().isoformat()
-                        })
-                except (ValueError, IndexError):
-                    continue
+        """Extract vital signs from OCR text in a single pass over precompiled patterns"""
+        timestamp = datetime.now().isoformat()
         
         # Remove duplicates based on type and value
         seen = set()
         unique_vital_signs = []
-        for vs in vital_signs:
-            key = (vs['type'], vs['value'], vs.get('secondary_value'))
+        for reading in scan_vital_signs(text.strip()):
+            key = (reading['type'], reading['value'], reading['secondary_value'])
             if key not in seen:
                 seen.add(key)
-                unique_vital_signs.append(vs)
+                reading.update({
+                    'confidence': 0.9,
+                    'source': 'ocr_extraction',
+                    'timestamp': timestamp
+                })
+                unique_vital_signs.append(reading)
         
         return unique_vital_signs
     
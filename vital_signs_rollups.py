@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Vital Signs Rollups - Hourly and daily aggregates for long-range charts
+
+Every recorded reading also updates one hourly and one daily bucket per vital
+type (count, sum, min, max and the latest value), so a 90- or 280-day chart
+reads a few hundred buckets instead of every raw reading. ``pick_resolution``
+chooses the finest resolution that keeps a chart under VITALS_CHART_POINTS
+points per type.
+
+Usage:
+    python vital_signs_rollups.py rebuild     # recompute rollups from stored readings
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from index_registry import index_registry
+from timeseries_store import timeseries_enabled, vital_signs_series
+from vital_signs_analytics import to_datetime, to_float
+
+ROLLUP_COLLECTION = "vital_signs_rollups"
+# Resolution -> NumPy datetime unit of its buckets
+ROLLUP_UNITS = {"hourly": "h", "daily": "D"}
+RESOLUTIONS = ("raw", "hourly", "daily")
+# Largest number of points per vital type that "auto" returns
+CHART_POINTS = int(os.getenv("VITALS_CHART_POINTS", "500"))
+
+index_registry.register(ROLLUP_COLLECTION, [("patient_id", 1), ("resolution", 1), ("type", 1), ("bucket", -1)],
+                        owner="vitals", unique=True)
+
+def _grouped(buckets: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+    """count/sum/min/max/last of values per bucket (values sorted by time, NaNs ignored)"""
+    keys, inverse = np.unique(buckets, return_inverse=True)
+    present = ~np.isnan(values)
+    count = np.bincount(inverse, weights=present, minlength=len(keys))
+    total = np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=len(keys))
+    low = np.full(len(keys), np.inf)
+    high = np.full(len(keys), -np.inf)
+    np.fmin.at(low, inverse, values)
+    np.fmax.at(high, inverse, values)
+    last = np.full(len(keys), -1)
+    np.maximum.at(last, inverse[present], np.flatnonzero(present))
+    return {"keys": keys, "count": count, "sum": total, "min": low, "max": high, "last": last}
+
+def _duplicate_bucket_index(error) -> Optional[int]:
+    """Index of the operation that lost an upsert race, or None for any other write error"""
+    if isinstance(error, DuplicateKeyError):
+        return 0
+    errors = error.details.get("writeErrors", [])
+    if len(errors) == 1 and errors[0].get("code") == 11000:
+        return errors[0]["index"]
+    return None
+
+class VitalSignsRollups:
+    """Maintains and reads the hourly/daily rollup buckets"""
+
+    def __init__(self, collection_name: str = ROLLUP_COLLECTION):
+        self.collection_name = collection_name
+
+    def collection(self, database):
+        return database[self.collection_name]
+
+    def operations(self, patient_id: str, records: List[Dict[str, Any]]) -> List[UpdateOne]:
+        """Bucket updates for a patient's new readings, aggregated per type before writing"""
+        timestamps = np.array([to_datetime(r.get("timestamp"), None) or datetime.now() for r in records],
+                              dtype="datetime64[us]")
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        types = np.array([r.get("type") or "" for r in records], dtype=object)[order]
+        values = np.array([to_float(r.get("value")) for r in records], dtype=float)[order]
+        secondary = np.array([to_float(r.get("secondary_value")) for r in records], dtype=float)[order]
+
+        operations = []
+        for vs_type in np.unique(types[types != ""]):
+            of_type = (types == vs_type) & ~np.isnan(values)
+            if not of_type.any():
+                continue
+            for resolution, unit in ROLLUP_UNITS.items():
+                buckets = timestamps[of_type].astype(f"datetime64[{unit}]")
+                primary = _grouped(buckets, values[of_type])
+                extra = _grouped(buckets, secondary[of_type])
+                for b, bucket in enumerate(primary["keys"].astype("datetime64[us]").tolist()):
+                    key = {"patient_id": patient_id, "type": vs_type, "resolution": resolution, "bucket": bucket}
+                    last = primary["last"][b]
+                    update = {
+                        "$inc": {"count": int(primary["count"][b]), "sum": float(primary["sum"][b])},
+                        "$min": {"min": float(primary["min"][b])},
+                        "$max": {"max": float(primary["max"][b])},
+                    }
+                    latest = {"last": float(values[of_type][last]),
+                              "last_timestamp": timestamps[of_type][last].tolist()}
+                    if extra["count"][b]:
+                        update["$inc"].update({"secondary_count": int(extra["count"][b]),
+                                               "secondary_sum": float(extra["sum"][b])})
+                        update["$min"]["secondary_min"] = float(extra["min"][b])
+                        update["$max"]["secondary_max"] = float(extra["max"][b])
+                        if extra["last"][b] == last:
+                            latest["secondary_last"] = float(secondary[of_type][last])
+                    operations.append(UpdateOne(key, update, upsert=True))
+                    # Only move "last" forward; older readings arriving late keep the newer value
+                    operations.append(UpdateOne({**key, "last_timestamp": {"$not": {"$gt": latest["last_timestamp"]}}},
+                                                {"$set": latest}))
+        return operations
+
+    def update(self, database, patient_id: str, records: List[Dict[str, Any]]) -> int:
+        """Fold new readings into their buckets; returns the number of bucket writes"""
+        operations = self.operations(patient_id, records)
+        if operations:
+            collection = self.collection(database)
+            # Ordered: each bucket's upsert must run before its "last" update
+            try:
+                collection.bulk_write(operations, ordered=True)
+            except (BulkWriteError, DuplicateKeyError) as e:
+                # Two writers creating the same new bucket race on the upsert; the loser
+                # retries from the failed operation, which now updates the existing bucket
+                failed = _duplicate_bucket_index(e)
+                if failed is None:
+                    raise
+                collection.bulk_write(operations[failed:], ordered=True)
+        return len(operations)
+
+    def series(self, database, patient_id: str, resolution: str, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Chart points for the window, newest first, shaped like raw readings plus min/max/mean/last"""
+        unit = ROLLUP_UNITS[resolution]
+        query: Dict[str, Any] = {"patient_id": patient_id, "resolution": resolution}
+        if types:
+            query["type"] = {"$in": types}
+        if start or end:
+            query["bucket"] = {}
+            if start:
+                # The bucket holding start is partially in the window
+                query["bucket"]["$gte"] = np.datetime64(start, unit).astype("datetime64[us]").tolist()
+            if end:
+                query["bucket"]["$lt"] = end
+        points = []
+        for bucket in self.collection(database).find(query, {"_id": 0}).sort("bucket", -1):
+            mean = bucket["sum"] / bucket["count"] if bucket.get("count") else None
+            point = {
+                "type": bucket["type"],
+                "timestamp": bucket["bucket"],
+                "value": mean,
+                "mean": mean,
+                "min": bucket.get("min"),
+                "max": bucket.get("max"),
+                "last": bucket.get("last"),
+                "count": bucket.get("count", 0),
+                "resolution": resolution
+            }
+            if bucket.get("secondary_count"):
+                point["secondary_value"] = bucket["secondary_sum"] / bucket["secondary_count"]
+                point["secondary"] = {
+                    "mean": point["secondary_value"],
+                    "min": bucket.get("secondary_min"),
+                    "max": bucket.get("secondary_max"),
+                    "last": bucket.get("secondary_last")
+                }
+            points.append(point)
+        return points
+
+    def readings_per_type(self, database, patient_id: str, start: datetime) -> int:
+        """Most raw readings of any one type since start, counted from the daily buckets"""
+        counts: Dict[str, int] = {}
+        query = {"patient_id": patient_id, "resolution": "daily",
+                 "bucket": {"$gte": datetime.combine(start.date(), datetime.min.time())}}
+        for bucket in self.collection(database).find(query, {"type": 1, "count": 1}):
+            counts[bucket["type"]] = counts.get(bucket["type"], 0) + bucket.get("count", 0)
+        return max(counts.values(), default=0)
+
+    def pick_resolution(self, database, patient_id: str, days: float) -> str:
+        """Finest resolution that keeps the window under CHART_POINTS points per type"""
+        start = datetime.now() - timedelta(days=days)
+        # Sparse logs stay raw however long the window is
+        if self.readings_per_type(database, patient_id, start) <= CHART_POINTS:
+            return "raw"
+        if days * 24 <= CHART_POINTS:
+            return "hourly"
+        return "daily"
+
+    def rebuild(self, database, patient_id: str, records: List[Dict[str, Any]]) -> int:
+        """Replace a patient's rollups with ones computed from all of their readings"""
+        self.collection(database).delete_many({"patient_id": patient_id})
+        return self.update(database, patient_id, records)
+
+# Global instance
+vital_signs_rollups = VitalSignsRollups()
+
+def main():
+    import pymongo
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+    if command != "rebuild":
+        print(f"❌ Unknown command '{command}' (use rebuild)")
+        sys.exit(1)
+
+    client = pymongo.MongoClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=10000)
+    database = client[os.getenv("DB_NAME", "patients_db")]
+    patients = database["Patient_test"]
+    rebuilt = 0
+    for patient in patients.find({}, {"patient_id": 1, "vital_signs_logs": 1}):
+        patient_id = patient.get("patient_id")
+        if not patient_id:
+            continue
+        if timeseries_enabled():
+            logs = vital_signs_series.window(database, patient_id)
+        else:
+            logs = patient.get("vital_signs_logs", [])
+        if logs:
+            vital_signs_rollups.rebuild(database, patient_id, logs)
+            rebuilt += 1
+    print(f"✅ Rebuilt vital sign rollups for {rebuilt} patients")
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,33 @@ Provides AI-powered vital signs analysis and monitoring
 
 import os
 import json
-import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from pymongo import MongoClient
+import numpy as np
+from pymongo import MongoClient, UpdateOne
 import logging
 
+from vital_signs_analytics import VitalSignsAnalytics, to_datetime, to_float
+from timeseries_store import timeseries_enabled, vital_signs_series
+from vital_signs_rollups import RESOLUTIONS, vital_signs_rollups
+
 logger = logging.getLogger(__name__)
 
+# Normal ranges; readings outside them raise an alert
+ALERT_THRESHOLDS = {
+    'heartRate': {'low': 50, 'high': 100},
+    'bloodPressure': {'low': 90, 'high': 140},
+    'temperature': {'low': 36.0, 'high': 37.5},
+    'spO2': {'low': 95, 'high': 100},
+    'respiratoryRate': {'low': 12, 'high': 20}
+}
+
+# Largest batch accepted by record_vital_signs_batch
+MAX_BATCH_SIZE = int(os.getenv('VITALS_MAX_BATCH_SIZE', '5000'))
+
 class VitalSignsService:
+    max_batch_size = MAX_BATCH_SIZE
+    
     def __init__(self, db=None):
         """Initialize the vital signs service"""
         self.db = db
@@ -53,14 +71,21 @@ class VitalSignsService:
                 "created_at": datetime.now()
             }
             
-            # Add to patient's vital_signs_logs array
-            result = self.db.patients_collection.update_one(
-                {"patient_id": patient_id},
-                {"$push": {"vital_signs_logs": vital_record}},
-                upsert=True
-            )
+            if timeseries_enabled():
+                # One measurement in the time-series collection
+                vital_signs_series.insert(self.db.patients_collection.database, patient_id, [vital_record])
+                acknowledged = True
+            else:
+                # Add to patient's vital_signs_logs array
+                result = self.db.patients_collection.update_one(
+                    {"patient_id": patient_id},
+                    {"$push": {"vital_signs_logs": vital_record}},
+                    upsert=True
+                )
+                acknowledged = result.acknowledged
             
-            if result.acknowledged:
+            if acknowledged:
+                self._update_rollups(patient_id, [vital_record])
                 # Check for anomalies and create alerts if needed
                 self._check_for_alerts(patient_id, vital_record)
                 
@@ -76,58 +101,209 @@ class VitalSignsService:
             logger.error(f"Error recording vital sign: {e}")
             return {"success": False, "message": f"Error: {str(e)}"}
     
-    def get_vital_signs_history(self, patient_id: str, days: int = 30) -> Dict[str, Any]:
-        """Get vital signs history for a patient"""
+    def record_vital_signs_batch(self, readings: List[Dict[str, Any]], patient_id: Optional[str] = None) -> Dict[str, Any]:
+        """Record many readings with one upsert per patient and one alert per breached range"""
         try:
             if self.db is None:
                 return {"success": False, "message": "Database not connected"}
+            if len(readings) > self.max_batch_size:
+                return {"success": False, "message": f"Batch too large. Maximum {self.max_batch_size} readings allowed."}
+            
+            now = datetime.now()
+            count = len(readings)
+            not_object = np.array([not isinstance(r, dict) for r in readings], dtype=bool)
+            readings = [r if isinstance(r, dict) else {} for r in readings]
+            patient_ids = np.array([str(r.get('patient_id') or patient_id or '') for r in readings], dtype=object)
+            types = np.array([r.get('type') or '' for r in readings], dtype=object)
+            values = np.array([to_float(r.get('value')) for r in readings], dtype=float)
+            timestamps = [to_datetime(r['timestamp'], None) if r.get('timestamp') is not None else now for r in readings]
+            
+            # Validate the whole batch at once; the first failing check is reported per item
+            checks = [
+                (not_object, "Reading must be a JSON object"),
+                (patient_ids == '', "Patient ID is required"),
+                (types == '', "Missing required field: type"),
+                (np.isnan(values), "Missing or non-numeric field: value"),
+                (np.array([ts is None for ts in timestamps], dtype=bool), "Invalid timestamp"),
+            ]
+            errors: List[Optional[str]] = [None] * count
+            valid = np.ones(count, dtype=bool)
+            for failed, message in checks:
+                for i in np.flatnonzero(failed & valid):
+                    errors[i] = message
+                valid &= ~failed
+            
+            # Alerts: one per patient, type and direction for the whole batch
+            breached = np.zeros(count, dtype=bool)
+            alerts_by_patient: Dict[str, List[Dict[str, Any]]] = {}
+            for vs_type, threshold in ALERT_THRESHOLDS.items():
+                of_type = valid & (types == vs_type)
+                for direction, mask in (("below", of_type & (values < threshold['low'])),
+                                        ("above", of_type & (values > threshold['high']))):
+                    breached |= mask
+                    for pid in np.unique(patient_ids[mask]):
+                        positions = np.flatnonzero(mask & (patient_ids == pid))
+                        extreme = positions[np.argmin(values[positions]) if direction == "below" else np.argmax(values[positions])]
+                        alerts_by_patient.setdefault(pid, []).append({
+                            "type": vs_type,
+                            "severity": "high",
+                            "message": f"{vs_type} is {direction} normal range ({readings[extreme].get('value')})"
+                                       + (f" in {len(positions)} readings" if len(positions) > 1 else ""),
+                            "timestamp": max(timestamps[i] for i in positions),
+                            "action_required": "Monitor closely",
+                            "is_resolved": False,
+                            "created_at": now,
+                            "reading_count": len(positions)
+                        })
+            
+            # One $push $each per patient
+            records_by_patient: Dict[str, List[Dict[str, Any]]] = {}
+            for i in np.flatnonzero(valid):
+                reading = readings[i]
+                records_by_patient.setdefault(patient_ids[i], []).append({
+                    "type": types[i],
+                    "value": reading.get('value'),
+                    "secondary_value": reading.get('secondary_value'),
+                    "timestamp": timestamps[i],
+                    "notes": reading.get('notes', ''),
+                    "is_anomaly": False,
+                    "confidence": None,
+                    "source": reading.get('source', 'batch'),
+                    "created_at": now
+                })
+            
+            operations = []
+            for pid, records in records_by_patient.items():
+                push = {}
+                if timeseries_enabled():
+                    vital_signs_series.insert(self.db.patients_collection.database, pid, records)
+                else:
+                    push["vital_signs_logs"] = {"$each": records}
+                if pid in alerts_by_patient:
+                    push["vital_signs_alerts"] = {"$each": alerts_by_patient[pid]}
+                if push:
+                    operations.append(UpdateOne({"patient_id": pid}, {"$push": push}, upsert=True))
+            if operations:
+                self.db.patients_collection.bulk_write(operations, ordered=False)
+            for pid, records in records_by_patient.items():
+                self._update_rollups(pid, records)
+            
+            results = []
+            for i in range(count):
+                if valid[i]:
+                    results.append({"index": i, "success": True, "alert": bool(breached[i])})
+                else:
+                    results.append({"index": i, "success": False, "error": errors[i]})
+            
+            accepted = int(valid.sum())
+            return {
+                "success": accepted > 0 or count == 0,
+                "message": f"Recorded {accepted} of {count} vital signs",
+                "accepted": accepted,
+                "rejected": count - accepted,
+                "patients": len(records_by_patient),
+                "alerts_created": sum(len(a) for a in alerts_by_patient.values()),
+                "results": results
+            }
             
-            # Find patient
-            patient = self.db.patients_collection.find_one({"patient_id": patient_id})
+        except Exception as e:
+            logger.error(f"Error recording vital sign batch: {e}")
+            return {"success": False, "message": f"Error: {str(e)}"}
+    
+    def _update_rollups(self, patient_id: str, records: List[Dict[str, Any]]):
+        """Fold new readings into the hourly/daily chart rollups; the readings are already saved"""
+        try:
+            vital_signs_rollups.update(self.db.patients_collection.database, patient_id, records)
+        except Exception as e:
+            logger.error(f"Error updating vital sign rollups: {e}")
+    
+    def load_analytics(self, patient_id: str, days: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Fetch the patient's vital signs once and build the shared analytics
+
+        With the time-series backend only the last `days` are read (a range scan);
+        the embedded layout always loads the whole array.
+        """
+        if timeseries_enabled():
+            patient = self.db.patients_collection.find_one({"patient_id": patient_id}, {"vital_signs_alerts": 1})
+            start = datetime.now() - timedelta(days=days) if days is not None else None
+            logs = vital_signs_series.window(self.db.patients_collection.database, patient_id, start)
+            if not patient and not logs:
+                return None
+            patient = patient or {}
+        else:
+            patient = self.db.patients_collection.find_one(
+                {"patient_id": patient_id},
+                {"vital_signs_logs": 1, "vital_signs_alerts": 1}
+            )
             if not patient:
-                return {"success": False, "message": "Patient not found"}
-            
-            # Get vital signs logs
-            vital_signs_logs = patient.get('vital_signs_logs', [])
+                return None
+            logs = patient.get('vital_signs_logs', [])
+        return {
+            "analytics": VitalSignsAnalytics.from_logs(logs),
+            "alerts": patient.get('vital_signs_alerts', [])
+        }
+    
+    def get_vital_signs_history(self, patient_id: str, days: int = 30, loaded: Optional[Dict[str, Any]] = None,
+                                resolution: str = "raw") -> Dict[str, Any]:
+        """Get vital signs history for a patient
+
+        resolution is "raw", "hourly", "daily" or "auto" (the finest one that keeps
+        the chart under VITALS_CHART_POINTS points per type).
+        """
+        try:
+            if self.db is None:
+                return {"success": False, "message": "Database not connected"}
             
-            # Filter by date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
+            database = self.db.patients_collection.database
+            if resolution == "auto":
+                resolution = vital_signs_rollups.pick_resolution(database, patient_id, days)
+            if resolution not in RESOLUTIONS:
+                return {"success": False, "message": f"Unknown resolution '{resolution}'. Use auto, {', '.join(RESOLUTIONS)}."}
+            if resolution != "raw":
+                points = vital_signs_rollups.series(database, patient_id, resolution, datetime.now() - timedelta(days=days))
+                return {
+                    "success": True,
+                    "patient_id": patient_id,
+                    "vital_signs": points,
+                    "total_count": len(points),
+                    "date_range_days": days,
+                    "resolution": resolution
+                }
             
-            filtered_logs = [
-                log for log in vital_signs_logs
-                if log.get('timestamp', datetime.now()) >= start_date
-            ]
+            loaded = loaded or self.load_analytics(patient_id, days)
+            if not loaded:
+                return {"success": False, "message": "Patient not found"}
             
-            # Sort by timestamp (newest first)
-            filtered_logs.sort(key=lambda x: x.get('timestamp', datetime.now()), reverse=True)
+            # Filter by date range, newest first
+            filtered_logs = loaded["analytics"].window(days=days).records()
             
             return {
                 "success": True,
                 "patient_id": patient_id,
                 "vital_signs": filtered_logs,
                 "total_count": len(filtered_logs),
-                "date_range_days": days
+                "date_range_days": days,
+                "resolution": "raw"
             }
             
         except Exception as e:
             logger.error(f"Error getting vital signs history: {e}")
             return {"success": False, "message": f"Error: {str(e)}"}
     
-    def analyze_vital_signs(self, patient_id: str, days: int = 7) -> Dict[str, Any]:
+    def analyze_vital_signs(self, patient_id: str, days: int = 7, loaded: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze vital signs for anomalies and trends"""
         try:
             if self.db is None:
                 return {"success": False, "message": "Database not connected"}
             
-            # Get recent vital signs
-            history_result = self.get_vital_signs_history(patient_id, days)
-            if not history_result["success"]:
-                return history_result
+            loaded = loaded or self.load_analytics(patient_id, days)
+            if not loaded:
+                return {"success": False, "message": "Patient not found"}
             
-            vital_signs = history_result["vital_signs"]
+            # Get recent vital signs
+            analytics = loaded["analytics"].window(days=days)
             
-            if not vital_signs:
+            if not len(analytics):
                 return {
                     "success": True,
                     "message": "No vital signs data for analysis",
@@ -139,14 +315,9 @@ class VitalSignsService:
                     }
                 }
             
-            # Analyze for anomalies
-            anomalies = self._detect_anomalies(vital_signs)
-            
-            # Analyze trends
-            trends = self._analyze_trends(vital_signs)
-            
-            # Calculate early warning score
-            ews = self._calculate_early_warning_score(vital_signs)
+            anomalies = analytics.anomalies(self._get_anomaly_action)
+            trends = analytics.trends()
+            ews = analytics.early_warning_score()
             
             # Determine overall health status
             health_status = self._determine_health_status(anomalies, ews)
@@ -159,7 +330,7 @@ class VitalSignsService:
                     "trends": trends,
                     "early_warning_score": ews,
                     "health_status": health_status,
-                    "total_vital_signs": len(vital_signs),
+                    "total_vital_signs": len(analytics),
                     "analysis_period_days": days
                 }
             }
@@ -168,40 +339,55 @@ class VitalSignsService:
             logger.error(f"Error analyzing vital signs: {e}")
             return {"success": False, "message": f"Error: {str(e)}"}
     
+    def get_vital_signs_stats(self, patient_id: str, days: int = 30, loaded: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Per-type count, latest value, average, min/max and rolling statistics"""
+        try:
+            if self.db is None:
+                return {"success": False, "message": "Database not connected"}
+            
+            loaded = loaded or self.load_analytics(patient_id, days)
+            if not loaded:
+                return {"success": False, "message": "Patient not found"}
+            
+            return {
+                "success": True,
+                "patient_id": patient_id,
+                "statistics": loaded["analytics"].window(days=days).statistics(),
+                "period_days": days
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting vital signs stats: {e}")
+            return {"success": False, "message": f"Error: {str(e)}"}
+    
     def get_health_summary(self, patient_id: str) -> Dict[str, Any]:
         """Get comprehensive health summary for a patient"""
         try:
             if self.db is None:
                 return {"success": False, "message": "Database not connected"}
             
-            # Find patient
-            patient = self.db.patients_collection.find_one({"patient_id": patient_id})
-            if not patient:
+            # Fetch the patient once for counts, alerts and analysis (last 24 hours)
+            loaded = self.load_analytics(patient_id, days=1)
+            if not loaded:
                 return {"success": False, "message": "Patient not found"}
             
             # Get recent vital signs (last 24 hours)
-            vital_signs_logs = patient.get('vital_signs_logs', [])
-            end_date = datetime.now()
-            start_date = end_date - timedelta(hours=24)
-            
-            recent_vitals = [
-                log for log in vital_signs_logs
-                if log.get('timestamp', datetime.now()) >= start_date
-            ]
+            recent_vitals = loaded["analytics"].window(hours=24)
             
             # Get alerts
-            alerts = patient.get('vital_signs_alerts', [])
+            alerts = loaded["alerts"]
             critical_alerts = len([a for a in alerts if a.get('severity') == 'critical' and not a.get('is_resolved', False)])
             warning_alerts = len([a for a in alerts if a.get('severity') in ['high', 'medium'] and not a.get('is_resolved', False)])
             
             # Analyze recent data
-            analysis_result = self.analyze_vital_signs(patient_id, 1)
+            analysis_result = self.analyze_vital_signs(patient_id, 1, loaded=loaded)
             analysis = analysis_result.get('analysis', {}) if analysis_result['success'] else {}
+            risk_level = (analysis.get('early_warning_score') or {}).get('risk_level')
             
             # Determine overall status
-            if critical_alerts > 0 or analysis.get('early_warning_score', {}).get('risk_level') == 'critical':
+            if critical_alerts > 0 or risk_level == 'critical':
                 overall_status = 'critical'
-            elif warning_alerts > 0 or analysis.get('early_warning_score', {}).get('risk_level') == 'high':
+            elif warning_alerts > 0 or risk_level == 'high':
                 overall_status = 'warning'
             elif analysis.get('health_status') == 'caution':
                 overall_status = 'caution'
@@ -225,176 +411,6 @@ class VitalSignsService:
             logger.error(f"Error getting health summary: {e}")
             return {"success": False, "message": f"Error: {str(e)}"}
     
-    def _detect_anomalies(self, vital_signs: List[Dict]) -> List[Dict]:
-        """Detect anomalies in vital signs using statistical methods"""
-        anomalies = []
-        
-        # Group by type
-        by_type = {}
-        for vs in vital_signs:
-            vs_type = vs.get('type')
-            if vs_type not in by_type:
-                by_type[vs_type] = []
-            by_type[vs_type].append(vs)
-        
-        for vs_type, signs in by_type.items():
-            if len(signs) < 3:  # Need at least 3 data points
-                continue
-                
-            values = [vs.get('value', 0) for vs in signs]
-            mean_val = np.mean(values)
-            std_val = np.std(values)
-            
-            for vs in signs:
-                value = vs.get('value', 0)
-                z_score = abs((value - mean_val) / std_val) if std_val > 0 else 0
-                
-                if z_score > 2.0:  # 2 standard deviations threshold
-                    anomaly = {
-                        "type": vs_type,
-                        "is_anomaly": True,
-                        "confidence": min(z_score / 2.0, 1.0),
-                        "reason": f"Value {value} is {z_score:.2f} standard deviations from mean",
-                        "suggested_action": self._get_anomaly_action(vs_type, value, mean_val),
-                        "timestamp": vs.get('timestamp')
-                    }
-                    anomalies.append(anomaly)
-        
-        return anomalies
-    
-    def _analyze_trends(self, vital_signs: List[Dict]) -> List[Dict]:
-        """Analyze trends in vital signs"""
-        trends = []
-        
-        # Group by type
-        by_type = {}
-        for vs in vital_signs:
-            vs_type = vs.get('type')
-            if vs_type not in by_type:
-                by_type[vs_type] = []
-            by_type[vs_type].append(vs)
-        
-        for vs_type, signs in by_type.items():
-            if len(signs) < 2:
-                continue
-                
-            # Sort by timestamp
-            signs.sort(key=lambda x: x.get('timestamp', datetime.now()))
-            
-            values = [vs.get('value', 0) for vs in signs]
-            if len(values) < 2:
-                continue
-                
-            # Calculate trend
-            first_half = values[:len(values)//2]
-            second_half = values[len(values)//2:]
-            
-            first_avg = np.mean(first_half)
-            second_avg = np.mean(second_half)
-            
-            change_percentage = ((second_avg - first_avg) / first_avg * 100) if first_avg != 0 else 0
-            
-            if abs(change_percentage) < 5:
-                trend = "stable"
-            elif change_percentage > 0:
-                trend = "increasing"
-            else:
-                trend = "decreasing"
-            
-            trend_data = {
-                "type": vs_type,
-                "trend": trend,
-                "change_percentage": round(change_percentage, 2),
-                "confidence": min(abs(change_percentage) / 10, 1.0),
-                "period_days": (signs[-1].get('timestamp', datetime.now()) - signs[0].get('timestamp', datetime.now())).days
-            }
-            trends.append(trend_data)
-        
-        return trends
-    
-    def _calculate_early_warning_score(self, vital_signs: List[Dict]) -> Dict[str, Any]:
-        """Calculate Early Warning Score based on recent vital signs"""
-        if not vital_signs:
-            return None
-        
-        # Get latest values for each vital sign type
-        latest_values = {}
-        for vs in vital_signs:
-            vs_type = vs.get('type')
-            if vs_type not in latest_values or vs.get('timestamp', datetime.now()) > latest_values[vs_type].get('timestamp', datetime.min):
-                latest_values[vs_type] = vs
-        
-        score = 0
-        factors = []
-        
-        # Heart Rate scoring
-        if 'heartRate' in latest_values:
-            hr = latest_values['heartRate'].get('value', 0)
-            if hr < 40 or hr > 130:
-                score += 3
-                factors.append(f"Heart rate {hr} BPM (abnormal)")
-            elif hr < 50 or hr > 110:
-                score += 2
-                factors.append(f"Heart rate {hr} BPM (elevated)")
-            elif hr < 60 or hr > 100:
-                score += 1
-                factors.append(f"Heart rate {hr} BPM (slightly elevated)")
-        
-        # Blood Pressure scoring
-        if 'bloodPressure' in latest_values:
-            bp = latest_values['bloodPressure'].get('value', 0)
-            if bp < 90 or bp > 180:
-                score += 3
-                factors.append(f"Blood pressure {bp} mmHg (abnormal)")
-            elif bp < 100 or bp > 160:
-                score += 2
-                factors.append(f"Blood pressure {bp} mmHg (elevated)")
-            elif bp < 110 or bp > 140:
-                score += 1
-                factors.append(f"Blood pressure {bp} mmHg (slightly elevated)")
-        
-        # Temperature scoring
-        if 'temperature' in latest_values:
-            temp = latest_values['temperature'].get('value', 0)
-            if temp < 35 or temp > 39:
-                score += 3
-                factors.append(f"Temperature {temp}°C (abnormal)")
-            elif temp < 36 or temp > 38:
-                score += 2
-                factors.append(f"Temperature {temp}°C (elevated)")
-            elif temp < 36.5 or temp > 37.5:
-                score += 1
-                factors.append(f"Temperature {temp}°C (slightly elevated)")
-        
-        # Determine risk level
-        if score >= 7:
-            risk_level = "critical"
-        elif score >= 4:
-            risk_level = "high"
-        elif score >= 2:
-            risk_level = "medium"
-        else:
-            risk_level = "low"
-        
-        # Generate recommendations
-        recommendations = []
-        if risk_level == "critical":
-            recommendations.append("Seek immediate medical attention")
-        elif risk_level == "high":
-            recommendations.append("Contact healthcare provider urgently")
-        elif risk_level == "medium":
-            recommendations.append("Monitor closely and consider contacting healthcare provider")
-        else:
-            recommendations.append("Continue regular monitoring")
-        
-        return {
-            "score": score,
-            "risk_level": risk_level,
-            "factors": factors,
-            "recommendations": recommendations,
-            "timestamp": datetime.now().isoformat()
-        }
-    
     def _determine_health_status(self, anomalies: List[Dict], ews: Dict[str, Any]) -> str:
         """Determine overall health status based on analysis"""
         if not ews:
@@ -438,14 +454,7 @@ class VitalSignsService:
             vs_type = vital_record.get('type')
             value = vital_record.get('value', 0)
             
-            # Define alert thresholds
-            thresholds = {
-                'heartRate': {'low': 50, 'high': 100},
-                'bloodPressure': {'low': 90, 'high': 140},
-                'temperature': {'low': 36.0, 'high': 37.5},
-                'spO2': {'low': 95, 'high': 100},
-                'respiratoryRate': {'low': 12, 'high': 20}
-            }
+            thresholds = ALERT_THRESHOLDS
             
             if vs_type not in thresholds:
                 return
@@ -475,7 +484,8 @@ class VitalSignsService:
                 # Add alert to patient's vital_signs_alerts array
                 self.db.patients_collection.update_one(
                     {"patient_id": patient_id},
-                    {"$push": {"vital_signs_alerts": alert}}
+                    {"$push": {"vital_signs_alerts": alert}},
+                    upsert=True
                 )
                 
         except Exception as e:
@@ -12,6 +12,7 @@ import logging
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
+from voice_pipeline import VoicePipelineWebSocketService
 
 # Load environment variables
 load_dotenv()
@@ -31,6 +32,10 @@ class VoiceInteractionService:
         # Initialize voice interaction components
         self._initialize_services()
         
+        # Streaming STT -> AI -> TTS over WebSocket (python voice_pipeline.py)
+        if self.websocket_service is None:
+            self.websocket_service = VoicePipelineWebSocketService(self)
+        
         logger.info(f"✅ {self.service_name} initialized successfully")
     
     def _initialize_services(self):
@@ -191,8 +196,10 @@ class VoiceInteractionService:
                 'speech_to_text',
                 'text_to_speech',
                 'ai_response_generation',
-                'voice_interaction_pipeline'
+                'voice_interaction_pipeline',
+                'streaming_voice_pipeline'
             ],
+            'websocket_port': int(os.getenv('VOICE_WS_PORT', '8765')),
             'supported_formats': ['wav', 'mp3', 'm4a', 'flac', 'webm'],
             'supported_languages': ['en', 'ta', 'hi', 'es', 'fr', 'de', 'zh', 'ja', 'ko']
         }
@@ -209,7 +216,8 @@ class VoiceInteractionService:
                 'ai_service': 'available' if hasattr(self, 'ai_service') else 'unavailable',
                 'tts_service': 'available' if hasattr(self, 'tts_service') else 'unavailable',
                 'websocket_service': 'available' if hasattr(self, 'websocket_service') and self.websocket_service else 'unavailable'
-            }
+            },
+            'pipeline_latency': self.websocket_service.stats() if hasattr(self.websocket_service, 'stats') else None
         }
 
 
@@ -217,9 +225,12 @@ class VoiceInteractionService:
 class MockSTTService:
     """Mock Speech-to-Text service"""
     
+    def __init__(self, latency: float = 0.5):
+        self.latency = latency  # Simulated processing time in seconds
+    
     async def transcribe_audio(self, audio_data: bytes, **kwargs) -> Dict[str, Any]:
         """Mock transcription"""
-        await asyncio.sleep(0.5)  # Simulate processing time
+        await asyncio.sleep(self.latency)  # Simulate processing time
         return {
             "text": "Mock transcription: Audio received and processed successfully.",
             "language": "en",
@@ -229,6 +240,14 @@ class MockSTTService:
             "model": "mock"
         }
     
+    async def transcribe_partial(self, audio_data: bytes, **kwargs) -> Dict[str, Any]:
+        """Mock partial transcription of the audio received so far"""
+        await asyncio.sleep(self.latency / 5)
+        return {
+            "text": f"Mock transcription ({len(audio_data)} bytes)...",
+            "provider": "mock"
+        }
+    
     async def transcribe_base64_audio(self, base64_audio: str, **kwargs) -> Dict[str, Any]:
         """Mock base64 transcription"""
         return await self.transcribe_audio(b"mock_audio", **kwargs)
@@ -237,23 +256,36 @@ class MockSTTService:
 class MockAIService:
     """Mock AI service"""
     
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+    
     async def generate_response(self, text: str, history: List[Dict] = None) -> Dict[str, Any]:
         """Mock AI response"""
-        await asyncio.sleep(1.0)  # Simulate processing time
+        await asyncio.sleep(self.latency)  # Simulate processing time
         return {
             "text": f"Mock AI response to: {text}",
             "confidence": 0.9,
             "provider": "mock",
             "model": "mock"
         }
+    
+    async def stream_response(self, text: str, history: List[Dict] = None):
+        """Mock AI response streamed word by word"""
+        words = f"Mock AI response to: {text}".split(" ")
+        for word in words:
+            await asyncio.sleep(self.latency / len(words))
+            yield word + " "
 
 
 class MockTTSService:
     """Mock Text-to-Speech service"""
     
+    def __init__(self, latency: float = 1.0):
+        self.latency = latency
+    
     async def text_to_speech(self, text: str, **kwargs) -> Dict[str, Any]:
         """Mock TTS"""
-        await asyncio.sleep(1.0)  # Simulate processing time
+        await asyncio.sleep(self.latency)  # Simulate processing time
         return {
             "audio_data": base64.b64encode(f"Mock audio for: {text}".encode()).decode(),
             "format": "wav",
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Voice Pipeline - Full-duplex voice interaction over WebSocket
+
+Audio frames stream in while partial transcripts stream out. When the client
+marks the end of an utterance, the final transcript starts the AI response. Its
+tokens are forwarded as they arrive, and every complete sentence goes to TTS
+right away, so the first audio chunk is sent before the AI has finished.
+Latency is measured per stage for every turn.
+
+Protocol (one WebSocket per conversation):
+    client -> server  binary frames: audio
+                      {"type": "start", "enable_tts": true}   optional, resets the conversation
+                      {"type": "end"}                         user stopped speaking
+                      {"type": "cancel"}                      barge-in: stop the current reply
+    server -> client  {"type": "partial_transcript", "text": ...}
+                      {"type": "final_transcript", "text": ...}
+                      {"type": "ai_token", "text": ...}
+                      {"type": "ai_response", "text": ...}
+                      {"type": "audio", "seq": n, "format": ..., "size": ...} followed by one binary frame
+                      {"type": "turn_complete", "latency": {...}}
+                      {"type": "error", "error": ...}
+
+Usage:
+    python voice_pipeline.py [--host 0.0.0.0] [--port 8765]
+"""
+
+import os
+import re
+import json
+import time
+import asyncio
+import argparse
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
+
+from audio_transport import decode_audio
+
+try:
+    import websockets
+except ImportError:  # websockets is only needed to serve the pipeline
+    websockets = None
+
+# Ask STT for a partial transcript every ~1 s of 16 kHz 16-bit mono audio
+PARTIAL_INTERVAL_BYTES = int(os.getenv("VOICE_PARTIAL_INTERVAL_BYTES", "32000"))
+# Latency history kept for stats()
+LATENCY_HISTORY = 100
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?।])\s+|\n+")
+
+Message = Union[Dict[str, Any], bytes]
+
+def _ms(since: float) -> float:
+    return round((time.perf_counter() - since) * 1000, 1)
+
+class VoicePipelineSession:
+    """One conversation: buffers audio and runs STT -> AI -> TTS per turn"""
+
+    def __init__(self, stt, ai, tts, send: Callable[[Message], Awaitable[None]], enable_tts: bool = True):
+        self.stt = stt
+        self.ai = ai
+        self.tts = tts
+        self.send = send
+        self.enable_tts = enable_tts
+        self.history: List[Dict[str, str]] = []
+        self.audio = bytearray()
+        self._first_frame_at: Optional[float] = None
+        self._first_partial_ms: Optional[float] = None
+        self._partial_at = 0
+        self._partial_task: Optional[asyncio.Task] = None
+
+    async def feed_audio(self, frame: bytes):
+        """Buffer an audio frame; periodically emit a partial transcript"""
+        if not self.audio:
+            self._first_frame_at = time.perf_counter()
+        self.audio += frame
+        if not hasattr(self.stt, "transcribe_partial"):
+            return
+        if len(self.audio) - self._partial_at >= PARTIAL_INTERVAL_BYTES and \
+                (self._partial_task is None or self._partial_task.done()):
+            self._partial_at = len(self.audio)
+            self._partial_task = asyncio.create_task(self._emit_partial(bytes(self.audio)))
+
+    async def _emit_partial(self, audio: bytes):
+        try:
+            result = await self.stt.transcribe_partial(audio)
+        except Exception as e:
+            print(f"⚠️ Partial transcription failed: {e}")
+            return
+        text = (result or {}).get("text", "").strip()
+        if text:
+            if self._first_partial_ms is None and self._first_frame_at is not None:
+                self._first_partial_ms = _ms(self._first_frame_at)
+            await self.send({"type": "partial_transcript", "text": text})
+
+    async def end_utterance(self) -> Optional[Dict[str, float]]:
+        """Finish the buffered utterance and reply to it; returns the turn's stage latencies"""
+        ended = time.perf_counter()
+        # Take the buffer before awaiting so the next utterance can start streaming in
+        audio, self.audio, self._partial_at = bytes(self.audio), bytearray(), 0
+        latency = {"stt_first_partial_ms": self._first_partial_ms}
+        self._first_partial_ms = None
+        if self._partial_task and not self._partial_task.done():
+            self._partial_task.cancel()
+
+        if not audio:
+            await self.send({"type": "error", "error": "No audio received"})
+            return None
+
+        transcription = await self.stt.transcribe_audio(audio)
+        text = (transcription or {}).get("text", "").strip()
+        latency["stt_ms"] = _ms(ended)
+        if not text:
+            await self.send({"type": "error", "error": "No speech detected in audio"})
+            return None
+        await self.send({"type": "final_transcript", "text": text, "language": transcription.get("language")})
+
+        # Sentences go to TTS while the AI is still generating
+        sentences: asyncio.Queue = asyncio.Queue()
+        speaker = asyncio.create_task(self._speak(sentences, ended, latency)) if self.enable_tts else None
+        ai_started = time.perf_counter()
+        parts: List[str] = []
+        pending = ""
+        try:
+            try:
+                async for delta in self._ai_tokens(text):
+                    if not parts:
+                        latency["ai_first_token_ms"] = _ms(ai_started)
+                    parts.append(delta)
+                    await self.send({"type": "ai_token", "text": delta})
+                    *complete, pending = SENTENCE_BOUNDARY.split(pending + delta)
+                    for sentence in complete:
+                        if sentence.strip():
+                            sentences.put_nowait(sentence.strip())
+                if pending.strip():
+                    sentences.put_nowait(pending.strip())
+            finally:
+                sentences.put_nowait(None)
+            latency["ai_ms"] = _ms(ai_started)
+
+            response = "".join(parts).strip()
+            await self.send({"type": "ai_response", "text": response})
+            self.history += [{"role": "user", "content": text}, {"role": "assistant", "content": response}]
+
+            if speaker:
+                await speaker
+        except BaseException:
+            # Cancelled (barge-in) or failed: stop speaking the rest of the reply
+            if speaker:
+                speaker.cancel()
+            raise
+        latency["total_ms"] = _ms(ended)
+        await self.send({"type": "turn_complete", "latency": latency})
+        return latency
+
+    async def _ai_tokens(self, text: str) -> AsyncIterator[str]:
+        """Token stream from the AI service, or its whole reply when it cannot stream"""
+        if hasattr(self.ai, "stream_response"):
+            async for delta in self.ai.stream_response(text, self.history):
+                yield delta
+            return
+        result = await self.ai.generate_response(text, self.history)
+        yield (result or {}).get("text", "")
+
+    async def _speak(self, sentences: asyncio.Queue, ended: float, latency: Dict[str, Any]):
+        """Synthesize queued sentences in order and send each as an audio chunk"""
+        seq = 0
+        tts_total = 0.0
+        while True:
+            sentence = await sentences.get()
+            if sentence is None:
+                break
+            started = time.perf_counter()
+            result = await self.tts.text_to_speech(sentence)
+            audio = decode_audio(result)
+            tts_total += time.perf_counter() - started
+            if seq == 0:
+                latency["tts_first_audio_ms"] = _ms(started)
+                # What the user waits for: end of speech to first audio
+                latency["end_to_end_ms"] = _ms(ended)
+            await self.send({"type": "audio", "seq": seq, "format": result.get("format"), "size": len(audio)})
+            await self.send(audio)
+            seq += 1
+        latency["tts_ms"] = round(tts_total * 1000, 1)
+        latency["audio_chunks"] = seq
+
+class VoicePipelineWebSocketService:
+    """WebSocket front end for VoicePipelineSession with per-stage latency stats"""
+
+    def __init__(self, voice_service):
+        self.voice_service = voice_service
+        self.latencies: List[Dict[str, float]] = []
+        self.active_sessions = 0
+
+    def session(self, send: Callable[[Message], Awaitable[None]], enable_tts: bool = True) -> VoicePipelineSession:
+        return VoicePipelineSession(self.voice_service.stt_service, self.voice_service.ai_service,
+                                    self.voice_service.tts_service, send, enable_tts)
+
+    def _record(self, latency: Optional[Dict[str, float]]):
+        if latency:
+            self.latencies = (self.latencies + [latency])[-LATENCY_HISTORY:]
+
+    async def _run_turn(self, session: VoicePipelineSession):
+        try:
+            self._record(await session.end_utterance())
+        except asyncio.CancelledError:
+            await session.send({"type": "error", "error": "Turn cancelled"})
+        except Exception as e:
+            print(f"❌ Voice pipeline turn failed: {e}")
+            await session.send({"type": "error", "error": str(e)})
+
+    async def handle(self, websocket):
+        """Serve one WebSocket connection"""
+        async def send(message: Message):
+            await websocket.send(message if isinstance(message, bytes) else json.dumps(message))
+
+        session = self.session(send)
+        turn: Optional[asyncio.Task] = None
+        self.active_sessions += 1
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    await session.feed_audio(message)
+                    continue
+                try:
+                    control = json.loads(message)
+                except ValueError:
+                    await send({"type": "error", "error": "Control messages must be JSON"})
+                    continue
+
+                kind = control.get("type")
+                if kind == "start":
+                    session = self.session(send, control.get("enable_tts", True))
+                elif kind == "end":
+                    # Turns are answered in order; audio for the next one keeps buffering
+                    if turn and not turn.done():
+                        await turn
+                    turn = asyncio.create_task(self._run_turn(session))
+                elif kind == "cancel":
+                    if turn and not turn.done():
+                        turn.cancel()
+                else:
+                    await send({"type": "error", "error": f"Unknown message type '{kind}'"})
+            if turn and not turn.done():
+                await turn
+        finally:
+            self.active_sessions -= 1
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8765):
+        if websockets is None:
+            raise RuntimeError("websockets is not installed. Run: pip install websockets")
+        async with websockets.serve(self.handle, host, port, max_size=2 ** 20):
+            print(f"✅ Voice pipeline listening on ws://{host}:{port}")
+            await asyncio.Future()
+
+    def stats(self) -> Dict[str, Any]:
+        """Average and worst latency per stage over recent turns"""
+        stages: Dict[str, List[float]] = {}
+        for latency in self.latencies:
+            for stage, value in latency.items():
+                if stage.endswith("_ms") and value is not None:
+                    stages.setdefault(stage, []).append(value)
+        return {
+            "turns": len(self.latencies),
+            "active_sessions": self.active_sessions,
+            "stages": {
+                stage: {"avg_ms": round(sum(values) / len(values), 1), "max_ms": max(values)}
+                for stage, values in stages.items()
+            }
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the streaming voice pipeline over WebSocket")
+    parser.add_argument("--host", default=os.getenv("VOICE_WS_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("VOICE_WS_PORT", "8765")))
+    args = parser.parse_args()
+
+    from voice_interaction_service import voice_interaction_service
+    asyncio.run(voice_interaction_service.websocket_service.serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()